@@ -0,0 +1,220 @@
+"""
+Background backtest job queue.
+
+Backtests submitted from the dashboard are stored as ``BacktestJob`` rows and
+executed by a separate worker process (``manage.py run_backtest_worker``), so
+web requests return immediately regardless of how long a run takes.
+
+This module provides functionality to:
+1. Enqueue backtests, deduplicating identical in-flight submissions
+2. Claim queued jobs safely from several concurrent workers
+3. Execute a job, recording progress and a JSON-serializable result
+4. Requeue jobs abandoned by a worker that died mid-run
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from dashboard.models import BacktestJob
+from core.backtester import ENGINE_BACKTRADER, extract_metrics, run_backtest
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Minimum change in progress between database writes
+PROGRESS_STEP = 0.02
+
+# Running jobs without a progress report for this long are assumed abandoned
+DEFAULT_STALE_AFTER = timedelta(minutes=10)
+
+
+def make_job_key(config):
+    """
+    Hash a backtest configuration so identical submissions share a key.
+
+    Parameters:
+        config (dict): JSON-serializable backtest configuration.
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical configuration.
+    """
+    canonical = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def enqueue_backtest(config):
+    """
+    Queue a backtest, or attach to an identical queued/running one.
+
+    Parameters:
+        config (dict): Backtest configuration with 'ticker', 'start_date' and
+                       'end_date' ('YYYY-MM-DD' or None), 'initial_cash',
+                       'commission', 'engine' and 'strategy_params'.
+
+    Returns:
+        tuple: (BacktestJob, created) where created is False when an
+               in-flight job with the same configuration was reused.
+    """
+    config_key = make_job_key(config)
+    for _ in range(3):
+        existing = BacktestJob.objects.filter(
+            config_key=config_key, status__in=BacktestJob.ACTIVE_STATUSES
+        ).first()
+        if existing is not None:
+            logger.info(f"Reusing in-flight backtest job {existing.pk} for {config['ticker']}")
+            return existing, False
+        try:
+            with transaction.atomic():
+                job = BacktestJob.objects.create(
+                    config_key=config_key, ticker=config['ticker'], config=config
+                )
+            logger.info(f"Queued backtest job {job.pk} for {config['ticker']}")
+            return job, True
+        except IntegrityError:
+            # Another request created the same job concurrently; pick it up
+            continue
+    raise RuntimeError(f"Could not enqueue backtest for {config['ticker']}")
+
+
+def claim_next_job():
+    """
+    Atomically mark the oldest queued job as running and return it.
+
+    Uses ``SELECT ... FOR UPDATE SKIP LOCKED`` so several workers can poll
+    the queue without claiming the same job.
+
+    Returns:
+        BacktestJob: The claimed job, or None if the queue is empty.
+    """
+    with transaction.atomic():
+        job = (
+            BacktestJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=BacktestJob.STATUS_QUEUED)
+            .order_by('created_at', 'pk')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = BacktestJob.STATUS_RUNNING
+        job.progress = 0.0
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'progress', 'started_at', 'updated_at'])
+    return job
+
+
+def requeue_stale_jobs(stale_after=DEFAULT_STALE_AFTER):
+    """
+    Return running jobs that stopped reporting progress to the queue.
+
+    Returns:
+        int: Number of jobs requeued.
+    """
+    cutoff = timezone.now() - stale_after
+    count = BacktestJob.objects.filter(
+        status=BacktestJob.STATUS_RUNNING, updated_at__lt=cutoff
+    ).update(status=BacktestJob.STATUS_QUEUED, progress=0.0, started_at=None, updated_at=timezone.now())
+    if count:
+        logger.warning(f"Requeued {count} stale backtest job(s)")
+    return count
+
+
+def _parse_config_date(value, end_of_day=False):
+    """Convert a 'YYYY-MM-DD' config date to an aware UTC datetime (or None)."""
+    if not value:
+        return None
+    day = datetime.strptime(value, '%Y-%m-%d').date()
+    return datetime.combine(day, time.max if end_of_day else time.min, tzinfo=dt_timezone.utc)
+
+
+def backtest_kwargs(config):
+    """
+    Translate a stored job configuration into ``run_backtest`` keyword arguments.
+
+    The end date is inclusive: the whole final day is part of the run.
+    """
+    return {
+        'start_date': _parse_config_date(config.get('start_date')),
+        'end_date': _parse_config_date(config.get('end_date'), end_of_day=True),
+        'strategy_params': config.get('strategy_params') or None,
+        'initial_cash': float(config['initial_cash']),
+        'commission': float(config['commission']),
+        'engine': config.get('engine', ENGINE_BACKTRADER),
+        'low_memory': bool(config.get('low_memory')),
+    }
+
+
+def summarize_result(results, config):
+    """
+    Build the JSON-serializable summary stored on a successful job.
+
+    Returns:
+        dict: 'metrics' from ``extract_metrics``, the 'equity' curve (dates
+              and portfolio values) and the closed 'trades'.
+    """
+    metrics = extract_metrics(results)
+    equity = results.get('equity_curve') or {
+        # Engines without a recorded curve: start and end value only
+        'dates': [config.get('start_date'), config.get('end_date')],
+        'values': [metrics['initial_capital'], metrics['final_capital']],
+    }
+    return {
+        'metrics': metrics,
+        'equity': equity,
+        'trades': results.get('trades') or [],
+    }
+
+
+def _progress_writer(job):
+    """Return a callback that records run progress on the job row, throttled."""
+    state = {'last': 0.0}
+
+    def report(fraction):
+        if fraction - state['last'] < PROGRESS_STEP and fraction < 1.0:
+            return
+        state['last'] = fraction
+        BacktestJob.objects.filter(pk=job.pk).update(progress=fraction, updated_at=timezone.now())
+
+    return report
+
+
+def execute_job(job):
+    """
+    Run a claimed job and store its outcome.
+
+    Parameters:
+        job (BacktestJob): A job in the running state.
+
+    Returns:
+        BacktestJob: The job, updated with status, result or error.
+    """
+    config = job.config
+    logger.info(f"Executing backtest job {job.pk} for {job.ticker}")
+    try:
+        results = run_backtest(
+            job.ticker, use_cache=True, progress_callback=_progress_writer(job),
+            **backtest_kwargs(config)
+        )
+        if results.get('success'):
+            job.status = BacktestJob.STATUS_SUCCEEDED
+            job.result = summarize_result(results, config)
+            job.progress = 1.0
+        else:
+            job.status = BacktestJob.STATUS_FAILED
+            job.error = results.get('error') or 'Backtest failed'
+    except Exception as e:
+        logger.exception(f"Backtest job {job.pk} crashed")
+        job.status = BacktestJob.STATUS_FAILED
+        job.error = f"An unexpected error occurred: {e}"
+
+    job.finished_at = timezone.now()
+    update_fields = ['status', 'result', 'error', 'finished_at', 'updated_at']
+    if job.status == BacktestJob.STATUS_SUCCEEDED:
+        update_fields.append('progress')
+    job.save(update_fields=update_fields)
+    logger.info(f"Backtest job {job.pk} finished with status {job.status}")
+    return job
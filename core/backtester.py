@@ -6,17 +6,26 @@ This module provides functionality to:
 2. Configure and run backtests with specified strategies
 3. Analyze and return results of backtest runs
 """
+import itertools
 import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from decimal import Decimal
 from django.utils import timezone
-from django.db.models import Min, Max
 import backtrader as bt
 
 from dashboard.models import OHLCVData
-from core.strategies import ClassicBreakoutStrategy
+from core.strategies import ClassicBreakoutStrategy, PortfolioBreakoutStrategy
+from core.vectorized import run_vectorized_backtest
+from core.result_cache import get_result_cache, make_cache_key
+from core.performance import ANALYZER_KEYS, PerformanceRecorder, trade_statistics
+from core.feeds import OHLCV_FIELDS, DatabaseStreamFeed, ohlcv_queryset
+from core.profiling import phase, profiling
+from core.indicator_cache import breakout_indicators
+from core.signals import get_signals, make_signal_feed
+from core.features import aligned_features
+from core.catalog import VERSION_FIELDS, catalog_date_range, catalog_versions, version_digest
 
 # Configure logging
 logging.basicConfig(
@@ -25,21 +34,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Available backtest engines for run_backtest
+ENGINE_BACKTRADER = 'backtrader'
+ENGINE_VECTORIZED = 'vectorized'
+ENGINES = (ENGINE_BACKTRADER, ENGINE_VECTORIZED)
 
-def get_data_feed(ticker, start_date=None, end_date=None):
+
+def get_ohlcv_dataframe(ticker, start_date=None, end_date=None):
     """
-    Create a data feed by querying OHLCV data from PostgreSQL.
-    
+    Load OHLCV data for a ticker from PostgreSQL into a DataFrame.
+
     Parameters:
         ticker (str): Stock ticker symbol
         start_date (datetime): Start date for the data range
         end_date (datetime): End date for the data range
-        
+
     Returns:
-        bt.feeds.PandasData: Backtrader data feed
+        pd.DataFrame: OHLCV data indexed by timestamp, or None if no data
     """
-    logger.info(f"Creating data feed for {ticker} from {start_date} to {end_date}")
-    
     # Build query for OHLCV data
     query = OHLCVData.objects.filter(ticker=ticker)
     
@@ -52,36 +64,82 @@ def get_data_feed(ticker, start_date=None, end_date=None):
     # Order by timestamp
     query = query.order_by('timestamp')
     
-    # Check if data exists
-    if not query.exists():
-        logger.warning(f"No data found for ticker {ticker} in date range")
-        return None
-    
-    # Convert QuerySet to DataFrame
-    records = []
-    for record in query:
-        records.append({
-            'timestamp': record.timestamp,
-            'open': float(record.open),
-            'high': float(record.high),
-            'low': float(record.low),
-            'close': float(record.close),
-            'volume': int(record.volume)
-        })
+    with phase('db_query'):
+        # Check if data exists
+        if not query.exists():
+            logger.warning(f"No data found for ticker {ticker} in date range")
+            return None
+
+        # Convert QuerySet to DataFrame
+        records = []
+        for record in query:
+            records.append({
+                'timestamp': record.timestamp,
+                'open': float(record.open),
+                'high': float(record.high),
+                'low': float(record.low),
+                'close': float(record.close),
+                'volume': int(record.volume)
+            })
     
     if not records:
         logger.warning(f"No data converted for ticker {ticker}")
         return None
     
-    # Create DataFrame with timestamp as index
-    df = pd.DataFrame(records)
-    df.set_index('timestamp', inplace=True)
-    
-    # Ensure DataFrame columns match Backtrader naming conventions
-    df.columns = df.columns.str.lower()
-    
-    # Convert DataFrame to Backtrader data feed
-    data_feed = bt.feeds.PandasData(
+    with phase('dataframe'):
+        # Create DataFrame with timestamp as index
+        df = pd.DataFrame(records)
+        df.set_index('timestamp', inplace=True)
+
+        # Ensure DataFrame columns match Backtrader naming conventions
+        df.columns = df.columns.str.lower()
+    return df
+
+
+def get_ohlcv_dataframes(tickers, start_date=None, end_date=None):
+    """
+    Load OHLCV data for several tickers with a single database query.
+
+    Parameters:
+        tickers (list): Stock ticker symbols
+        start_date (datetime): Start date for the data range
+        end_date (datetime): End date for the data range
+
+    Returns:
+        dict: Ticker -> OHLCV DataFrame indexed by timestamp, in the order of
+              ``tickers``; tickers without data are left out
+    """
+    query = OHLCVData.objects.filter(ticker__in=tickers)
+    if start_date:
+        query = query.filter(timestamp__gte=start_date)
+    if end_date:
+        query = query.filter(timestamp__lte=end_date)
+    with phase('db_query'):
+        rows = list(query.order_by('ticker', 'timestamp').values_list('ticker', *OHLCV_FIELDS))
+    if not rows:
+        logger.warning(f"No data found for tickers {', '.join(tickers)} in date range")
+        return {}
+
+    with phase('dataframe'):
+        df = pd.DataFrame.from_records(rows, columns=['ticker', *OHLCV_FIELDS])
+        df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].astype(float)
+        df['volume'] = df['volume'].astype(int)
+        frames = {ticker: group.drop(columns='ticker').set_index('timestamp')
+                  for ticker, group in df.groupby('ticker', sort=False)}
+    return {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+
+
+def make_data_feed(df):
+    """
+    Wrap an OHLCV DataFrame in a Backtrader data feed.
+
+    Parameters:
+        df (pd.DataFrame): OHLCV data indexed by timestamp
+
+    Returns:
+        bt.feeds.PandasData: Backtrader data feed
+    """
+    return bt.feeds.PandasData(
         dataname=df,
         datetime=None,  # Index is already datetime
         open='open',
@@ -91,14 +149,86 @@ def get_data_feed(ticker, start_date=None, end_date=None):
         volume='volume',
         openinterest=-1  # Not used
     )
+
+
+def get_data_feed(ticker, start_date=None, end_date=None):
+    """
+    Create a data feed by querying OHLCV data from PostgreSQL.
+    
+    Parameters:
+        ticker (str): Stock ticker symbol
+        start_date (datetime): Start date for the data range
+        end_date (datetime): End date for the data range
+        
+    Returns:
+        bt.feeds.PandasData: Backtrader data feed
+    """
+    logger.info(f"Creating data feed for {ticker} from {start_date} to {end_date}")
+
+    df = get_ohlcv_dataframe(ticker, start_date, end_date)
+    if df is None:
+        return None
+
+    # Convert DataFrame to Backtrader data feed
+    data_feed = make_data_feed(df)
     
     logger.info(f"Created data feed with {len(df)} bars")
     return data_feed
 
 
+def get_stream_feed(ticker, start_date=None, end_date=None, chunk_size=None):
+    """
+    Create a data feed that streams bars from the database in chunks.
+
+    Parameters:
+        ticker (str): Stock ticker symbol
+        start_date (datetime): Start date for the data range
+        end_date (datetime): End date for the data range
+        chunk_size (int): Rows fetched per database round trip
+
+    Returns:
+        DatabaseStreamFeed: Streaming data feed, or None if no data
+    """
+    if not ohlcv_queryset(ticker, start_date, end_date).exists():
+        logger.warning(f"No data found for {ticker} in the specified date range")
+        return None
+
+    params = {'ticker': ticker, 'start_date': start_date, 'end_date': end_date}
+    if chunk_size:
+        params['chunk_size'] = chunk_size
+    return DatabaseStreamFeed(**params)
+
+
+def get_signal_feed(ticker, start_date=None, end_date=None, strategy_params=None):
+    """
+    Create a data feed carrying precomputed breakout signal lines.
+
+    Parameters:
+        ticker (str): Stock ticker symbol
+        start_date (datetime): Start date for the data range
+        end_date (datetime): End date for the data range
+        strategy_params (dict): ClassicBreakoutStrategy parameters
+
+    Returns:
+        core.signals.SignalData: Backtrader data feed, or None if no data
+    """
+    df = get_ohlcv_dataframe(ticker, start_date, end_date)
+    if df is None:
+        return None
+    with phase('signals'):
+        signals = get_signals(df, strategy_params, ticker=ticker,
+                              data_version=get_data_version(ticker, start_date, end_date),
+                              start_date=start_date, end_date=end_date,
+                              features=aligned_features(ticker, df, start_date, end_date))
+    return make_signal_feed(df, signals)
+
+
 def get_available_date_range(ticker):
     """
     Get the available date range for a ticker in the database.
+
+    Read from the ticker catalog (``core.catalog``) rather than aggregating
+    the ticker's bars.
     
     Parameters:
         ticker (str): Stock ticker symbol
@@ -106,21 +236,97 @@ def get_available_date_range(ticker):
     Returns:
         tuple: (min_date, max_date) or (None, None) if no data
     """
-    result = OHLCVData.objects.filter(ticker=ticker).aggregate(
-        min_date=Min('timestamp'),
-        max_date=Max('timestamp')
-    )
-    
-    return result['min_date'], result['max_date']
+    return catalog_date_range(ticker)
+
+
+def get_data_version(ticker, start_date=None, end_date=None):
+    """
+    Get a fingerprint of a ticker's stored OHLCV data.
+
+    The fingerprint changes whenever bars are added, removed or modified,
+    so it can be used to invalidate anything derived from the data.
+
+    When the range covers the ticker's whole history the fingerprint is its
+    ticker catalog ``data_version`` (one row); only ranges that cut the
+    history aggregate the bars in the range.
+
+    Parameters:
+        ticker (str): Stock ticker symbol
+        start_date (datetime): Optional start of the range to fingerprint
+        end_date (datetime): Optional end of the range to fingerprint
+
+    Returns:
+        str: Short hex digest identifying the current data
+    """
+    version = catalog_versions([ticker], start_date, end_date).get(ticker)
+    if version is not None:
+        return version
+    summary = ohlcv_queryset(ticker, start_date, end_date).order_by().aggregate(**VERSION_FIELDS)
+    return version_digest(summary)
+
+
+def get_data_versions(tickers, start_date=None, end_date=None):
+    """
+    Get ``get_data_version`` fingerprints for several tickers.
+
+    Tickers whose whole history lies in the range are read from the ticker
+    catalog; the others share one grouped aggregate over their bars.
+
+    Returns:
+        dict: Ticker -> fingerprint, for tickers that have data in the range
+    """
+    versions = catalog_versions(tickers, start_date, end_date)
+    remaining = [ticker for ticker in tickers if ticker not in versions]
+    if not remaining:
+        return versions
+    query = OHLCVData.objects.filter(ticker__in=remaining)
+    if start_date:
+        query = query.filter(timestamp__gte=start_date)
+    if end_date:
+        query = query.filter(timestamp__lte=end_date)
+    rows = query.order_by().values('ticker').annotate(**VERSION_FIELDS)
+    versions.update((row.pop('ticker'), version_digest(row)) for row in rows)
+    return versions
 
 
 def run_backtest(ticker, start_date=None, end_date=None,
                  strategy_class=ClassicBreakoutStrategy,
-                 strategy_params=None, initial_cash=100000.0, commission=0.001):
+                 strategy_params=None, initial_cash=100000.0, commission=0.001,
+                 engine=ENGINE_BACKTRADER, use_cache=False, progress_callback=None,
+                 low_memory=False, profile=False, precompute_signals=False):
     """
     Runs a backtest using the Backtrader engine for the specified ticker,
     date range, and strategy.
 
+    With ``engine='vectorized'`` the Classic Breakout rules are evaluated by
+    the NumPy engine in ``core.vectorized`` instead, which returns the same
+    result shape without Backtrader's per-bar event loop.
+
+    With ``low_memory=True`` (Backtrader engine only) bars are streamed from
+    the database in chunks and Cerebro runs with ``exactbars`` so line
+    buffers only hold the bars indicators and the strategy look back over.
+    Memory use then stays flat regardless of history length, which makes
+    long intraday histories practical; results are identical, except that
+    the equity curve holds one value per day.
+
+    With ``precompute_signals=True`` (Backtrader engine, ClassicBreakoutStrategy)
+    the consolidation range, volume MA, ATR and breakout condition are
+    computed with pandas over the whole series and fed to the strategy as
+    extra data lines (``core.signals``), so ``next`` only reads them. The
+    signal columns are cached per ticker, data version and parameters.
+    Results are identical to a regular run.
+
+    With ``profile=True`` the time spent in each phase (data loading,
+    DataFrame building, indicator setup, the Cerebro loop, strategy logging,
+    analyzers) is returned under 'profile' and written to
+    ``BACKTEST_PROFILE_DIR``; ``profile='sample'`` adds a sampled call
+    profile (see ``core.profiling``).
+
+    With ``use_cache=True`` successful results are memoized in the on-disk
+    result cache (``core.result_cache``), keyed by the full configuration and
+    the ticker's data version, so identical reruns return immediately and any
+    change to the ticker's data causes a fresh run.
+
     Parameters:
         ticker (str): Stock ticker symbol.
         start_date (datetime): Start date for backtest (timezone aware).
@@ -129,6 +335,14 @@ def run_backtest(ticker, start_date=None, end_date=None,
         strategy_params (dict): Optional parameters for the strategy.
         initial_cash (float): Initial cash amount for the backtest.
         commission (float): Commission rate (e.g., 0.001 for 0.1%).
+        engine (str): 'backtrader' (default) or 'vectorized'.
+        use_cache (bool): Return/store results via the backtest result cache.
+        progress_callback (callable): Optional; called with the fraction of
+                                      bars processed (0.0 - 1.0) as the run advances.
+        low_memory (bool): Stream bars from the database with bounded buffers.
+        profile (bool or str): Profile the run (True, or 'sample' to also
+                               sample call stacks).
+        precompute_signals (bool): Feed precomputed signal lines to the strategy.
 
     Returns:
         dict: A dictionary containing results:
@@ -137,14 +351,150 @@ def run_backtest(ticker, start_date=None, end_date=None,
               - 'error': Error message string (if failed).
               - 'start_value': Starting portfolio value.
               - 'end_value': Ending portfolio value.
+              - 'equity_curve': {'dates', 'values'} portfolio value per bar (if successful).
+              - 'trades': Closed trades with PnL and R-multiple (if successful).
+              - 'events': Signals, fills, stop updates and closed trades recorded
+                by the strategy (Backtrader engine; see ``core.events``).
+              - 'profile': Phase timings (only when profiling).
     """
+    with profiling(f"backtest-{ticker}", profile) as profiler:
+        result = _run_backtest(ticker, start_date, end_date, strategy_class, strategy_params,
+                               initial_cash, commission, engine, use_cache, progress_callback,
+                               low_memory, precompute_signals)
+    if profiler is not None:
+        result['profile'] = profiler.finish()
+    return result
+
+
+def _run_backtest(ticker, start_date, end_date, strategy_class, strategy_params,
+                  initial_cash, commission, engine, use_cache, progress_callback, low_memory,
+                  precompute_signals=False):
+    """``run_backtest`` without profiling; see there for parameters."""
+    if engine not in ENGINES:
+        error_msg = f"Unknown backtest engine '{engine}'. Use one of: {', '.join(ENGINES)}"
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
+
+    if low_memory and engine != ENGINE_BACKTRADER:
+        error_msg = "Low-memory mode is only supported by the backtrader engine."
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
+
+    if precompute_signals and (engine != ENGINE_BACKTRADER or low_memory
+                               or not issubclass(strategy_class, ClassicBreakoutStrategy)):
+        error_msg = ("Precomputed signals require the backtrader engine, ClassicBreakoutStrategy "
+                     "and a preloaded (not low-memory) feed.")
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
+
+    if not use_cache:
+        return _execute_backtest(ticker, start_date, end_date, strategy_class,
+                                 strategy_params, initial_cash, commission, engine,
+                                 progress_callback, low_memory, precompute_signals)
+
+    cache = get_result_cache()
+    with phase('cache_lookup'):
+        cache_key = make_cache_key(
+            ticker, start_date, end_date, strategy_class, strategy_params,
+            initial_cash, commission, get_data_version(ticker), engine,
+            options={'low_memory': True} if low_memory else None
+        )
+        cached_result = cache.get(cache_key)
+    if cached_result is not None:
+        logger.info(f"Backtest cache hit for {ticker} (key {cache_key[:12]})")
+        if progress_callback:
+            progress_callback(1.0)
+        return cached_result
+
+    result = _execute_backtest(ticker, start_date, end_date, strategy_class,
+                               strategy_params, initial_cash, commission, engine,
+                               progress_callback, low_memory, precompute_signals)
+    # Only successful runs are cached; failures may be transient
+    if result['success']:
+        with phase('cache_store'):
+            cache.set(cache_key, result)
+    return result
+
+
+def _execute_backtest(ticker, start_date, end_date, strategy_class,
+                      strategy_params, initial_cash, commission, engine,
+                      progress_callback=None, low_memory=False, precompute_signals=False):
+    """
+    Run a backtest with the selected engine, bypassing the result cache.
+
+    Returns the same result dictionary as ``run_backtest``.
+    """
+    if engine == ENGINE_VECTORIZED:
+        result = _run_vectorized(ticker, start_date, end_date, strategy_class,
+                                 strategy_params, initial_cash, commission)
+        if progress_callback and result['success']:
+            progress_callback(1.0)
+        return result
+
     logger.info(
         f"Initializing Cerebro for backtest: Ticker={ticker}, "
         f"Start={start_date}, End={end_date}, Strategy={strategy_class.__name__}"
     )
 
+    # 1. Get Data Feed
+    with phase('load_data'):
+        if low_memory:
+            data_feed = get_stream_feed(ticker, start_date, end_date)
+        elif precompute_signals:
+            data_feed = get_signal_feed(ticker, start_date, end_date, strategy_params)
+        else:
+            data_feed = get_data_feed(ticker, start_date, end_date)
+    if data_feed is None:
+        error_msg = f"No data feed available for {ticker} in the specified date range."
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
+
+    # 2. Configure and run Cerebro
+    return _run_cerebro(data_feed, strategy_class, strategy_params, initial_cash, commission,
+                        progress_callback, low_memory)
+
+
+class ProgressReporter(bt.Analyzer):
+    """
+    Analyzer that reports the fraction of bars processed to a callback.
+
+    Reports are throttled to changes of at least ``step`` so that long runs
+    don't flood the callback.
+    """
+    params = (
+        ('callback', None),
+        ('step', 0.01),
+    )
+
+    def start(self):
+        self._last_reported = 0.0
+
+    def next(self):
+        # Streamed feeds know their length up front; preloaded ones hold it all
+        total = getattr(self.data, 'total_bars', None) or self.data.buflen()
+        if not total or self.p.callback is None:
+            return
+        fraction = min(len(self.data) / total, 1.0)
+        if fraction - self._last_reported >= self.p.step or (fraction >= 1.0 > self._last_reported):
+            self._last_reported = fraction
+            self.p.callback(fraction)
+
+
+def _run_cerebro(data_feed, strategy_class, strategy_params, initial_cash, commission,
+                 progress_callback=None, low_memory=False):
+    """
+    Configure Cerebro with a strategy, data feed, broker settings and
+    analyzers, run it, and collect the results.
+
+    Returns the same result dictionary as ``run_backtest``.
+    """
     # 1. Initialize Cerebro engine
-    cerebro = bt.Cerebro()
+    if low_memory:
+        # Bounded line buffers; implies no preload/runonce. Observers are only
+        # needed for plotting
+        cerebro = bt.Cerebro(exactbars=1, stdstats=False)
+    else:
+        cerebro = bt.Cerebro()
 
     # 2. Add Strategy
     # Pass strategy parameters if provided
@@ -153,13 +503,7 @@ def run_backtest(ticker, start_date=None, end_date=None,
     else:
         cerebro.addstrategy(strategy_class)
 
-    # 3. Get and Add Data Feed
-    data_feed = get_data_feed(ticker, start_date, end_date)
-    if data_feed is None:
-        error_msg = f"No data feed available for {ticker} in the specified date range."
-        logger.error(error_msg)
-        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
-
+    # 3. Add Data Feed
     cerebro.adddata(data_feed)
 
     # 4. Set Initial Cash
@@ -171,44 +515,361 @@ def run_backtest(ticker, start_date=None, end_date=None,
     cerebro.broker.setcommission(commission=commission)
 
     # 6. Add Analyzers
-    # Standard analyzers for performance evaluation
-    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trade_analyzer')
-    cerebro.addanalyzer(bt.analyzers.SQN, _name='sqn')
-    # Additional analyzers
-    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe', timeframe=bt.TimeFrame.Days)
+    # A single recorder captures the equity curve and closed trades; all
+    # metrics are computed from its arrays after the run
+    cerebro.addanalyzer(PerformanceRecorder, _name='performance', compact=low_memory)
+    if progress_callback:
+        cerebro.addanalyzer(ProgressReporter, _name='progress', callback=progress_callback)
 
     # 7. Run the Backtest
     try:
         logger.info("Running Cerebro...")
         # The result is a list of strategy instances, one for each data feed (we only have one)
-        results = cerebro.run()
+        with phase('cerebro_run'):
+            results = cerebro.run()
         end_value = cerebro.broker.getvalue() # Record ending value
         logger.info(f"Backtest complete. Final Portfolio Value: {end_value:.2f}")
 
         # 8. Extract and Return Analyzer Results
         # Access analyzers from the first strategy instance in the results list
-        strategy_instance = results[0]
-        analyzer_results = {}
-        if hasattr(strategy_instance.analyzers, 'trade_analyzer'):
-            analyzer_results['trade_analyzer'] = strategy_instance.analyzers.trade_analyzer.get_analysis()
-        if hasattr(strategy_instance.analyzers, 'sqn'):
-             analyzer_results['sqn'] = strategy_instance.analyzers.sqn.get_analysis()
-        # Add other analyzers
-        if hasattr(strategy_instance.analyzers, 'drawdown'):
-            analyzer_results['drawdown'] = strategy_instance.analyzers.drawdown.get_analysis()
-        if hasattr(strategy_instance.analyzers, 'sharpe'):
-            analyzer_results['sharpe'] = strategy_instance.analyzers.sharpe.get_analysis()
+        with phase('analyzers'):
+            recorder = results[0].analyzers.performance
+            analysis = recorder.get_analysis()
+            analyzer_results = {name: analysis[name] for name in ANALYZER_KEYS}
+            analyzer_results['performance'] = analysis['performance']
+            equity_curve = recorder.equity_curve()
+            trades = recorder.closed_trades()
+            events = strategy_events(results[0])
 
         return {
             'success': True,
             'analyzers': analyzer_results,
             'error': None,
             'start_value': start_value,
-            'end_value': end_value
+            'end_value': end_value,
+            'equity_curve': equity_curve,
+            'trades': trades,
+            'events': events,
         }
 
     except Exception as e:
         error_msg = f"An error occurred during Cerebro run: {e}"
         logger.exception(error_msg) # Log exception with traceback
         return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': start_value, 'end_value': None}
+
+
+def strategy_events(strategy):
+    """
+    Recorded events of a finished strategy as JSON-friendly records.
+
+    Strategies without an ``events`` buffer (see ``core.events``) yield an
+    empty list.
+    """
+    buffer = getattr(strategy, 'events', None)
+    return buffer.to_records() if buffer is not None else []
+
+
+def _run_vectorized(ticker, start_date, end_date, strategy_class,
+                    strategy_params, initial_cash, commission, data=None, data_version=None,
+                    features=None):
+    """
+    Run a backtest with the vectorized engine, loading data if not supplied.
+
+    With ``data_version`` the indicator arrays come from the shared
+    indicator cache (``core.indicator_cache``); indicators held by
+    ``features`` (``core.features.aligned_features``) are read from them.
+
+    Returns the same result dictionary as ``run_backtest``.
+    """
+    if not issubclass(strategy_class, ClassicBreakoutStrategy):
+        error_msg = (
+            f"The vectorized engine only supports ClassicBreakoutStrategy, "
+            f"not {strategy_class.__name__}."
+        )
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
+
+    if data is None:
+        with phase('load_data'):
+            data = get_ohlcv_dataframe(ticker, start_date, end_date)
+    if data is None:
+        error_msg = f"No data available for {ticker} in the specified date range."
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None, 'end_value': None}
+
+    logger.info(f"Running vectorized backtest for {ticker} over {len(data)} bars")
+    indicators = None
+    if data_version is not None:
+        with phase('indicators'):
+            indicators = breakout_indicators(data, strategy_params, ticker=ticker, data_version=data_version,
+                                             start_date=start_date, end_date=end_date, features=features)
+    with phase('vectorized'):
+        return run_vectorized_backtest(data, strategy_params, initial_cash, commission, indicators=indicators)
+
+
+def run_parameter_sweep(ticker, param_grid, start_date=None, end_date=None,
+                        strategy_class=ClassicBreakoutStrategy,
+                        initial_cash=100000.0, commission=0.001,
+                        engine=ENGINE_VECTORIZED, profile=False):
+    """
+    Run one backtest per combination of strategy parameters.
+
+    The ticker's data is loaded from the database once and shared by every
+    run. Indicator arrays come from the shared indicator cache
+    (``core.indicator_cache``), so each indicator is computed once per
+    distinct set of its own parameters and a sweep over exit parameters does
+    no indicator work after the first run. With the Backtrader engine
+    (ClassicBreakoutStrategy) they are fed to the strategy as precomputed
+    signal lines (``core.signals``).
+
+    Parameters:
+        ticker (str): Stock ticker symbol.
+        param_grid (dict): Maps parameter names to lists of values to try,
+                           e.g. {'lookback': [20, 50], 'trail_stop_atr_mult': [2.0, 3.0]}.
+        start_date (datetime): Start date for the backtests.
+        end_date (datetime): End date for the backtests.
+        strategy_class: Strategy class to use (default: ClassicBreakoutStrategy).
+        initial_cash (float): Initial cash amount for each run.
+        commission (float): Commission rate (e.g., 0.001 for 0.1%).
+        engine (str): 'vectorized' (default) or 'backtrader'.
+        profile (bool or str): Profile the whole sweep (see ``run_backtest``).
+
+    Returns:
+        list: One dict per combination with 'params' and 'result' keys, where
+              'result' has the same shape as ``run_backtest``'s return value.
+              When profiling, every result carries the report of the whole
+              sweep under 'profile' (each run is timed as phase 'run').
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown backtest engine '{engine}'. Use one of: {', '.join(ENGINES)}")
+
+    with profiling(f"sweep-{ticker}", profile) as profiler:
+        with phase('load_data'):
+            data = get_ohlcv_dataframe(ticker, start_date, end_date)
+        use_signals = (engine == ENGINE_BACKTRADER and data is not None
+                       and issubclass(strategy_class, ClassicBreakoutStrategy))
+        data_version = get_data_version(ticker, start_date, end_date) if data is not None else None
+        with phase('features'):
+            features = aligned_features(ticker, data, start_date, end_date)
+        names = list(param_grid)
+        combinations = list(itertools.product(*(param_grid[name] for name in names)))
+        logger.info(f"Running parameter sweep for {ticker}: {len(combinations)} combinations ({engine} engine)")
+
+        sweep_results = []
+        for values in combinations:
+            params = dict(zip(names, values))
+            with phase('run'):
+                if engine == ENGINE_VECTORIZED:
+                    result = _run_vectorized(ticker, start_date, end_date, strategy_class,
+                                             params, initial_cash, commission, data=data,
+                                             data_version=data_version, features=features)
+                elif data is None:
+                    result = {'success': False,
+                              'error': f"No data feed available for {ticker} in the specified date range.",
+                              'analyzers': None, 'start_value': None, 'end_value': None}
+                elif use_signals:
+                    with phase('signals'):
+                        signals = get_signals(data, params, ticker=ticker, data_version=data_version,
+                                              start_date=start_date, end_date=end_date, features=features)
+                    result = _run_cerebro(make_signal_feed(data, signals), strategy_class, params,
+                                          initial_cash, commission)
+                else:
+                    result = _run_cerebro(make_data_feed(data), strategy_class, params, initial_cash, commission)
+            sweep_results.append({'params': params, 'result': result})
+
+    if profiler is not None:
+        report = profiler.finish()
+        for entry in sweep_results:
+            entry['result']['profile'] = report
+    return sweep_results
+
+
+def run_portfolio_backtest(tickers, start_date=None, end_date=None, strategy_params=None,
+                           initial_cash=100000.0, commission=0.001, profile=False):
+    """
+    Run the breakout rules over several tickers sharing one broker account.
+
+    All tickers are loaded with one query and added to a single Cerebro run
+    of ``PortfolioBreakoutStrategy``, which trades every symbol from the same
+    cash balance with risk-based position sizing. Each ticker is fed with
+    precomputed signal lines whose indicators come from the shared indicator
+    cache, so they are reused by later runs and single-ticker sweeps.
+
+    Parameters:
+        tickers (list): Stock ticker symbols.
+        start_date (datetime): Start date for the backtest.
+        end_date (datetime): End date for the backtest.
+        strategy_params (dict): Optional PortfolioBreakoutStrategy parameters.
+        initial_cash (float): Initial cash shared by all symbols.
+        commission (float): Commission rate (e.g., 0.001 for 0.1%).
+        profile (bool or str): Profile the run (see ``run_backtest``).
+
+    Returns:
+        dict: Same shape as ``run_backtest`` for the whole portfolio (trades
+              carry a 'ticker' key), plus:
+              - 'symbols': per-ticker metrics (trades, win rate, net PnL,
+                expectancy, average R, open position size)
+              - 'missing': tickers without data, which were skipped
+    """
+    tickers = list(dict.fromkeys(tickers))
+    with profiling(f"portfolio-{len(tickers)}-tickers", profile) as profiler:
+        result = _run_portfolio(tickers, start_date, end_date, strategy_params, initial_cash, commission)
+    if profiler is not None:
+        result['profile'] = profiler.finish()
+    return result
+
+
+def _run_portfolio(tickers, start_date, end_date, strategy_params, initial_cash, commission):
+    """``run_portfolio_backtest`` without profiling; see there for parameters."""
+    with phase('load_data'):
+        frames = get_ohlcv_dataframes(tickers, start_date, end_date)
+    missing = [ticker for ticker in tickers if ticker not in frames]
+    if not frames:
+        error_msg = "No data available for any of the requested tickers in the specified date range."
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': None,
+                'end_value': None, 'missing': missing}
+    if missing:
+        logger.warning(f"Skipping tickers without data: {', '.join(missing)}")
+
+    with phase('signals'):
+        versions = get_data_versions(list(frames), start_date, end_date)
+        signals = {ticker: get_signals(df, strategy_params, ticker=ticker, data_version=versions.get(ticker),
+                                       start_date=start_date, end_date=end_date,
+                                       features=aligned_features(ticker, df, start_date, end_date))
+                   for ticker, df in frames.items()}
+
+    cerebro = bt.Cerebro()
+    cerebro.addstrategy(PortfolioBreakoutStrategy, **(strategy_params or {}))
+    for ticker, df in frames.items():
+        cerebro.adddata(make_signal_feed(df, signals[ticker]), name=ticker)
+    cerebro.broker.setcash(initial_cash)
+    cerebro.broker.setcommission(commission=commission)
+    cerebro.addanalyzer(PerformanceRecorder, _name='performance')
+
+    start_value = cerebro.broker.getvalue()
+    logger.info(f"Running portfolio backtest over {len(frames)} tickers. Starting value: {start_value:.2f}")
+    try:
+        with phase('cerebro_run'):
+            strategy = cerebro.run()[0]
+    except Exception as e:
+        error_msg = f"An error occurred during Cerebro run: {e}"
+        logger.exception(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None, 'start_value': start_value,
+                'end_value': None, 'missing': missing}
+
+    end_value = cerebro.broker.getvalue()
+    logger.info(f"Portfolio backtest complete. Final Portfolio Value: {end_value:.2f}")
+
+    with phase('analyzers'):
+        recorder = strategy.analyzers.performance
+        analysis = recorder.get_analysis()
+        analyzer_results = {name: analysis[name] for name in ANALYZER_KEYS}
+        analyzer_results['performance'] = analysis['performance']
+
+        trades = recorder.closed_trades()
+        for trade, ticker in zip(trades, recorder.closed_trade_symbols()):
+            trade['ticker'] = ticker
+
+        trade_arrays = recorder.trade_arrays()
+        trade_symbols = np.array(recorder.closed_trade_symbols(), dtype=object)
+        symbols = {}
+        for data in strategy.datas:
+            mask = trade_symbols == data._name
+            symbols[data._name] = {
+                'bars': len(frames[data._name]),
+                'pnl_net': float(trade_arrays['pnlcomm'][mask].sum()),
+                'open_position': strategy.getposition(data).size,
+                **trade_statistics(trade_arrays['pnlcomm'][mask], trade_arrays['risk'][mask]),
+            }
+        equity_curve = recorder.equity_curve()
+        events = strategy_events(strategy)
+
+    return {
+        'success': True,
+        'analyzers': analyzer_results,
+        'error': None,
+        'start_value': start_value,
+        'end_value': end_value,
+        'equity_curve': equity_curve,
+        'trades': trades,
+        'events': events,
+        'symbols': symbols,
+        'missing': missing,
+    }
+
+
+def _analysis_value(analysis, *path, default=None):
+    """
+    Follow ``path`` through nested analyzer output, returning ``default`` if
+    any level is missing. Works with plain dicts, Backtrader's AutoOrderedDict
+    and attribute-style objects.
+    """
+    value = analysis
+    for key in path:
+        if value is None:
+            return default
+        if isinstance(value, dict):
+            value = value.get(key)
+        else:
+            value = getattr(value, key, None)
+    return default if value is None else value
+
+
+def extract_metrics(results):
+    """
+    Extract the headline performance metrics from a ``run_backtest`` result.
+
+    Missing analyzers or fields fall back to neutral defaults (0 for counts
+    and amounts, None for ratios).
+
+    Parameters:
+        results (dict): Successful result dictionary from ``run_backtest``.
+
+    Returns:
+        dict: total_trades, winning_trades, win_rate (%), pnl_net,
+              max_drawdown (%), sqn, sharpe_ratio, initial_capital,
+              final_capital, total_return (%), and from the 'performance'
+              section sortino_ratio, max_drawdown_duration (bars),
+              expectancy and average_r.
+    """
+    analyzers = results.get('analyzers') or {}
+    trade_analysis = analyzers.get('trade_analyzer')
+
+    total_trades = int(_analysis_value(trade_analysis, 'total', 'closed', default=0))
+    winning_trades = int(_analysis_value(trade_analysis, 'won', 'total', default=0))
+    win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
+    pnl_net = float(_analysis_value(trade_analysis, 'pnl', 'net', 'total', default=0.0))
+
+    # Drawdown reported alongside trade stats is a fraction; the DrawDown
+    # analyzer already reports a percentage
+    max_drawdown = _analysis_value(trade_analysis, 'drawdown', 'max', 'drawdown')
+    if max_drawdown is not None:
+        max_drawdown = float(max_drawdown) * 100
+    else:
+        max_drawdown = float(_analysis_value(analyzers.get('drawdown'), 'max', 'drawdown', default=0.0))
+
+    sqn = _analysis_value(analyzers.get('sqn'), 'sqn')
+    sharpe_ratio = _analysis_value(analyzers.get('sharpe'), 'sharperatio')
+    performance = analyzers.get('performance') or {}
+
+    initial_capital = float(results.get('start_value') or 0.0)
+    final_capital = float(results.get('end_value') or initial_capital)
+    total_return = ((final_capital - initial_capital) / initial_capital * 100) if initial_capital else 0.0
+
+    return {
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'win_rate': win_rate,
+        'pnl_net': pnl_net,
+        'max_drawdown': max_drawdown,
+        'sqn': float(sqn) if sqn is not None else None,
+        'sharpe_ratio': float(sharpe_ratio) if sharpe_ratio is not None else None,
+        'initial_capital': initial_capital,
+        'final_capital': final_capital,
+        'total_return': total_return,
+        'sortino_ratio': performance.get('sortino_ratio'),
+        'max_drawdown_duration': performance.get('max_drawdown_duration'),
+        'expectancy': performance.get('expectancy'),
+        'average_r': performance.get('average_r'),
+    }
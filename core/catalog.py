@@ -0,0 +1,208 @@
+"""
+The ticker catalog: a per-ticker summary of the stored OHLCV data.
+
+Listing tickers with ``OHLCVData.objects.values_list('ticker').distinct()``
+or finding a ticker's date range with Min/Max aggregates scans the bars of
+the hypertable on every request. ``TickerCatalog`` keeps one row per ticker
+instead:
+1. ``save_ohlcv_data`` calls ``update_ticker_catalog`` in the transaction
+   that inserts the bars, so the row always matches the committed data.
+   When the new bars follow the catalogued ones, only they are aggregated
+   and added to the row's stored ``summary``, so an ingest costs O(new bars)
+2. ``catalog_tickers`` and ``catalog_date_range`` read it for the ticker
+   picker and ``core.backtester.get_available_date_range``
+3. ``rebuild_ticker_catalog`` recomputes it, e.g. after bars were written or
+   deleted outside ``save_ohlcv_data`` (``manage.py rebuild_indicators``)
+
+The row's ``data_version`` is the ticker's ``get_data_version`` fingerprint
+over its full history, computed from the same aggregates, so
+``get_data_version`` reads it (``catalog_versions``) instead of aggregating
+the bars whenever the requested range covers the whole history.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Count, Min, Max, Sum
+from django.utils import timezone
+
+from dashboard.models import OHLCVData, TickerCatalog
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Aggregates fingerprinted by the data version of a ticker's bars
+VERSION_FIELDS = {
+    'bars': Count('id'),
+    'first': Min('timestamp'),
+    'last': Max('timestamp'),
+    'open_sum': Sum('open'),
+    'high_sum': Sum('high'),
+    'low_sum': Sum('low'),
+    'close_sum': Sum('close'),
+    'volume_sum': Sum('volume'),
+}
+
+
+# Price sums come back with a backend-dependent scale (SQLite sums floats), so
+# they are fingerprinted at the decimal places of the price fields
+PRICE_SCALE = Decimal(1).scaleb(-OHLCVData._meta.get_field('close').decimal_places)
+
+
+def _canonical(value):
+    if isinstance(value, Decimal):
+        return str(value.quantize(PRICE_SCALE))
+    return str(value)
+
+
+def version_digest(summary):
+    """Short hex fingerprint of a ``VERSION_FIELDS`` aggregate."""
+    canonical = json.dumps(summary, sort_keys=True, default=_canonical)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def summary_payload(summary):
+    """JSON-friendly copy of a ``VERSION_FIELDS`` aggregate with the same ``version_digest``."""
+    return json.loads(json.dumps(summary, default=_canonical))
+
+
+def extend_summary(payload, summary):
+    """
+    Add the aggregate of later bars to a ``summary_payload``.
+
+    Lets a running fingerprint follow appended bars without aggregating the
+    earlier ones again.
+
+    Parameters:
+        payload (dict): ``summary_payload`` of the earlier bars
+        summary (dict): ``VERSION_FIELDS`` aggregate of bars after all of them
+
+    Returns:
+        dict: ``summary_payload`` of the aggregate over both.
+    """
+    if not summary['bars']:
+        return payload
+    if not payload.get('bars'):
+        return summary_payload(summary)
+    combined = {'bars': payload['bars'] + summary['bars'], 'first': payload['first'], 'last': summary['last']}
+    for key in VERSION_FIELDS:
+        if key.endswith('_sum'):
+            added = summary[key]
+            combined[key] = payload[key] + added if isinstance(added, int) else Decimal(payload[key]) + added
+    return summary_payload(combined)
+
+
+def _save_entry(ticker, summary, ingested):
+    payload = summary_payload(summary)
+    defaults = {
+        'first_timestamp': datetime.fromisoformat(payload['first']),
+        'last_timestamp': datetime.fromisoformat(payload['last']),
+        'bars': payload['bars'],
+        'data_version': version_digest(payload),
+        'summary': payload,
+    }
+    if ingested:
+        defaults['last_ingest'] = timezone.now()
+    entry, _ = TickerCatalog.objects.update_or_create(ticker=ticker, defaults=defaults)
+    return entry
+
+
+def update_ticker_catalog(ticker, ingested=True, new_from=None):
+    """
+    Update a ticker's catalog row after its bars changed.
+
+    Call it in the transaction that changed them. If ``new_from`` (the
+    earliest bar just inserted) is after the catalogued last bar, only the
+    bars after it are aggregated and added to the stored summary; otherwise
+    (backfills, deletes, rows without a summary) all of the ticker's bars
+    are aggregated, served by the (ticker, timestamp) index.
+
+    Parameters:
+        ticker (str): Stock ticker symbol
+        ingested (bool): Whether bars were just ingested (sets ``last_ingest``)
+        new_from (datetime): Earliest timestamp of the bars just inserted, if
+                             the only change was inserting them
+
+    Returns:
+        TickerCatalog: The updated row, or None if the ticker has no bars
+                       (its row is removed).
+    """
+    bars = OHLCVData.objects.filter(ticker=ticker).order_by()
+    entry = TickerCatalog.objects.select_for_update().filter(ticker=ticker).first()
+    if new_from is not None and entry is not None and entry.summary and new_from > entry.last_timestamp:
+        newer = bars.filter(timestamp__gt=entry.last_timestamp).aggregate(**VERSION_FIELDS)
+        return _save_entry(ticker, extend_summary(entry.summary, newer), ingested)
+
+    summary = bars.aggregate(**VERSION_FIELDS)
+    if not summary['bars']:
+        TickerCatalog.objects.filter(ticker=ticker).delete()
+        return None
+    return _save_entry(ticker, summary, ingested)
+
+
+def rebuild_ticker_catalog():
+    """
+    Rebuild the whole catalog from OHLCVData with one grouped aggregate.
+
+    Returns:
+        int: Number of tickers in the catalog.
+    """
+    rows = OHLCVData.objects.order_by().values('ticker').annotate(**VERSION_FIELDS)
+    tickers = []
+    for row in rows:
+        ticker = row.pop('ticker')
+        _save_entry(ticker, row, ingested=False)
+        tickers.append(ticker)
+    TickerCatalog.objects.exclude(ticker__in=tickers).delete()
+    logger.info(f"Rebuilt the ticker catalog: {len(tickers)} tickers")
+    return len(tickers)
+
+
+def catalog_tickers():
+    """Tickers with stored bars, sorted."""
+    return list(TickerCatalog.objects.order_by('ticker').values_list('ticker', flat=True))
+
+
+def catalog_date_range(ticker):
+    """
+    First and last bar timestamps of a ticker.
+
+    Returns:
+        tuple: (first, last), or (None, None) if the ticker isn't catalogued
+    """
+    entry = TickerCatalog.objects.filter(ticker=ticker).values_list('first_timestamp', 'last_timestamp').first()
+    return entry or (None, None)
+
+
+def _covers(first, last, start_date, end_date):
+    """Whether a date range includes every bar from ``first`` to ``last``."""
+    try:
+        return (start_date is None or start_date <= first) and (end_date is None or end_date >= last)
+    except TypeError:
+        # Plain dates or naive datetimes: leave it to the bar aggregate
+        return False
+
+
+def catalog_versions(tickers, start_date=None, end_date=None):
+    """
+    Catalog data versions of the tickers whose whole history lies in a range.
+
+    For those tickers the fingerprint of the range equals the catalog's
+    ``data_version``, read with one indexed query instead of an aggregate
+    over every bar.
+
+    Parameters:
+        tickers (list): Stock ticker symbols
+        start_date (datetime): Optional start of the range
+        end_date (datetime): Optional end of the range
+
+    Returns:
+        dict: Ticker -> data version; tickers that aren't catalogued or whose
+              bars extend beyond the range are left out.
+    """
+    entries = TickerCatalog.objects.filter(ticker__in=tickers).values_list(
+        'ticker', 'first_timestamp', 'last_timestamp', 'data_version')
+    return {ticker: version for ticker, first, last, version in entries
+            if _covers(first, last, start_date, end_date)}
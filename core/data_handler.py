@@ -20,6 +20,8 @@ from django.utils.timezone import make_aware
 # Import the model within a try-except block
 try:
     from dashboard.models import OHLCVData
+    from core.indicator_engine import update_indicator_state
+    from core.catalog import update_ticker_catalog
     DJANGO_MODELS_AVAILABLE = True
 except ImportError:
     # Handle case where Django models aren't available
@@ -151,7 +153,13 @@ def fetch_stock_data(ticker, source='yfinance', start_date=None, end_date=None):
 def save_ohlcv_data(dataframe: pd.DataFrame, ticker: str):
     """
     Save OHLCV data from a Pandas DataFrame to the OHLCVData model.
-    Handles timezone conversion and potential duplicates via ignore_conflicts.
+    Handles timezone conversion and skips bars already stored for the ticker.
+    The newly inserted bars are fed to the ticker's streaming indicators
+    (core.indicator_engine) and its ticker catalog row (core.catalog) is
+    updated in the same transaction.
+
+    Returns:
+        int: Number of new bars inserted.
     """
     if not DJANGO_MODELS_AVAILABLE or OHLCVData is None:
         logger.error("OHLCVData model is not available. Cannot save data.")
@@ -241,21 +249,39 @@ def save_ohlcv_data(dataframe: pd.DataFrame, ticker: str):
         logger.warning(f"No valid instances generated for {ticker}. Nothing to save.")
         return 0
 
-    try:
-        # Use bulk_create with ignore_conflicts=True
-        # Assumes a unique constraint exists on (ticker, timestamp) in the DB / Timescale hypertable
-        created_objects = OHLCVData.objects.bulk_create(ohlcv_instances, ignore_conflicts=True)
-        # Note: len(created_objects) might be 0 if ALL were conflicts, or less than len(ohlcv_instances)
-        # It reflects objects Django *prepared* for insertion, not necessarily *newly* inserted count with ignore_conflicts.
-        num_prepared = len(ohlcv_instances) # How many we tried to insert
-        # A more accurate count of *new* records requires querying before/after or specific DB features.
-        logger.info(f"Processed bulk insert for {ticker}. Prepared {num_prepared} objects (existing matching ticker/timestamp ignored).")
-        # Returning num_prepared might be more informative than len(created_objects) here.
-        return num_prepared
+    # Only insert bars that aren't stored yet (and only once per timestamp), so
+    # duplicates are skipped even without a unique (ticker, timestamp) index and
+    # the indicator engine knows exactly which bars are new
+    timestamps = [instance.timestamp for instance in ohlcv_instances]
+    existing = set(
+        OHLCVData.objects.filter(ticker=ticker, timestamp__gte=min(timestamps), timestamp__lte=max(timestamps))
+        .values_list('timestamp', flat=True)
+    )
+    new_instances = []
+    for instance in ohlcv_instances:
+        if instance.timestamp not in existing:
+            existing.add(instance.timestamp)
+            new_instances.append(instance)
+    if not new_instances:
+        logger.info(f"All {len(ohlcv_instances)} bars for {ticker} are already stored.")
+        return 0
 
+    try:
+        # ignore_conflicts still guards against concurrent writers where the DB / Timescale
+        # hypertable has a unique constraint on (ticker, timestamp)
+        OHLCVData.objects.bulk_create(new_instances, ignore_conflicts=True)
+        logger.info(f"Inserted {len(new_instances)} new bars for {ticker} "
+                    f"({len(ohlcv_instances) - len(new_instances)} already stored).")
     except IntegrityError as e: # Should be less common with ignore_conflicts=True unless other constraints fail
         logger.error(f"Integrity error during bulk save for {ticker}: {e}") # pragma: no cover
         return 0 # pragma: no cover
     except Exception as e:
         logger.error(f"Unexpected error during bulk save for {ticker}: {e}") # pragma: no cover
         raise e # Re-raise unexpected errors # pragma: no cover
+
+    update_indicator_state(ticker, [
+        (instance.timestamp, instance.high, instance.low, instance.close, instance.volume)
+        for instance in new_instances
+    ])
+    update_ticker_catalog(ticker, new_from=min(instance.timestamp for instance in new_instances))
+    return len(new_instances)
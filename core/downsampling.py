@@ -0,0 +1,111 @@
+"""
+Downsampling of long price histories for charts.
+
+A 30-year daily chart has ~7,500 bars per trace, far more than the pixels
+it is drawn on. The chart view reduces each trace to about one point per
+pixel before building the figure:
+1. Line traces (moving averages) use Largest-Triangle-Three-Buckets: the
+   series is split into equal buckets and, in each, the point forming the
+   largest triangle with the previously selected point and the next
+   bucket's average is kept, which preserves peaks and troughs
+2. Candlesticks and volume are aggregated into equal buckets of bars
+   instead, so every bucket keeps its first open, highest high, lowest low,
+   last close and total volume (OHLC extremes are never dropped)
+
+Both work on bar positions rather than timestamps: daily bars are evenly
+spaced in trading time, and weekends would otherwise skew the buckets.
+"""
+import logging
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def lttb_indices(y, threshold, x=None):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    Parameters:
+        y (array-like): Values to downsample (no NaNs).
+        threshold (int): Number of points to keep.
+        x (array-like): Optional x positions (default: 0..n-1).
+
+    Returns:
+        np.ndarray: Sorted indices into ``y``; all of them if ``y`` already
+                    has at most ``threshold`` points. The first and last
+                    points are always kept.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # Bucket i covers [edges[i], edges[i + 1]); the first and last points are their own buckets
+    every = (n - 2) / (threshold - 2)
+    edges = np.floor(np.arange(threshold - 1) * every).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Twice the triangle area; the constant factor doesn't change the argmax
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_line(y, threshold):
+    """
+    LTTB-downsample a line trace that may contain NaNs (e.g. indicator warm-up).
+
+    Returns:
+        np.ndarray: Sorted indices of the points to draw; NaN points are dropped.
+    """
+    y = np.asarray(y, dtype=float)
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= threshold:
+        return valid
+    return valid[lttb_indices(y[valid], threshold, x=valid)]
+
+
+def bucket_ohlcv(open_, high, low, close, volume, buckets):
+    """
+    Aggregate consecutive bars into at most ``buckets`` OHLCV bars.
+
+    Parameters:
+        open_, high, low, close, volume (array-like): Bar values in time order.
+        buckets (int): Maximum number of aggregated bars.
+
+    Returns:
+        dict: 'start' (index of each bucket's first bar, for its timestamp),
+              'open', 'high', 'low', 'close' and 'volume' arrays. Without
+              aggregation (``buckets`` >= number of bars) the inputs are
+              returned as arrays.
+    """
+    columns = {name: np.asarray(values, dtype=float) for name, values in
+               (('open', open_), ('high', high), ('low', low), ('close', close), ('volume', volume))}
+    n = len(columns['close'])
+    if buckets >= n or buckets < 1:
+        return {'start': np.arange(n), **columns}
+
+    starts = np.unique(np.linspace(0, n, buckets + 1).astype(int)[:-1])
+    ends = np.append(starts[1:], n) - 1
+    return {
+        'start': starts,
+        'open': columns['open'][starts],
+        'high': np.maximum.reduceat(columns['high'], starts),
+        'low': np.minimum.reduceat(columns['low'], starts),
+        'close': columns['close'][ends],
+        'volume': np.add.reduceat(columns['volume'], starts),
+    }
@@ -0,0 +1,123 @@
+"""
+Compact recording of strategy events.
+
+Strategies record what happens during a run into an ``EventBuffer`` instead
+of formatting a log line for every signal, fill and stop change:
+1. Records are typed (signal, order, fill, stop update, trade close) and
+   written into a preallocated NumPy structured array, so recording an
+   event costs one row assignment
+2. Backtest results carry the events as JSON-friendly records under 'events'
+3. Text logging only happens when a strategy is created with ``verbose=True``
+"""
+import logging
+
+import backtrader as bt
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Event types
+EVENT_SIGNAL = 1  # Entry or exit signal; price is the close that triggered it
+EVENT_ORDER = 2  # Order not filled (canceled, margin, rejected); status is the Backtrader order status
+EVENT_FILL = 3  # Order executed; price, size and commission of the execution
+EVENT_STOP = 4  # Stop set or raised; price is the new stop
+EVENT_TRADE = 5  # Trade closed; value is the gross PnL, commission the total commission
+
+EVENT_NAMES = {
+    EVENT_SIGNAL: 'signal',
+    EVENT_ORDER: 'order',
+    EVENT_FILL: 'fill',
+    EVENT_STOP: 'stop',
+    EVENT_TRADE: 'trade',
+}
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+# Status of stop events
+STOP_INITIAL = 0
+STOP_TRAIL = 1
+
+EVENT_DTYPE = np.dtype([
+    ('dt', 'f8'),  # Backtrader date number
+    ('kind', 'u1'),
+    ('data', 'u2'),  # Index of the data feed
+    ('side', 'i1'),
+    ('status', 'i1'),
+    ('price', 'f8'),
+    ('size', 'f8'),
+    ('value', 'f8'),
+    ('commission', 'f8'),
+    ('bars', 'i4'),
+])
+
+
+class EventBuffer:
+    """
+    Growable array of typed strategy events.
+
+    Parameters:
+        data_names (list): Names of the run's data feeds, used in records.
+        capacity (int): Initial number of rows; doubled when full.
+    """
+
+    def __init__(self, data_names=(), capacity=256):
+        self.data_names = list(data_names)
+        self._events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def record(self, kind, dt, data=0, side=0, status=0, price=np.nan, size=np.nan,
+               value=np.nan, commission=np.nan, bars=0):
+        """Append one event."""
+        if self._count == len(self._events):
+            self._events = np.resize(self._events, len(self._events) * 2)
+        self._events[self._count] = (dt, kind, data, side, status, price, size, value, commission, bars)
+        self._count += 1
+
+    @property
+    def events(self):
+        """Structured array of the recorded events."""
+        return self._events[:self._count]
+
+    def count(self, kind):
+        """Number of recorded events of one type."""
+        return int(np.count_nonzero(self.events['kind'] == kind))
+
+    def to_records(self):
+        """
+        Events as JSON-serializable dicts.
+
+        Every record has 'date', 'type' and 'data' (feed name, when the run
+        has more than one feed); the remaining keys depend on the type.
+        """
+        records = []
+        multi_data = len(self.data_names) > 1
+        for event in self.events:
+            kind = int(event['kind'])
+            record = {
+                'date': bt.num2date(event['dt']).isoformat(),
+                'type': EVENT_NAMES[kind],
+            }
+            if multi_data:
+                record['data'] = self.data_names[event['data']]
+            side = 'buy' if event['side'] == SIDE_BUY else 'sell'
+            if kind == EVENT_SIGNAL:
+                record.update(side=side, price=float(event['price']))
+            elif kind == EVENT_ORDER:
+                record.update(side=side, status=bt.Order.Status[event['status']])
+            elif kind == EVENT_FILL:
+                record.update(side=side, price=float(event['price']), size=float(event['size']),
+                              commission=float(event['commission']))
+            elif kind == EVENT_STOP:
+                record.update(price=float(event['price']),
+                              reason='initial' if event['status'] == STOP_INITIAL else 'trail')
+            elif kind == EVENT_TRADE:
+                record.update(pnl=float(event['value']),
+                              pnlcomm=float(event['value'] - event['commission']),
+                              bars=int(event['bars']))
+            records.append(record)
+        return records
@@ -0,0 +1,127 @@
+"""
+Reading the persisted daily feature table.
+
+``DailyFeature`` holds one row of indicator values per ticker and bar,
+maintained at ingest by ``core.indicator_engine``. This module is its read
+side:
+1. ``get_features`` loads a ticker's features for a date range with a single
+   (ticker, timestamp) range query
+2. ``aligned_features`` returns them for the bars of a backtest, so
+   ``core.indicator_cache.breakout_indicators`` can take the ATR and volume
+   MA from the table instead of recomputing them; for a range that starts
+   after the first bar only the window indicators are returned, with their
+   warm-up masked to match values computed over the range
+3. ``rebuild_features`` backfills the table (and the engine state) for many
+   tickers, in parallel worker processes
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from django.db import connections
+
+from dashboard.models import DailyFeature
+from core.indicator_engine import DEFAULT_INDICATORS, rebuild_indicator_state
+
+# Indicator kinds whose value depends only on the last ``period`` bars, so a
+# full-history value equals one computed over any range once its window is full
+WINDOW_KINDS = ('sma', 'vol_ma', 'highest', 'lowest')
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = DEFAULT_INDICATORS
+
+
+def get_features(ticker, start_date=None, end_date=None, columns=FEATURE_COLUMNS):
+    """
+    Load a ticker's daily features.
+
+    Parameters:
+        ticker (str): Stock ticker symbol
+        start_date (datetime): Start of the range (inclusive)
+        end_date (datetime): End of the range (inclusive)
+        columns (tuple): Feature columns to load (default: all)
+
+    Returns:
+        pd.DataFrame: Float columns indexed by timestamp (NaN during warm-up);
+                      empty if there are no features in the range.
+    """
+    unknown = set(columns) - set(FEATURE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown feature columns: {sorted(unknown)}")
+    query = DailyFeature.objects.filter(ticker=ticker)
+    if start_date:
+        query = query.filter(timestamp__gte=start_date)
+    if end_date:
+        query = query.filter(timestamp__lte=end_date)
+    rows = list(query.order_by('timestamp').values_list('timestamp', *columns))
+    frame = pd.DataFrame.from_records(rows, columns=['timestamp', *columns]).set_index('timestamp')
+    return frame.astype(float)
+
+
+def aligned_features(ticker, data, start_date=None, end_date=None):
+    """
+    A ticker's features aligned with OHLCV data loaded for a backtest.
+
+    Features are computed over the ticker's full history. When ``data``
+    starts later (a ``start_date``), the window indicators (SMA, volume MA,
+    highest/lowest) are NaN for their first ``period - 1`` bars, as if
+    computed over ``data``; recursive ones (EMA, ATR) depend on bars before
+    the range and are left out, so callers compute them instead.
+
+    Parameters:
+        ticker (str): Stock ticker symbol
+        data (pd.DataFrame): OHLCV data loaded for the same range
+        start_date (datetime): Start of the loaded range
+        end_date (datetime): End of the loaded range
+
+    Returns:
+        pd.DataFrame: Features on ``data``'s index, or None if the features
+                      don't cover every bar.
+    """
+    if data is None:
+        return None
+    features = get_features(ticker, start_date=start_date, end_date=end_date)
+    if len(features) != len(data) or not features.index.equals(data.index):
+        logger.debug(f"Features for {ticker} don't cover the loaded bars; computing indicators instead")
+        return None
+    if start_date is None:
+        return features
+
+    windowed = {}
+    for column in features.columns:
+        kind, _, period = column.rpartition('_')
+        if kind in WINDOW_KINDS:
+            values = features[column].copy()
+            values.iloc[:int(period) - 1] = float('nan')
+            windowed[column] = values
+    return pd.DataFrame(windowed, index=features.index)
+
+
+def _rebuild_one(ticker):
+    engine = rebuild_indicator_state(ticker)
+    return ticker, engine.bars if engine else 0
+
+
+def rebuild_features(tickers, workers=1):
+    """
+    Rebuild the indicator state and DailyFeature rows of several tickers.
+
+    Parameters:
+        tickers (list): Tickers to rebuild.
+        workers (int): Worker processes; 1 rebuilds in this process.
+
+    Yields:
+        tuple: (ticker, bars processed) as each ticker finishes (0 if it has no bars).
+    """
+    if workers <= 1 or len(tickers) <= 1:
+        for ticker in tickers:
+            yield _rebuild_one(ticker)
+        return
+
+    # Forked workers must open their own database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_rebuild_one, tickers)
+
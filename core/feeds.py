@@ -0,0 +1,85 @@
+"""
+Backtrader data feeds reading directly from the database.
+
+``get_data_feed`` loads a ticker's full history into a DataFrame and hands it
+to ``bt.feeds.PandasData``, so memory grows with the length of the history.
+``DatabaseStreamFeed`` instead pulls bars from the database in chunks as the
+backtest advances; combined with Cerebro's ``exactbars`` mode only the most
+recent bars needed by indicators and the strategy are kept in memory.
+"""
+import logging
+
+import backtrader as bt
+
+from dashboard.models import OHLCVData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the database per round trip
+DEFAULT_CHUNK_SIZE = 5000
+
+OHLCV_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+def ohlcv_queryset(ticker, start_date=None, end_date=None):
+    """OHLCV rows for a ticker and optional date range, oldest first."""
+    query = OHLCVData.objects.filter(ticker=ticker)
+    if start_date:
+        query = query.filter(timestamp__gte=start_date)
+    if end_date:
+        query = query.filter(timestamp__lte=end_date)
+    return query.order_by('timestamp')
+
+
+class DatabaseStreamFeed(bt.feed.DataBase):
+    """
+    Streams OHLCV bars for one ticker from the database.
+
+    Rows are read through a server-side cursor (``QuerySet.iterator``) in
+    chunks of ``chunk_size`` and converted one bar at a time, so neither the
+    query result nor a DataFrame of the full history is ever held in memory.
+
+    Params:
+        ticker (str): Stock ticker symbol.
+        start_date, end_date (datetime): Optional date range (timezone aware).
+        chunk_size (int): Rows fetched per database round trip.
+    """
+    params = (
+        ('ticker', None),
+        ('start_date', None),
+        ('end_date', None),
+        ('chunk_size', DEFAULT_CHUNK_SIZE),
+    )
+
+    def __init__(self):
+        super().__init__()
+        self._query = ohlcv_queryset(self.p.ticker, self.p.start_date, self.p.end_date)
+        self._rows = None
+        self.total_bars = None
+
+    def start(self):
+        super().start()
+        # Counting up front lets progress reporting work without a preloaded buffer
+        self.total_bars = self._query.count()
+        self._rows = self._query.values_list(*OHLCV_FIELDS).iterator(chunk_size=self.p.chunk_size)
+        logger.info(f"Streaming {self.total_bars} bars for {self.p.ticker} from the database")
+
+    def stop(self):
+        super().stop()
+        self._rows = None
+
+    def _load(self):
+        try:
+            timestamp, open_, high, low, close, volume = next(self._rows)
+        except StopIteration:
+            return False
+
+        self.lines.datetime[0] = bt.date2num(timestamp)
+        self.lines.open[0] = float(open_)
+        self.lines.high[0] = float(high)
+        self.lines.low[0] = float(low)
+        self.lines.close[0] = float(close)
+        self.lines.volume[0] = float(volume)
+        self.lines.openinterest[0] = 0.0
+        return True
@@ -0,0 +1,242 @@
+"""
+Incremental (checkpointed) backtests.
+
+Rerunning a tracked backtest every night only needs to process the bars
+added since the previous run. ``run_incremental_backtest`` saves the
+vectorized engine's state in a ``BacktestCheckpoint`` after each run and
+resumes from it on the next one, so a nightly run costs O(new bars):
+1. The checkpoint keeps the fingerprinted aggregate of the ticker's bars up
+   to its last bar; adding the aggregate of the newer bars must give the
+   ticker catalog's ``data_version``, otherwise bars behind the checkpoint
+   were added, removed or modified and the backtest is rerun in full
+2. Bars newer than the checkpoint are simulated from the saved state
+   (open position, highest high since entry, trailing stop, ATR and
+   indicator windows, cash)
+3. Their equity curve points and closed trades are stored as a new
+   ``BacktestCheckpointRun`` row; ``checkpoint_history`` joins the runs
+4. Metrics come from running performance metrics kept in the checkpoint
+   (``core.performance.running_performance``), giving the same result as a
+   full ``run_backtest`` with the vectorized engine
+
+Configurations are tracked by running them once (``extend_backtests --add``);
+the nightly ``extend_backtests`` then extends every checkpoint.
+
+Checkpoints use the vectorized engine because Backtrader keeps its state in
+Cerebro, strategy and line objects that cannot be saved and restored.
+"""
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from dashboard.models import BacktestCheckpoint, BacktestCheckpointRun, OHLCVData
+from core.backtester import ENGINE_VECTORIZED, get_data_version, get_ohlcv_dataframe
+from core.catalog import VERSION_FIELDS, extend_summary, summary_payload, version_digest
+from core.performance import (
+    ANALYZER_KEYS, equity_curve_payload, extend_running_performance, running_analysis, running_performance,
+    trade_records,
+)
+from core.result_cache import make_cache_key
+from core.strategies import ClassicBreakoutStrategy
+from core.vectorized import DEFAULT_PARAMS, breakout_params, resume_breakout, simulate_breakout
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How a run was computed, reported in result['incremental']['mode']
+MODE_FULL = 'full'
+MODE_RESUMED = 'resumed'
+MODE_UNCHANGED = 'unchanged'
+
+
+def checkpoint_key(ticker, start_date, strategy_params, initial_cash, commission):
+    """
+    Key identifying the checkpoint of an incremental backtest configuration.
+
+    There is no end date (runs always extend to the newest bar) and no data
+    version (the data is expected to grow).
+    """
+    return make_cache_key(
+        ticker, start_date, None, ClassicBreakoutStrategy, breakout_params(strategy_params),
+        initial_cash, commission, data_version=None, engine=ENGINE_VECTORIZED,
+        options={'incremental': True}
+    )
+
+
+def checkpoint_kwargs(config):
+    """
+    Convert a checkpoint's stored configuration into ``run_incremental_backtest`` arguments.
+    """
+    start_date = config.get('start_date')
+    return {
+        'ticker': config['ticker'],
+        'start_date': datetime.fromisoformat(start_date) if start_date else None,
+        'strategy_params': config.get('strategy_params'),
+        'initial_cash': float(config['initial_cash']),
+        'commission': float(config['commission']),
+    }
+
+
+def checkpoint_history(checkpoint):
+    """
+    Equity curve and closed trades of a checkpointed backtest, joined from its runs.
+
+    Reads every run of the checkpoint, so unlike the nightly runs it is O(history).
+
+    Returns:
+        dict: 'equity_curve' ({'dates': [...], 'values': [...]}) and 'trades'
+              (closed trades as ``core.performance.trade_records`` dicts).
+    """
+    dates, values, trades = [], [], []
+    for run in checkpoint.runs.order_by('first_bar'):
+        dates += run.equity_curve['dates']
+        values += run.equity_curve['values']
+        trades += run.trades
+    return {'equity_curve': {'dates': dates, 'values': values}, 'trades': trades}
+
+
+def _closed_trades(trades):
+    """Closed trades of a simulation as ``trade_records`` columns, dropping any open position."""
+    closed = [t for t in trades if t['exit_bar'] is not None]
+    return {
+        'entry_date': [t['entry_date'] for t in closed],
+        'exit_date': [t['exit_date'] for t in closed],
+        'entry_price': np.array([t['entry_price'] for t in closed], dtype=float),
+        'size': np.array([t['size'] for t in closed], dtype=float),
+        'pnl': np.array([t['pnl'] for t in closed], dtype=float),
+        'pnlcomm': np.array([t['pnlcomm'] for t in closed], dtype=float),
+        'barlen': np.array([t['barlen'] for t in closed], dtype=float),
+        'risk': np.array([(t['entry_price'] - t['initial_stop']) * t['size'] for t in closed], dtype=float),
+    }
+
+
+def _bar_summary(ticker, after=None, until=None):
+    """``VERSION_FIELDS`` aggregate of a ticker's bars in a range (read from the (ticker, timestamp) index)."""
+    query = OHLCVData.objects.filter(ticker=ticker)
+    if after is not None:
+        query = query.filter(timestamp__gt=after)
+    if until is not None:
+        query = query.filter(timestamp__lte=until)
+    return query.order_by().aggregate(**VERSION_FIELDS)
+
+
+def _error_result(error_msg, initial_cash=None):
+    """Log an error and return it in the ``run_backtest`` result shape."""
+    logger.error(error_msg)
+    return {'success': False, 'error': error_msg, 'analyzers': None,
+            'start_value': initial_cash, 'end_value': None}
+
+
+def run_incremental_backtest(ticker, start_date=None, strategy_params=None,
+                             initial_cash=100000.0, commission=0.001):
+    """
+    Run a Classic Breakout backtest up to the newest bar, resuming from its checkpoint.
+
+    The first run for a configuration processes the full history; later runs
+    only read and simulate bars added since. Runs fall back to the full
+    history when bars behind the checkpoint have changed.
+
+    Parameters:
+        ticker (str): Stock ticker symbol.
+        start_date (datetime): Optional start date of the backtest.
+        strategy_params (dict): Optional ClassicBreakoutStrategy parameters.
+        initial_cash (float): Initial cash amount for the backtest.
+        commission (float): Commission rate (e.g., 0.001 for 0.1%).
+
+    Returns:
+        dict: Same shape as ``core.backtester.run_backtest`` without
+              'equity_curve' and 'trades' (see ``checkpoint_history``), plus
+              on success 'incremental' with 'mode' ('full', 'resumed' or
+              'unchanged'), 'new_bars' (bars simulated by this run) and
+              'bars' (total).
+    """
+    unknown = set(strategy_params or {}) - set(DEFAULT_PARAMS)
+    if unknown:
+        return _error_result(f"Unsupported strategy parameters for incremental backtests: {sorted(unknown)}",
+                             initial_cash)
+
+    params = breakout_params(strategy_params)
+    key = checkpoint_key(ticker, start_date, params, initial_cash, commission)
+    checkpoint = BacktestCheckpoint.objects.filter(config_key=key).first()
+
+    if checkpoint is not None:
+        # Only the bars newer than the checkpoint are aggregated; checkpoints
+        # saved without a data summary or running metrics are rerun in full
+        newer = _bar_summary(ticker, after=checkpoint.last_timestamp)
+        data_summary = extend_summary(checkpoint.data_summary, newer) if checkpoint.data_summary else None
+        if (data_summary is None or not checkpoint.performance
+                or version_digest(data_summary) != get_data_version(ticker)):
+            logger.info(f"History of {ticker} behind the checkpoint changed; rerunning in full")
+            checkpoint = None
+
+    sim = None
+    if checkpoint is None:
+        data = get_ohlcv_dataframe(ticker, start_date)
+        if data is None:
+            return _error_result(f"No data available for {ticker} in the specified date range.", initial_cash)
+
+        sim = simulate_breakout(data, params, initial_cash, commission)
+        mode, new_data = MODE_FULL, data
+        performance = running_performance(initial_cash)
+        data_summary = summary_payload(_bar_summary(ticker, until=data.index[-1].to_pydatetime()))
+    else:
+        state, performance = checkpoint.state, checkpoint.performance
+        mode, new_data = MODE_UNCHANGED, None
+        if newer['bars']:
+            data = get_ohlcv_dataframe(ticker, checkpoint.last_timestamp)
+            new_data = data[data.index > checkpoint.last_timestamp] if data is not None else data
+        if new_data is not None and not new_data.empty:
+            sim = resume_breakout(state, new_data, params, commission)
+            mode = MODE_RESUMED
+
+    new_bars = 0
+    if sim is not None:
+        new_bars = len(new_data)
+        state = sim['checkpoint']
+        trades = _closed_trades(sim['trades'])
+        extend_running_performance(
+            performance, sim['equity'], pd.DatetimeIndex(new_data.index).normalize().strftime('%Y-%m-%d'),
+            trades['pnl'], trades['pnlcomm'], trades['barlen'], trades['risk']
+        )
+        with transaction.atomic():
+            checkpoint, _ = BacktestCheckpoint.objects.update_or_create(
+                config_key=key,
+                defaults={
+                    'ticker': ticker,
+                    'config': {
+                        'ticker': ticker,
+                        'start_date': start_date.isoformat() if start_date else None,
+                        'strategy_params': params,
+                        'initial_cash': initial_cash,
+                        'commission': commission,
+                    },
+                    'bars': state['bars'],
+                    'last_timestamp': new_data.index[-1].to_pydatetime(),
+                    'data_summary': data_summary,
+                    'state': state,
+                    'performance': performance,
+                }
+            )
+            if mode == MODE_FULL:
+                checkpoint.runs.all().delete()
+            BacktestCheckpointRun.objects.create(
+                checkpoint=checkpoint, first_bar=state['bars'] - new_bars,
+                equity_curve=equity_curve_payload(new_data.index, sim['equity']),
+                trades=trade_records(**trades),
+            )
+    logger.info(f"Incremental backtest for {ticker}: {mode}, {new_bars} new bar(s), {state['bars']} total")
+
+    analysis = running_analysis(performance, open_trades=int(state['open_trade'] is not None))
+    analyzers = {name: analysis[name] for name in ANALYZER_KEYS}
+    analyzers['performance'] = analysis['performance']
+    last_value = performance['returns']['value']
+    return {
+        'success': True,
+        'analyzers': analyzers,
+        'error': None,
+        'start_value': initial_cash,
+        'end_value': last_value if last_value is not None else initial_cash,
+        'incremental': {'mode': mode, 'new_bars': new_bars, 'bars': state['bars']},
+    }
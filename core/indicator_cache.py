@@ -0,0 +1,237 @@
+"""
+Shared cache of computed indicator arrays.
+
+Indicators only depend on a ticker's bars and their own parameters, so runs
+that differ in anything else (stop multipliers, cash, commission, engine or
+strategy) can share them:
+1. Each indicator is keyed by ticker, data version, date range, indicator
+   name and the parameters it depends on (``INDICATORS``)
+2. Arrays are kept in a per-process LRU memory layer, backed by an on-disk
+   layer (``INDICATOR_CACHE_DIR``) shared by every process on the machine
+3. ``breakout_indicators`` returns the Classic Breakout indicator arrays,
+   computing only the ones missing from the cache (or reading them from the
+   persisted daily features when given); ``core.signals`` injects
+   them into Backtrader strategies as precomputed lines and the vectorized
+   engine uses them directly
+
+A sweep over exit parameters therefore computes its indicators once, and a
+sweep over ``lookback`` recomputes only the consolidation range.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+
+from core.result_cache import BacktestResultCache
+from core.vectorized import (
+    average_true_range, breakout_params, prior_rolling_max, prior_rolling_min, simple_moving_average,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate cached indicators when their computation changes
+INDICATOR_FORMAT_VERSION = 1
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _range(data, lookback):
+    return {
+        'range_high': prior_rolling_max(data['high'].to_numpy(dtype=float), lookback),
+        'range_low': prior_rolling_min(data['low'].to_numpy(dtype=float), lookback),
+    }
+
+
+def _vol_ma(data, volume_ma_period):
+    return {'vol_ma': simple_moving_average(data['volume'].to_numpy(dtype=float), volume_ma_period)}
+
+
+def _atr(data, atr_period):
+    return {'atr': average_true_range(data['high'].to_numpy(dtype=float), data['low'].to_numpy(dtype=float),
+                                      data['close'].to_numpy(dtype=float), atr_period)}
+
+
+# Indicator name -> (strategy parameters it depends on, function computing its arrays)
+INDICATORS = {
+    'range': (('lookback',), _range),
+    'vol_ma': (('volume_ma_period',), _vol_ma),
+    'atr': (('atr_period',), _atr),
+}
+
+# Indicator name -> daily feature column holding it (``core.features``)
+FEATURE_COLUMNS = {
+    'vol_ma': 'vol_ma_{volume_ma_period}',
+    'atr': 'atr_{atr_period}',
+}
+
+
+def indicator_key(ticker, data_version, start_date, end_date, name, params):
+    """
+    Key of one indicator's arrays for a ticker's data and parameter values.
+
+    Parameters:
+        params (dict): Values of the parameters the indicator depends on.
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical configuration.
+    """
+    config = {
+        'format': INDICATOR_FORMAT_VERSION,
+        'ticker': ticker,
+        'data_version': data_version,
+        'start_date': start_date.isoformat() if start_date else None,
+        'end_date': end_date.isoformat() if end_date else None,
+        'indicator': name,
+        'params': params,
+    }
+    canonical = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class IndicatorCache:
+    """
+    Two-level cache of indicator arrays: in-process LRU memory, then disk.
+
+    Entries are dicts of NumPy arrays. Disk hits are promoted to memory;
+    the memory layer evicts least recently used entries beyond
+    ``memory_bytes``.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, memory_bytes=None):
+        self.disk = BacktestResultCache(
+            directory=directory or getattr(settings, 'INDICATOR_CACHE_DIR',
+                                           Path(settings.BASE_DIR) / '.cache' / 'indicators'),
+            max_bytes=max_bytes if max_bytes is not None else getattr(
+                settings, 'INDICATOR_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+        )
+        self.memory_bytes = memory_bytes if memory_bytes is not None else getattr(
+            settings, 'INDICATOR_CACHE_MEMORY_BYTES', DEFAULT_MEMORY_BYTES)
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached arrays for ``key`` or None on a miss."""
+        with self._lock:
+            arrays = self._memory.get(key)
+            if arrays is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return arrays
+        arrays = self.disk.get(key)
+        with self._lock:
+            if arrays is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, arrays)
+        return arrays
+
+    def set(self, key, arrays):
+        """Store ``arrays`` under ``key`` in memory and on disk."""
+        self._remember(key, arrays)
+        self.disk.set(key, arrays)
+
+    def get_or_compute(self, key, compute):
+        """Return the arrays for ``key``, calling ``compute()`` and storing them on a miss."""
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = compute()
+            self.set(key, arrays)
+        return arrays
+
+    def _remember(self, key, arrays):
+        size = sum(values.nbytes for values in arrays.values())
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = arrays
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= sum(values.nbytes for values in evicted.values())
+
+    def clear(self):
+        """Remove every entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+        self.disk.clear()
+
+
+_indicator_cache = None
+_indicator_cache_lock = threading.Lock()
+
+
+def get_indicator_cache():
+    """Return the process-wide indicator cache configured from Django settings."""
+    global _indicator_cache
+    with _indicator_cache_lock:
+        if _indicator_cache is None:
+            _indicator_cache = IndicatorCache()
+        return _indicator_cache
+
+
+def _from_features(name, values, features):
+    """An indicator's arrays from the daily features, or None if they don't include it."""
+    column = FEATURE_COLUMNS.get(name, '').format(**values)
+    if features is None or column not in features:
+        return None
+    return {name: features[column].to_numpy(dtype=float)}
+
+
+def breakout_indicators(data, params=None, ticker=None, data_version=None, start_date=None, end_date=None,
+                        cache=None, features=None):
+    """
+    Classic Breakout indicator arrays for ``data``, shared through the indicator cache.
+
+    The cache is only used when both ``ticker`` and ``data_version`` are
+    given; otherwise the arrays are computed directly.
+
+    Parameters:
+        data (pd.DataFrame): OHLCV data indexed by timestamp.
+        params (dict): Strategy parameters (defaults from ClassicBreakoutStrategy).
+        ticker (str): Ticker the data belongs to.
+        data_version (str): ``get_data_version`` of the data's range.
+        start_date (datetime): Start of the loaded range.
+        end_date (datetime): End of the loaded range.
+        cache (IndicatorCache): Optional cache (default: ``get_indicator_cache()``).
+        features (pd.DataFrame): Optional daily features aligned with ``data``
+                                 (``core.features.aligned_features``); indicators
+                                 they hold are read instead of computed.
+
+    Returns:
+        dict: 'range_high', 'range_low', 'vol_ma' and 'atr' arrays, as from
+              ``core.vectorized.compute_breakout_indicators``. Cached arrays
+              are shared between runs and must not be modified.
+    """
+    p = breakout_params(params)
+    use_cache = ticker is not None and data_version is not None
+    if use_cache:
+        cache = cache or get_indicator_cache()
+
+    indicators = {}
+    for name, (param_names, compute) in INDICATORS.items():
+        values = {param: p[param] for param in param_names}
+
+        def load():
+            return _from_features(name, values, features) or compute(data, **values)
+
+        if use_cache:
+            key = indicator_key(ticker, data_version, start_date, end_date, name, values)
+            arrays = cache.get_or_compute(key, load)
+        else:
+            arrays = load()
+        indicators.update(arrays)
+    return indicators
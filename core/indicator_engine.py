@@ -0,0 +1,471 @@
+"""
+Streaming indicator engine with persisted per-ticker state.
+
+Charts, the strategy and screening all need the same handful of indicators
+on the latest bars. Instead of recomputing them over the full history, this
+module keeps them up to date as bars are ingested:
+1. Each indicator (SMA, EMA, Wilder ATR, rolling highest/lowest and volume
+   MA) is updated in O(1) per bar from a compact state: a running sum and
+   window for moving averages, the previous value for EMA and ATR, and a
+   monotonic deque for the rolling extremes
+2. ``save_ohlcv_data`` feeds newly inserted bars to the ticker's engine and
+   stores its state in ``IndicatorState``, so restarts resume from the saved
+   state instead of recomputing from scratch
+3. The engine also keeps a short tail of recent values; ``latest_indicators``
+   and ``indicator_tail`` read from the saved state without loading any bars
+   (and never rebuild it; that is left to ingest and ``rebuild_indicators``)
+4. Every processed bar's values are written to ``DailyFeature`` (one row per
+   bar, read by ``core.features``), so the feature table is extended by just
+   the new rows at ingest
+5. Bars inserted at or before the last processed bar (backfills) invalidate
+   the state, and the ticker's state and features are rebuilt from its full
+   history
+
+Values follow the conventions of ``core.vectorized``: the ATR matches
+``average_true_range`` (Backtrader's seeding), EMAs are seeded with the SMA
+of their first ``period`` values, and highest/lowest include the current bar
+(the strategy's consolidation range is the previous bar's value).
+"""
+import logging
+import math
+from collections import deque
+from datetime import datetime
+
+from django.db import transaction
+
+from dashboard.models import DailyFeature, IndicatorState, OHLCVData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Indicators maintained for every ticker: the chart's SMA/EMA traces and the
+# ClassicBreakoutStrategy defaults (ATR 14, volume MA 20, 50-bar range).
+# Each one is a DailyFeature column.
+DEFAULT_INDICATORS = (
+    'sma_10', 'sma_20', 'sma_50', 'ema_10', 'ema_20', 'ema_50',
+    'atr_14', 'highest_50', 'lowest_50', 'vol_ma_20',
+)
+
+# DailyFeature rows written per bulk_create
+FEATURE_BATCH_SIZE = 5000
+
+# Recent values kept per indicator for ``indicator_tail``
+TAIL_LENGTH = 50
+
+# Bump to invalidate saved states when an indicator's computation changes
+ENGINE_FORMAT_VERSION = 1
+
+
+class MovingAverage:
+    """Simple moving average of one bar field, from a running sum over a window."""
+    field = 'close'
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.count = 0
+
+    def update(self, bar):
+        value = bar[self.field]
+        self.window.append(value)
+        self.total += value
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+        self.count += 1
+        # Re-add the window once per period so rounding errors don't accumulate
+        if self.count % self.period == 0:
+            self.total = math.fsum(self.window)
+        return self.value
+
+    @property
+    def value(self):
+        return self.total / self.period if len(self.window) == self.period else None
+
+    def get_state(self):
+        return {'window': list(self.window), 'total': self.total, 'count': self.count}
+
+    def set_state(self, state):
+        self.window = deque(state['window'])
+        self.total = state['total']
+        self.count = state['count']
+
+
+class VolumeMovingAverage(MovingAverage):
+    """Simple moving average of volume."""
+    field = 'volume'
+
+
+class ExponentialMovingAverage:
+    """EMA of closes (alpha = 2 / (period + 1)), seeded with the SMA of the first ``period`` closes."""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.seed_total = 0.0
+        self.count = 0
+        self.value = None
+
+    def update(self, bar):
+        close = bar['close']
+        self.count += 1
+        if self.value is not None:
+            self.value += self.alpha * (close - self.value)
+        else:
+            self.seed_total += close
+            if self.count == self.period:
+                self.value = self.seed_total / self.period
+        return self.value
+
+    def get_state(self):
+        return {'seed_total': self.seed_total, 'count': self.count, 'value': self.value}
+
+    def set_state(self, state):
+        self.seed_total = state['seed_total']
+        self.count = state['count']
+        self.value = state['value']
+
+
+class AverageTrueRange:
+    """
+    Wilder's ATR, seeded with the simple average of the first ``period`` true
+    ranges like ``core.vectorized.average_true_range``.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.prev_close = None
+        self.seen = 0
+        self.seed_total = 0.0
+        self.value = None
+
+    def update(self, bar):
+        if self.prev_close is not None:
+            true_range = max(bar['high'], self.prev_close) - min(bar['low'], self.prev_close)
+            self.seen += 1
+            if self.value is not None:
+                self.value += (true_range - self.value) / self.period
+            else:
+                self.seed_total += true_range
+                if self.seen == self.period:
+                    self.value = self.seed_total / self.period
+        self.prev_close = bar['close']
+        return self.value
+
+    def get_state(self):
+        return {'prev_close': self.prev_close, 'seen': self.seen,
+                'seed_total': self.seed_total, 'value': self.value}
+
+    def set_state(self, state):
+        self.prev_close = state['prev_close']
+        self.seen = state['seen']
+        self.seed_total = state['seed_total']
+        self.value = state['value']
+
+
+class RollingHighest:
+    """
+    Highest high over the last ``period`` bars (including the current one).
+
+    Keeps a deque of (bar number, value) pairs with decreasing values, so
+    each bar is pushed and popped at most once.
+    """
+    field = 'high'
+
+    def __init__(self, period):
+        self.period = period
+        self.candidates = deque()
+        self.count = 0
+
+    def _dominates(self, new, old):
+        return new >= old
+
+    def update(self, bar):
+        value = bar[self.field]
+        while self.candidates and self._dominates(value, self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        if self.candidates[0][0] <= self.count - self.period:
+            self.candidates.popleft()
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        return self.candidates[0][1] if self.count >= self.period else None
+
+    def get_state(self):
+        return {'candidates': [list(item) for item in self.candidates], 'count': self.count}
+
+    def set_state(self, state):
+        self.candidates = deque(tuple(item) for item in state['candidates'])
+        self.count = state['count']
+
+
+class RollingLowest(RollingHighest):
+    """Lowest low over the last ``period`` bars (including the current one)."""
+    field = 'low'
+
+    def _dominates(self, new, old):
+        return new <= old
+
+
+# Indicator name prefix -> class; names are '<kind>_<period>', e.g. 'ema_20'
+INDICATOR_KINDS = {
+    'sma': MovingAverage,
+    'ema': ExponentialMovingAverage,
+    'atr': AverageTrueRange,
+    'highest': RollingHighest,
+    'lowest': RollingLowest,
+    'vol_ma': VolumeMovingAverage,
+}
+
+
+def make_indicator(name):
+    """
+    Create the streaming indicator for a name such as 'sma_50' or 'vol_ma_20'.
+
+    Raises:
+        ValueError: If the kind is unknown or the period is not a positive integer.
+    """
+    kind, _, period = name.rpartition('_')
+    if kind not in INDICATOR_KINDS or not period.isdigit() or int(period) < 1:
+        raise ValueError(f"Unknown indicator '{name}'. Use <kind>_<period> with kind in {sorted(INDICATOR_KINDS)}")
+    return INDICATOR_KINDS[kind](int(period))
+
+
+class IndicatorEngine:
+    """
+    A set of streaming indicators for one ticker plus a short tail of their values.
+    """
+
+    def __init__(self, indicators=DEFAULT_INDICATORS, tail_length=TAIL_LENGTH):
+        self.names = tuple(indicators)
+        self.indicators = {name: make_indicator(name) for name in self.names}
+        self.tail_length = tail_length
+        self.bars = 0
+        self.last_timestamp = None
+        self.timestamps = deque(maxlen=tail_length)
+        self.tails = {name: deque(maxlen=tail_length) for name in self.names}
+
+    def update(self, timestamp, high, low, close, volume):
+        """
+        Process the next bar. Bars must arrive in timestamp order.
+
+        Returns:
+            dict: Indicator name -> value after this bar (None during warm-up).
+        """
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise ValueError(f"Bar at {timestamp} is not after the last processed bar ({self.last_timestamp})")
+        bar = {'high': float(high), 'low': float(low), 'close': float(close), 'volume': float(volume)}
+        values = {name: indicator.update(bar) for name, indicator in self.indicators.items()}
+        self.bars += 1
+        self.last_timestamp = timestamp
+        self.timestamps.append(timestamp)
+        for name, value in values.items():
+            self.tails[name].append(value)
+        return values
+
+    def feed(self, rows):
+        """Process an iterable of (timestamp, high, low, close, volume) rows in order."""
+        for row in rows:
+            self.update(*row)
+        return self
+
+    def latest(self):
+        """
+        Latest indicator values.
+
+        Returns:
+            dict: 'timestamp' (last processed bar, or None), 'bars' and one
+                  entry per indicator (None during warm-up).
+        """
+        latest = {'timestamp': self.last_timestamp, 'bars': self.bars}
+        latest.update({name: indicator.value for name, indicator in self.indicators.items()})
+        return latest
+
+    def tail(self, names=None, n=None):
+        """
+        The last ``n`` values of some indicators (at most ``tail_length``).
+
+        Returns:
+            dict: 'timestamp' (list of bar timestamps) and a list of values
+                  per requested indicator, oldest first.
+        """
+        names = self.names if names is None else names
+        unknown = set(names) - set(self.names)
+        if unknown:
+            raise ValueError(f"Indicators not maintained by this engine: {sorted(unknown)}")
+        n = len(self.timestamps) if n is None else max(0, min(int(n), len(self.timestamps)))
+        start = len(self.timestamps) - n
+        tail = {'timestamp': list(self.timestamps)[start:]}
+        tail.update({name: list(self.tails[name])[start:] for name in names})
+        return tail
+
+    def get_state(self):
+        """JSON-serializable state from which ``from_state`` restores the engine."""
+        return {
+            'format': ENGINE_FORMAT_VERSION,
+            'indicators': list(self.names),
+            'tail_length': self.tail_length,
+            'bars': self.bars,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp else None,
+            'states': {name: indicator.get_state() for name, indicator in self.indicators.items()},
+            'tail': {
+                'timestamp': [ts.isoformat() for ts in self.timestamps],
+                **{name: list(values) for name, values in self.tails.items()},
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Restore an engine saved with ``get_state``."""
+        engine = cls(state['indicators'], state['tail_length'])
+        engine.bars = state['bars']
+        if state['last_timestamp']:
+            engine.last_timestamp = datetime.fromisoformat(state['last_timestamp'])
+        for name, indicator in engine.indicators.items():
+            indicator.set_state(state['states'][name])
+        engine.timestamps.extend(datetime.fromisoformat(ts) for ts in state['tail']['timestamp'])
+        for name in engine.names:
+            engine.tails[name].extend(state['tail'][name])
+        return engine
+
+
+def _state_is_current(state):
+    """True if a saved state was produced by this engine version and indicator set."""
+    return (state.get('format') == ENGINE_FORMAT_VERSION
+            and tuple(state.get('indicators', ())) == DEFAULT_INDICATORS
+            and state.get('tail_length') == TAIL_LENGTH)
+
+
+def _save_engine(ticker, engine):
+    IndicatorState.objects.update_or_create(
+        ticker=ticker,
+        defaults={'bars': engine.bars, 'last_timestamp': engine.last_timestamp, 'state': engine.get_state()},
+    )
+
+
+def _feed_and_store(ticker, engine, rows):
+    """Feed bars to ``engine``, writing each bar's values as a DailyFeature row."""
+    batch = []
+    for row in rows:
+        values = engine.update(*row)
+        batch.append(DailyFeature(ticker=ticker, timestamp=row[0], **values))
+        if len(batch) >= FEATURE_BATCH_SIZE:
+            DailyFeature.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        DailyFeature.objects.bulk_create(batch)
+    return engine
+
+
+@transaction.atomic
+def rebuild_indicator_state(ticker):
+    """
+    Recompute a ticker's indicator state and DailyFeature rows from its full stored history.
+
+    Returns:
+        IndicatorEngine: The rebuilt engine, or None if the ticker has no bars
+                         (any saved state and features are then removed).
+    """
+    rows = (
+        OHLCVData.objects.filter(ticker=ticker)
+        .order_by('timestamp')
+        .values_list('timestamp', 'high', 'low', 'close', 'volume')
+        .iterator(chunk_size=FEATURE_BATCH_SIZE)
+    )
+    DailyFeature.objects.filter(ticker=ticker).delete()
+    engine = _feed_and_store(ticker, IndicatorEngine(), rows)
+    if not engine.bars:
+        IndicatorState.objects.filter(ticker=ticker).delete()
+        return None
+    _save_engine(ticker, engine)
+    logger.info(f"Rebuilt indicator state for {ticker} from {engine.bars} bars")
+    return engine
+
+
+@transaction.atomic
+def update_indicator_state(ticker, new_bars):
+    """
+    Feed newly stored bars to a ticker's saved indicator state and features.
+
+    Called by ``save_ohlcv_data`` with the bars it inserted, in its
+    transaction. The saved state is locked (``select_for_update``) until that
+    transaction commits, so concurrent ingests of a ticker update it one
+    after the other; a ticker's first ingest creates an empty placeholder
+    state to lock, so concurrent first ingests queue up the same way. If
+    there is no usable saved state, or a new bar is not after the last
+    processed one (e.g. another ingest stored later bars first), the state
+    and features are rebuilt from the full history instead.
+
+    Parameters:
+        ticker (str): Stock ticker symbol.
+        new_bars (list): (timestamp, high, low, close, volume) tuples of the
+                         newly inserted bars (any order).
+
+    Returns:
+        IndicatorEngine: The updated engine, or None if there is nothing to update.
+    """
+    if not new_bars:
+        return None
+    new_bars = sorted(new_bars, key=lambda bar: bar[0])
+    # Waits for other ingests of the ticker, then checks the state they left.
+    # A missing row is created empty (and so rebuilt below); if a concurrent
+    # ingest creates it first, get_or_create waits for it and locks that row.
+    saved, _ = IndicatorState.objects.select_for_update().get_or_create(
+        ticker=ticker, defaults={'bars': 0, 'last_timestamp': new_bars[0][0], 'state': {}},
+    )
+    if not _state_is_current(saved.state) or new_bars[0][0] <= saved.last_timestamp:
+        return rebuild_indicator_state(ticker)
+
+    engine = _feed_and_store(ticker, IndicatorEngine.from_state(saved.state), new_bars)
+    _save_engine(ticker, engine)
+    logger.debug(f"Updated indicator state for {ticker} with {len(new_bars)} bar(s)")
+    return engine
+
+
+def get_indicator_engine(ticker):
+    """
+    A ticker's indicator engine restored from its saved state.
+
+    Reads never rebuild: a state that is missing or was saved by a different
+    engine version or indicator set is rebuilt at the next ingest or by
+    ``rebuild_indicators``.
+
+    Returns:
+        IndicatorEngine: The engine, or None if the ticker has no usable saved state.
+    """
+    saved = IndicatorState.objects.filter(ticker=ticker).first()
+    if saved is None or not _state_is_current(saved.state):
+        if saved is not None:
+            logger.warning(f"Indicator state of {ticker} is outdated; run rebuild_indicators")
+        return None
+    return IndicatorEngine.from_state(saved.state)
+
+
+def latest_indicators(ticker):
+    """
+    Latest indicator values of a ticker (see ``IndicatorEngine.latest``).
+
+    Returns:
+        dict: Values, or None if the ticker has no saved state.
+    """
+    engine = get_indicator_engine(ticker)
+    return engine.latest() if engine else None
+
+
+def indicator_tail(ticker, names=None, n=None):
+    """
+    Recent values of some of a ticker's indicators (see ``IndicatorEngine.tail``).
+
+    Parameters:
+        ticker (str): Stock ticker symbol.
+        names (list): Indicator names (default: all of ``DEFAULT_INDICATORS``).
+        n (int): Number of bars (default and maximum: ``TAIL_LENGTH``).
+
+    Returns:
+        dict: Timestamps and values, or None if the ticker has no saved state.
+    """
+    engine = get_indicator_engine(ticker)
+    return engine.tail(names, n) if engine else None
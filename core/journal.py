@@ -0,0 +1,192 @@
+"""
+Trade journal statistics.
+
+Statistics of the trade log are computed in the database instead of by
+loading every TradeLog row:
+1. ``trade_log_summary``: trade count, total PnL and win rate of the whole
+   journal with a single aggregate query
+2. ``JournalSummary`` rows aggregate the trades of each (strategy, ticker,
+   month of entry). TradeLog save and delete signals (``dashboard.signals``)
+   call ``refresh_journal_bucket`` for the affected rows only, and
+   ``rebuild_journal_summary`` recomputes the table with one grouped query
+3. ``journal_analytics`` rolls the rows up by any of strategy, ticker and
+   month (e.g. win rate and expectancy by strategy by month), reading only
+   the aggregates
+
+The realized R-multiple of a closed trade is its PnL divided by its initial
+risk, ``|entry price - initial stop| * position size``.
+"""
+import logging
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, DateField, DateTimeField, F, FloatField, Q, Sum
+from django.db.models.functions import Abs, Cast, TruncMonth
+from django.utils import timezone
+
+from dashboard.models import JournalSummary, TradeLog
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def trade_log_summary():
+    """
+    Summary statistics of the whole trade journal, from one aggregate query.
+
+    Returns:
+        dict: 'trades', 'closed', 'wins', 'total_pnl' (Decimal, 0 without
+              closed trades) and 'win_rate' (fraction of closed trades won;
+              None without closed trades).
+    """
+    summary = TradeLog.objects.order_by().aggregate(
+        trades=Count('id'),
+        closed=Count('id', filter=Q(pnl__isnull=False)),
+        wins=Count('id', filter=Q(pnl__gt=0)),
+        total_pnl=Sum('pnl'),
+    )
+    summary['total_pnl'] = summary['total_pnl'] or 0
+    summary['win_rate'] = summary['wins'] / summary['closed'] if summary['closed'] else None
+    return summary
+
+
+# Aggregates of a JournalSummary row over the trades of its bucket
+_BUCKET_FIELDS = {
+    'trades': Count('id'),
+    'closed': Count('id', filter=Q(pnl__isnull=False)),
+    'wins': Count('id', filter=Q(pnl__gt=0)),
+    'losses': Count('id', filter=Q(pnl__lt=0)),
+    'total_pnl': Sum('pnl'),
+    'planned_rr_sum': Sum('planned_rr_ratio'),
+    'planned_rr_count': Count('planned_rr_ratio'),
+    'r_multiple_sum': Sum(Cast('pnl', FloatField()) / Cast('risk', FloatField()),
+                          filter=Q(pnl__isnull=False, risk__gt=0)),
+    'r_multiple_count': Count('id', filter=Q(pnl__isnull=False, risk__gt=0)),
+}
+_SUM_FIELDS = ('total_pnl', 'planned_rr_sum', 'r_multiple_sum')
+
+# Dimensions journal_analytics can group by
+ANALYTICS_DIMENSIONS = ('strategy', 'ticker', 'month')
+
+
+def month_of(timestamp):
+    """First day of the (UTC) month of a datetime (or a string, as assigned before saving)."""
+    timestamp = DateTimeField().to_python(timestamp)
+    if timezone.is_naive(timestamp):
+        # Saved in the default time zone, like DateTimeField does
+        timestamp = timezone.make_aware(timestamp)
+    return timestamp.astimezone(dt_timezone.utc).date().replace(day=1)
+
+
+def journal_bucket(strategy, ticker, entry_date):
+    """The (strategy, ticker, month) JournalSummary bucket of a trade."""
+    return strategy, ticker, month_of(entry_date)
+
+
+def summarize_trades(trades):
+    """JournalSummary field values per (strategy, ticker, month) of a TradeLog queryset."""
+    rows = (
+        trades.order_by()
+        .annotate(month=TruncMonth('entry_date', output_field=DateField(), tzinfo=dt_timezone.utc),
+                  risk=Abs(F('entry_price') - F('initial_stop_loss')) * F('position_size'))
+        .values('strategy', 'ticker', 'month')
+        .annotate(**_BUCKET_FIELDS)
+    )
+    for row in rows:
+        for name in _SUM_FIELDS:
+            row[name] = row[name] or 0
+        yield row
+
+
+def _month_start(month):
+    return datetime.combine(month, time.min, tzinfo=dt_timezone.utc)
+
+
+def refresh_journal_bucket(strategy, ticker, month):
+    """
+    Recompute one JournalSummary row from the trades of its bucket.
+
+    Parameters:
+        strategy (str): Trading strategy
+        ticker (str): Stock ticker symbol
+        month (date): First day of the month
+
+    Returns:
+        JournalSummary: The updated row, or None if the bucket has no trades
+                        (its row is removed).
+    """
+    next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    trades = TradeLog.objects.filter(
+        strategy=strategy, ticker=ticker,
+        entry_date__gte=_month_start(month), entry_date__lt=_month_start(next_month),
+    )
+    for row in summarize_trades(trades):
+        key = {name: row.pop(name) for name in ('strategy', 'ticker', 'month')}
+        summary, _ = JournalSummary.objects.update_or_create(**key, defaults=row)
+        return summary
+    JournalSummary.objects.filter(strategy=strategy, ticker=ticker, month=month).delete()
+    return None
+
+
+@transaction.atomic
+def rebuild_journal_summary():
+    """
+    Recompute the whole JournalSummary table with one grouped query, e.g.
+    after trades were changed with bulk operations that send no signals.
+
+    Runs in a transaction, so readers never see the table emptied and a
+    failure leaves the previous rows in place.
+
+    Returns:
+        int: Number of summary rows.
+    """
+    rows = [JournalSummary(**row) for row in summarize_trades(TradeLog.objects.all())]
+    JournalSummary.objects.all().delete()
+    JournalSummary.objects.bulk_create(rows)
+    logger.info(f"Rebuilt the journal summary: {len(rows)} rows")
+    return len(rows)
+
+
+def journal_analytics(group_by=('strategy', 'month'), strategy=None, ticker=None):
+    """
+    Journal statistics grouped by any of strategy, ticker and month.
+
+    Reads only JournalSummary rows, so the cost depends on the number of
+    (strategy, ticker, month) buckets rather than the number of trades.
+
+    Parameters:
+        group_by (tuple): Dimensions from ANALYTICS_DIMENSIONS
+        strategy (str): Only this strategy
+        ticker (str): Only this ticker
+
+    Returns:
+        list: One dict per group with the dimensions, 'trades', 'closed',
+              'wins', 'losses', 'total_pnl', 'win_rate', 'avg_pnl' (per
+              closed trade), 'avg_planned_rr' and 'avg_r_multiple' (the
+              expectancy in R); averages are None without trades to average.
+    """
+    unknown = set(group_by) - set(ANALYTICS_DIMENSIONS)
+    if unknown or not group_by:
+        raise ValueError(f"Group by one or more of {', '.join(ANALYTICS_DIMENSIONS)}")
+    query = JournalSummary.objects.all()
+    if strategy:
+        query = query.filter(strategy=strategy)
+    if ticker:
+        query = query.filter(ticker=ticker)
+    ordering = [f'-{name}' if name == 'month' else name for name in group_by]
+    rows = list(
+        query.order_by().values(*group_by)
+        .annotate(**{name: Sum(name) for name in ('trades', 'closed', 'wins', 'losses', 'total_pnl',
+                                                  'planned_rr_sum', 'planned_rr_count',
+                                                  'r_multiple_sum', 'r_multiple_count')})
+        .order_by(*ordering)
+    )
+    for row in rows:
+        closed = row['closed']
+        row['win_rate'] = row['wins'] / closed if closed else None
+        row['avg_pnl'] = row['total_pnl'] / closed if closed else None
+        planned_rr_count = row.pop('planned_rr_count')
+        row['avg_planned_rr'] = row.pop('planned_rr_sum') / planned_rr_count if planned_rr_count else None
+        r_multiple_count = row.pop('r_multiple_count')
+        row['avg_r_multiple'] = row.pop('r_multiple_sum') / r_multiple_count if r_multiple_count else None
+    return rows
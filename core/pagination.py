@@ -0,0 +1,138 @@
+"""
+Keyset (cursor) pagination.
+
+OFFSET pagination reads and discards every row before the requested page,
+so later pages get slower as a table grows. Keyset pagination continues
+from the last row shown instead:
+1. Rows are ordered by (field, id) descending, e.g. newest trade first
+2. The next page is ``WHERE (field, id) < (last field, last id)`` and the
+   previous page ``WHERE (field, id) > (first field, first id)``, both
+   answered from a (field, id) index in the same time on every page
+3. Cursors encode the boundary row's (field, id) in an opaque URL-safe string
+"""
+import base64
+import logging
+from datetime import datetime
+
+from django.db.models import Q
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(value, pk):
+    """Opaque cursor for the row with ``field`` value ``value`` (a datetime) and id ``pk``."""
+    raw = f"{value.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    (datetime, id) of a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid page cursor '{cursor}'") from e
+
+
+class KeysetPage:
+    """
+    One page of a queryset ordered by (field, id) descending.
+
+    The page is evaluated on first use, so a template fragment served from
+    the cache never runs its query.
+
+    Parameters:
+        queryset (QuerySet): Rows to paginate (any ordering is replaced)
+        field (str): Datetime field to order by, with id as the tie-breaker
+        page_size (int): Rows per page
+        after (str): Cursor of the last row of the previous page (next page)
+        before (str): Cursor of the first row of the following page (previous page)
+
+    Raises:
+        ValueError: If a cursor is malformed.
+    """
+
+    def __init__(self, queryset, field, page_size, after=None, before=None):
+        self.queryset = queryset
+        self.field = field
+        self.page_size = page_size
+        self.after = decode_cursor(after) if after else None
+        self.before = decode_cursor(before) if before else None
+        self._rows = None
+        self._has_next = False
+        self._has_previous = False
+
+    def _evaluate(self):
+        if self._rows is not None:
+            return self._rows
+        field = self.field
+        if self.before:
+            value, pk = self.before
+            query = self.queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk}))
+            rows = list(query.order_by(field, 'id')[:self.page_size + 1])
+            self._has_previous = len(rows) > self.page_size
+            self._has_next = True
+            rows = rows[:self.page_size][::-1]
+        else:
+            query = self.queryset
+            if self.after:
+                value, pk = self.after
+                query = query.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk}))
+            rows = list(query.order_by(f'-{field}', '-id')[:self.page_size + 1])
+            self._has_next = len(rows) > self.page_size
+            self._has_previous = self.after is not None
+            rows = rows[:self.page_size]
+        self._rows = rows
+        return rows
+
+    @property
+    def object_list(self):
+        return self._evaluate()
+
+    def __iter__(self):
+        return iter(self._evaluate())
+
+    def __len__(self):
+        return len(self._evaluate())
+
+    def __bool__(self):
+        return bool(self._evaluate())
+
+    @property
+    def has_next(self):
+        """Whether older rows follow this page."""
+        self._evaluate()
+        return self._has_next
+
+    @property
+    def has_previous(self):
+        """Whether newer rows precede this page."""
+        self._evaluate()
+        return self._has_previous
+
+    def first(self):
+        """First row of the page, or None if it is empty."""
+        rows = self._evaluate()
+        return rows[0] if rows else None
+
+    def _cursor(self, row):
+        return encode_cursor(getattr(row, self.field), row.pk)
+
+    @property
+    def next_cursor(self):
+        """Cursor of the next page, or None on the last page."""
+        rows = self._evaluate()
+        return self._cursor(rows[-1]) if self._has_next and rows else None
+
+    @property
+    def previous_cursor(self):
+        """Cursor of the previous page, or None on the first page."""
+        rows = self._evaluate()
+        return self._cursor(rows[0]) if self._has_previous and rows else None
@@ -0,0 +1,592 @@
+"""
+Performance metrics for backtest results, computed with NumPy.
+
+Instead of stacking several Backtrader analyzers that each run Python code on
+every bar or trade, a backtest attaches a single ``PerformanceRecorder``. It
+writes the portfolio value of each bar into preallocated arrays and records
+closed trades; every metric is then computed once from those arrays:
+1. Returns, Sharpe and Sortino ratios
+2. Maximum drawdown and its duration
+3. SQN, win rate, expectancy and R-multiples
+
+``compute_performance`` returns the metrics in the layout of Backtrader's
+``TradeAnalyzer``, ``SQN``, ``DrawDown`` and ``SharpeRatio`` analyzers (so
+existing consumers of ``run_backtest`` results keep working) plus a
+``performance`` section with the additional metrics. The vectorized engine
+uses the same functions, so both engines report identical numbers.
+
+Runs that are extended over time (``core.incremental``) keep the same metrics
+in ``running_performance`` instead: return moments and drawdown state are
+folded in as bars are added, so the equity curve is never revisited.
+"""
+import logging
+import math
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Backtrader's SharpeRatio defaults (daily timeframe, 1% annual risk-free rate)
+SHARPE_RISK_FREE_RATE = 0.01
+SHARPE_DAYS_FACTOR = 252
+
+# Analyzer names in run_backtest results, in the layout of the Backtrader analyzers
+ANALYZER_KEYS = ('trade_analyzer', 'sqn', 'drawdown', 'sharpe')
+
+
+class PerformanceRecorder(bt.Analyzer):
+    """
+    Records the equity curve and closed trades of a run for ``compute_performance``.
+
+    The portfolio value and date of every bar go into arrays preallocated to
+    the length of the data feed. For each closed trade the entry/exit dates,
+    entry price, size, PnL, bar length and initial risk (from the strategy's
+    ``initial_stop_price`` when the trade opened) are kept for R-multiples.
+
+    With ``compact=True`` (used for streamed, low-memory runs) only the last
+    value of each day is stored and drawdown is tracked bar by bar as the run
+    advances, so memory grows with the number of days rather than bars.
+    """
+    params = (
+        ('compact', False),
+    )
+
+    def start(self):
+        capacity = 256 if self.p.compact else max(self.data.buflen(), 1)
+        self._values = np.empty(capacity)
+        self._dates = np.empty(capacity)
+        self._count = 0
+        self._open_trades = {}
+        self._closed_trades = []
+        self._symbols = []
+        self._analysis = None
+        # Running drawdown state (compact mode)
+        self._peak = -np.inf
+        self._drawdown = {'len': 0, 'drawdown': 0.0, 'moneydown': 0.0,
+                          'max': {'len': 0, 'drawdown': 0.0, 'moneydown': 0.0}}
+
+    def _grow(self):
+        # Data that isn't preloaded reports a shorter buffer; double as needed
+        self._values = np.resize(self._values, len(self._values) * 2)
+        self._dates = np.resize(self._dates, len(self._dates) * 2)
+
+    def _update_drawdown(self, value):
+        """Advance the running drawdown, as Backtrader's DrawDown analyzer does."""
+        dd = self._drawdown
+        self._peak = max(self._peak, value)
+        dd['moneydown'] = self._peak - value
+        dd['drawdown'] = 100.0 * dd['moneydown'] / self._peak
+        dd['len'] = dd['len'] + 1 if dd['drawdown'] else 0
+        dd['max']['drawdown'] = max(dd['max']['drawdown'], dd['drawdown'])
+        dd['max']['moneydown'] = max(dd['max']['moneydown'], dd['moneydown'])
+        dd['max']['len'] = max(dd['max']['len'], dd['len'])
+
+    def next(self):
+        value = self.strategy.broker.getvalue()
+        # The strategy clock is the latest bar across all data feeds
+        date = self.strategy.datetime[0]
+        if self.p.compact:
+            self._update_drawdown(value)
+            if self._count and math.floor(self._dates[self._count - 1]) == math.floor(date):
+                # Same day: keep only the latest value
+                self._values[self._count - 1] = value
+                self._dates[self._count - 1] = date
+                return
+
+        if self._count == len(self._values):
+            self._grow()
+        self._values[self._count] = value
+        self._dates[self._count] = date
+        self._count += 1
+
+    def notify_trade(self, trade):
+        if trade.justopened:
+            # Multi-data strategies keep one stop per data feed
+            stop_for = getattr(self.strategy, 'initial_stop_for', None)
+            stop = stop_for(trade.data) if stop_for else getattr(self.strategy, 'initial_stop_price', None)
+            self._open_trades[trade.ref] = (trade.size, stop)
+        elif trade.isclosed:
+            size, stop = self._open_trades.pop(trade.ref, (0, None))
+            risk = (trade.price - stop) * abs(size) if stop is not None else np.nan
+            self._closed_trades.append((
+                trade.dtopen, trade.dtclose, trade.price, size,
+                trade.pnl, trade.pnlcomm, trade.barlen, risk,
+            ))
+            self._symbols.append(trade.data._name)
+
+    def trade_arrays(self):
+        """Closed trades as NumPy arrays (dates as Backtrader date numbers)."""
+        records = np.array(self._closed_trades, dtype=float).reshape(-1, 8)
+        return {
+            'entry_date': records[:, 0], 'exit_date': records[:, 1],
+            'entry_price': records[:, 2], 'size': records[:, 3],
+            'pnl': records[:, 4], 'pnlcomm': records[:, 5],
+            'barlen': records[:, 6], 'risk': records[:, 7],
+        }
+
+    def get_analysis(self):
+        if self._analysis is None:
+            trades = self.trade_arrays()
+            self._analysis = compute_performance(
+                self._values[:self._count], self.strategy.broker.startingcash,
+                trades['pnl'], trades['pnlcomm'], trades['barlen'], trades['risk'],
+                days=np.floor(self._dates[:self._count]),
+                open_trades=len(self._open_trades),
+            )
+            if self.p.compact:
+                # Daily values understate intraday drawdowns; use the per-bar tracking
+                self._analysis['drawdown'] = self._drawdown
+                self._analysis['performance']['max_drawdown'] = self._drawdown['max']['drawdown']
+                self._analysis['performance']['max_drawdown_duration'] = self._drawdown['max']['len']
+        return self._analysis
+
+    def equity_curve(self):
+        """Equity curve as {'dates': [ISO strings], 'values': [floats]}."""
+        dates = [bt.num2date(num) for num in self._dates[:self._count]]
+        return equity_curve_payload(dates, self._values[:self._count])
+
+    def closed_trades(self):
+        """Closed trades as a list of dicts (see ``trade_records``)."""
+        trades = self.trade_arrays()
+        trades['entry_date'] = [bt.num2date(num) for num in trades['entry_date']]
+        trades['exit_date'] = [bt.num2date(num) for num in trades['exit_date']]
+        return trade_records(**trades)
+
+    def closed_trade_symbols(self):
+        """Name of the data feed of each closed trade, in closing order."""
+        return list(self._symbols)
+
+
+def equity_curve_payload(dates, values):
+    """JSON-serializable equity curve: naive UTC ISO dates and float values."""
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return {
+        'dates': [ts.isoformat() for ts in index],
+        'values': [float(v) for v in values],
+    }
+
+
+def trade_records(entry_date, exit_date, entry_price, size, pnl, pnlcomm, barlen, risk):
+    """
+    Closed trades as JSON-friendly dicts with exit price and R-multiple.
+
+    The exit price is derived from the gross PnL: exit = entry + pnl / size.
+    """
+    r_multiples = _r_multiples(pnlcomm, risk)
+    records = []
+    for i in range(len(pnl)):
+        records.append({
+            'entry_date': pd.Timestamp(entry_date[i]).isoformat(),
+            'exit_date': pd.Timestamp(exit_date[i]).isoformat(),
+            'entry_price': float(entry_price[i]),
+            'exit_price': float(entry_price[i] + pnl[i] / size[i]) if size[i] else None,
+            'size': float(size[i]),
+            'pnl': float(pnl[i]),
+            'pnlcomm': float(pnlcomm[i]),
+            'barlen': int(barlen[i]),
+            'r_multiple': None if np.isnan(r_multiples[i]) else float(r_multiples[i]),
+        })
+    return records
+
+
+def _r_multiples(pnlcomm, risk):
+    """Net PnL of each trade in units of its initial risk (NaN when unknown)."""
+    pnlcomm = np.asarray(pnlcomm, dtype=float)
+    risk = np.asarray(risk, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(risk > 0, pnlcomm / risk, np.nan)
+
+
+def compute_performance(equity, start_value, pnl, pnlcomm, barlen, risk=None,
+                        days=None, open_trades=0):
+    """
+    Compute all performance metrics of a run.
+
+    Parameters:
+        equity (array): Portfolio value at every bar.
+        start_value (float): Portfolio value before the first bar.
+        pnl, pnlcomm, barlen (array): Gross PnL, net PnL and length in bars of
+                                      each closed trade, in closing order.
+        risk (array): Initial risk (currency) of each closed trade, NaN if unknown.
+        days (array): Calendar day of each bar; returns are measured between
+                      the last bars of consecutive days. Defaults to one day per bar.
+        open_trades (int): Trades still open at the end of the run.
+
+    Returns:
+        dict: 'trade_analyzer', 'sqn', 'drawdown' and 'sharpe' in Backtrader's
+              analyzer layouts, plus 'performance' with the extended metrics.
+    """
+    equity = np.asarray(equity, dtype=float)
+    pnl = np.asarray(pnl, dtype=float)
+    pnlcomm = np.asarray(pnlcomm, dtype=float)
+    barlen = np.asarray(barlen, dtype=float)
+    risk = np.full(len(pnlcomm), np.nan) if risk is None else np.asarray(risk, dtype=float)
+
+    returns = daily_excess_returns(equity, start_value, days)
+    trades = trade_analysis(pnl, pnlcomm, barlen, open_trades)
+    sqn = sqn_analysis(pnlcomm)
+    drawdown = drawdown_analysis(equity)
+    sharpe = {'sharperatio': sharpe_ratio(returns)}
+
+    end_value = float(equity[-1]) if len(equity) else float(start_value)
+
+    performance = {
+        'total_return': (end_value / start_value - 1.0) * 100 if start_value else 0.0,
+        'sharpe_ratio': sharpe['sharperatio'],
+        'sortino_ratio': sortino_ratio(returns),
+        'max_drawdown': drawdown['max']['drawdown'],
+        'max_drawdown_duration': drawdown['max']['len'],
+        'sqn': sqn['sqn'],
+        **trade_statistics(pnlcomm, risk),
+    }
+
+    return {
+        'trade_analyzer': trades,
+        'sqn': sqn,
+        'drawdown': drawdown,
+        'sharpe': sharpe,
+        'performance': performance,
+    }
+
+
+def trade_statistics(pnlcomm, risk=None):
+    """
+    Win rate, expectancy and R-multiple statistics of closed trades.
+
+    Parameters:
+        pnlcomm (array): Net PnL of each closed trade.
+        risk (array): Initial risk (currency) of each trade, NaN if unknown.
+
+    Returns:
+        dict: trades, win_rate (%), expectancy, average_win, average_loss,
+              profit_factor, average_r and r_multiples.
+    """
+    pnlcomm = np.asarray(pnlcomm, dtype=float)
+    risk = np.full(len(pnlcomm), np.nan) if risk is None else np.asarray(risk, dtype=float)
+    closed = len(pnlcomm)
+    wins = pnlcomm[pnlcomm >= 0.0]
+    losses = pnlcomm[pnlcomm < 0.0]
+    gross_loss = -losses.sum()
+    r_multiples = _r_multiples(pnlcomm, risk)
+    known_r = r_multiples[~np.isnan(r_multiples)]
+    return {
+        'trades': closed,
+        'win_rate': len(wins) / closed * 100 if closed else 0.0,
+        'expectancy': float(pnlcomm.mean()) if closed else 0.0,
+        'average_win': float(wins.mean()) if len(wins) else 0.0,
+        'average_loss': float(losses.mean()) if len(losses) else 0.0,
+        'profit_factor': float(wins.sum() / gross_loss) if gross_loss > 0 else None,
+        'average_r': float(known_r.mean()) if len(known_r) else None,
+        'r_multiples': [None if np.isnan(r) else float(r) for r in r_multiples],
+    }
+
+
+def trade_analysis(pnl, pnlcomm, barlen, open_trades=0):
+    """
+    Summarize closed trades in the layout of Backtrader's ``TradeAnalyzer``.
+
+    Only the sections consumed by the dashboard (totals, streaks, PnL,
+    won/lost, long and length statistics) are produced.
+    """
+    closed = len(pnlcomm)
+    analysis = {'total': {'total': closed + open_trades}}
+    if not closed + open_trades:
+        return analysis
+
+    analysis['total'].update({'open': open_trades, 'closed': closed})
+    if not closed:
+        return analysis
+
+    won = pnlcomm >= 0.0
+    lost = ~won
+
+    analysis['streak'] = {
+        'won': {'current': _current_streak(won), 'longest': _longest_streak(won)},
+        'lost': {'current': _current_streak(lost), 'longest': _longest_streak(lost)},
+    }
+    analysis['pnl'] = {
+        'gross': {'total': float(pnl.sum()), 'average': float(pnl.mean())},
+        'net': {'total': float(pnlcomm.sum()), 'average': float(pnlcomm.mean())},
+    }
+    for name, mask, func in (('won', won, np.max), ('lost', lost, np.min)):
+        count = int(mask.sum())
+        total = float(pnlcomm[mask].sum())
+        analysis[name] = {
+            'total': count,
+            'pnl': {
+                'total': total,
+                'average': total / (count or 1.0),
+                'max': float(func(np.append(pnlcomm[mask], 0.0))),
+            },
+        }
+    analysis['long'] = {
+        'total': closed,
+        'pnl': {'total': float(pnlcomm.sum()), 'average': float(pnlcomm.mean())},
+        'won': int(won.sum()),
+        'lost': int(lost.sum()),
+    }
+    analysis['short'] = {'total': 0, 'pnl': {'total': 0.0, 'average': 0.0}, 'won': 0, 'lost': 0}
+    analysis['len'] = {
+        'total': int(barlen.sum()),
+        'average': float(barlen.mean()),
+        'max': int(barlen.max()),
+        'min': int(barlen.min()),
+    }
+    return analysis
+
+
+def _current_streak(mask):
+    """Length of the run of True values at the end of ``mask``."""
+    falses = np.flatnonzero(~mask)
+    return int(len(mask) - (falses[-1] + 1 if falses.size else 0))
+
+
+def _longest_streak(mask):
+    """Length of the longest run of True values in ``mask``."""
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max()) if edges.size else 0
+
+
+def sqn_analysis(pnlcomm):
+    """System Quality Number, computed like Backtrader's ``SQN`` analyzer."""
+    pnlcomm = np.asarray(pnlcomm, dtype=float)
+    count = len(pnlcomm)
+    if count > 1:
+        stddev = pnlcomm.std()
+        sqn = math.sqrt(count) * pnlcomm.mean() / stddev if stddev else None
+    else:
+        sqn = 0
+    return {'sqn': sqn, 'trades': count}
+
+
+def drawdown_analysis(equity):
+    """
+    Drawdown statistics in the layout of Backtrader's ``DrawDown`` analyzer.
+
+    ``drawdown`` values are percentages, ``moneydown`` values are currency
+    and ``len`` values count bars (the drawdown's duration).
+    """
+    if len(equity) == 0:
+        return {'len': 0, 'drawdown': 0.0, 'moneydown': 0.0,
+                'max': {'len': 0, 'drawdown': 0.0, 'moneydown': 0.0}}
+
+    peak = np.maximum.accumulate(equity)
+    moneydown = peak - equity
+    drawdown = 100.0 * moneydown / peak
+
+    # Length of each drawdown run: bars since the last bar with no drawdown
+    in_drawdown = drawdown != 0
+    idx = np.arange(len(equity))
+    last_flat = np.maximum.accumulate(np.where(in_drawdown, -1, idx))
+    lengths = np.where(in_drawdown, idx - last_flat, 0)
+
+    return {
+        'len': int(lengths[-1]),
+        'drawdown': float(drawdown[-1]),
+        'moneydown': float(moneydown[-1]),
+        'max': {
+            'len': int(lengths.max()),
+            'drawdown': float(drawdown.max()),
+            'moneydown': float(moneydown.max()),
+        },
+    }
+
+
+def daily_excess_returns(equity, start_value, days=None,
+                         riskfreerate=SHARPE_RISK_FREE_RATE, factor=SHARPE_DAYS_FACTOR):
+    """
+    Daily returns in excess of the risk-free rate, measured like Backtrader's
+    ``SharpeRatio`` with ``timeframe=Days``: from the starting value to the
+    last bar of each day.
+    """
+    equity = np.asarray(equity, dtype=float)
+    if days is not None and len(equity):
+        days = np.asarray(days)
+        is_last = np.append(days[1:] != days[:-1], True)
+        equity = equity[is_last]
+    if len(equity) == 0:
+        return equity
+
+    values = np.concatenate(([start_value], equity))
+    returns = values[1:] / values[:-1] - 1.0
+    rate = pow(1.0 + riskfreerate, 1.0 / factor) - 1.0
+    return returns - rate
+
+
+def sharpe_ratio(excess_returns):
+    """Non-annualized Sharpe ratio (population standard deviation), or None."""
+    if len(excess_returns) == 0:
+        return None
+    stddev = excess_returns.std()
+    return float(excess_returns.mean() / stddev) if stddev else None
+
+
+def sortino_ratio(excess_returns):
+    """Non-annualized Sortino ratio: mean excess return over downside deviation."""
+    if len(excess_returns) == 0:
+        return None
+    downside = np.sqrt(np.mean(np.minimum(excess_returns, 0.0) ** 2))
+    return float(excess_returns.mean() / downside) if downside else None
+
+
+def running_performance(start_value):
+    """
+    Empty running metrics of a run that is extended over time (``core.incremental``).
+
+    The equity curve is folded into daily return moments and drawdown state,
+    so extending a run costs O(new bars); closed trades keep their net PnL,
+    gross PnL, length and risk. The dict is JSON-serializable.
+    """
+    return {
+        'start_value': float(start_value),
+        # Excess returns of closed days (count, mean, sum of squared
+        # deviations and of squared negative returns), the value at the end of
+        # the last closed day and the still open last day
+        'returns': {'count': 0, 'mean': 0.0, 'm2': 0.0, 'downside': 0.0,
+                    'prev_value': float(start_value), 'day': None, 'value': None},
+        'drawdown': {'peak': None, 'len': 0, 'drawdown': 0.0, 'moneydown': 0.0,
+                     'max': {'len': 0, 'drawdown': 0.0, 'moneydown': 0.0}},
+        'trades': {'pnl': [], 'pnlcomm': [], 'barlen': [], 'risk': []},
+    }
+
+
+def extend_running_performance(running, equity, days, pnl=(), pnlcomm=(), barlen=(), risk=()):
+    """
+    Fold new bars and closed trades into ``running_performance`` metrics.
+
+    Parameters:
+        running (dict): Running metrics, updated in place.
+        equity (array): Portfolio value at every new bar.
+        days (array): Calendar day of every new bar (comparable values, e.g. ISO dates).
+        pnl, pnlcomm, barlen, risk (array): Trades closed on the new bars
+                                            (risk NaN if unknown).
+
+    Returns:
+        dict: ``running``.
+    """
+    equity = np.asarray(equity, dtype=float)
+    if len(equity):
+        _extend_returns(running['returns'], equity, np.asarray(days))
+        _extend_drawdown(running['drawdown'], equity)
+    trades = running['trades']
+    trades['pnl'] += [float(v) for v in pnl]
+    trades['pnlcomm'] += [float(v) for v in pnlcomm]
+    trades['barlen'] += [int(v) for v in barlen]
+    trades['risk'] += [None if np.isnan(v) else float(v) for v in np.asarray(risk, dtype=float)]
+    return running
+
+
+def _extend_returns(returns, equity, days):
+    if returns['day'] is not None:
+        # The open day may continue on the new bars
+        equity = np.concatenate(([returns['value']], equity))
+        days = np.concatenate(([returns['day']], days))
+    is_last = np.append(days[1:] != days[:-1], True)
+    day_values, day_keys = equity[is_last], days[is_last]
+
+    closed = day_values[:-1]
+    if len(closed):
+        values = np.concatenate(([returns['prev_value']], closed))
+        excess = values[1:] / values[:-1] - 1.0 - _daily_risk_free_rate()
+        _merge_moments(returns, excess)
+        returns['downside'] += float((np.minimum(excess, 0.0) ** 2).sum())
+        returns['prev_value'] = float(closed[-1])
+    returns['day'] = day_keys[-1].item() if hasattr(day_keys[-1], 'item') else day_keys[-1]
+    returns['value'] = float(day_values[-1])
+
+
+def _merge_moments(moments, values):
+    """Combine count, mean and sum of squared deviations with those of ``values``."""
+    count, added = moments['count'], len(values)
+    mean = float(values.mean())
+    delta = mean - moments['mean']
+    total = count + added
+    moments['m2'] += float(((values - mean) ** 2).sum()) + delta * delta * count * added / total
+    moments['mean'] += delta * added / total
+    moments['count'] = total
+
+
+def _extend_drawdown(dd, equity):
+    peak = np.maximum.accumulate(equity)
+    if dd['peak'] is not None:
+        peak = np.maximum(peak, dd['peak'])
+    moneydown = peak - equity
+    drawdown = 100.0 * moneydown / peak
+
+    # Bars since the last bar with no drawdown, continuing the open drawdown
+    in_drawdown = drawdown != 0
+    idx = np.arange(len(equity))
+    last_flat = np.maximum.accumulate(np.where(in_drawdown, -1, idx))
+    lengths = np.where(in_drawdown, np.where(last_flat >= 0, idx - last_flat, dd['len'] + idx + 1), 0)
+
+    dd.update({'peak': float(peak[-1]), 'len': int(lengths[-1]),
+               'drawdown': float(drawdown[-1]), 'moneydown': float(moneydown[-1])})
+    dd['max'] = {
+        'len': max(dd['max']['len'], int(lengths.max())),
+        'drawdown': max(dd['max']['drawdown'], float(drawdown.max())),
+        'moneydown': max(dd['max']['moneydown'], float(moneydown.max())),
+    }
+
+
+def _daily_risk_free_rate(riskfreerate=SHARPE_RISK_FREE_RATE, factor=SHARPE_DAYS_FACTOR):
+    return pow(1.0 + riskfreerate, 1.0 / factor) - 1.0
+
+
+def running_analysis(running, open_trades=0):
+    """
+    Metrics of ``running_performance`` in the layout of ``compute_performance``.
+
+    Parameters:
+        running (dict): Running metrics.
+        open_trades (int): Trades still open at the end of the run.
+
+    Returns:
+        dict: Same as ``compute_performance`` for the whole run so far.
+    """
+    returns = dict(running['returns'])
+    if returns['day'] is not None:
+        # Include the open last day, as daily_excess_returns does
+        excess = np.array([returns['value'] / returns['prev_value'] - 1.0 - _daily_risk_free_rate()])
+        _merge_moments(returns, excess)
+        returns['downside'] += float(min(excess[0], 0.0) ** 2)
+    if returns['count']:
+        stddev = math.sqrt(returns['m2'] / returns['count'])
+        downside = math.sqrt(returns['downside'] / returns['count'])
+        sharpe = returns['mean'] / stddev if stddev else None
+        sortino = returns['mean'] / downside if downside else None
+    else:
+        sharpe = sortino = None
+
+    dd = running['drawdown']
+    drawdown = {'len': dd['len'], 'drawdown': dd['drawdown'], 'moneydown': dd['moneydown'], 'max': dict(dd['max'])}
+
+    trades = running['trades']
+    pnl = np.array(trades['pnl'], dtype=float)
+    pnlcomm = np.array(trades['pnlcomm'], dtype=float)
+    barlen = np.array(trades['barlen'], dtype=float)
+    risk = np.array([np.nan if r is None else r for r in trades['risk']], dtype=float)
+    sqn = sqn_analysis(pnlcomm)
+
+    start_value = running['start_value']
+    end_value = returns['value'] if returns['value'] is not None else start_value
+    return {
+        'trade_analyzer': trade_analysis(pnl, pnlcomm, barlen, open_trades),
+        'sqn': sqn,
+        'drawdown': drawdown,
+        'sharpe': {'sharperatio': sharpe},
+        'performance': {
+            'total_return': (end_value / start_value - 1.0) * 100 if start_value else 0.0,
+            'sharpe_ratio': sharpe,
+            'sortino_ratio': sortino,
+            'max_drawdown': drawdown['max']['drawdown'],
+            'max_drawdown_duration': drawdown['max']['len'],
+            'sqn': sqn['sqn'],
+            **trade_statistics(pnlcomm, risk),
+        },
+    }
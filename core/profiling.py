@@ -0,0 +1,231 @@
+"""
+Opt-in profiling for backtest runs.
+
+``run_backtest``, ``run_parameter_sweep`` and ``run_portfolio_backtest`` accept
+``profile=True`` to find out where the time of a slow run goes:
+1. Phase timings: stages such as database loading, DataFrame building,
+   indicator setup, the Cerebro loop, strategy logging and analyzer
+   extraction are wrapped in ``phase(name)``; nested phases are reported as
+   'outer.inner' with their total time and number of calls
+2. Sampled call profile (``profile='sample'``): a background thread samples
+   the profiled thread's call stack every few milliseconds and counts the
+   functions found on it, without tracing every call like cProfile
+3. The report is returned under result['profile'] and written as JSON to
+   ``BACKTEST_PROFILE_DIR``
+
+When no profiler is active ``phase`` returns a shared no-op context manager,
+so instrumented code pays a single ContextVar lookup.
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds between stack samples
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Functions listed in the report, by samples
+TOP_FUNCTIONS = 30
+
+# Profiler of the run in progress in this context, if any
+_active_profiler = contextvars.ContextVar('backtest_profiler', default=None)
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+def phase(name):
+    """
+    Time a stage of a run under ``name`` when profiling is active.
+
+    Usage:
+        with phase('load_data'):
+            df = get_ohlcv_dataframe(...)
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+
+def profiling(label, profile=False):
+    """
+    Context manager that profiles its block when ``profile`` is truthy.
+
+    Parameters:
+        label (str): Name of the run, used in the report and file name.
+        profile (bool or str): False to disable, True for phase timings,
+                               'sample' to also sample call stacks.
+
+    Returns:
+        Profiler, or a no-op context manager yielding None when disabled or
+        when a profiler is already active (nested entry points join the
+        outer profile).
+    """
+    if not profile or _active_profiler.get() is not None:
+        return contextlib.nullcontext()
+    return Profiler(label, sample=(profile == 'sample'))
+
+
+class StackSampler(threading.Thread):
+    """Samples the call stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id, interval=DEFAULT_SAMPLE_INTERVAL):
+        super().__init__(name='backtest-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.self_counts = Counter()
+        self.total_counts = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            seen = set()
+            leaf = True
+            while frame is not None:
+                code = frame.f_code
+                key = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                if leaf:
+                    self.self_counts[key] += 1
+                    leaf = False
+                if key not in seen:
+                    # Count recursive functions once per sample
+                    self.total_counts[key] += 1
+                    seen.add(key)
+                frame = frame.f_back
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def report(self):
+        """Top functions by samples where they were running and on the stack."""
+        return {
+            'interval': self.interval,
+            'samples': self.samples,
+            'self': [{'function': name, 'samples': count}
+                     for name, count in self.self_counts.most_common(TOP_FUNCTIONS)],
+            'cumulative': [{'function': name, 'samples': count}
+                           for name, count in self.total_counts.most_common(TOP_FUNCTIONS)],
+        }
+
+
+class Profiler:
+    """
+    Collects phase timings (and optionally stack samples) for one run.
+
+    Use as a context manager; while active, ``phase`` calls anywhere in the
+    same thread or context record into it.
+    """
+
+    def __init__(self, label, sample=False, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.label = label
+        self.sample = sample
+        self.interval = interval
+        self.phases = {}
+        self.total = None
+        self._stack = []
+        self._sampler = None
+        self._token = None
+        self._started = None
+
+    def __enter__(self):
+        self._token = _active_profiler.set(self)
+        if self.sample:
+            self._sampler = StackSampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.total = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+        _active_profiler.reset(self._token)
+        return False
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self._stack.append(name)
+        key = '.'.join(self._stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            entry = self.phases.setdefault(key, {'seconds': 0.0, 'calls': 0})
+            entry['seconds'] += elapsed
+            entry['calls'] += 1
+
+    def report(self):
+        """
+        JSON-serializable profile.
+
+        Returns:
+            dict: 'label', 'total' (seconds), 'phases' (name -> seconds, calls
+                  and share of the total), 'unaccounted' (top-level time outside
+                  any phase) and 'sampling' when stacks were sampled.
+        """
+        total = self.total or 0.0
+        phases = {
+            name: {
+                'seconds': entry['seconds'],
+                'calls': entry['calls'],
+                'percent': entry['seconds'] / total * 100 if total else 0.0,
+            }
+            for name, entry in self.phases.items()
+        }
+        top_level = sum(entry['seconds'] for name, entry in self.phases.items() if '.' not in name)
+        report = {
+            'label': self.label,
+            'total': total,
+            'phases': phases,
+            'unaccounted': max(total - top_level, 0.0),
+        }
+        if self._sampler is not None:
+            report['sampling'] = self._sampler.report()
+        return report
+
+    def write(self, report=None, directory=None):
+        """
+        Write the report as JSON to the profile directory.
+
+        Returns:
+            str: Path of the written file, or None if it could not be written.
+        """
+        report = report or self.report()
+        directory = Path(directory or getattr(settings, 'BACKTEST_PROFILE_DIR', 'profiles'))
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        safe_label = ''.join(c if c.isalnum() or c in '-_' else '_' for c in self.label)
+        path = directory / f"{stamp}-{safe_label}.json"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+        except OSError as e:
+            logger.warning(f"Could not write profile {path}: {e}")
+            return None
+        logger.info(f"Profile for {self.label} written to {path}")
+        return str(path)
+
+    def finish(self):
+        """Build the report, write it to disk and return it with its 'file' path."""
+        report = self.report()
+        report['file'] = self.write(report)
+        return report
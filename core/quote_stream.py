@@ -0,0 +1,154 @@
+"""
+Shared live quote pollers for the WebSocket quote stream.
+
+Browsers watching a ticker join its channel layer group (``quote_group``)
+through ``dashboard.consumers.QuoteConsumer`` instead of polling Alpaca
+themselves, so upstream calls grow with the number of watched tickers
+rather than viewers:
+1. Each process runs at most one poller task per ticker, started by its
+   first local subscriber and cancelled with its last
+2. Across processes (channels-redis layer and a shared cache), a lease in
+   the Django cache elects one poller per ticker; the others stand by and
+   take over if the lease expires
+3. The elected poller fetches the quote every QUOTE_POLL_INTERVAL_SECONDS
+   through ``core.upstream`` and publishes it to the group only when the
+   prices or sizes changed; the latest quote is kept in the cache so new
+   subscribers get it right away
+"""
+import asyncio
+import logging
+import math
+import re
+import uuid
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+
+from core.market_data import get_latest_quote, is_tradable
+from core.upstream import UpstreamTimeout, call_upstream
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+TICKER_PATTERN = re.compile(r'^[A-Z][A-Z0-9.\-]{0,9}$')
+
+# A quote is only published when one of these changed
+QUOTE_FIELDS = ('status', 'bid_price', 'bid_size', 'ask_price', 'ask_size')
+
+# Identifies this process's pollers in the cache leases
+_owner = uuid.uuid4().hex
+
+# Local pollers: ticker -> [task, local subscribers]
+_pollers = {}
+
+
+def normalize_ticker(ticker):
+    """
+    Upper-case a ticker symbol and validate it.
+
+    Raises:
+        ValueError: If it isn't a plausible ticker (also keeps group names valid).
+    """
+    ticker = ticker.strip().upper() if isinstance(ticker, str) else ''
+    if not TICKER_PATTERN.match(ticker):
+        raise ValueError(f"Invalid ticker '{ticker}'")
+    return ticker
+
+
+def quote_group(ticker):
+    """Channel layer group the quotes of a ticker are published to."""
+    return f"quotes.{ticker}"
+
+
+def _lease_key(ticker):
+    return f"quote_stream:lease:{ticker}"
+
+
+def _latest_key(ticker):
+    return f"quote_stream:latest:{ticker}"
+
+
+def _lease_seconds():
+    return max(5, math.ceil(3 * settings.QUOTE_POLL_INTERVAL_SECONDS))
+
+
+def subscribe(ticker):
+    """Count a local subscriber of a ticker, starting its poller if it is the first."""
+    entry = _pollers.get(ticker)
+    if entry is None:
+        entry = _pollers[ticker] = [asyncio.ensure_future(_poll(ticker)), 0]
+    entry[1] += 1
+
+
+def unsubscribe(ticker):
+    """Remove a local subscriber of a ticker, cancelling its poller after the last."""
+    entry = _pollers.get(ticker)
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del _pollers[ticker]
+        entry[0].cancel()
+
+
+def active_pollers():
+    """Tickers with a poller in this process."""
+    return sorted(_pollers)
+
+
+async def latest_quote(ticker):
+    """The last quote published for a ticker by any process, or None."""
+    return await cache.aget(_latest_key(ticker))
+
+
+def _serializable(quote):
+    # Channel layers serialize messages (msgpack with Redis); Alpaca timestamps are datetimes
+    return {key: value.isoformat() if hasattr(value, 'isoformat') else value for key, value in quote.items()}
+
+
+async def _hold_lease(ticker):
+    key = _lease_key(ticker)
+    if await cache.aadd(key, _owner, _lease_seconds()):
+        return True
+    if await cache.aget(key) == _owner:
+        await cache.atouch(key, _lease_seconds())
+        return True
+    return False
+
+
+async def _release_lease(ticker):
+    key = _lease_key(ticker)
+    if await cache.aget(key) == _owner:
+        await cache.adelete(key)
+
+
+async def _fetch(ticker, tradable):
+    quote = await call_upstream(get_latest_quote, ticker)
+    if quote is None:
+        quote = {'ticker': ticker, 'status': 'error', 'error_message': f"No quote data found for {ticker}."}
+    return {**_serializable(quote), 'tradable': tradable}
+
+
+async def _poll(ticker):
+    layer = get_channel_layer()
+    previous = None
+    tradable = None
+    try:
+        while True:
+            try:
+                if await _hold_lease(ticker):
+                    if tradable is None:
+                        tradable = await call_upstream(is_tradable, ticker)
+                    quote = await _fetch(ticker, tradable)
+                    await cache.aset(_latest_key(ticker), quote, _lease_seconds())
+                    if previous is None or any(quote.get(f) != previous.get(f) for f in QUOTE_FIELDS):
+                        previous = quote
+                        await layer.group_send(quote_group(ticker), {'type': 'quote.update', 'quote': quote})
+            except UpstreamTimeout:
+                pass
+            except Exception:
+                logger.exception(f"Error polling quotes for {ticker}")
+            await asyncio.sleep(settings.QUOTE_POLL_INTERVAL_SECONDS)
+    finally:
+        await _release_lease(ticker)
@@ -0,0 +1,233 @@
+"""
+Content-addressed cache for backtest results.
+
+Backtest results are stored on disk under a key derived from everything that
+can change the outcome of a run:
+1. Ticker and date range
+2. Strategy class name and a hash of its source code, its module and the
+   engine modules (indicators, signals, vectorized engine, metrics)
+3. Strategy parameters, initial cash, commission and engine
+4. The ticker's data version (changes whenever its OHLCV data changes)
+
+Because the data version is part of the key, new or changed bars make old
+entries unreachable instead of requiring explicit invalidation; unreachable
+entries age out through size-based LRU eviction.
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import backtrader as bt
+from django.conf import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every entry when the stored result format changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# Modules whose code shapes a run besides the strategy's own module: signal
+# and indicator helpers, the vectorized engine and the metrics
+ENGINE_MODULES = (
+    'core.events', 'core.indicator_cache', 'core.performance', 'core.signals', 'core.strategies',
+    'core.vectorized',
+)
+
+
+def _source_digest(obj, fallback):
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        # Source unavailable (e.g. defined interactively); fall back to the name
+        source = fallback
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def engine_source_version():
+    """Hash of the source code of ``ENGINE_MODULES``."""
+    digest = hashlib.sha256()
+    for name in ENGINE_MODULES:
+        digest.update(_source_digest(importlib.import_module(name), name).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def strategy_source_version(strategy_class):
+    """
+    Hash of the code a strategy's results depend on.
+
+    Covers the modules defining the strategy class and its strategy base
+    classes (so indicators such as ``PriorRange`` next to them count too) and
+    the engine modules (``engine_source_version``). Editing any of them
+    changes the hash, so cached results produced by older code are never
+    returned.
+    """
+    digest = hashlib.sha256(engine_source_version().encode('utf-8'))
+    for klass in inspect.getmro(strategy_class):
+        if klass is bt.Strategy or not issubclass(klass, bt.Strategy):
+            break
+        name = f"{klass.__module__}.{klass.__qualname__}"
+        digest.update(name.encode('utf-8'))
+        module = inspect.getmodule(klass)
+        digest.update(_source_digest(module if module is not None else klass, name).encode('utf-8'))
+        digest.update(_source_digest(klass, name).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _key_value(value):
+    """Normalize a key component into a JSON-serializable value."""
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def make_cache_key(ticker, start_date, end_date, strategy_class, strategy_params,
+                   initial_cash, commission, data_version, engine='backtrader', options=None):
+    """
+    Build the content-addressed key for a backtest configuration.
+
+    ``options`` holds any further run settings that change the stored result
+    (e.g. ``{'low_memory': True}``); it is left out of the key when empty so
+    keys of plain runs stay stable.
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical configuration.
+    """
+    config = {
+        'format': CACHE_FORMAT_VERSION,
+        'ticker': ticker,
+        'start_date': _key_value(start_date),
+        'end_date': _key_value(end_date),
+        'strategy': f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+        'strategy_version': strategy_source_version(strategy_class),
+        'strategy_params': {k: _key_value(v) for k, v in sorted((strategy_params or {}).items())},
+        'initial_cash': float(initial_cash),
+        'commission': float(commission),
+        'engine': engine,
+        'data_version': data_version,
+    }
+    if options:
+        config['options'] = {k: _key_value(v) for k, v in sorted(options.items())}
+    canonical = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class BacktestResultCache:
+    """
+    File-based result cache shared by every process on the machine.
+
+    Each entry is a pickle file named after its key. Reads refresh the file's
+    modification time so that eviction removes the least recently used
+    entries once the cache grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = Path(directory or getattr(
+            settings, 'BACKTEST_CACHE_DIR', Path(settings.BASE_DIR) / '.cache' / 'backtests'
+        ))
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(
+            settings, 'BACKTEST_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES
+        )
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def get(self, key):
+        """Return the cached result for ``key`` or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                result = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable backtest cache entry {key}: {e}")
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return result
+
+    def set(self, key, result):
+        """Store ``result`` under ``key``. Returns True if it was written."""
+        path = self._path(key)
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Backtest result for cache key {key} is not picklable: {e}")
+            return False
+        if len(payload) > self.max_bytes:
+            logger.info(f"Backtest result for cache key {key} exceeds cache size; not cached")
+            return False
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename so readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write backtest cache entry {key}: {e}")
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        total = 0
+        for path in self.directory.glob('*/*.pkl'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        logger.info(f"Evicted {removed} backtest cache entries")
+        return removed
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for path in self.directory.glob('*/*.pkl'):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def get_result_cache():
+    """Return a cache instance configured from Django settings."""
+    return BacktestResultCache()
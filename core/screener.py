@@ -0,0 +1,373 @@
+"""
+Universe-wide Classic Breakout screener.
+
+Answers "which tickers triggered a Classic Breakout entry signal on the
+latest bar?" for every ticker in ``OHLCVData`` at once, instead of running a
+backtest per symbol:
+1. The last ``bars`` rows of every ticker are loaded with a single query
+   (a ``RowNumber`` window partitioned by ticker, newest first), read
+   through the raw cursor so the database casts prices to floats instead
+   of Django converting 600k values one by one. The window only numbers
+   rows after a cutoff estimated from the ticker catalog (``_window_cutoff``),
+   so it doesn't sort every ticker's full history; tickers the cutoff cut
+   short (e.g. stale ones) are reloaded without it
+2. They are scattered into bars × tickers NumPy panels. Each column ends
+   with its ticker's latest bar, so tickers with gaps or different listing
+   dates don't leave holes in the rolling windows
+3. The consolidation range, volume MA and ATR of the latest bar are
+   computed for all columns at once, and the breakout, volume and ATR
+   conditions are evaluated as boolean vectors
+4. Candidates are ranked by how far they closed above their range, in ATRs,
+   and come with the strategy's suggested initial stop
+
+When the parameters match the persisted daily features (``core.features``,
+e.g. the strategy defaults), steps 1-3 are replaced by reading the last two
+feature rows and the latest bar of every ticker; the panels are only used
+if some ticker's features lag its bars.
+
+The panel ATR uses Backtrader's seeding from the first loaded bar. With
+``bars`` well above ``atr_period`` it matches the ATR of a full-history
+backtest (and the feature table) to within rounding.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+from django.db import connection
+from django.db.models import F, FloatField, Window
+from django.db.models.functions import Cast, RowNumber
+from django.utils import timezone
+
+from dashboard.models import DailyFeature, OHLCVData, TickerCatalog
+from core.features import FEATURE_COLUMNS
+from core.vectorized import breakout_params
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bars loaded per ticker by default
+DEFAULT_BARS = 200
+
+# Slack on the catalog's average bar spacing when estimating where a window starts
+CUTOFF_MARGIN = 1.5
+
+
+def _window_cutoff(rows, as_of, tickers):
+    """
+    Estimate where the last ``rows`` bars of the current tickers start, from the ticker catalog.
+
+    A ticker's window ends at its latest bar (or ``as_of``) and spans
+    ``rows`` times its average bar spacing, plus ``CUTOFF_MARGIN``. Stale
+    tickers, whose window ends before the others' start, don't move the
+    cutoff back; ``_last_rows`` reloads them.
+
+    Returns:
+        tuple: (cutoff datetime or None if nothing is catalogued,
+                dict of ticker -> first timestamp for the catalogued tickers)
+    """
+    catalog = TickerCatalog.objects.all()
+    if tickers is not None:
+        catalog = catalog.filter(ticker__in=tickers)
+    if as_of is not None:
+        catalog = catalog.filter(first_timestamp__lte=as_of)
+    windows, firsts = [], {}
+    for ticker, first, last, count in catalog.values_list('ticker', 'first_timestamp', 'last_timestamp', 'bars'):
+        firsts[ticker] = first
+        end = min(last, as_of) if as_of is not None else last
+        span = (last - first) / max(count - 1, 1) * rows * CUTOFF_MARGIN
+        windows.append((end - span, end))
+    if not windows:
+        return None, firsts
+    newest = max(end for _, end in windows)
+    return min(start for start, end in windows if end >= newest - (end - start)), firsts
+
+
+def _window_query(model, rows, as_of, tickers, since=None):
+    """Rows of a (ticker, timestamp) table numbered newest first per ticker, up to ``rows`` each."""
+    query = model.objects.all()
+    if tickers is not None:
+        query = query.filter(ticker__in=tickers)
+    if as_of is not None:
+        query = query.filter(timestamp__lte=as_of)
+    if since is not None:
+        query = query.filter(timestamp__gte=since)
+    return (
+        query.order_by()
+        .annotate(bar=Window(RowNumber(), partition_by=[F('ticker')], order_by=F('timestamp').desc()))
+        .filter(bar__lte=rows)
+    )
+
+
+def _last_rows(model, rows, as_of, tickers, fetch, bound):
+    """
+    The last ``rows`` rows of every ticker, as fetched by ``fetch`` (first value: the ticker).
+
+    The window is bounded by the ``_window_cutoff`` in ``bound``. Catalogued
+    tickers that come back with fewer rows but have older ones are fetched
+    again without the bound.
+    """
+    cutoff, firsts = bound
+    result = fetch(_window_query(model, rows, as_of, tickers, since=cutoff))
+    if cutoff is None:
+        return result
+    counts = Counter(row[0] for row in result)
+    short = sorted(ticker for ticker, first in firsts.items() if counts[ticker] < rows and first < cutoff)
+    if short:
+        logger.debug(f"Reloading {len(short)} ticker(s) cut short by the window cutoff")
+        reloaded = set(short)
+        result = [row for row in result if row[0] not in reloaded] + fetch(_window_query(model, rows, as_of, short))
+    return result
+
+
+def _fetch_floats(window):
+    """Fetch a window of bars through the raw cursor, with prices cast to floats by the database."""
+    sql, params = window.values_list(
+        'ticker', 'bar', Cast('high', FloatField()), Cast('low', FloatField()),
+        Cast('close', FloatField()), Cast('volume', FloatField())
+    ).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def load_panels(bars=DEFAULT_BARS, as_of=None, tickers=None):
+    """
+    Load the last ``bars`` bars of every ticker into bars × tickers panels.
+
+    Parameters:
+        bars (int): Bars per ticker, ending at each ticker's latest bar.
+        as_of (datetime): Optional; ignore bars after this timestamp.
+        tickers (list): Optional; only load these tickers.
+
+    Returns:
+        dict: 'tickers' (column labels), 'last_timestamp' (latest bar of each
+              column), and 'high', 'low', 'close', 'volume' float panels of
+              shape (bars, len(tickers)). Columns with fewer bars are padded
+              with NaN at the top. None if there is no data.
+    """
+    bound = _window_cutoff(bars, as_of, tickers)
+    rows = pd.DataFrame.from_records(_last_rows(OHLCVData, bars, as_of, tickers, _fetch_floats, bound),
+                                     columns=['ticker', 'bar', 'high', 'low', 'close', 'volume'])
+    if rows.empty:
+        return None
+
+    codes, labels = pd.factorize(rows['ticker'], sort=True)
+    # Row number 1 (the latest bar) goes to the last panel row
+    positions = bars - rows['bar'].to_numpy(dtype=int)
+    panels = {}
+    for name in ('high', 'low', 'close', 'volume'):
+        panel = np.full((bars, len(labels)), np.nan)
+        panel[positions, codes] = rows[name].to_numpy(dtype=float)
+        panels[name] = panel
+
+    latest = dict(_last_rows(OHLCVData, 1, as_of, tickers,
+                             lambda window: list(window.values_list('ticker', 'timestamp')), bound))
+    last_timestamp = np.array([latest[ticker] for ticker in labels], dtype=object)
+
+    return {'tickers': list(labels), 'last_timestamp': last_timestamp, **panels}
+
+
+def wilder_atr(high, low, close, period):
+    """
+    Average True Range of the last row of each panel column.
+
+    Each column is seeded with the simple average of its first ``period``
+    true ranges (after its leading NaNs) and then Wilder-smoothed, like
+    Backtrader's ``ATR``.
+
+    Returns:
+        np.ndarray: ATR per column; NaN where a column has too few bars.
+    """
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    true_range = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+    # The first bar of each column has no previous close
+    true_range[np.isnan(prev_close)] = np.nan
+
+    atr = np.full(close.shape[1], np.nan)
+    seen = np.zeros(close.shape[1], dtype=int)
+    total = np.zeros(close.shape[1])
+    for tr in true_range:
+        valid = ~np.isnan(tr)
+        seen += valid
+        seeding = valid & (seen <= period)
+        total[seeding] += tr[seeding]
+        seeded = seeding & (seen == period)
+        atr[seeded] = total[seeded] / period
+        smoothing = valid & (seen > period)
+        atr[smoothing] += (tr[smoothing] - atr[smoothing]) / period
+    return atr
+
+
+def _feature_window(model, fields, rows, as_of, tickers, bound):
+    """The last ``rows`` rows of every ticker from a (ticker, timestamp) table, newest first."""
+    return _last_rows(model, rows, as_of, tickers,
+                      lambda window: list(window.values_list('ticker', 'bar', 'timestamp', *fields)), bound)
+
+
+def load_feature_snapshot(strategy_params=None, as_of=None, tickers=None):
+    """
+    Latest-bar screening inputs of every ticker, read from the daily features.
+
+    The consolidation range is the previous bar's rolling highest/lowest;
+    the volume MA and ATR are the latest bar's.
+
+    Parameters:
+        strategy_params (dict): Optional ClassicBreakoutStrategy parameters.
+        as_of (datetime): Optional; ignore bars after this timestamp.
+        tickers (list): Optional; only load these tickers.
+
+    Returns:
+        dict: 'tickers', 'last_timestamp', then per ticker the latest 'close'
+              and 'volume', 'range_high', 'range_low', 'vol_ma', 'atr' and
+              'ready' (past every indicator's warm-up). None if the parameters
+              have no feature columns, there are no features, or some
+              ticker's features don't reach its latest bar.
+    """
+    p = breakout_params(strategy_params)
+    columns = (f"highest_{p['lookback']}", f"lowest_{p['lookback']}",
+               f"vol_ma_{p['volume_ma_period']}", f"atr_{p['atr_period']}")
+    if not set(columns) <= set(FEATURE_COLUMNS):
+        return None
+
+    bound = _window_cutoff(2, as_of, tickers)
+    features = _feature_window(DailyFeature, columns, 2, as_of, tickers, bound)
+    latest_bars = _feature_window(OHLCVData, ('close', 'volume'), 1, as_of, tickers, bound)
+    if not features:
+        return None
+
+    current = {row[0]: row for row in features if row[1] == 1}
+    previous = {row[0]: row for row in features if row[1] == 2}
+    labels = sorted(row[0] for row in latest_bars)
+    if any(ticker not in current or current[ticker][2] != ts for ticker, _, ts, *_ in latest_bars):
+        logger.info("Daily features lag the latest bars; screening from bar panels")
+        return None
+
+    def column(values):
+        return np.array([np.nan if value is None else float(value) for value in values])
+
+    bars = {row[0]: row for row in latest_bars}
+    empty = (None,) * 7
+    snapshot = {
+        'tickers': labels,
+        'last_timestamp': np.array([bars[ticker][2] for ticker in labels], dtype=object),
+        'close': column(bars[ticker][3] for ticker in labels),
+        'volume': column(bars[ticker][4] for ticker in labels),
+        'range_high': column(previous.get(ticker, empty)[3] for ticker in labels),
+        'range_low': column(previous.get(ticker, empty)[4] for ticker in labels),
+        'vol_ma': column(current[ticker][5] for ticker in labels),
+        'atr': column(current[ticker][6] for ticker in labels),
+    }
+    # Every indicator is past its warm-up
+    snapshot['ready'] = ~np.isnan(np.vstack([snapshot[name] for name in ('range_high', 'vol_ma', 'atr')])).any(axis=0)
+    return snapshot
+
+
+def _panel_snapshot(bars, p, as_of, tickers):
+    """Latest-bar screening inputs of every ticker, computed from bar panels."""
+    panels = load_panels(bars, as_of, tickers)
+    if panels is None:
+        return None
+    high, low, close, volume = panels['high'], panels['low'], panels['close'], panels['volume']
+
+    # Enough history for every indicator (leading NaNs are missing bars)
+    valid_bars = np.count_nonzero(~np.isnan(close), axis=0)
+    with np.errstate(invalid='ignore'):
+        return {
+            'tickers': panels['tickers'],
+            'last_timestamp': panels['last_timestamp'],
+            'close': close[-1],
+            'volume': volume[-1],
+            'range_high': np.max(high[-p['lookback'] - 1:-1], axis=0),
+            'range_low': np.min(low[-p['lookback'] - 1:-1], axis=0),
+            'vol_ma': np.mean(volume[-p['volume_ma_period']:], axis=0),
+            'atr': wilder_atr(high, low, close, p['atr_period']),
+            'ready': valid_bars > max(p['lookback'], p['atr_period'], p['volume_ma_period'] - 1),
+        }
+
+
+def screen_breakouts(bars=DEFAULT_BARS, strategy_params=None, as_of=None, tickers=None,
+                     include_stale=False, limit=None, use_features=True):
+    """
+    Find tickers whose latest bar is a Classic Breakout entry signal.
+
+    Parameters:
+        bars (int): Bars loaded per ticker (must cover the lookback and ATR warm-up).
+        strategy_params (dict): Optional ClassicBreakoutStrategy parameters.
+        as_of (datetime or date): Screen as of this date (default: latest data).
+        tickers (list): Optional; only screen these tickers.
+        include_stale (bool): Also report tickers whose latest bar is older
+                              than the newest bar in the universe.
+        limit (int): Optional; return at most this many candidates.
+        use_features (bool): Read the indicators from the daily features when
+                             the parameters match them.
+
+    Returns:
+        dict: 'as_of' (ISO date of the newest bar screened), 'scanned' (tickers
+              evaluated), 'params', 'source' ('features' or 'bars') and
+              'candidates' (ranked list of dicts with ticker, date, close,
+              range_high, range_low, volume, vol_ma, volume_ratio, atr,
+              strength (ATRs above the range), stop and risk_per_share).
+    """
+    p = breakout_params(strategy_params)
+    bars = max(int(bars), p['lookback'] + 1, p['volume_ma_period'], p['atr_period'] + 1)
+    if as_of is not None and not isinstance(as_of, datetime):
+        as_of = timezone.make_aware(datetime.combine(as_of, time.max))
+
+    snapshot = load_feature_snapshot(p, as_of, tickers) if use_features else None
+    source = 'features'
+    if snapshot is None:
+        snapshot = _panel_snapshot(bars, p, as_of, tickers)
+        source = 'bars'
+    if snapshot is None:
+        return {'as_of': None, 'scanned': 0, 'params': p, 'source': None, 'candidates': []}
+
+    last_close, last_volume = snapshot['close'], snapshot['volume']
+    range_high, range_low = snapshot['range_high'], snapshot['range_low']
+    vol_ma, atr = snapshot['vol_ma'], snapshot['atr']
+    ready = snapshot['ready']
+
+    last_timestamp = snapshot['last_timestamp']
+    newest = max(last_timestamp)
+    if not include_stale:
+        ready &= np.array([ts.date() == newest.date() for ts in last_timestamp])
+
+    with np.errstate(invalid='ignore'):
+        breakout = last_close > range_high
+        volume_confirmed = last_volume > vol_ma * p['volume_mult']
+        atr_valid = atr > 0
+    hits = np.flatnonzero(ready & breakout & volume_confirmed & atr_valid)
+
+    strength = (last_close[hits] - range_high[hits]) / atr[hits]
+    order = hits[np.argsort(-strength, kind='stable')]
+    if limit:
+        order = order[:limit]
+
+    candidates = []
+    for rank, col in enumerate(order, start=1):
+        stop = last_close[col] - atr[col] * p['initial_stop_atr_mult']
+        candidates.append({
+            'rank': rank,
+            'ticker': snapshot['tickers'][col],
+            'date': last_timestamp[col].date().isoformat(),
+            'close': float(last_close[col]),
+            'range_high': float(range_high[col]),
+            'range_low': float(range_low[col]),
+            'volume': float(last_volume[col]),
+            'vol_ma': float(vol_ma[col]),
+            'volume_ratio': float(last_volume[col] / vol_ma[col]),
+            'atr': float(atr[col]),
+            'strength': float((last_close[col] - range_high[col]) / atr[col]),
+            'stop': float(stop),
+            'risk_per_share': float(last_close[col] - stop),
+        })
+
+    logger.info(f"Screened {int(ready.sum())} tickers as of {newest.date()}: {len(candidates)} breakout(s)")
+    return {
+        'as_of': newest.date().isoformat(),
+        'scanned': int(ready.sum()),
+        'params': p,
+        'source': source,
+        'candidates': candidates,
+    }
@@ -0,0 +1,154 @@
+"""
+Precomputed breakout signals for Backtrader runs.
+
+``ClassicBreakoutStrategy`` normally builds its consolidation range, volume
+MA and ATR as Backtrader indicators and evaluates the breakout condition bar
+by bar in Python. This module moves that work into one pandas/NumPy pass:
+1. ``compute_signals`` calculates the range, volume MA, ATR and the breakout
+   boolean over the whole series (using the vectorized engine's functions,
+   so values match the Backtrader indicators)
+2. ``SignalData`` is a ``PandasData`` feed with the signal columns as extra
+   lines; when the strategy runs on it, ``next`` only reads those lines
+3. ``get_signals`` takes the indicator arrays from the shared indicator
+   cache (``core.indicator_cache``), so parameter sweeps that only vary the
+   stop multipliers compute them once
+"""
+import logging
+
+import backtrader as bt
+import pandas as pd
+
+from core.indicator_cache import breakout_indicators
+from core.vectorized import (
+    breakout_params, breakout_signals, compute_breakout_indicators, first_tradable_bar,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Extra lines of SignalData, in column order
+SIGNAL_COLUMNS = ('range_high', 'range_low', 'vol_ma', 'atr', 'breakout')
+
+
+def compute_signals(data, params=None, indicators=None):
+    """
+    Compute the Classic Breakout indicator and signal columns for a whole series.
+
+    Parameters:
+        data (pd.DataFrame): OHLCV data indexed by timestamp.
+        params (dict): Strategy parameters (defaults from ClassicBreakoutStrategy).
+        indicators (dict): Optional precomputed indicator arrays (see
+                           ``core.indicator_cache.breakout_indicators``).
+
+    Returns:
+        pd.DataFrame: Columns ``SIGNAL_COLUMNS`` on the same index; 'breakout'
+                      is 1.0 on bars that close above the consolidation range
+                      with volume confirmation and 0.0 elsewhere (including
+                      the indicator warm-up).
+    """
+    p = breakout_params(params)
+    close = data['close'].to_numpy(dtype=float)
+    volume = data['volume'].to_numpy(dtype=float)
+    if indicators is None:
+        indicators = compute_breakout_indicators(
+            data['high'].to_numpy(dtype=float), data['low'].to_numpy(dtype=float), volume, close, p)
+
+    signals = breakout_signals(close, volume, indicators['range_high'], indicators['vol_ma'],
+                               p['volume_mult'], first_tradable_bar(p))
+    return pd.DataFrame({
+        'range_high': indicators['range_high'],
+        'range_low': indicators['range_low'],
+        'vol_ma': indicators['vol_ma'],
+        'atr': indicators['atr'],
+        'breakout': signals.astype(float),
+    }, index=data.index)
+
+
+def get_signals(data, params=None, ticker=None, data_version=None, start_date=None, end_date=None,
+                cache=None, features=None):
+    """
+    Signal columns for ``data``, built from cached indicator arrays.
+
+    The indicator cache is only used when both ``ticker`` and
+    ``data_version`` are given; otherwise everything is computed directly.
+
+    Parameters:
+        data (pd.DataFrame): OHLCV data indexed by timestamp.
+        params (dict): Strategy parameters.
+        ticker (str): Ticker the data belongs to.
+        data_version (str): ``get_data_version`` of the data's range.
+        start_date (datetime): Start of the loaded range.
+        end_date (datetime): End of the loaded range.
+        cache (IndicatorCache): Optional cache (default: ``get_indicator_cache()``).
+        features (pd.DataFrame): Optional daily features aligned with ``data``.
+
+    Returns:
+        pd.DataFrame: See ``compute_signals``.
+    """
+    indicators = breakout_indicators(data, params, ticker=ticker, data_version=data_version,
+                                     start_date=start_date, end_date=end_date, cache=cache,
+                                     features=features)
+    return compute_signals(data, params, indicators=indicators)
+
+
+class SignalData(bt.feeds.PandasData):
+    """
+    ``PandasData`` feed carrying precomputed signal columns as extra lines.
+
+    Columns are matched by name (see ``SIGNAL_COLUMNS``). Rows are loaded
+    from column lists extracted once in ``start`` rather than with
+    ``PandasData``'s per-value ``iloc`` lookups, which would otherwise cost
+    more than the indicators the extra lines replace.
+    """
+    lines = SIGNAL_COLUMNS
+    params = tuple((column, -1) for column in SIGNAL_COLUMNS)
+
+    def start(self):
+        super().start()
+        df = self.p.dataname
+        self._rows = len(df)
+        self._fields = [
+            (getattr(self.lines, name), df.iloc[:, colindex].to_numpy(dtype=float).tolist())
+            for name in self.getlinealiases()
+            if name != 'datetime' and (colindex := self._colmapping.get(name)) is not None
+        ]
+        # make_signal_feed always indexes rows by timestamp
+        self._datetimes = [bt.date2num(ts.to_pydatetime()) for ts in df.index]
+
+    def _load(self):
+        self._idx += 1
+        if self._idx >= self._rows:
+            return False
+        for line, values in self._fields:
+            line[0] = values[self._idx]
+        self.lines.datetime[0] = self._datetimes[self._idx]
+        return True
+
+
+def make_signal_feed(data, signals):
+    """
+    Wrap OHLCV data and its signal columns in a ``SignalData`` feed.
+
+    Parameters:
+        data (pd.DataFrame): OHLCV data indexed by timestamp.
+        signals (pd.DataFrame): Output of ``compute_signals`` for ``data``.
+
+    Returns:
+        SignalData: Backtrader data feed
+    """
+    df = data[['open', 'high', 'low', 'close', 'volume']].join(signals[list(SIGNAL_COLUMNS)])
+    return SignalData(
+        dataname=df,
+        datetime=None,  # Index is already datetime
+        open='open',
+        high='high',
+        low='low',
+        close='close',
+        volume='volume',
+        openinterest=-1  # Not used
+    )
+
+
+def has_signal_lines(data):
+    """True if a Backtrader data feed carries precomputed signal lines."""
+    return 'breakout' in data.lines.getlinealiases()
@@ -3,20 +3,81 @@ Core strategies module defining trading strategies for backtesting.
 
 This module implements trading strategies using the Backtrader framework.
 Currently implements:
+- PriorRange: Indicator for the consolidation range (highest high and lowest
+  low of the previous bars) in O(1) per bar.
 - ClassicBreakoutStrategy: A strategy based on price consolidation breakouts
   with volume confirmation and ATR-based stop management.
+- PortfolioBreakoutStrategy: The same rules applied to every data feed of a
+  run, sharing one broker account with risk-based position sizing.
 """
+import array
 import logging
+from collections import deque
+
 import backtrader as bt
+import numpy as np
+import pandas as pd
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from core.events import (
+    EVENT_FILL, EVENT_ORDER, EVENT_SIGNAL, EVENT_STOP, EVENT_TRADE, SIDE_BUY, SIDE_SELL,
+    STOP_INITIAL, STOP_TRAIL, EventBuffer,
 )
+from core.profiling import phase
+from core.signals import has_signal_lines
+
+# Configure logging
 logger = logging.getLogger(__name__)
 
 
+class PriorRange(bt.Indicator):
+    """
+    Highest high and lowest low of the previous ``period`` bars.
+
+    The current bar is excluded and the window expands from the start of the
+    data until ``period`` bars are available, matching the consolidation
+    range of ``ClassicBreakoutStrategy``. ``next`` keeps monotonic deques
+    (amortized O(1) per bar, and only reads the previous bar, so it works
+    with bounded ``exactbars`` buffers); ``once`` computes the whole series
+    with rolling window operations in ``runonce`` mode.
+    """
+    lines = ('range_high', 'range_low')
+    params = (('period', 50),)
+
+    def __init__(self):
+        # Needs at least one previous bar
+        self.addminperiod(2)
+        self._highs = deque()  # (bar index, high), highs decreasing
+        self._lows = deque()  # (bar index, low), lows increasing
+
+    def next(self):
+        index = len(self) - 1
+        high, low = self.data.high[-1], self.data.low[-1]
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((index - 1, high))
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((index - 1, low))
+
+        oldest = index - self.p.period
+        while self._highs[0][0] < oldest:
+            self._highs.popleft()
+        while self._lows[0][0] < oldest:
+            self._lows.popleft()
+
+        self.lines.range_high[0] = self._highs[0][1]
+        self.lines.range_low[0] = self._lows[0][1]
+
+    def once(self, start, end):
+        window = self.p.period
+        highs = pd.Series(np.asarray(self.data.high.array[:end])).shift(1)
+        lows = pd.Series(np.asarray(self.data.low.array[:end])).shift(1)
+        range_high = highs.rolling(window, min_periods=1).max().to_numpy()
+        range_low = lows.rolling(window, min_periods=1).min().to_numpy()
+        self.lines.range_high.array[start:end] = array.array('d', range_high[start:end])
+        self.lines.range_low.array[start:end] = array.array('d', range_low[start:end])
+
+
 class ClassicBreakoutStrategy(bt.Strategy):
     """
     Classic Breakout Strategy
@@ -31,6 +92,14 @@ class ClassicBreakoutStrategy(bt.Strategy):
     3. Enter on the next bar after a confirmed breakout
     4. Set initial stop-loss based on ATR
     5. Trail stop using Chandelier Exit mechanism
+
+    On a ``core.signals.SignalData`` feed the range, volume MA, ATR and
+    breakout condition are read from precomputed lines instead of being
+    computed by indicators.
+
+    Signals, fills, stop updates and closed trades are recorded in
+    ``self.events`` (``core.events.EventBuffer``); they are also logged as
+    text only when the strategy is created with ``verbose=True``.
     """
 
     params = (
@@ -40,12 +109,14 @@ class ClassicBreakoutStrategy(bt.Strategy):
         ('atr_period', 14),  # Period for ATR calculation
         ('initial_stop_atr_mult', 2.0),  # Initial stop = Entry - (ATR * this value)
         ('trail_stop_atr_mult', 3.0),  # Trailing stop = Highest High - (ATR * this value)
+        ('verbose', False),  # Also log events as text
     )
 
     def log(self, txt, dt=None):
         """Logger for the strategy."""
-        dt = dt or self.datas[0].datetime.date(0)
-        logger.info(f'{dt.isoformat()} - {txt}')
+        with phase('strategy_logging'):
+            dt = dt or self.datas[0].datetime.date(0)
+            logger.info(f'{dt.isoformat()} - {txt}')
 
     def __init__(self):
         """Initialize strategy components."""
@@ -57,8 +128,18 @@ class ClassicBreakoutStrategy(bt.Strategy):
         self.datavolume = self.datas[0].volume
 
         # Indicators
-        self.atr = bt.indicators.ATR(self.datas[0], period=self.p.atr_period)
-        self.vol_ma = bt.indicators.SMA(self.datavolume, period=self.p.volume_ma_period)
+        if has_signal_lines(self.datas[0]):
+            # Computed over the whole series up front (core.signals)
+            self.atr = self.datas[0].atr
+            self.vol_ma = self.datas[0].vol_ma
+            self.range = self.datas[0]  # range_high / range_low lines
+            self.breakout = self.datas[0].breakout
+        else:
+            with phase('indicator_setup'):
+                self.atr = bt.indicators.ATR(self.datas[0], period=self.p.atr_period)
+                self.vol_ma = bt.indicators.SMA(self.datavolume, period=self.p.volume_ma_period)
+                self.range = PriorRange(self.datas[0], period=self.p.lookback)
+            self.breakout = None
 
         # Trade management
         self.order = None  # Current pending order
@@ -67,25 +148,35 @@ class ClassicBreakoutStrategy(bt.Strategy):
         self.highest_high_since_entry = None  # Highest high since we entered
         self.trailing_stop_price = None  # Current trailing stop price
 
+        # Event recording
+        self.events = EventBuffer([data._name for data in self.datas])
+
     def notify_order(self, order):
         """Handle order notifications."""
         if order.status in [order.Submitted, order.Accepted]:
             # Order just submitted/accepted - no action required
             return
 
+        dt = self.datetime[0]
         # Check if an order has been completed
         if order.status in [order.Completed]:
+            side = SIDE_BUY if order.isbuy() else SIDE_SELL
+            self.events.record(EVENT_FILL, dt, side=side, price=order.executed.price,
+                               size=order.executed.size, commission=order.executed.comm)
             if order.isbuy():
-                self.log(f'BUY EXECUTED, Price: {order.executed.price:.2f}')
                 # Record entry details
                 self.entry_price = order.executed.price
                 self.highest_high_since_entry = self.datahigh[0]
                 # Set initial stop loss
                 self.initial_stop_price = self.entry_price - (self.atr[0] * self.p.initial_stop_atr_mult)
                 self.trailing_stop_price = self.initial_stop_price
-                self.log(f'INITIAL STOP SET AT: {self.initial_stop_price:.2f}')
+                self.events.record(EVENT_STOP, dt, price=self.initial_stop_price, status=STOP_INITIAL)
+                if self.p.verbose:
+                    self.log(f'BUY EXECUTED, Price: {order.executed.price:.2f}')
+                    self.log(f'INITIAL STOP SET AT: {self.initial_stop_price:.2f}')
             else:  # Sell
-                self.log(f'SELL EXECUTED, Price: {order.executed.price:.2f}')
+                if self.p.verbose:
+                    self.log(f'SELL EXECUTED, Price: {order.executed.price:.2f}')
                 # Reset entry tracking variables
                 self.entry_price = None
                 self.highest_high_since_entry = None
@@ -93,7 +184,10 @@ class ClassicBreakoutStrategy(bt.Strategy):
                 self.trailing_stop_price = None
 
         elif order.status in [order.Canceled, order.Margin, order.Rejected]:
-            self.log(f'Order Canceled/Margin/Rejected: {order.status}')
+            self.events.record(EVENT_ORDER, dt, side=SIDE_BUY if order.isbuy() else SIDE_SELL,
+                               status=order.status)
+            if self.p.verbose:
+                self.log(f'Order Canceled/Margin/Rejected: {order.status}')
 
         # Reset order reference
         self.order = None
@@ -103,7 +197,10 @@ class ClassicBreakoutStrategy(bt.Strategy):
         if not trade.isclosed:
             return
 
-        self.log(f'TRADE CLOSED - Profit: {trade.pnl:.2f}, Net: {trade.pnlcomm:.2f}')
+        self.events.record(EVENT_TRADE, self.datetime[0], value=trade.pnl,
+                           commission=trade.commission, bars=trade.barlen)
+        if self.p.verbose:
+            self.log(f'TRADE CLOSED - Profit: {trade.pnl:.2f}, Net: {trade.pnlcomm:.2f}')
 
     def next(self):
         """Main strategy logic executed on each bar."""
@@ -114,20 +211,25 @@ class ClassicBreakoutStrategy(bt.Strategy):
         # Check if we are in a position
         if not self.position:
             # No position - check for entry signals
+            if self.breakout is not None:
+                # Precomputed breakout with volume confirmation
+                signal = self.breakout[0] > 0
+            else:
+                # 1. Consolidation range of the previous `lookback` bars
+                high_range = self.range.range_high[0]
 
-            # 1. Identify consolidation range
-            high_range = max([self.datahigh[-i] for i in range(1, min(self.p.lookback + 1, len(self)))])
-            low_range = min([self.datalow[-i] for i in range(1, min(self.p.lookback + 1, len(self)))])
-
-            # 2. Check for a breakout with volume confirmation
-            # Breakout is when price closes above the recent high range
-            breakout_up = self.dataclose[0] > high_range
-            # Confirm with volume
-            volume_confirmed = self.datavolume[0] > (self.vol_ma[0] * self.p.volume_mult)
+                # 2. Check for a breakout with volume confirmation
+                # Breakout is when price closes above the recent high range
+                breakout_up = self.dataclose[0] > high_range
+                # Confirm with volume
+                volume_confirmed = self.datavolume[0] > (self.vol_ma[0] * self.p.volume_mult)
+                signal = breakout_up and volume_confirmed
 
             # 3. If breakout is confirmed, generate buy signal for next bar
-            if breakout_up and volume_confirmed:
-                self.log('BUY SIGNAL - Breakout Confirmed')
+            if signal:
+                self.events.record(EVENT_SIGNAL, self.datetime[0], side=SIDE_BUY, price=self.dataclose[0])
+                if self.p.verbose:
+                    self.log('BUY SIGNAL - Breakout Confirmed')
                 # Execute buy order with next bar market order
                 self.order = self.buy()
         else:
@@ -141,10 +243,222 @@ class ClassicBreakoutStrategy(bt.Strategy):
                 # Only raise the stop, never lower it
                 if new_stop > self.trailing_stop_price:
                     self.trailing_stop_price = new_stop
-                    self.log(f'TRAILING STOP RAISED TO: {self.trailing_stop_price:.2f}')
+                    self.events.record(EVENT_STOP, self.datetime[0], price=new_stop, status=STOP_TRAIL)
+                    if self.p.verbose:
+                        self.log(f'TRAILING STOP RAISED TO: {self.trailing_stop_price:.2f}')
 
             # Check if stop is hit
             if self.dataclose[0] < self.trailing_stop_price:
-                self.log('SELL SIGNAL - Trailing Stop Hit')
+                self.events.record(EVENT_SIGNAL, self.datetime[0], side=SIDE_SELL, price=self.dataclose[0])
+                if self.p.verbose:
+                    self.log('SELL SIGNAL - Trailing Stop Hit')
                 # Execute sell order
                 self.order = self.sell()
+
+
+class PortfolioBreakoutStrategy(bt.Strategy):
+    """
+    Portfolio Breakout Strategy
+
+    Applies the Classic Breakout rules to every data feed added to Cerebro,
+    all trading from one shared cash balance. Each data has its own ATR and
+    volume MA (created once in ``__init__``, or read from precomputed lines
+    on ``core.signals.SignalData`` feeds) and its own trade state, so the
+    per-bar work grows linearly with the number of symbols.
+
+    Position sizing:
+    1. Each entry risks ``risk_per_trade`` of the portfolio value, i.e. the
+       size is chosen so a hit on the initial ATR stop loses that amount
+    2. Entries are skipped while the open risk of all positions would exceed
+       ``max_portfolio_risk`` of the portfolio value, or cash is insufficient
+    3. Cash committed to entries submitted but not yet filled (e.g. earlier
+       on the same bar) is not available to size later entries
+    """
+
+    params = ClassicBreakoutStrategy.params._gettuple() + (
+        ('risk_per_trade', 0.01),  # Fraction of portfolio value risked per trade
+        ('max_portfolio_risk', 0.06),  # Cap on the summed initial risk of open positions
+    )
+
+    def log(self, txt, dt=None):
+        """Logger for the strategy."""
+        with phase('strategy_logging'):
+            dt = dt or self.datetime.date(0)
+            logger.info(f'{dt.isoformat()} - {txt}')
+
+    def __init__(self):
+        """Initialize per-data indicators and trade state."""
+        self.indicators = {}
+        self.trade_state = {}
+        for data in self.datas:
+            if has_signal_lines(data):
+                # Computed over the whole series up front (core.signals)
+                self.indicators[data] = {
+                    'atr': data.atr,
+                    'vol_ma': data.vol_ma,
+                    'range': data,
+                    'breakout': data.breakout,
+                }
+            else:
+                with phase('indicator_setup'):
+                    self.indicators[data] = {
+                        'atr': bt.indicators.ATR(data, period=self.p.atr_period),
+                        'vol_ma': bt.indicators.SMA(data.volume, period=self.p.volume_ma_period),
+                        'range': PriorRange(data, period=self.p.lookback),
+                        'breakout': None,
+                    }
+            self.trade_state[data] = {
+                'order': None,  # Pending order
+                'entry_price': None,
+                'initial_stop_price': None,
+                'highest_high_since_entry': None,
+                'trailing_stop_price': None,
+                'risk': 0.0,  # Initial risk (currency) of the position or pending entry
+                'committed': 0.0,  # Estimated cost of the pending entry
+                'seen': 0,  # Length of the data when last processed
+            }
+        # Bars each data needs before its indicators produce values
+        self.warmup = max(self.p.atr_period + 1, self.p.volume_ma_period)
+
+        # Event recording; events reference data feeds by index
+        self.events = EventBuffer([data._name for data in self.datas])
+        self.data_index = {data: i for i, data in enumerate(self.datas)}
+
+    def initial_stop_for(self, data):
+        """Initial stop price of the position in ``data`` (used for R-multiples)."""
+        return self.trade_state[data]['initial_stop_price']
+
+    def open_risk(self):
+        """Summed initial risk of open positions and pending entries."""
+        return sum(state['risk'] for state in self.trade_state.values())
+
+    def committed_cash(self):
+        """Estimated cost of pending entries, which the broker hasn't taken from cash yet."""
+        return sum(state['committed'] for state in self.trade_state.values())
+
+    def notify_order(self, order):
+        """Handle order notifications for any data."""
+        if order.status in [order.Submitted, order.Accepted]:
+            return
+
+        data = order.data
+        state = self.trade_state[data]
+        index = self.data_index[data]
+        dt = self.datetime[0]
+        if order.status in [order.Completed]:
+            side = SIDE_BUY if order.isbuy() else SIDE_SELL
+            self.events.record(EVENT_FILL, dt, data=index, side=side, price=order.executed.price,
+                               size=order.executed.size, commission=order.executed.comm)
+            if order.isbuy():
+                atr = self.indicators[data]['atr'][0]
+                state['entry_price'] = order.executed.price
+                state['highest_high_since_entry'] = data.high[0]
+                state['initial_stop_price'] = state['entry_price'] - atr * self.p.initial_stop_atr_mult
+                state['trailing_stop_price'] = state['initial_stop_price']
+                state['risk'] = (state['entry_price'] - state['initial_stop_price']) * order.executed.size
+                self.events.record(EVENT_STOP, dt, data=index, price=state['initial_stop_price'],
+                                   status=STOP_INITIAL)
+                if self.p.verbose:
+                    self.log(f'{data._name} BUY EXECUTED, Size: {order.executed.size}, '
+                             f'Price: {order.executed.price:.2f}')
+            else:
+                if self.p.verbose:
+                    self.log(f'{data._name} SELL EXECUTED, Price: {order.executed.price:.2f}')
+                state.update(entry_price=None, initial_stop_price=None,
+                             highest_high_since_entry=None, trailing_stop_price=None, risk=0.0)
+
+        elif order.status in [order.Canceled, order.Margin, order.Rejected]:
+            self.events.record(EVENT_ORDER, dt, data=index, side=SIDE_BUY if order.isbuy() else SIDE_SELL,
+                               status=order.status)
+            if self.p.verbose:
+                self.log(f'{data._name} Order Canceled/Margin/Rejected: {order.status}')
+            if order.isbuy():
+                state['risk'] = 0.0
+
+        if order.isbuy():
+            state['committed'] = 0.0
+        state['order'] = None
+
+    def notify_trade(self, trade):
+        """Handle trade notifications."""
+        if not trade.isclosed:
+            return
+
+        self.events.record(EVENT_TRADE, self.datetime[0], data=self.data_index[trade.data], value=trade.pnl,
+                           commission=trade.commission, bars=trade.barlen)
+        if self.p.verbose:
+            self.log(f'{trade.data._name} TRADE CLOSED - Profit: {trade.pnl:.2f}, Net: {trade.pnlcomm:.2f}')
+
+    def prenext(self):
+        # Data feeds can start on different dates; trade each one as soon as
+        # its own indicators are ready
+        self.next()
+
+    def next(self):
+        """Apply the breakout rules to every data with a new bar."""
+        for data in self.datas:
+            state = self.trade_state[data]
+            length = len(data)
+            if length == state['seen'] or length < self.warmup:
+                # No new bar for this data (other calendars) or still warming up
+                state['seen'] = length
+                continue
+            state['seen'] = length
+            if state['order']:
+                continue
+
+            if self.getposition(data).size:
+                self._manage_position(data, state)
+            else:
+                self._check_entry(data, state)
+
+    def _check_entry(self, data, state):
+        """Enter on a consolidation breakout with volume confirmation."""
+        breakout = self.indicators[data]['breakout']
+        if breakout is not None:
+            if not breakout[0] > 0:
+                return
+        else:
+            breakout_up = data.close[0] > self.indicators[data]['range'].range_high[0]
+            volume_confirmed = data.volume[0] > self.indicators[data]['vol_ma'][0] * self.p.volume_mult
+            if not (breakout_up and volume_confirmed):
+                return
+
+        stop_distance = self.indicators[data]['atr'][0] * self.p.initial_stop_atr_mult
+        if stop_distance <= 0:
+            return
+        value = self.broker.getvalue()
+        size = int(value * self.p.risk_per_trade / stop_distance)
+        # The order fills at the next open; leave headroom for gaps and commission
+        # (once for all pending entries, whose cost the broker hasn't deducted yet)
+        available = self.broker.getcash() * 0.95 - self.committed_cash()
+        size = min(size, int(available / data.close[0]))
+        risk = size * stop_distance
+        if size < 1 or self.open_risk() + risk > value * self.p.max_portfolio_risk:
+            return
+
+        self.events.record(EVENT_SIGNAL, self.datetime[0], data=self.data_index[data], side=SIDE_BUY,
+                           price=data.close[0])
+        if self.p.verbose:
+            self.log(f'{data._name} BUY SIGNAL - Breakout Confirmed, Size: {size}')
+        state['risk'] = risk
+        state['committed'] = size * data.close[0]
+        state['order'] = self.buy(data=data, size=size)
+
+    def _manage_position(self, data, state):
+        """Trail the Chandelier stop and exit when it is hit."""
+        if data.high[0] > state['highest_high_since_entry']:
+            state['highest_high_since_entry'] = data.high[0]
+            new_stop = state['highest_high_since_entry'] - (
+                self.indicators[data]['atr'][0] * self.p.trail_stop_atr_mult)
+            if new_stop > state['trailing_stop_price']:
+                state['trailing_stop_price'] = new_stop
+                self.events.record(EVENT_STOP, self.datetime[0], data=self.data_index[data], price=new_stop,
+                                   status=STOP_TRAIL)
+
+        if data.close[0] < state['trailing_stop_price']:
+            self.events.record(EVENT_SIGNAL, self.datetime[0], data=self.data_index[data], side=SIDE_SELL,
+                               price=data.close[0])
+            if self.p.verbose:
+                self.log(f'{data._name} SELL SIGNAL - Trailing Stop Hit')
+            state['order'] = self.close(data=data)
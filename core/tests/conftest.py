@@ -0,0 +1,14 @@
+"""
+Shared fixtures for core tests
+"""
+import pytest
+
+from core.indicator_cache import IndicatorCache
+
+
+@pytest.fixture(autouse=True)
+def indicator_cache(tmp_path, monkeypatch):
+    """Give every test an empty indicator cache instead of the process-wide one."""
+    cache = IndicatorCache(directory=tmp_path / 'indicators')
+    monkeypatch.setattr('core.indicator_cache._indicator_cache', cache)
+    return cache
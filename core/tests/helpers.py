@@ -0,0 +1,131 @@
+"""
+Shared fixture builders and helpers for core and dashboard tests
+"""
+from datetime import timezone
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import backtrader as bt
+
+from core.indicator_cache import INDICATORS
+from core.strategies import ClassicBreakoutStrategy
+from core.vectorized import average_true_range, simple_moving_average
+from dashboard.models import OHLCVData
+
+PARITY_PARAMS = [
+    {},
+    {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10},
+    {'lookback': 30, 'initial_stop_atr_mult': 1.0, 'trail_stop_atr_mult': 1.5},
+]
+
+
+def make_ohlcv(seed, bars=600):
+    """Random-walk OHLCV fixture with enough breakouts to trade."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, bars)))
+    open_ = close * (1 + rng.normal(0, 0.004, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, bars)))
+    volume = rng.lognormal(10, 0.5, bars)
+    index = pd.date_range('2015-01-01', periods=bars, freq='B')
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=index
+    )
+
+
+def saved_bars(df):
+    """Fixture rows as stored by save_ohlcv_data (rounded like the Decimal fields)."""
+    return df.round({'open': 4, 'high': 4, 'low': 4, 'close': 4}).assign(volume=df['volume'].astype(int))
+
+
+def store_bars(df, ticker='INCR'):
+    """Store fixture rows as OHLCVData."""
+    OHLCVData.objects.bulk_create([
+        OHLCVData(
+            ticker=ticker, timestamp=ts.to_pydatetime().replace(tzinfo=timezone.utc),
+            open=round(row.open, 4), high=round(row.high, 4), low=round(row.low, 4),
+            close=round(row.close, 4), volume=int(row.volume),
+        )
+        for ts, row in df.iterrows()
+    ])
+
+
+def force_breakout(df, when, size=1.0):
+    """Make the bar at ``when`` close above the prior 20-bar high on heavy volume."""
+    i = df.index.get_loc(pd.Timestamp(when))
+    prior_high = df['high'].iloc[max(i - 20, 0):i].max()
+    df.iloc[i, df.columns.get_loc('close')] = prior_high * (1 + 0.01 * size)
+    df.iloc[i, df.columns.get_loc('high')] = prior_high * (1 + 0.012 * size)
+    df.iloc[i, df.columns.get_loc('volume')] = df['volume'].iloc[i - 10:i].mean() * 3
+
+
+def expected_indicators(df):
+    """Full-history reference values for DEFAULT_INDICATORS."""
+    close, volume = df['close'].to_numpy(), df['volume'].to_numpy(dtype=float)
+    expected = {
+        'sma_10': simple_moving_average(close, 10),
+        'sma_20': simple_moving_average(close, 20),
+        'sma_50': simple_moving_average(close, 50),
+        'atr_14': average_true_range(df['high'], df['low'], close, 14),
+        'highest_50': df['high'].rolling(50).max().to_numpy(),
+        'lowest_50': df['low'].rolling(50).min().to_numpy(),
+        'vol_ma_20': simple_moving_average(volume, 20),
+    }
+    for period in (10, 20, 50):
+        seeded = df['close'].copy()
+        seeded.iloc[:period - 1] = np.nan
+        seeded.iloc[period - 1] = close[:period].mean()
+        expected[f'ema_{period}'] = seeded.iloc[period - 1:].ewm(span=period, adjust=False).mean().reindex(
+            df.index).to_numpy()
+    return expected
+
+
+class ClosedTradeRecorder(bt.Analyzer):
+    """Records (entry price, pnl, pnlcomm, bar length) of each closed trade."""
+
+    def start(self):
+        self.trades = []
+
+    def notify_trade(self, trade):
+        if trade.isclosed:
+            self.trades.append((trade.price, trade.pnl, trade.pnlcomm, trade.barlen))
+
+    def get_analysis(self):
+        return self.trades
+
+
+def run_backtrader(df, params):
+    """Run the Backtrader engine on a fixture with run_backtest's analyzers."""
+    cerebro = bt.Cerebro()
+    cerebro.addstrategy(ClassicBreakoutStrategy, **params)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(100000.0)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trade_analyzer')
+    cerebro.addanalyzer(bt.analyzers.SQN, _name='sqn')
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe', timeframe=bt.TimeFrame.Days)
+    cerebro.addanalyzer(ClosedTradeRecorder, _name='closed_trades')
+    with patch('logging.Logger.info'):
+        strategy = cerebro.run()[0]
+    return strategy, cerebro.broker.getvalue()
+
+
+def compute_counter():
+    """Patch the indicator functions with call-counting wrappers."""
+    wrapped = {name: (params, patch_fn(fn)) for name, (params, fn) in INDICATORS.items()}
+    return patch.dict('core.indicator_cache.INDICATORS', wrapped), wrapped
+
+
+def patch_fn(fn):
+    def counted(*args, **kwargs):
+        counted.calls += 1
+        return fn(*args, **kwargs)
+    counted.calls = 0
+    return counted
+
+
+def calls(wrapped):
+    return {name: fn.calls for name, (_, fn) in wrapped.items()}
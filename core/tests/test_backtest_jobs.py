@@ -0,0 +1,178 @@
+"""
+Tests for the background backtest job queue
+"""
+import pytest
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import backtrader as bt
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.backtest_jobs import (
+    backtest_kwargs, claim_next_job, enqueue_backtest, execute_job, requeue_stale_jobs,
+)
+from core.backtester import ProgressReporter
+from core.tests.helpers import make_ohlcv
+from dashboard.models import BacktestJob
+
+
+def make_config(**overrides):
+    config = {
+        'ticker': 'AAPL',
+        'start_date': '2023-01-01',
+        'end_date': '2023-12-31',
+        'initial_cash': 100000.0,
+        'commission': 0.001,
+        'engine': 'backtrader',
+        'strategy_params': {'lookback': 50},
+    }
+    config.update(overrides)
+    return config
+
+
+SUCCESS_RESULT = {
+    'success': True,
+    'analyzers': {
+        'trade_analyzer': {'total': {'closed': 4}, 'won': {'total': 3}, 'pnl': {'net': {'total': 800.0}}},
+        'sqn': {'sqn': 1.2},
+        'drawdown': {'max': {'drawdown': 5.5}},
+    },
+    'error': None,
+    'start_value': 100000.0,
+    'end_value': 100800.0,
+}
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    """Queueing and deduplication."""
+
+    def test_enqueue_creates_job(self):
+        job, created = enqueue_backtest(make_config())
+        assert created is True
+        assert job.status == BacktestJob.STATUS_QUEUED
+        assert job.ticker == 'AAPL'
+
+    def test_identical_in_flight_submission_is_deduplicated(self):
+        job, _ = enqueue_backtest(make_config())
+        again, created = enqueue_backtest(make_config())
+        assert created is False
+        assert again.pk == job.pk
+
+        other, created = enqueue_backtest(make_config(strategy_params={'lookback': 20}))
+        assert created is True
+        assert other.pk != job.pk
+
+    def test_finished_job_is_not_reused(self):
+        job, _ = enqueue_backtest(make_config())
+        BacktestJob.objects.filter(pk=job.pk).update(status=BacktestJob.STATUS_SUCCEEDED)
+        again, created = enqueue_backtest(make_config())
+        assert created is True
+        assert again.pk != job.pk
+
+
+@pytest.mark.django_db
+class TestWorkerLifecycle:
+    """Claiming, executing and recovering jobs."""
+
+    def test_claim_oldest_first(self):
+        first, _ = enqueue_backtest(make_config(ticker='AAA'))
+        enqueue_backtest(make_config(ticker='BBB'))
+
+        claimed = claim_next_job()
+        assert claimed.pk == first.pk
+        assert claimed.status == BacktestJob.STATUS_RUNNING
+        assert claimed.started_at is not None
+        assert claim_next_job().ticker == 'BBB'
+        assert claim_next_job() is None
+
+    @patch('core.backtest_jobs.run_backtest', return_value=SUCCESS_RESULT)
+    def test_execute_success(self, mock_run_backtest):
+        enqueue_backtest(make_config())
+        job = execute_job(claim_next_job())
+
+        job.refresh_from_db()
+        assert job.status == BacktestJob.STATUS_SUCCEEDED
+        assert job.progress == 1.0
+        assert job.finished_at is not None
+        assert job.result['metrics']['total_trades'] == 4
+        assert job.result['metrics']['win_rate'] == pytest.approx(75.0)
+        assert job.result['metrics']['max_drawdown'] == pytest.approx(5.5)
+
+        args, kwargs = mock_run_backtest.call_args
+        assert args == ('AAPL',)
+        assert kwargs['use_cache'] is True
+        assert kwargs['strategy_params'] == {'lookback': 50}
+        assert kwargs['end_date'].date().isoformat() == '2023-12-31'
+        assert callable(kwargs['progress_callback'])
+
+    @patch('core.backtest_jobs.run_backtest')
+    def test_execute_failure(self, mock_run_backtest):
+        mock_run_backtest.return_value = {'success': False, 'error': 'No data', 'analyzers': None}
+        enqueue_backtest(make_config())
+        job = execute_job(claim_next_job())
+        job.refresh_from_db()
+        assert job.status == BacktestJob.STATUS_FAILED
+        assert job.error == 'No data'
+        assert job.result is None
+
+    @patch('core.backtest_jobs.run_backtest', side_effect=RuntimeError('boom'))
+    def test_execute_crash_marks_failed(self, mock_run_backtest):
+        enqueue_backtest(make_config())
+        job = execute_job(claim_next_job())
+        assert job.status == BacktestJob.STATUS_FAILED
+        assert 'boom' in job.error
+
+    def test_progress_is_recorded(self):
+        enqueue_backtest(make_config())
+        job = claim_next_job()
+
+        def fake_run(ticker, progress_callback=None, **kwargs):
+            progress_callback(0.5)
+            assert BacktestJob.objects.get(pk=job.pk).progress == pytest.approx(0.5)
+            return SUCCESS_RESULT
+
+        with patch('core.backtest_jobs.run_backtest', side_effect=fake_run):
+            execute_job(job)
+
+    def test_stale_running_jobs_are_requeued(self):
+        enqueue_backtest(make_config())
+        job = claim_next_job()
+        BacktestJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        assert requeue_stale_jobs(timedelta(minutes=10)) == 1
+        assert claim_next_job().pk == job.pk
+
+    @patch('core.backtest_jobs.run_backtest', return_value=SUCCESS_RESULT)
+    def test_worker_command_once(self, mock_run_backtest):
+        enqueue_backtest(make_config(ticker='AAA'))
+        enqueue_backtest(make_config(ticker='BBB'))
+        out = StringIO()
+        call_command('run_backtest_worker', '--once', stdout=out)
+
+        assert mock_run_backtest.call_count == 2
+        assert BacktestJob.objects.filter(status=BacktestJob.STATUS_SUCCEEDED).count() == 2
+        assert 'after 2 job(s)' in out.getvalue()
+
+
+def test_backtest_kwargs_defaults():
+    kwargs = backtest_kwargs(make_config(start_date=None, end_date=None, strategy_params={}))
+    assert kwargs['start_date'] is None
+    assert kwargs['end_date'] is None
+    assert kwargs['strategy_params'] is None
+    assert kwargs['engine'] == 'backtrader'
+
+
+def test_progress_reporter_reaches_completion():
+    reports = []
+    cerebro = bt.Cerebro()
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.adddata(bt.feeds.PandasData(dataname=make_ohlcv(0, bars=200)))
+    cerebro.addanalyzer(ProgressReporter, callback=reports.append, step=0.1)
+    cerebro.run()
+
+    assert reports == sorted(reports)
+    assert 9 <= len(reports) <= 11
+    assert reports[-1] == pytest.approx(1.0)
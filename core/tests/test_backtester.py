@@ -117,19 +117,16 @@ class TestBacktester:
         # Assertions
         assert result is None
     
-    @patch('core.backtester.OHLCVData.objects.filter')
+    @patch('core.catalog.TickerCatalog.objects.filter')
     def test_get_available_date_range(self, mock_filter):
-        """Test that get_available_date_range correctly returns min and max dates"""
-        # Setup mock aggregate result
+        """Test that get_available_date_range reads min and max dates from the ticker catalog"""
+        # Setup mock catalog row
         mock_query = MagicMock()
         
         min_date = datetime(2023, 1, 1, tzinfo=datetime.now().tzinfo)
         max_date = datetime(2023, 12, 31, tzinfo=datetime.now().tzinfo)
         
-        mock_query.aggregate.return_value = {
-            'min_date': min_date,
-            'max_date': max_date
-        }
+        mock_query.values_list.return_value.first.return_value = (min_date, max_date)
         
         mock_filter.return_value = mock_query
         
@@ -0,0 +1,127 @@
+"""
+Tests for the ticker catalog maintained at ingest
+"""
+import pytest
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from core.backtester import get_available_date_range, get_data_version, get_data_versions
+from core.catalog import (VERSION_FIELDS, catalog_tickers, rebuild_ticker_catalog, update_ticker_catalog,
+                          version_digest)
+from core.data_handler import save_ohlcv_data
+from core.tests.helpers import make_ohlcv, saved_bars, store_bars
+from dashboard.models import DailyFeature, OHLCVData, TickerCatalog
+
+
+def bars_version(ticker):
+    return version_digest(OHLCVData.objects.filter(ticker=ticker).aggregate(**VERSION_FIELDS))
+
+
+@pytest.mark.django_db
+class TestTickerCatalog:
+
+    def test_updated_at_ingest(self):
+        df = saved_bars(make_ohlcv(1, bars=120))
+        save_ohlcv_data(df.iloc[:100].copy(), 'CAT')
+        entry = TickerCatalog.objects.get(ticker='CAT')
+        assert entry.bars == 100
+        assert entry.data_version == bars_version('CAT')
+        first_ingest = entry.last_ingest
+
+        save_ohlcv_data(df.iloc[90:].copy(), 'CAT')
+        entry.refresh_from_db()
+        assert entry.bars == 120
+        assert entry.first_timestamp == df.index[0].tz_localize('UTC')
+        assert entry.last_timestamp == df.index[-1].tz_localize('UTC')
+        assert entry.data_version == bars_version('CAT')
+        assert entry.last_ingest > first_ingest
+
+    def test_ingest_aggregates_only_appended_bars(self):
+        df = saved_bars(make_ohlcv(7, bars=120))
+        save_ohlcv_data(df.iloc[20:100].copy(), 'CAT')
+        with CaptureQueriesContext(connection) as queries:
+            save_ohlcv_data(df.iloc[100:].copy(), 'CAT')
+        aggregates = [q['sql'] for q in queries if 'COUNT(' in q['sql'] and 'dashboard_ohlcvdata' in q['sql']]
+        assert len(aggregates) == 1 and '"timestamp" >' in aggregates[0]
+        entry = TickerCatalog.objects.get(ticker='CAT')
+        assert (entry.bars, entry.data_version) == (100, bars_version('CAT'))
+
+        # A backfill before the first bar aggregates the whole history again
+        save_ohlcv_data(df.iloc[:20].copy(), 'CAT')
+        entry.refresh_from_db()
+        assert (entry.bars, entry.data_version) == (120, bars_version('CAT'))
+        assert entry.first_timestamp == df.index[0].tz_localize('UTC')
+
+    def test_rolled_back_with_the_bars(self):
+        df = saved_bars(make_ohlcv(2, bars=60))
+        with patch('core.data_handler.update_ticker_catalog', side_effect=RuntimeError('boom')):
+            with pytest.raises(RuntimeError):
+                save_ohlcv_data(df.copy(), 'CAT')
+        assert not OHLCVData.objects.filter(ticker='CAT').exists()
+        assert not TickerCatalog.objects.exists()
+
+    def test_lookups_read_the_catalog(self, django_assert_num_queries):
+        for seed, ticker in enumerate(['BBB', 'AAA']):
+            save_ohlcv_data(saved_bars(make_ohlcv(seed, bars=30)), ticker)
+        with django_assert_num_queries(1):
+            assert catalog_tickers() == ['AAA', 'BBB']
+        with django_assert_num_queries(1):
+            first, last = get_available_date_range('AAA')
+        assert (first, last) == (OHLCVData.objects.filter(ticker='AAA').earliest('timestamp').timestamp,
+                                 OHLCVData.objects.filter(ticker='AAA').latest('timestamp').timestamp)
+        assert get_available_date_range('NONE') == (None, None)
+
+    def test_data_versions_read_the_catalog(self, django_assert_num_queries):
+        df = saved_bars(make_ohlcv(4, bars=40))
+        save_ohlcv_data(df.copy(), 'AAA')
+        save_ohlcv_data(saved_bars(make_ohlcv(5, bars=40)), 'BBB')
+        first, last = df.index[0].tz_localize('UTC'), df.index[-1].tz_localize('UTC')
+        expected = {'AAA': bars_version('AAA'), 'BBB': bars_version('BBB')}
+        with django_assert_num_queries(1):
+            assert get_data_version('AAA') == expected['AAA']
+        with django_assert_num_queries(1):
+            assert get_data_version('AAA', first, last) == expected['AAA']
+        with django_assert_num_queries(1):
+            assert get_data_versions(['AAA', 'BBB']) == expected
+
+        # A range that cuts the history fingerprints the bars in it
+        second = df.index[1].tz_localize('UTC')
+        partial = version_digest(OHLCVData.objects.filter(ticker='AAA', timestamp__gte=second).aggregate(**VERSION_FIELDS))
+        with django_assert_num_queries(2):
+            assert get_data_version('AAA', second) == partial
+        with django_assert_num_queries(2):
+            assert get_data_versions(['AAA', 'BBB'], second)['AAA'] == partial
+
+    def test_rebuild(self):
+        store_bars(make_ohlcv(3, bars=40), 'RAW')
+        TickerCatalog.objects.create(ticker='GONE', first_timestamp='2020-01-01T00:00Z',
+                                     last_timestamp='2020-01-01T00:00Z', bars=1, data_version='x')
+        assert rebuild_ticker_catalog() == 1
+        entry = TickerCatalog.objects.get()
+        assert (entry.ticker, entry.bars, entry.last_ingest) == ('RAW', 40, None)
+        assert entry.data_version == get_data_version('RAW')
+
+        OHLCVData.objects.filter(ticker='RAW').delete()
+        assert update_ticker_catalog('RAW') is None
+        assert not TickerCatalog.objects.exists()
+
+    def test_rebuild_command(self):
+        store_bars(make_ohlcv(4, bars=70), 'RAW')
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_indicators', stdout=StringIO())
+        assert TickerCatalog.objects.get(ticker='RAW').bars == 70
+        assert DailyFeature.objects.filter(ticker='RAW').count() == 70
+        assert not any('DISTINCT' in query['sql'] for query in queries.captured_queries)
+
+    def test_admin_ticker_filter(self, admin_user):
+        save_ohlcv_data(saved_bars(make_ohlcv(5, bars=20)), 'ADM')
+        request = RequestFactory().get('/admin/dashboard/ohlcvdata/')
+        request.user = admin_user
+        changelist = site._registry[OHLCVData].get_changelist_instance(request)
+        ticker_filter = changelist.filter_specs[0]
+        assert ticker_filter.lookup_choices == [('ADM', 'ADM')]
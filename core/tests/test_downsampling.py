@@ -0,0 +1,55 @@
+"""
+Tests for chart downsampling
+"""
+import pytest
+import numpy as np
+
+from core.downsampling import bucket_ohlcv, downsample_line, lttb_indices
+from core.tests.helpers import make_ohlcv
+
+
+class TestLTTB:
+
+    def test_keeps_threshold_points_including_ends(self):
+        y = np.random.default_rng(1).normal(size=5000).cumsum()
+        keep = lttb_indices(y, 500)
+        assert len(keep) == 500
+        assert keep[0] == 0 and keep[-1] == len(y) - 1
+        assert np.all(np.diff(keep) > 0)
+
+    def test_keeps_spikes(self):
+        y = np.zeros(1000)
+        y[[137, 512, 880]] = [50.0, -40.0, 30.0]
+        keep = lttb_indices(y, 50)
+        assert {137, 512, 880} <= set(keep)
+
+    def test_short_series_unchanged(self):
+        np.testing.assert_array_equal(lttb_indices(np.arange(10.0), 20), np.arange(10))
+
+    def test_downsample_line_skips_warmup(self):
+        y = np.arange(1000.0)
+        y[:49] = np.nan
+        keep = downsample_line(y, 100)
+        assert len(keep) == 100
+        assert keep[0] == 49
+        assert not np.isnan(y[keep]).any()
+
+
+class TestBucketOHLCV:
+
+    @pytest.mark.parametrize('buckets', [1, 7, 250, 999])
+    def test_preserves_extremes_and_volume(self, buckets):
+        df = make_ohlcv(2, bars=1000)
+        result = bucket_ohlcv(df['open'], df['high'], df['low'], df['close'], df['volume'], buckets)
+        assert len(result['start']) == buckets
+        assert result['high'].max() == df['high'].max()
+        assert result['low'].min() == df['low'].min()
+        assert result['open'][0] == df['open'].iloc[0]
+        assert result['close'][-1] == df['close'].iloc[-1]
+        assert result['volume'].sum() == pytest.approx(df['volume'].sum())
+
+    def test_no_aggregation_when_bars_fit(self):
+        df = make_ohlcv(3, bars=50)
+        result = bucket_ohlcv(df['open'], df['high'], df['low'], df['close'], df['volume'], 100)
+        np.testing.assert_array_equal(result['start'], np.arange(50))
+        np.testing.assert_array_equal(result['close'], df['close'])
@@ -0,0 +1,86 @@
+"""
+Tests for structured strategy event recording
+"""
+import pytest
+import backtrader as bt
+from datetime import datetime
+from unittest.mock import patch
+
+from core.backtester import run_backtest, run_portfolio_backtest
+from core.events import (
+    EVENT_FILL, EVENT_SIGNAL, EVENT_STOP, EVENT_TRADE, SIDE_BUY, STOP_INITIAL, EventBuffer,
+)
+from core.tests.helpers import make_ohlcv, store_bars
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+class TestEventBuffer:
+
+    def test_grows_past_capacity(self):
+        buffer = EventBuffer(['TEST'], capacity=2)
+        dt = bt.date2num(datetime(2024, 1, 2))
+        for i in range(5):
+            buffer.record(EVENT_SIGNAL, dt, side=SIDE_BUY, price=100.0 + i)
+        assert len(buffer) == 5
+        assert buffer.count(EVENT_SIGNAL) == 5
+        assert list(buffer.events['price']) == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+    def test_records(self):
+        buffer = EventBuffer(['AAA', 'BBB'])
+        dt = bt.date2num(datetime(2024, 1, 2))
+        buffer.record(EVENT_STOP, dt, data=1, price=95.5, status=STOP_INITIAL)
+        buffer.record(EVENT_TRADE, dt, data=0, value=12.0, commission=0.5, bars=7)
+
+        stop, trade = buffer.to_records()
+        assert stop == {'date': '2024-01-02T00:00:00', 'type': 'stop', 'data': 'BBB',
+                        'price': 95.5, 'reason': 'initial'}
+        assert trade['data'] == 'AAA'
+        assert trade['pnl'] == 12.0 and trade['pnlcomm'] == 11.5 and trade['bars'] == 7
+
+    def test_single_feed_records_omit_data(self):
+        buffer = EventBuffer(['TEST'])
+        buffer.record(EVENT_SIGNAL, bt.date2num(datetime(2024, 1, 2)), side=SIDE_BUY, price=1.0)
+        assert 'data' not in buffer.to_records()[0]
+
+
+@pytest.mark.django_db
+class TestStrategyEvents:
+
+    @pytest.fixture(autouse=True)
+    def bars(self):
+        store_bars(make_ohlcv(1, bars=400), 'EVT')
+
+    def test_events_match_trades(self):
+        with patch('logging.Logger.info'):
+            results = run_backtest('EVT', strategy_params=PARAMS)
+        events = results['events']
+        trades = [e for e in events if e['type'] == 'trade']
+        fills = [e for e in events if e['type'] == 'fill']
+
+        assert len(trades) == len(results['trades']) > 0
+        assert [t['pnlcomm'] for t in trades] == pytest.approx([t['pnlcomm'] for t in results['trades']])
+        assert len(fills) in (2 * len(trades), 2 * len(trades) + 1)  # Last entry may still be open
+        assert [f['side'] for f in fills[:2]] == ['buy', 'sell']
+        assert sum(e['type'] == 'stop' and e['reason'] == 'initial' for e in events) == \
+            sum(f['side'] == 'buy' for f in fills)
+
+    def test_no_text_logging_by_default(self):
+        with patch('core.strategies.logger') as strategy_logger:
+            run_backtest('EVT', strategy_params=PARAMS)
+        strategy_logger.info.assert_not_called()
+
+    def test_verbose_logs_text(self):
+        with patch('core.strategies.logger') as strategy_logger:
+            results = run_backtest('EVT', strategy_params=dict(PARAMS, verbose=True))
+        messages = [call.args[0] for call in strategy_logger.info.call_args_list]
+        assert sum('TRADE CLOSED' in m for m in messages) == len(results['trades'])
+
+    def test_portfolio_events_name_their_data(self):
+        store_bars(make_ohlcv(2, bars=400), 'EVT2')
+        with patch('logging.Logger.info'):
+            results = run_portfolio_backtest(['EVT', 'EVT2'], strategy_params=PARAMS)
+        trades = [e for e in results['events'] if e['type'] == 'trade']
+        assert len(trades) == len(results['trades']) > 0
+        assert {e['data'] for e in results['events']} <= {'EVT', 'EVT2'}
+        assert sorted(e['data'] for e in trades) == sorted(t['ticker'] for t in results['trades'])
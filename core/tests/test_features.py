@@ -0,0 +1,150 @@
+"""
+Tests for the daily feature table maintained at ingest
+"""
+import pytest
+import numpy as np
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+
+from core.backtester import run_backtest, run_parameter_sweep
+from core.data_handler import save_ohlcv_data
+from core.features import FEATURE_COLUMNS, aligned_features, get_features
+from core.screener import screen_breakouts
+from core.tests.helpers import calls, compute_counter, expected_indicators, make_ohlcv, saved_bars
+from dashboard.models import DailyFeature, OHLCVData
+
+
+def plant_breakout(df, i):
+    """Make bar ``i`` close above the prior 50-bar high on heavy volume."""
+    prior_high = df['high'].iloc[i - 50:i].max()
+    df.iloc[i, df.columns.get_loc('close')] = round(prior_high * 1.02, 4)
+    df.iloc[i, df.columns.get_loc('high')] = round(prior_high * 1.03, 4)
+    df.iloc[i, df.columns.get_loc('volume')] = int(df['volume'].iloc[i - 20:i].mean() * 3)
+
+
+def test_feature_columns_match_model():
+    model_columns = {field.name for field in DailyFeature._meta.get_fields()} - {'id', 'ticker', 'timestamp'}
+    assert model_columns == set(FEATURE_COLUMNS)
+
+
+@pytest.mark.django_db
+class TestFeatureTable:
+
+    def test_rows_written_at_ingest(self):
+        df = saved_bars(make_ohlcv(1, bars=300))
+        save_ohlcv_data(df.iloc[:250].copy(), 'FEAT')
+        first_ids = set(DailyFeature.objects.filter(ticker='FEAT').values_list('id', flat=True))
+        save_ohlcv_data(df.iloc[240:].copy(), 'FEAT')
+
+        # Only the 50 new rows were added
+        rows = DailyFeature.objects.filter(ticker='FEAT')
+        assert rows.count() == 300
+        assert first_ids < set(rows.values_list('id', flat=True))
+
+        features = get_features('FEAT')
+        assert list(features.columns) == list(FEATURE_COLUMNS)
+        for name, values in expected_indicators(df).items():
+            np.testing.assert_allclose(features[name], values, rtol=1e-9, equal_nan=True, err_msg=name)
+
+    def test_range_query(self, django_assert_num_queries):
+        df = saved_bars(make_ohlcv(2, bars=100))
+        save_ohlcv_data(df.copy(), 'FEAT')
+        with django_assert_num_queries(1):
+            features = get_features('FEAT', df.index[10].tz_localize('UTC'), df.index[19].tz_localize('UTC'),
+                                    columns=('sma_10',))
+        assert len(features) == 10
+        assert list(features.columns) == ['sma_10']
+        with pytest.raises(ValueError):
+            get_features('FEAT', columns=('sma_200',))
+
+    def test_backfill_rewrites_features(self):
+        df = saved_bars(make_ohlcv(3, bars=120))
+        save_ohlcv_data(df.iloc[60:].copy(), 'FEAT')
+        save_ohlcv_data(df.iloc[:60].copy(), 'FEAT')
+        features = get_features('FEAT')
+        assert len(features) == 120
+        np.testing.assert_allclose(features['sma_50'], expected_indicators(df)['sma_50'], equal_nan=True)
+
+    def test_aligned_features_cover_the_loaded_bars(self):
+        df = saved_bars(make_ohlcv(4, bars=80))
+        save_ohlcv_data(df.copy(), 'FEAT')
+        data = get_features('FEAT')
+        assert aligned_features('FEAT', data) is not None
+        assert aligned_features('FEAT', data.iloc[1:]) is None
+
+    def test_ranged_features_match_the_range_computation(self):
+        df = saved_bars(make_ohlcv(4, bars=120))
+        save_ohlcv_data(df.copy(), 'FEAT')
+        start = df.index[30].tz_localize('UTC')
+        features = aligned_features('FEAT', get_features('FEAT', start_date=start), start_date=start)
+        expected = expected_indicators(df.iloc[30:])
+        assert sorted(features.columns) == ['highest_50', 'lowest_50', 'sma_10', 'sma_20', 'sma_50', 'vol_ma_20']
+        for column in features.columns:
+            np.testing.assert_allclose(features[column], expected[column], equal_nan=True)
+
+    def test_rebuild_command(self):
+        save_ohlcv_data(saved_bars(make_ohlcv(5, bars=70)), 'FEAT')
+        DailyFeature.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_indicators', stdout=out)
+        assert 'FEAT: 70 bars' in out.getvalue()
+        assert DailyFeature.objects.filter(ticker='FEAT').count() == 70
+
+
+@pytest.mark.django_db
+class TestFeatureConsumers:
+
+    @pytest.fixture
+    def ingested(self):
+        frames = {}
+        for seed in range(6):
+            df = saved_bars(make_ohlcv(seed, bars=260))
+            if seed in (1, 4):
+                plant_breakout(df, len(df) - 1)
+            ticker = f"F{seed:02d}"
+            save_ohlcv_data(df.copy(), ticker)
+            frames[ticker] = df
+        return frames
+
+    @pytest.mark.parametrize('engine', ['vectorized', 'backtrader'])
+    def test_sweep_reads_atr_and_volume_ma(self, ingested, engine):
+        grid = {'trail_stop_atr_mult': [2.0, 3.0], 'lookback': [20]}
+        patcher, wrapped = compute_counter()
+        with patch('logging.Logger.info'), patcher:
+            sweep = run_parameter_sweep('F02', grid, engine=engine)
+        assert calls(wrapped) == {'range': 1, 'vol_ma': 0, 'atr': 0}
+
+        with patch('logging.Logger.info'):
+            single = run_backtest('F02', strategy_params=sweep[-1]['params'], engine=engine)
+        assert sweep[-1]['result']['trades'] == single['trades']
+
+    @pytest.mark.parametrize('engine', ['vectorized', 'backtrader'])
+    def test_ranged_sweep_reads_volume_ma(self, ingested, engine):
+        start = ingested['F02'].index[40].tz_localize('UTC')
+        grid = {'trail_stop_atr_mult': [2.0, 3.0]}
+        patcher, wrapped = compute_counter()
+        with patch('logging.Logger.info'), patcher:
+            from_features = run_parameter_sweep('F02', grid, start_date=start, engine=engine)
+        assert calls(wrapped) == {'range': 1, 'vol_ma': 0, 'atr': 1}
+
+        with patch('logging.Logger.info'), patch('core.backtester.aligned_features', return_value=None):
+            computed = run_parameter_sweep('F02', grid, start_date=start, engine=engine)
+        for ours, theirs in zip(from_features, computed):
+            assert ours['result']['trades'] == theirs['result']['trades']
+            assert ours['result']['end_value'] == pytest.approx(theirs['result']['end_value'])
+
+    def test_screener_reads_features(self, ingested):
+        from_features = screen_breakouts()
+        from_bars = screen_breakouts(use_features=False)
+        assert from_features['source'] == 'features'
+        assert from_bars['source'] == 'bars'
+        assert from_features['scanned'] == from_bars['scanned'] == 6
+        assert sorted(c['ticker'] for c in from_features['candidates']) == ['F01', 'F04']
+        for features, bars in zip(from_features['candidates'], from_bars['candidates']):
+            assert features == pytest.approx(bars, rel=1e-6)
+
+    def test_screener_falls_back_when_features_lag(self, ingested):
+        OHLCVData.objects.create(ticker='F00', timestamp=ingested['F00'].index[-1].tz_localize('UTC').replace(
+            year=2016), open=1, high=1, low=1, close=1, volume=1)
+        assert screen_breakouts()['source'] == 'bars'
@@ -0,0 +1,106 @@
+"""
+Tests for the database streaming feed and the low-memory backtest mode
+"""
+import pytest
+import backtrader as bt
+from datetime import timezone
+from unittest.mock import patch
+
+from core.backtester import run_backtest
+from core.feeds import DatabaseStreamFeed
+from core.performance import PerformanceRecorder
+from core.result_cache import make_cache_key
+from core.strategies import ClassicBreakoutStrategy
+from core.tests.helpers import make_ohlcv
+from dashboard.models import OHLCVData
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+@pytest.fixture
+def stored_bars():
+    """Store a random-walk fixture for TEST as OHLCVData rows."""
+    df = make_ohlcv(1, bars=400)
+    OHLCVData.objects.bulk_create([
+        OHLCVData(
+            ticker='TEST', timestamp=ts.to_pydatetime().replace(tzinfo=timezone.utc),
+            open=round(row.open, 4), high=round(row.high, 4), low=round(row.low, 4),
+            close=round(row.close, 4), volume=int(row.volume),
+        )
+        for ts, row in df.iterrows()
+    ])
+    return df
+
+
+def run_stream(chunk_size, exactbars=1):
+    """Run the strategy on a streamed feed and return the strategy instance."""
+    cerebro = bt.Cerebro(exactbars=exactbars, stdstats=False)
+    cerebro.addstrategy(ClassicBreakoutStrategy, **PARAMS)
+    cerebro.adddata(DatabaseStreamFeed(ticker='TEST', chunk_size=chunk_size))
+    cerebro.addanalyzer(PerformanceRecorder, _name='performance', compact=True)
+    with patch('logging.Logger.info'):
+        return cerebro.run()[0]
+
+
+@pytest.mark.django_db
+class TestDatabaseStreamFeed:
+    """The streaming feed delivers every bar with bounded buffers."""
+
+    def test_streams_all_bars_in_small_chunks(self, stored_bars):
+        strategy = run_stream(chunk_size=7)
+        data = strategy.datas[0]
+        assert len(data) == len(stored_bars)
+        assert data.total_bars == len(stored_bars)
+        assert data.close[0] == pytest.approx(round(stored_bars['close'].iloc[-1], 4))
+
+    def test_exactbars_keeps_buffers_bounded(self, stored_bars):
+        strategy = run_stream(chunk_size=50)
+        # Only the strategy's lookback window is kept, not the whole history
+        assert len(strategy.datas[0].high.array) <= PARAMS['lookback'] + 2
+        assert len(strategy.datas[0].high.array) < len(stored_bars)
+
+
+@pytest.mark.django_db
+class TestLowMemoryBacktest:
+    """Low-memory runs reproduce the regular Backtrader results."""
+
+    def test_matches_regular_run(self, stored_bars):
+        with patch('logging.Logger.info'):
+            regular = run_backtest('TEST', strategy_params=PARAMS)
+            streamed = run_backtest('TEST', strategy_params=PARAMS, low_memory=True)
+
+        assert regular['success'] and streamed['success']
+        assert streamed['end_value'] == pytest.approx(regular['end_value'])
+        assert len(streamed['trades']) == len(regular['trades']) > 0
+        for name in ('trade_analyzer', 'sqn'):
+            assert streamed['analyzers'][name] == regular['analyzers'][name]
+        assert streamed['analyzers']['drawdown']['max']['drawdown'] == pytest.approx(
+            regular['analyzers']['drawdown']['max']['drawdown'])
+        assert streamed['analyzers']['drawdown']['max']['len'] == regular['analyzers']['drawdown']['max']['len']
+        assert streamed['analyzers']['performance']['max_drawdown'] == pytest.approx(
+            regular['analyzers']['performance']['max_drawdown'])
+        # Daily bars: the compact equity curve has one point per bar
+        assert streamed['equity_curve']['values'] == pytest.approx(regular['equity_curve']['values'])
+
+    def test_progress_reported_from_row_count(self, stored_bars):
+        progress = []
+        with patch('logging.Logger.info'):
+            run_backtest('TEST', strategy_params=PARAMS, low_memory=True, progress_callback=progress.append)
+        assert progress[-1] == pytest.approx(1.0)
+        assert progress == sorted(progress)
+
+    def test_no_data(self):
+        results = run_backtest('MISSING', low_memory=True)
+        assert not results['success']
+        assert 'No data feed' in results['error']
+
+    def test_vectorized_engine_rejected(self):
+        results = run_backtest('TEST', engine='vectorized', low_memory=True)
+        assert not results['success']
+        assert 'Low-memory' in results['error']
+
+
+def test_cache_key_distinguishes_low_memory():
+    args = ('TEST', None, None, ClassicBreakoutStrategy, PARAMS, 100000.0, 0.001, 'v1')
+    assert make_cache_key(*args) == make_cache_key(*args, options={})
+    assert make_cache_key(*args) != make_cache_key(*args, options={'low_memory': True})
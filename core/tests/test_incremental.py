@@ -0,0 +1,176 @@
+"""
+Tests for checkpointed incremental backtests
+"""
+import json
+import pytest
+import numpy as np
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.backtester import run_backtest
+from core.catalog import update_ticker_catalog
+from core.incremental import (
+    MODE_FULL, MODE_RESUMED, MODE_UNCHANGED, checkpoint_history, run_incremental_backtest,
+)
+from core.tests.helpers import PARITY_PARAMS, make_ohlcv, store_bars
+from core.vectorized import resume_breakout, simulate_breakout
+from dashboard.models import BacktestCheckpoint, BacktestCheckpointRun, OHLCVData
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+def assert_same_analysis(actual, expected):
+    """Compare analyzer dicts, allowing for the summation order of running metrics."""
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same_analysis(actual[key], value)
+        elif isinstance(value, float):
+            assert actual[key] == pytest.approx(value), key
+        else:
+            assert actual[key] == value, key
+
+
+def closed(trades):
+    return [t for t in trades if t['exit_bar'] is not None]
+
+
+class TestResumeBreakout:
+    """Resuming from a checkpoint reproduces a full simulation."""
+
+    @pytest.mark.parametrize('params', PARITY_PARAMS)
+    @pytest.mark.parametrize('split', [5, 120, 333, 599])
+    def test_resume_matches_full_run(self, params, split):
+        df = make_ohlcv(2)
+        full = simulate_breakout(df, params)
+
+        sim = simulate_breakout(df.iloc[:split], params)
+        trades, equity, checkpoint = closed(sim['trades']), list(sim['equity']), sim['checkpoint']
+        position = split
+        while position < len(df):
+            # Extend a few bars at a time, like nightly runs
+            step = 1 + position % 3
+            resumed = resume_breakout(checkpoint, df.iloc[position:position + step], params)
+            trades += closed(resumed['trades'])
+            equity += list(resumed['equity'])
+            checkpoint = resumed['checkpoint']
+            position += step
+
+        expected = closed(full['trades'])
+        assert [(t['entry_bar'], t['exit_bar']) for t in trades] == [(t['entry_bar'], t['exit_bar']) for t in expected]
+        assert [t['pnlcomm'] for t in trades] == pytest.approx([t['pnlcomm'] for t in expected])
+        np.testing.assert_allclose(equity, full['equity'])
+        assert checkpoint['position'] == full['position']
+        assert checkpoint['cash'] == pytest.approx(full['cash'])
+
+
+@pytest.mark.django_db
+class TestRunIncrementalBacktest:
+    """Checkpoints are created, extended and invalidated."""
+
+    def test_extends_with_new_bars_only(self):
+        df = make_ohlcv(1, bars=400)
+        store_bars(df.iloc[:350])
+        with patch('logging.Logger.info'):
+            first = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        assert first['incremental'] == {'mode': MODE_FULL, 'new_bars': 350, 'bars': 350}
+        assert BacktestCheckpoint.objects.get().bars == 350
+
+        store_bars(df.iloc[350:])
+        with patch('logging.Logger.info'), patch('core.incremental.simulate_breakout') as mock_full:
+            resumed = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        mock_full.assert_not_called()
+        assert resumed['incremental'] == {'mode': MODE_RESUMED, 'new_bars': 50, 'bars': 400}
+
+        # Each run stored only the bars it simulated
+        checkpoint = BacktestCheckpoint.objects.get()
+        assert [(run.first_bar, len(run.equity_curve['values'])) for run in checkpoint.runs.all()] == [(0, 350),
+                                                                                                      (350, 50)]
+
+        with patch('logging.Logger.info'):
+            expected = run_backtest('INCR', strategy_params=PARAMS, engine='vectorized')
+        history = checkpoint_history(checkpoint)
+        assert resumed['end_value'] == pytest.approx(expected['end_value'])
+        assert history['trades'] == expected['trades']
+        assert history['equity_curve']['dates'] == expected['equity_curve']['dates']
+        assert history['equity_curve']['values'] == pytest.approx(expected['equity_curve']['values'])
+        assert_same_analysis(resumed['analyzers'], expected['analyzers'])
+
+    def test_resume_reads_only_new_bars(self):
+        df = make_ohlcv(1, bars=300)
+        store_bars(df.iloc[:280])
+        update_ticker_catalog('INCR')
+        run_incremental_backtest('INCR', strategy_params=PARAMS)
+
+        store_bars(df.iloc[280:])
+        update_ticker_catalog('INCR')
+        with CaptureQueriesContext(connection) as queries:
+            result = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        assert result['incremental']['mode'] == MODE_RESUMED
+        # The history check read the catalog; every query on the bars starts at the checkpoint
+        bar_queries = [q['sql'] for q in queries if 'dashboard_ohlcvdata' in q['sql']]
+        assert bar_queries and all('"timestamp" >' in sql for sql in bar_queries)
+
+        with patch('core.incremental.get_ohlcv_dataframe') as mock_read:
+            again = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        mock_read.assert_not_called()
+        assert again['incremental']['mode'] == MODE_UNCHANGED
+        assert again['analyzers'] == result['analyzers']
+
+    def test_no_new_bars(self):
+        store_bars(make_ohlcv(1, bars=200))
+        first = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        again = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        assert again['incremental']['mode'] == MODE_UNCHANGED
+        assert again['end_value'] == pytest.approx(first['end_value'])
+
+    def test_changed_history_reruns_in_full(self):
+        store_bars(make_ohlcv(1, bars=200))
+        run_incremental_backtest('INCR', strategy_params=PARAMS)
+        bar = OHLCVData.objects.filter(ticker='INCR').order_by('timestamp')[50]
+        OHLCVData.objects.filter(pk=bar.pk).update(high=bar.high + 1)
+
+        result = run_incremental_backtest('INCR', strategy_params=PARAMS)
+        assert result['incremental']['mode'] == MODE_FULL
+        assert BacktestCheckpoint.objects.count() == 1
+        assert BacktestCheckpointRun.objects.get().first_bar == 0
+
+    def test_errors(self):
+        assert not run_incremental_backtest('MISSING')['success']
+        assert 'Unsupported' in run_incremental_backtest('INCR', strategy_params={'foo': 1})['error']
+
+    def test_extend_backtests_command(self):
+        df = make_ohlcv(1, bars=200)
+        store_bars(df.iloc[:150])
+        run_incremental_backtest('INCR', strategy_params=PARAMS)
+        store_bars(df.iloc[150:])
+
+        out = StringIO()
+        call_command('extend_backtests', stdout=out)
+        assert 'INCR: resumed, 50 new bar(s)' in out.getvalue()
+        assert BacktestCheckpoint.objects.get().bars == 200
+
+    def test_extend_backtests_adds_configurations(self):
+        df = make_ohlcv(1, bars=200)
+        store_bars(df.iloc[:150])
+        start = df.index[20].strftime('%Y-%m-%d')
+        out = StringIO()
+        call_command('extend_backtests', '--add', 'incr', '--start-date', start, '--commission', '0.002',
+                     '--params', json.dumps(PARAMS), stdout=out)
+        assert 'INCR: full, 130 new bar(s)' in out.getvalue()
+        checkpoint = BacktestCheckpoint.objects.get()
+        assert (checkpoint.ticker, checkpoint.bars, checkpoint.config['commission']) == ('INCR', 130, 0.002)
+
+        store_bars(df.iloc[150:])
+        out = StringIO()
+        call_command('extend_backtests', stdout=out)
+        assert 'INCR: resumed, 50 new bar(s)' in out.getvalue()
+        assert BacktestCheckpoint.objects.get().bars == 180
+
+        with pytest.raises(CommandError):
+            call_command('extend_backtests', '--add', 'INCR', '--params', '[20]', stdout=StringIO())
+        with pytest.raises(CommandError):
+            call_command('extend_backtests', '--add', 'MISSING', stdout=StringIO())
@@ -0,0 +1,82 @@
+"""
+Tests for the shared indicator cache
+"""
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from core.backtester import get_data_version, get_data_versions, run_backtest, run_parameter_sweep
+from core.indicator_cache import IndicatorCache, breakout_indicators, indicator_key
+from core.tests.helpers import calls, compute_counter, make_ohlcv, store_bars
+from core.vectorized import breakout_params, compute_breakout_indicators
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+class TestIndicatorCache:
+
+    def test_matches_direct_computation(self, indicator_cache):
+        data = make_ohlcv(1, bars=300)
+        cached = breakout_indicators(data, PARAMS, ticker='TEST', data_version='v1', cache=indicator_cache)
+        direct = compute_breakout_indicators(
+            data['high'].to_numpy(), data['low'].to_numpy(), data['volume'].to_numpy(dtype=float),
+            data['close'].to_numpy(), breakout_params(PARAMS))
+        for name, values in direct.items():
+            np.testing.assert_array_equal(cached[name], values)
+
+    def test_only_changed_indicators_are_recomputed(self, indicator_cache):
+        data = make_ohlcv(1, bars=300)
+        patcher, wrapped = compute_counter()
+        with patcher:
+            breakout_indicators(data, PARAMS, ticker='TEST', data_version='v1')
+            breakout_indicators(data, dict(PARAMS, trail_stop_atr_mult=5.0, volume_mult=2.0),
+                                ticker='TEST', data_version='v1')
+            assert calls(wrapped) == {'range': 1, 'vol_ma': 1, 'atr': 1}
+            breakout_indicators(data, dict(PARAMS, lookback=30), ticker='TEST', data_version='v1')
+            assert calls(wrapped) == {'range': 2, 'vol_ma': 1, 'atr': 1}
+            # New data version: everything is recomputed
+            breakout_indicators(data, PARAMS, ticker='TEST', data_version='v2')
+            assert calls(wrapped) == {'range': 3, 'vol_ma': 2, 'atr': 2}
+
+    def test_disk_layer_shared_between_instances(self, tmp_path):
+        data = make_ohlcv(1, bars=100)
+        breakout_indicators(data, PARAMS, ticker='TEST', data_version='v1',
+                            cache=IndicatorCache(directory=tmp_path / 'shared'))
+        fresh = IndicatorCache(directory=tmp_path / 'shared')
+        key = indicator_key('TEST', 'v1', None, None, 'atr', {'atr_period': PARAMS['atr_period']})
+        assert fresh.get(key) is not None
+        assert fresh.hits == 1
+
+    def test_memory_layer_evicts_least_recently_used(self, tmp_path):
+        cache = IndicatorCache(directory=tmp_path / 'lru', memory_bytes=2 * 800)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, {'values': np.zeros(100)})
+        assert list(cache._memory) == ['b', 'c']
+        # Still on disk
+        assert cache.get('a') is not None
+
+
+@pytest.mark.django_db
+class TestSharedIndicators:
+
+    @pytest.fixture(autouse=True)
+    def bars(self):
+        store_bars(make_ohlcv(1, bars=400), 'IND')
+        store_bars(make_ohlcv(2, bars=300), 'IND2')
+
+    def test_grouped_data_versions(self):
+        versions = get_data_versions(['IND', 'IND2', 'NONE'])
+        assert versions == {'IND': get_data_version('IND'), 'IND2': get_data_version('IND2')}
+
+    @pytest.mark.parametrize('engine', ['vectorized', 'backtrader'])
+    def test_exit_sweep_computes_indicators_once(self, engine):
+        grid = {'trail_stop_atr_mult': [2.0, 3.0, 4.0], 'initial_stop_atr_mult': [1.5, 2.5]}
+        patcher, wrapped = compute_counter()
+        with patch('logging.Logger.info'), patcher:
+            sweep = run_parameter_sweep('IND', {**{k: [v] for k, v in PARAMS.items()}, **grid}, engine=engine)
+        assert calls(wrapped) == {'range': 1, 'vol_ma': 1, 'atr': 1}
+        assert len(sweep) == 6
+
+        with patch('logging.Logger.info'):
+            single = run_backtest('IND', strategy_params=sweep[-1]['params'], engine=engine)
+        assert sweep[-1]['result']['trades'] == single['trades']
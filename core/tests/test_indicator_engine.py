@@ -0,0 +1,161 @@
+"""
+Tests for the streaming indicator engine
+"""
+import pytest
+import numpy as np
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+
+from core.data_handler import save_ohlcv_data
+from core.indicator_engine import (
+    DEFAULT_INDICATORS, TAIL_LENGTH, IndicatorEngine, get_indicator_engine, indicator_tail,
+    latest_indicators, make_indicator, rebuild_indicator_state, update_indicator_state,
+)
+from core.tests.helpers import expected_indicators, make_ohlcv, saved_bars, store_bars
+from dashboard.models import DailyFeature, IndicatorState, OHLCVData
+
+
+def rows(df):
+    return [(ts.to_pydatetime(), r.high, r.low, r.close, r.volume) for ts, r in df.iterrows()]
+
+
+class TestIndicatorEngine:
+
+    def test_matches_full_history_computation(self):
+        df = make_ohlcv(1, bars=400)
+        engine = IndicatorEngine()
+        history = {name: [] for name in DEFAULT_INDICATORS}
+        for row in rows(df):
+            for name, value in engine.update(*row).items():
+                history[name].append(np.nan if value is None else value)
+
+        for name, values in expected_indicators(df).items():
+            np.testing.assert_allclose(history[name], values, rtol=1e-9, equal_nan=True, err_msg=name)
+        assert engine.latest()['bars'] == 400
+
+    def test_restored_state_continues_identically(self):
+        df = make_ohlcv(2, bars=300)
+        full = IndicatorEngine().feed(rows(df))
+
+        engine = IndicatorEngine().feed(rows(df.iloc[:120]))
+        for start in range(120, 300, 45):
+            # Round-trip through JSON-compatible state between batches, like restarts
+            engine = IndicatorEngine.from_state(engine.get_state()).feed(rows(df.iloc[start:start + 45]))
+
+        assert engine.latest() == full.latest()
+        assert engine.tail() == full.tail()
+
+    def test_tail(self):
+        df = make_ohlcv(3, bars=80)
+        engine = IndicatorEngine().feed(rows(df))
+        tail = engine.tail(['sma_10', 'atr_14'], n=5)
+        assert set(tail) == {'timestamp', 'sma_10', 'atr_14'}
+        assert tail['timestamp'] == [ts.to_pydatetime() for ts in df.index[-5:]]
+        np.testing.assert_allclose(tail['sma_10'], df['close'].rolling(10).mean().iloc[-5:])
+        assert len(engine.tail()['timestamp']) == TAIL_LENGTH
+        with pytest.raises(ValueError):
+            engine.tail(['sma_200'])
+
+    def test_rejects_out_of_order_bars(self):
+        df = make_ohlcv(1, bars=5)
+        engine = IndicatorEngine().feed(rows(df))
+        with pytest.raises(ValueError):
+            engine.update(*rows(df)[2])
+
+    @pytest.mark.parametrize('name', ['wma_10', 'sma', 'sma_0', 'ema_x'])
+    def test_unknown_indicator(self, name):
+        with pytest.raises(ValueError):
+            make_indicator(name)
+
+
+@pytest.mark.django_db
+class TestPersistedIndicators:
+
+    def test_save_updates_state_incrementally(self):
+        df = saved_bars(make_ohlcv(1, bars=250))
+        save_ohlcv_data(df.iloc[:200].copy(), 'ENG')
+        state = IndicatorState.objects.get(ticker='ENG')
+        assert state.bars == 200
+
+        with patch('core.indicator_engine.rebuild_indicator_state') as rebuild:
+            assert save_ohlcv_data(df.iloc[190:].copy(), 'ENG') == 50
+        rebuild.assert_not_called()
+
+        latest = latest_indicators('ENG')
+        assert latest['bars'] == 250
+        expected = expected_indicators(df)
+        for name in DEFAULT_INDICATORS:
+            assert latest[name] == pytest.approx(expected[name][-1]), name
+
+    def test_backfill_rebuilds_from_history(self):
+        df = saved_bars(make_ohlcv(2, bars=150))
+        save_ohlcv_data(df.iloc[100:].copy(), 'ENG')
+        save_ohlcv_data(df.iloc[:100].copy(), 'ENG')
+
+        latest = latest_indicators('ENG')
+        assert latest['bars'] == 150
+        assert latest['sma_50'] == pytest.approx(df['close'].iloc[-50:].mean())
+
+    def test_state_is_locked_while_updating(self):
+        df = saved_bars(make_ohlcv(5, bars=120))
+        save_ohlcv_data(df.iloc[:100].copy(), 'ENG')
+        with patch.object(IndicatorState.objects, 'select_for_update',
+                          wraps=IndicatorState.objects.select_for_update) as lock:
+            save_ohlcv_data(df.iloc[100:].copy(), 'ENG')
+        lock.assert_called_once_with()
+
+    def test_first_ingest_locks_a_placeholder_state(self):
+        # Concurrent first ingests of a ticker must wait on the same row
+        # rather than both rebuilding and racing to insert the state
+        def rebuild(ticker):
+            assert IndicatorState.objects.filter(ticker=ticker, bars=0).exists()
+            return rebuild_indicator_state(ticker)
+
+        with patch('core.indicator_engine.rebuild_indicator_state', side_effect=rebuild) as rebuilt:
+            save_ohlcv_data(saved_bars(make_ohlcv(7, bars=60)), 'ENG')
+        rebuilt.assert_called_once_with('ENG')
+        assert IndicatorState.objects.get(ticker='ENG').bars == 60
+
+    def test_ingest_behind_a_concurrent_one_rebuilds(self):
+        # This ingest stored bars 100-109; another one stored bars 110-119
+        # (without seeing them) and updated the state before this one got the lock
+        df = saved_bars(make_ohlcv(6, bars=120))
+        save_ohlcv_data(df.iloc[:100].copy(), 'ENG')
+        store_bars(df.iloc[100:110], 'ENG')
+        save_ohlcv_data(df.iloc[110:].copy(), 'ENG')
+
+        bars = OHLCVData.objects.filter(ticker='ENG').order_by('timestamp')[100:110]
+        update_indicator_state('ENG', [(b.timestamp, b.high, b.low, b.close, b.volume) for b in bars])
+        latest = latest_indicators('ENG')
+        assert latest['bars'] == 120
+        assert latest['sma_50'] == pytest.approx(df['close'].iloc[-50:].mean())
+        assert DailyFeature.objects.filter(ticker='ENG').count() == 120
+
+    def test_reads_do_not_load_bars(self, django_assert_num_queries):
+        save_ohlcv_data(saved_bars(make_ohlcv(3, bars=60)), 'ENG')
+        with django_assert_num_queries(1):
+            tail = indicator_tail('ENG', ['ema_10'], n=3)
+        assert len(tail['ema_10']) == 3
+
+    def test_reads_do_not_rebuild_state(self):
+        save_ohlcv_data(saved_bars(make_ohlcv(3, bars=60)), 'ENG')
+        assert get_indicator_engine('ENG').bars == 60
+
+        IndicatorState.objects.filter(ticker='ENG').update(state={'format': 0})
+        with patch('core.indicator_engine.rebuild_indicator_state') as rebuild:
+            assert latest_indicators('ENG') is None
+            IndicatorState.objects.all().delete()
+            assert latest_indicators('ENG') is None
+            assert indicator_tail('ENG') is None
+        rebuild.assert_not_called()
+        assert not IndicatorState.objects.exists()
+        assert latest_indicators('NONE') is None
+
+    def test_rebuild_command(self):
+        save_ohlcv_data(saved_bars(make_ohlcv(4, bars=60)), 'ENG')
+        OHLCVData.objects.filter(ticker='ENG').order_by('-timestamp')[:1].get().delete()
+        out = StringIO()
+        call_command('rebuild_indicators', '--tickers', 'eng', stdout=out)
+        assert 'ENG: 59 bars' in out.getvalue()
+        assert IndicatorState.objects.get(ticker='ENG').bars == 59
@@ -0,0 +1,122 @@
+"""
+Tests for the trade journal summary table and analytics
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core.journal import journal_analytics, rebuild_journal_summary
+from dashboard.models import JournalSummary, TradeLog
+
+
+def trade(ticker='AAA', strategy='Classic Breakout', entry=(2024, 1, 15), pnl=None, rr=None,
+          entry_price='100', stop='95', size='10'):
+    return TradeLog.objects.create(
+        ticker=ticker, strategy=strategy, entry_date=timezone.make_aware(datetime(*entry, 10, 0)),
+        entry_price=Decimal(entry_price), initial_stop_loss=Decimal(stop), position_size=Decimal(size),
+        pnl=None if pnl is None else Decimal(pnl), planned_rr_ratio=None if rr is None else Decimal(rr),
+        user_risk_percent=Decimal('1.0'), account_capital_at_trade=Decimal('10000.00'), rationale='Test'
+    )
+
+
+def summary_rows():
+    return {(row.strategy, row.ticker, row.month): row for row in JournalSummary.objects.all()}
+
+
+@pytest.mark.django_db
+class TestJournalSummary:
+
+    def test_maintained_by_signals(self):
+        # Initial risk is |100 - 95| * 10 = 50
+        trade(pnl='100', rr='2.0')
+        trade(pnl='-50', rr='3.0')
+        open_trade = trade()
+        row = summary_rows()[('Classic Breakout', 'AAA', date(2024, 1, 1))]
+        assert (row.trades, row.closed, row.wins, row.losses) == (3, 2, 1, 1)
+        assert row.total_pnl == Decimal('50')
+        assert row.planned_rr_sum == Decimal('5.0') and row.planned_rr_count == 2
+        assert row.r_multiple_sum == pytest.approx(1.0) and row.r_multiple_count == 2
+
+        open_trade.pnl = Decimal('150')
+        open_trade.save()
+        row.refresh_from_db()
+        assert (row.closed, row.wins, row.total_pnl) == (3, 2, Decimal('200'))
+
+    def test_edit_moves_trade_between_buckets(self):
+        moved = trade(pnl='100')
+        trade(ticker='BBB', pnl='10')
+        moved.entry_date = timezone.make_aware(datetime(2024, 2, 3, 10, 0))
+        moved.save()
+        rows = summary_rows()
+        assert ('Classic Breakout', 'AAA', date(2024, 1, 1)) not in rows
+        assert rows[('Classic Breakout', 'AAA', date(2024, 2, 1))].total_pnl == Decimal('100')
+
+        moved.delete()
+        assert set(summary_rows()) == {('Classic Breakout', 'BBB', date(2024, 1, 1))}
+
+    def test_rebuild_matches_signals(self):
+        for i, pnl in enumerate(['100', '-20', None, '35', '-70']):
+            trade(ticker='AAA' if i % 2 else 'BBB', strategy='S1' if i < 3 else 'S2',
+                  entry=(2024, 1 + i % 3, 10), pnl=pnl, rr='2.5')
+        maintained = {key: (r.trades, r.wins, r.losses, r.total_pnl, r.r_multiple_sum)
+                      for key, r in summary_rows().items()}
+        out = StringIO()
+        call_command('rebuild_journal_summary', stdout=out)
+        assert f"Rebuilt {len(maintained)} journal summary row(s)." in out.getvalue()
+        rebuilt = {key: (r.trades, r.wins, r.losses, r.total_pnl, r.r_multiple_sum)
+                   for key, r in summary_rows().items()}
+        assert rebuilt == maintained
+
+    def test_failed_rebuild_keeps_summary(self):
+        trade(pnl='100')
+        before = set(summary_rows())
+        with patch.object(JournalSummary.objects, 'bulk_create', side_effect=RuntimeError('boom')):
+            with pytest.raises(RuntimeError):
+                rebuild_journal_summary()
+        assert set(summary_rows()) == before
+
+    def test_analytics_roll_up(self, django_assert_num_queries):
+        trade(ticker='AAA', strategy='S1', entry=(2024, 1, 5), pnl='100', rr='2')
+        trade(ticker='BBB', strategy='S1', entry=(2024, 1, 20), pnl='-50', rr='3')
+        trade(ticker='AAA', strategy='S1', entry=(2024, 2, 5), pnl='25')
+        trade(ticker='AAA', strategy='S2', entry=(2024, 1, 7))
+        with django_assert_num_queries(1):
+            rows = journal_analytics(('strategy', 'month'))
+        assert [(r['strategy'], r['month']) for r in rows] == [
+            ('S1', date(2024, 2, 1)), ('S1', date(2024, 1, 1)), ('S2', date(2024, 1, 1))]
+        january = rows[1]
+        assert (january['trades'], january['wins'], january['losses']) == (2, 1, 1)
+        assert january['win_rate'] == 0.5
+        assert january['avg_pnl'] == Decimal('25')
+        assert january['avg_planned_rr'] == Decimal('2.5')
+        assert january['avg_r_multiple'] == pytest.approx(0.5)
+        assert rows[2]['win_rate'] is None and rows[2]['avg_r_multiple'] is None
+
+        by_ticker = journal_analytics(('ticker',), strategy='S1')
+        assert [(r['ticker'], r['trades']) for r in by_ticker] == [('AAA', 2), ('BBB', 1)]
+        with pytest.raises(ValueError):
+            journal_analytics(('emotion',))
+
+    def test_analytics_page(self):
+        trade(pnl='100', rr='2')
+        trade(pnl='-50')
+        client = Client()
+        response = client.get(reverse('dashboard:journal_analytics'), {'group': 'strategy'})
+        assert response.status_code == 200
+        assert response.context['rows'][0]['trades'] == 2
+        assert b'50%' in response.content
+        assert b'0.50R' in response.content
+        response = client.get(reverse('dashboard:journal_analytics'), {'group': 'mood'})
+        assert 'error_message' in response.context
+
+    def test_zero_risk_trades_have_no_r_multiple(self):
+        trade(pnl='10', stop='100')
+        rebuild_journal_summary()
+        row = JournalSummary.objects.get()
+        assert row.r_multiple_count == 0
@@ -0,0 +1,74 @@
+"""
+Tests for Monte Carlo trade-sequence stress testing
+"""
+import time
+import pytest
+import numpy as np
+
+from core.monte_carlo import max_drawdowns, run_monte_carlo, simulate_trade_sequences
+
+
+PNL = np.array([500.0, -200.0, 300.0, -400.0, 150.0, 250.0, -100.0])
+
+
+class TestSimulateTradeSequences:
+    """Path generation"""
+
+    def test_shuffle_preserves_trades(self):
+        equity = simulate_trade_sequences(PNL, 1000.0, n_paths=200, method='shuffle', seed=1)
+        assert equity.shape == (200, len(PNL) + 1)
+        assert np.all(equity[:, 0] == 1000.0)
+        # Every permutation ends at the same equity
+        np.testing.assert_allclose(equity[:, -1], 1000.0 + PNL.sum())
+        steps = np.sort(np.diff(equity, axis=1), axis=1)
+        np.testing.assert_allclose(steps, np.broadcast_to(np.sort(PNL), steps.shape))
+
+    def test_bootstrap_draws_from_trades(self):
+        equity = simulate_trade_sequences(PNL, 1000.0, n_paths=500, method='bootstrap', seed=1)
+        assert np.isin(np.round(np.diff(equity, axis=1), 6), PNL).all()
+        assert np.unique(equity[:, -1]).size > 1
+
+    def test_seed_is_reproducible(self):
+        a = simulate_trade_sequences(PNL, 1000.0, n_paths=50, seed=7)
+        b = simulate_trade_sequences(PNL, 1000.0, n_paths=50, seed=7)
+        np.testing.assert_array_equal(a, b)
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            simulate_trade_sequences(PNL, 1000.0, method='jackknife')
+
+
+class TestRunMonteCarlo:
+    """Percentile bands and risk of ruin"""
+
+    def test_max_drawdowns(self):
+        equity = np.array([[100.0, 120.0, 90.0, 130.0], [100.0, 110.0, 120.0, 130.0]])
+        np.testing.assert_allclose(max_drawdowns(equity), [25.0, 0.0])
+
+    def test_percentiles_are_ordered(self):
+        result = run_monte_carlo(PNL, 1000.0, n_paths=2000, seed=3)
+        ending = list(result['ending_equity'].values())
+        drawdown = list(result['max_drawdown'].values())
+        assert ending == sorted(ending)
+        assert drawdown == sorted(drawdown)
+        assert set(result['bands']) == {'p5', 'p25', 'p50', 'p75', 'p95'}
+        assert len(result['bands']['p50']) == len(PNL) + 1
+
+    def test_risk_of_ruin(self):
+        # Half of the starting capital is lost after two losing trades in a row
+        result = run_monte_carlo([-300.0, 100.0], 1000.0, n_paths=4000, method='bootstrap',
+                                 ruin_fraction=0.5, seed=5)
+        assert result['ruin_level'] == 500.0
+        assert result['risk_of_ruin'] == pytest.approx(0.25, abs=0.03)
+
+        safe = run_monte_carlo([10.0, -5.0], 1000.0, n_paths=1000, seed=5)
+        assert safe['risk_of_ruin'] == 0.0
+
+    def test_no_trades(self):
+        assert run_monte_carlo([], 1000.0) is None
+
+    def test_ten_thousand_paths_are_fast(self):
+        pnl = np.random.default_rng(0).normal(50, 500, 300)
+        started = time.perf_counter()
+        run_monte_carlo(pnl, 100000.0, n_paths=10000, seed=0)
+        assert time.perf_counter() - started < 1.0
@@ -0,0 +1,164 @@
+"""
+Tests for the NumPy performance metrics and the PerformanceRecorder analyzer
+"""
+import pytest
+import numpy as np
+import backtrader as bt
+from unittest.mock import patch
+
+from core.performance import (
+    PerformanceRecorder, compute_performance, daily_excess_returns, drawdown_analysis, extend_running_performance,
+    running_analysis, running_performance, sortino_ratio,
+)
+from core.strategies import ClassicBreakoutStrategy
+from core.tests.helpers import make_ohlcv, run_backtrader
+from core.vectorized import run_vectorized_backtest
+
+
+def run_recorder(df, params=None, preload=True):
+    """Run the Backtrader engine with only the PerformanceRecorder attached."""
+    cerebro = bt.Cerebro(preload=preload)
+    cerebro.addstrategy(ClassicBreakoutStrategy, **(params or {}))
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(100000.0)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.addanalyzer(PerformanceRecorder, _name='performance')
+    with patch('logging.Logger.info'):
+        strategy = cerebro.run()[0]
+    return strategy.analyzers.performance
+
+
+class TestRecorderMatchesBacktraderAnalyzers:
+    """The recorder reproduces the stacked analyzers it replaces."""
+
+    @pytest.mark.parametrize('seed', [0, 1, 3])
+    def test_analyzer_parity(self, seed):
+        df = make_ohlcv(seed)
+        strategy, end_value = run_backtrader(df, {})
+        recorder = run_recorder(df)
+        analysis = recorder.get_analysis()
+
+        bt_trades = strategy.analyzers.trade_analyzer.get_analysis()
+        assert analysis['trade_analyzer']['total'] == dict(bt_trades['total'])
+        assert analysis['trade_analyzer']['won']['total'] == bt_trades['won']['total']
+        assert analysis['trade_analyzer']['pnl']['net']['total'] == pytest.approx(bt_trades['pnl']['net']['total'])
+        assert analysis['trade_analyzer']['len']['max'] == bt_trades['len']['max']
+
+        assert analysis['sqn']['sqn'] == pytest.approx(strategy.analyzers.sqn.get_analysis()['sqn'])
+        bt_drawdown = strategy.analyzers.drawdown.get_analysis()
+        assert analysis['drawdown']['max']['drawdown'] == pytest.approx(bt_drawdown['max']['drawdown'])
+        assert analysis['drawdown']['max']['len'] == bt_drawdown['max']['len']
+        assert analysis['sharpe']['sharperatio'] == pytest.approx(
+            strategy.analyzers.sharpe.get_analysis()['sharperatio']
+        )
+        assert recorder.equity_curve()['values'][-1] == pytest.approx(end_value)
+
+    @pytest.mark.parametrize('seed', [0, 2])
+    def test_vectorized_engine_reports_same_performance(self, seed):
+        df = make_ohlcv(seed)
+        recorder = run_recorder(df)
+        vectorized = run_vectorized_backtest(df)
+
+        expected = recorder.get_analysis()['performance']
+        actual = vectorized['analyzers']['performance']
+        for key in ('total_return', 'sharpe_ratio', 'sortino_ratio', 'max_drawdown',
+                    'max_drawdown_duration', 'win_rate', 'expectancy', 'average_r'):
+            assert actual[key] == pytest.approx(expected[key]), key
+        assert actual['r_multiples'] == pytest.approx(expected['r_multiples'])
+        assert [t['exit_price'] for t in vectorized['trades']] == pytest.approx(
+            [t['exit_price'] for t in recorder.closed_trades()]
+        )
+
+    def test_recorder_grows_without_preload(self):
+        df = make_ohlcv(1, bars=300)
+        preloaded = run_recorder(df).equity_curve()
+        streamed = run_recorder(df, preload=False).equity_curve()
+        assert len(streamed['values']) == len(df)
+        assert streamed == preloaded
+
+    def test_r_multiples_use_initial_stop(self):
+        recorder = run_recorder(make_ohlcv(0))
+        trades = recorder.closed_trades()
+        assert trades
+        for trade in trades:
+            assert trade['r_multiple'] is not None
+            if trade['pnlcomm'] < 0:
+                assert trade['r_multiple'] < 0
+
+
+class TestMetrics:
+    """Metric functions on hand-checked inputs."""
+
+    def test_drawdown_duration(self):
+        equity = np.array([100.0, 110.0, 99.0, 105.0, 111.0, 100.0])
+        analysis = drawdown_analysis(equity)
+        assert analysis['max']['drawdown'] == pytest.approx(10.0)
+        assert analysis['max']['len'] == 2
+        assert analysis['len'] == 1
+
+    def test_sortino_only_penalizes_downside(self):
+        returns = np.array([0.02, -0.01, 0.03, -0.01])
+        downside = np.sqrt(np.mean(np.array([0, -0.01, 0, -0.01]) ** 2))
+        assert sortino_ratio(returns) == pytest.approx(returns.mean() / downside)
+        assert sortino_ratio(np.array([0.01, 0.02])) is None
+
+    def test_daily_returns_use_last_bar_of_day(self):
+        equity = [101.0, 102.0, 104.0]
+        returns = daily_excess_returns(equity, 100.0, days=[1, 1, 2], riskfreerate=0.0)
+        np.testing.assert_allclose(returns, [0.02, 104.0 / 102.0 - 1])
+
+    def test_trade_statistics(self):
+        pnlcomm = np.array([200.0, -100.0, 50.0, -50.0])
+        analysis = compute_performance(
+            [100000.0, 100100.0], 100000.0, pnl=pnlcomm + 1, pnlcomm=pnlcomm,
+            barlen=np.array([3, 2, 5, 1]), risk=np.array([100.0, 100.0, np.nan, 50.0]),
+        )
+        performance = analysis['performance']
+        assert performance['win_rate'] == pytest.approx(50.0)
+        assert performance['expectancy'] == pytest.approx(25.0)
+        assert performance['profit_factor'] == pytest.approx(250.0 / 150.0)
+        assert performance['r_multiples'] == [2.0, -1.0, None, -1.0]
+        assert performance['average_r'] == pytest.approx(0.0)
+        assert analysis['trade_analyzer']['total'] == {'total': 4, 'open': 0, 'closed': 4}
+
+    def test_no_trades(self):
+        analysis = compute_performance([100.0, 100.0], 100.0, [], [], [])
+        assert analysis['trade_analyzer'] == {'total': {'total': 0}}
+        assert analysis['sqn']['sqn'] == 0
+        assert analysis['performance']['expectancy'] == 0.0
+        assert analysis['performance']['average_r'] is None
+
+
+class TestRunningPerformance:
+    """Running metrics extended chunk by chunk match compute_performance."""
+
+    @pytest.mark.parametrize('splits', [[], [1], [7, 8, 40], [3, 50, 99]])
+    def test_matches_full_computation(self, splits):
+        rng = np.random.default_rng(4)
+        equity = 100000.0 * np.cumprod(1 + rng.normal(0, 0.01, 120))
+        days = np.repeat(np.arange(60), 2)  # two bars a day; some splits fall inside a day
+        pnlcomm = rng.normal(10, 100, 12)
+        trade_bars = np.linspace(5, 115, 12).astype(int)
+        risk = np.where(np.arange(12) % 4 == 0, np.nan, 80.0)
+
+        running = running_performance(100000.0)
+        bounds = [0, *splits, len(equity)]
+        for start, end in zip(bounds, bounds[1:]):
+            closed = (trade_bars >= start) & (trade_bars < end)
+            extend_running_performance(running, equity[start:end], days[start:end], pnlcomm[closed] + 1,
+                                       pnlcomm[closed], np.full(closed.sum(), 3), risk[closed])
+
+        expected = compute_performance(equity, 100000.0, pnlcomm + 1, pnlcomm, np.full(12, 3), risk,
+                                       days=days, open_trades=1)
+        actual = running_analysis(running, open_trades=1)
+        assert actual['trade_analyzer'] == expected['trade_analyzer']
+        assert actual['drawdown'] == expected['drawdown']
+        for name in ('total_return', 'sharpe_ratio', 'sortino_ratio', 'max_drawdown', 'max_drawdown_duration',
+                     'sqn', 'win_rate', 'average_r', 'r_multiples'):
+            assert actual['performance'][name] == pytest.approx(expected['performance'][name]), name
+
+    def test_empty(self):
+        analysis = running_analysis(running_performance(100.0))
+        assert analysis['sharpe']['sharperatio'] is None
+        assert analysis['drawdown']['max']['drawdown'] == 0.0
+        assert analysis['performance']['total_return'] == 0.0
@@ -0,0 +1,85 @@
+"""
+Tests for shared-portfolio multi-data backtests
+"""
+import pytest
+from unittest.mock import patch
+
+from core.backtester import get_ohlcv_dataframes, run_backtest, run_portfolio_backtest
+from core.tests.helpers import make_ohlcv, store_bars
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+@pytest.fixture
+def watchlist():
+    """Three tickers; the last one starts trading 100 bars later."""
+    store_bars(make_ohlcv(1, bars=300), 'AAA')
+    store_bars(make_ohlcv(2, bars=300), 'BBB')
+    store_bars(make_ohlcv(3, bars=300).iloc[100:], 'CCC')
+    return ['AAA', 'BBB', 'CCC']
+
+
+def run_quietly(*args, **kwargs):
+    with patch('logging.Logger.info'):
+        return run_portfolio_backtest(*args, **kwargs)
+
+
+@pytest.mark.django_db
+class TestPortfolioBacktest:
+
+    def test_loads_all_tickers_in_one_query(self, watchlist, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            frames = get_ohlcv_dataframes(watchlist + ['NONE'])
+        assert list(frames) == watchlist
+        assert len(frames['CCC']) == 200
+        assert frames['AAA']['close'].dtype == float
+
+    def test_per_symbol_and_portfolio_metrics(self, watchlist):
+        results = run_quietly(watchlist, strategy_params=PARAMS)
+
+        assert results['success'] is True
+        assert set(results['symbols']) == set(watchlist)
+        assert all(t['ticker'] in watchlist for t in results['trades'])
+        assert sum(s['trades'] for s in results['symbols'].values()) == len(results['trades'])
+        assert results['symbols']['CCC']['trades'] > 0  # Later start still trades
+        assert sum(s['pnl_net'] for s in results['symbols'].values()) == pytest.approx(
+            results['analyzers']['trade_analyzer']['pnl']['net']['total'])
+        # Risk-based sizing: stop-outs lose about risk_per_trade of the account
+        assert all(t['size'] > 1 for t in results['trades'])
+        assert all(t['r_multiple'] is not None for t in results['trades'])
+
+    def test_single_symbol_follows_classic_rules(self, watchlist):
+        portfolio = run_quietly(['AAA'], strategy_params=dict(PARAMS, max_portfolio_risk=1.0))
+        with patch('logging.Logger.info'):
+            single = run_backtest('AAA', strategy_params=PARAMS)
+
+        def dates(trades):
+            return [(t['entry_date'], t['exit_date']) for t in trades]
+        assert dates(portfolio['trades']) == dates(single['trades'])
+
+    def test_risk_budget_blocks_entries(self, watchlist):
+        results = run_quietly(watchlist, strategy_params=dict(PARAMS, max_portfolio_risk=0.001))
+        assert results['trades'] == []
+
+    def test_same_bar_breakouts_share_the_cash(self):
+        # Identical feeds break out on the same bars; each entry alone would
+        # take about 70% of the cash
+        df = make_ohlcv(3, bars=300)
+        store_bars(df, 'AAA')
+        store_bars(df, 'BBB')
+        results = run_quietly(['AAA', 'BBB'], strategy_params=dict(PARAMS, risk_per_trade=0.03,
+                                                                   max_portfolio_risk=1.0))
+        assert [e for e in results['events'] if e['type'] == 'order'] == []
+        first, second = results['trades'][:2]
+        assert {first['ticker'], second['ticker']} == {'AAA', 'BBB'}
+        assert first['entry_date'] == second['entry_date']
+        assert 0 < second['size'] < first['size']
+        assert (first['size'] + second['size']) * first['entry_price'] < 100000.0
+
+    def test_missing_tickers(self, watchlist):
+        results = run_quietly(['AAA', 'NONE'], strategy_params=PARAMS)
+        assert results['success'] is True
+        assert results['missing'] == ['NONE']
+
+        results = run_quietly(['NONE'])
+        assert results['success'] is False
@@ -0,0 +1,102 @@
+"""
+Tests for opt-in backtest profiling
+"""
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.backtester import run_backtest, run_parameter_sweep
+from core.profiling import Profiler, phase, profiling
+from core.tests.helpers import make_ohlcv, store_bars
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    settings.BACKTEST_PROFILE_DIR = tmp_path / 'profiles'
+    return settings.BACKTEST_PROFILE_DIR
+
+
+class TestProfiler:
+
+    def test_phase_is_noop_without_profiler(self):
+        assert phase('a') is phase('b')
+        with profiling('off', profile=False) as profiler:
+            assert profiler is None
+
+    def test_nested_phases_and_calls(self):
+        with Profiler('test') as profiler:
+            for _ in range(3):
+                with phase('outer'):
+                    with phase('inner'):
+                        pass
+        report = profiler.report()
+        assert report['phases']['outer']['calls'] == 3
+        assert report['phases']['outer.inner']['calls'] == 3
+        assert report['total'] >= report['phases']['outer']['seconds']
+        # Inactive again once the block exits
+        assert phase('outer') is phase('other')
+
+    def test_nested_entry_points_join_outer_profile(self):
+        with profiling('outer', profile=True) as outer:
+            with profiling('inner', profile=True) as inner:
+                with phase('work'):
+                    pass
+        assert inner is None
+        assert 'work' in outer.report()['phases']
+
+    def test_sampling_records_stacks(self):
+        def busy_loop():
+            total = 0
+            for i in range(3_000_000):
+                total += i
+            return total
+
+        with profiling('sampled', profile='sample') as profiler:
+            busy_loop()
+        sampling = profiler.report()['sampling']
+        assert sampling['samples'] > 0
+        assert any('busy_loop' in entry['function'] for entry in sampling['cumulative'])
+
+    def test_finish_writes_report(self, profile_dir):
+        with Profiler('write me') as profiler:
+            with phase('step'):
+                pass
+        report = profiler.finish()
+        path = Path(report['file'])
+        assert path.parent == profile_dir
+        assert json.loads(path.read_text())['phases']['step']['calls'] == 1
+
+
+@pytest.mark.django_db
+class TestProfiledRuns:
+
+    @pytest.fixture(autouse=True)
+    def bars(self):
+        store_bars(make_ohlcv(1, bars=400), 'PROF')
+
+    def test_run_backtest_phases(self):
+        with patch('logging.Logger.info'):
+            # Text logging (timed as strategy_logging) only happens in verbose mode
+            results = run_backtest('PROF', strategy_params=dict(PARAMS, verbose=True), profile=True)
+        phases = results['profile']['phases']
+        for name in ('load_data', 'load_data.db_query', 'load_data.dataframe', 'cerebro_run',
+                     'cerebro_run.indicator_setup', 'cerebro_run.strategy_logging', 'analyzers'):
+            assert name in phases
+        assert Path(results['profile']['file']).exists()
+
+    def test_disabled_by_default(self, profile_dir):
+        with patch('logging.Logger.info'):
+            results = run_backtest('PROF', strategy_params=PARAMS, engine='vectorized')
+        assert 'profile' not in results
+        assert not profile_dir.exists()
+
+    def test_sweep_profile(self):
+        sweep = run_parameter_sweep('PROF', {'lookback': [10, 20, 30]}, profile=True)
+        report = sweep[0]['result']['profile']
+        assert report['phases']['run']['calls'] == 3
+        assert report['phases']['load_data']['calls'] == 1
+        assert 'run.vectorized.indicators' in report['phases']
+        assert all(entry['result']['profile'] is report for entry in sweep)
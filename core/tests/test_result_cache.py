@@ -0,0 +1,183 @@
+"""
+Tests for the content-addressed backtest result cache
+"""
+import os
+import pytest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from core.backtester import get_data_version, run_backtest
+from core import result_cache
+from core.result_cache import (
+    BacktestResultCache, engine_source_version, make_cache_key, strategy_source_version,
+)
+from core.strategies import ClassicBreakoutStrategy
+from dashboard.models import OHLCVData
+
+
+def key_for(**overrides):
+    """Cache key for a baseline configuration with some components changed."""
+    config = {
+        'ticker': 'AAPL',
+        'start_date': datetime(2023, 1, 1, tzinfo=dt_timezone.utc),
+        'end_date': datetime(2023, 12, 31, tzinfo=dt_timezone.utc),
+        'strategy_class': ClassicBreakoutStrategy,
+        'strategy_params': {'lookback': 50},
+        'initial_cash': 100000.0,
+        'commission': 0.001,
+        'data_version': 'v1',
+    }
+    config.update(overrides)
+    return make_cache_key(**config)
+
+
+class TestCacheKey:
+    """The key changes with every input that affects the result."""
+
+    def test_key_is_stable(self):
+        assert key_for() == key_for()
+        assert key_for(strategy_params={'lookback': 50}) == key_for()
+
+    @pytest.mark.parametrize('override', [
+        {'ticker': 'MSFT'},
+        {'end_date': datetime(2024, 1, 1, tzinfo=dt_timezone.utc)},
+        {'strategy_params': {'lookback': 20}},
+        {'initial_cash': 50000.0},
+        {'commission': 0.002},
+        {'data_version': 'v2'},
+        {'engine': 'vectorized'},
+    ])
+    def test_key_changes(self, override):
+        assert key_for(**override) != key_for()
+
+    def test_strategy_source_version_differs_for_subclass(self):
+        class TweakedBreakout(ClassicBreakoutStrategy):
+            params = (('lookback', 10),)
+
+        assert strategy_source_version(TweakedBreakout) != strategy_source_version(ClassicBreakoutStrategy)
+        assert key_for(strategy_class=TweakedBreakout) != key_for()
+
+    @pytest.mark.parametrize('module', ['core.vectorized', 'core.signals', 'core.strategies'])
+    def test_engine_code_is_part_of_the_version(self, module):
+        real_digest = result_cache._source_digest
+
+        def edited(obj, fallback):
+            digest = real_digest(obj, fallback)
+            return digest + 'edited' if getattr(obj, '__name__', None) == module else digest
+
+        before = strategy_source_version(ClassicBreakoutStrategy)
+        try:
+            strategy_source_version.cache_clear()
+            engine_source_version.cache_clear()
+            with patch('core.result_cache._source_digest', side_effect=edited):
+                assert strategy_source_version(ClassicBreakoutStrategy) != before
+        finally:
+            strategy_source_version.cache_clear()
+            engine_source_version.cache_clear()
+
+
+class TestBacktestResultCache:
+    """Storage, retrieval and eviction."""
+
+    def test_roundtrip(self, tmp_path):
+        cache = BacktestResultCache(directory=tmp_path)
+        result = {'success': True, 'analyzers': {'sqn': {'sqn': 1.5}}, 'start_value': 1.0, 'end_value': 2.0}
+        assert cache.get('ab' * 32) is None
+        assert cache.set('ab' * 32, result) is True
+        assert cache.get('ab' * 32) == result
+
+    def test_persists_across_instances(self, tmp_path):
+        BacktestResultCache(directory=tmp_path).set('cd' * 32, {'success': True})
+        assert BacktestResultCache(directory=tmp_path).get('cd' * 32) == {'success': True}
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = BacktestResultCache(directory=tmp_path, max_bytes=10 ** 6)
+        payload = {'data': 'x' * 4000}
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for age, key in enumerate(keys):
+            cache.set(key, payload)
+            # Make earlier entries older
+            os.utime(cache._path(key), (1000 + age, 1000 + age))
+        cache.get(keys[0])  # Touch the oldest entry
+
+        cache.max_bytes = 9000  # Room for two entries
+        cache.evict()
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        cache = BacktestResultCache(directory=tmp_path)
+        key = 'ef' * 32
+        cache._path(key).parent.mkdir(parents=True)
+        cache._path(key).write_bytes(b'not a pickle')
+        assert cache.get(key) is None
+        assert not cache._path(key).exists()
+
+    def test_unpicklable_result_is_skipped(self, tmp_path):
+        cache = BacktestResultCache(directory=tmp_path)
+        assert cache.set('12' * 32, {'callback': lambda: None}) is False
+
+
+@pytest.mark.django_db
+class TestRunBacktestCaching:
+    """run_backtest memoizes results and invalidates on data changes."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, settings, tmp_path):
+        settings.BACKTEST_CACHE_DIR = tmp_path
+
+    def create_bars(self, ticker, start, count):
+        for i in range(count):
+            price = Decimal(100 + (i % 7))
+            OHLCVData.objects.create(
+                ticker=ticker, timestamp=start + timedelta(days=i),
+                open=price, high=price + 2, low=price - 2, close=price + 1, volume=1000 + i
+            )
+
+    def test_data_version_changes_with_data(self):
+        start = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+        self.create_bars('CACHE', start, 30)
+        version = get_data_version('CACHE')
+        assert get_data_version('CACHE') == version
+        self.create_bars('CACHE', start + timedelta(days=30), 1)
+        assert get_data_version('CACHE') != version
+
+    def test_data_version_changes_with_corrected_bars(self):
+        start = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+        self.create_bars('CACHE', start, 30)
+        for field in ('open', 'high', 'low'):
+            version = get_data_version('CACHE')
+            OHLCVData.objects.filter(ticker='CACHE', timestamp=start).update(**{field: Decimal('150')})
+            assert get_data_version('CACHE') != version, field
+
+    def test_cache_hit_skips_engine(self):
+        self.create_bars('CACHE', datetime(2023, 1, 1, tzinfo=dt_timezone.utc), 40)
+        first = run_backtest('CACHE', engine='vectorized', use_cache=True)
+        assert first['success'] is True
+
+        with patch('core.backtester._execute_backtest') as mock_execute:
+            second = run_backtest('CACHE', engine='vectorized', use_cache=True)
+        mock_execute.assert_not_called()
+        assert second == first
+
+    def test_new_data_invalidates(self):
+        start = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+        self.create_bars('CACHE', start, 40)
+        run_backtest('CACHE', engine='vectorized', use_cache=True)
+        self.create_bars('CACHE', start + timedelta(days=40), 5)
+
+        with patch('core.backtester._execute_backtest',
+                   return_value={'success': True, 'analyzers': {}, 'error': None,
+                                 'start_value': 1.0, 'end_value': 1.0}) as mock_execute:
+            run_backtest('CACHE', engine='vectorized', use_cache=True)
+        mock_execute.assert_called_once()
+
+    @patch('core.backtester._execute_backtest')
+    def test_failures_are_not_cached(self, mock_execute):
+        mock_execute.return_value = {'success': False, 'error': 'boom', 'analyzers': None,
+                                     'start_value': None, 'end_value': None}
+        run_backtest('MISSING', use_cache=True)
+        run_backtest('MISSING', use_cache=True)
+        assert mock_execute.call_count == 2
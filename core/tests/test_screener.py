@@ -0,0 +1,119 @@
+"""
+Tests for the universe-wide breakout screener
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.catalog import rebuild_ticker_catalog, update_ticker_catalog
+from core.screener import load_panels, screen_breakouts
+from core.signals import compute_signals
+from core.tests.helpers import force_breakout, make_ohlcv, store_bars
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+def rounded(df):
+    """The fixture as stored (prices rounded to the model's 4 decimals)."""
+    df = df.copy()
+    df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].round(4)
+    df['volume'] = df['volume'].astype(int)
+    return df
+
+
+@pytest.fixture
+def universe():
+    """Twelve random-walk tickers sharing a calendar, with planted breakouts; one starts late."""
+    frames = {}
+    for seed in range(12):
+        df = make_ohlcv(seed, bars=150)
+        if seed in (0, 3, 6, 9):
+            force_breakout(df, df.index[-1], size=seed + 1)
+        if seed in (1, 4):
+            force_breakout(df, '2015-04-15', size=seed + 1)
+        if seed == 11:
+            df = df.iloc[100:]  # Too short to screen
+        ticker = f"T{seed:02d}"
+        store_bars(df, ticker)
+        frames[ticker] = rounded(df)
+    rebuild_ticker_catalog()
+    return frames
+
+
+@pytest.mark.django_db
+class TestScreener:
+
+    def test_loads_panels_set_based(self, universe, django_assert_num_queries):
+        # The catalog, the bar window and the latest timestamp of each ticker
+        with django_assert_num_queries(3):
+            panels = load_panels(bars=60)
+        assert panels['tickers'] == sorted(universe)
+        assert panels['close'].shape == (60, len(universe))
+        col = panels['tickers'].index('T03')
+        np.testing.assert_allclose(panels['close'][:, col], universe['T03']['close'].iloc[-60:])
+        # Short history is padded at the top
+        assert np.isnan(panels['close'][:10, panels['tickers'].index('T11')]).all()
+
+    @pytest.mark.parametrize('as_of', [None, date(2015, 3, 20), date(2015, 4, 15)])
+    def test_matches_strategy_signals(self, universe, as_of):
+        result = screen_breakouts(bars=150, strategy_params=PARAMS, as_of=as_of)
+
+        expected = {}
+        for ticker, df in universe.items():
+            if as_of is not None:
+                df = df[df.index.date <= as_of]
+            if len(df) <= PARAMS['lookback']:
+                continue
+            signals = compute_signals(df, PARAMS)
+            if signals['breakout'].iloc[-1]:
+                expected[ticker] = signals.iloc[-1]
+
+        assert {c['ticker'] for c in result['candidates']} == set(expected)
+        if as_of != date(2015, 3, 20):
+            assert len(expected) >= 2
+        for candidate in result['candidates']:
+            row = expected[candidate['ticker']]
+            assert candidate['range_high'] == pytest.approx(row['range_high'])
+            assert candidate['atr'] == pytest.approx(row['atr'])
+            assert candidate['stop'] == pytest.approx(candidate['close'] - 2.0 * row['atr'])
+        strengths = [c['strength'] for c in result['candidates']]
+        assert strengths == sorted(strengths, reverse=True)
+
+    def test_windows_are_bounded_by_the_catalog(self, universe):
+        with CaptureQueriesContext(connection) as queries:
+            panels = load_panels(bars=60)
+        windows = [q['sql'] for q in queries if 'ROW_NUMBER' in q['sql']]
+        assert len(windows) == 2 and all('"timestamp" >=' in sql for sql in windows)
+
+        # A stale ticker has no bars after the cutoff and is reloaded without it
+        old = make_ohlcv(50, bars=120)
+        old.index = old.index - pd.Timedelta(days=400)
+        store_bars(old, 'OLD')
+        update_ticker_catalog('OLD', ingested=False)
+        with CaptureQueriesContext(connection) as queries:
+            with_old = load_panels(bars=60)
+        reloads = [q['sql'] for q in queries if 'ROW_NUMBER' in q['sql'] and '"timestamp" >=' not in q['sql']]
+        assert len(reloads) == 2 and all("IN ('OLD')" in sql for sql in reloads)
+        np.testing.assert_allclose(with_old['close'][:, with_old['tickers'].index('OLD')],
+                                   rounded(old)['close'].iloc[-60:])
+        np.testing.assert_allclose(with_old['close'][:, with_old['tickers'].index('T03')],
+                                   panels['close'][:, panels['tickers'].index('T03')])
+
+    def test_stale_and_short_tickers_are_skipped(self, universe):
+        store_bars(make_ohlcv(50, bars=120), 'OLD')  # Ends before the others
+        update_ticker_catalog('OLD', ingested=False)
+        result = screen_breakouts(bars=100, strategy_params=PARAMS)
+        assert result['scanned'] == len(universe)
+        with_stale = screen_breakouts(bars=100, strategy_params=PARAMS, include_stale=True)
+        assert with_stale['scanned'] == len(universe) + 1
+        # T11's 50 bars don't cover a 60-bar consolidation range
+        long_lookback = screen_breakouts(bars=100, strategy_params=dict(PARAMS, lookback=60))
+        assert long_lookback['scanned'] == len(universe) - 1
+
+    def test_no_data(self):
+        result = screen_breakouts()
+        assert result['scanned'] == 0 and result['candidates'] == []
@@ -0,0 +1,61 @@
+"""
+Tests for precomputed signal lines
+"""
+import pytest
+from unittest.mock import patch
+
+from core.backtester import run_backtest, run_parameter_sweep
+from core.signals import SIGNAL_COLUMNS, compute_signals, get_signals
+from core.tests.helpers import make_ohlcv, store_bars
+
+PARAMS = {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2, 'atr_period': 10}
+
+
+class TestComputeSignals:
+
+    def test_columns_and_warmup(self):
+        data = make_ohlcv(1, bars=400)
+        signals = compute_signals(data, PARAMS)
+        assert tuple(signals.columns) == SIGNAL_COLUMNS
+        assert signals.index.equals(data.index)
+        assert set(signals['breakout'].unique()) <= {0.0, 1.0}
+        assert signals['breakout'].iloc[:PARAMS['atr_period']].sum() == 0
+        assert signals['breakout'].sum() > 0
+
+    def test_cached_indicators_give_same_signals(self, indicator_cache):
+        data = make_ohlcv(1, bars=100)
+        cached = get_signals(data, PARAMS, ticker='TEST', data_version='v1', cache=indicator_cache)
+        assert cached.equals(compute_signals(data, PARAMS))
+
+
+@pytest.mark.django_db
+class TestPrecomputedBacktest:
+
+    @pytest.fixture(autouse=True)
+    def bars(self):
+        store_bars(make_ohlcv(1, bars=400), 'SIG')
+
+    def test_matches_indicator_run(self):
+        with patch('logging.Logger.info'):
+            regular = run_backtest('SIG', strategy_params=PARAMS)
+            precomputed = run_backtest('SIG', strategy_params=PARAMS, precompute_signals=True)
+
+        assert precomputed['success']
+        assert len(precomputed['trades']) == len(regular['trades']) > 0
+        assert precomputed['trades'] == regular['trades']
+        assert precomputed['end_value'] == pytest.approx(regular['end_value'])
+        assert precomputed['equity_curve'] == regular['equity_curve']
+        assert precomputed['analyzers']['performance'] == regular['analyzers']['performance']
+
+    def test_backtrader_sweep_matches_single_runs(self):
+        grid = {'lookback': [20], 'trail_stop_atr_mult': [2.0, 3.0, 4.0]}
+        with patch('logging.Logger.info'):
+            sweep = run_parameter_sweep('SIG', grid, engine='backtrader')
+        with patch('logging.Logger.info'):
+            single = run_backtest('SIG', strategy_params={'lookback': 20, 'trail_stop_atr_mult': 4.0})
+        assert sweep[-1]['result']['trades'] == single['trades']
+
+    def test_requires_backtrader_engine(self):
+        results = run_backtest('SIG', engine='vectorized', precompute_signals=True)
+        assert not results['success']
+        assert 'Precomputed signals' in results['error']
@@ -8,7 +8,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
-from core.strategies import ClassicBreakoutStrategy
+from core.strategies import ClassicBreakoutStrategy, PriorRange
+from core.tests.helpers import ClosedTradeRecorder, make_ohlcv
 
 
 class TestClassicBreakoutStrategy:
@@ -217,3 +218,70 @@ class TestClassicBreakoutStrategy:
         assert strategy.params.atr_period == 10
         assert strategy.params.initial_stop_atr_mult == 1.5
         assert strategy.params.trail_stop_atr_mult == 2.5
+
+
+class RangeRecorder(bt.Strategy):
+    """Records PriorRange next to the list-based range the strategy used to build."""
+    params = (('period', 20), ('compare', True))
+
+    def __init__(self):
+        self.range = PriorRange(self.data, period=self.p.period)
+        self.rows = []
+
+    def next(self):
+        actual = (self.range.range_high[0], self.range.range_low[0])
+        expected = None
+        if self.p.compare:
+            bars = range(1, min(self.p.period + 1, len(self)))
+            expected = (max([self.data.high[-i] for i in bars]), min([self.data.low[-i] for i in bars]))
+        self.rows.append((len(self), actual, expected))
+
+
+class ListRangeBreakoutStrategy(ClassicBreakoutStrategy):
+    """ClassicBreakoutStrategy with the original list-based consolidation range."""
+
+    def next(self):
+        if self.order or self.position:
+            return super().next()
+        high_range = max([self.datahigh[-i] for i in range(1, min(self.p.lookback + 1, len(self)))])
+        if self.dataclose[0] > high_range and self.datavolume[0] > self.vol_ma[0] * self.p.volume_mult:
+            self.order = self.buy()
+
+
+class TestPriorRange:
+    """PriorRange reproduces the list-based consolidation range exactly."""
+
+    def run_recorder(self, df, period, **cerebro_kwargs):
+        cerebro = bt.Cerebro(stdstats=False, **cerebro_kwargs)
+        cerebro.addstrategy(RangeRecorder, period=period,
+                            compare=not cerebro_kwargs.get('exactbars'))
+        cerebro.adddata(bt.feeds.PandasData(dataname=df))
+        return cerebro.run()[0].rows
+
+    @pytest.mark.parametrize('period', [1, 5, 50])
+    @pytest.mark.parametrize('mode', [{}, {'runonce': False}, {'preload': False}])
+    def test_matches_list_logic(self, period, mode):
+        rows = self.run_recorder(make_ohlcv(4, bars=300), period, **mode)
+        assert len(rows) == 299  # First value after one previous bar
+        for length, actual, expected in rows:
+            assert actual == expected, f"bar {length}"
+
+    def test_bounded_buffers(self):
+        df = make_ohlcv(4, bars=300)
+        full = self.run_recorder(df, 50)
+        bounded = self.run_recorder(df, 50, exactbars=1)
+        assert [row[1] for row in bounded] == [row[1] for row in full]
+
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    @pytest.mark.parametrize('params', [{}, {'lookback': 20, 'volume_ma_period': 10, 'volume_mult': 1.2}])
+    def test_strategy_signals_unchanged(self, seed, params):
+        trades = []
+        for strategy_class in (ClassicBreakoutStrategy, ListRangeBreakoutStrategy):
+            cerebro = bt.Cerebro()
+            cerebro.addstrategy(strategy_class, **params)
+            cerebro.adddata(bt.feeds.PandasData(dataname=make_ohlcv(seed)))
+            cerebro.addanalyzer(ClosedTradeRecorder, _name='closed_trades')
+            with patch('logging.Logger.info'):
+                trades.append(cerebro.run()[0].analyzers.closed_trades.get_analysis())
+        assert trades[0] == trades[1]
+        assert trades[0]
@@ -0,0 +1,125 @@
+"""
+Tests for the vectorized Classic Breakout engine, including parity checks
+against the Backtrader engine on shared fixtures.
+"""
+import pytest
+import numpy as np
+import backtrader as bt
+from unittest.mock import patch
+
+from core.backtester import run_backtest, run_parameter_sweep
+from core.tests.helpers import PARITY_PARAMS, make_ohlcv, run_backtrader
+from core.vectorized import (
+    average_true_range, prior_rolling_max, run_vectorized_backtest, simulate_breakout,
+)
+
+
+class TestVectorizedIndicators:
+    """Indicator helpers match the values Backtrader computes."""
+
+    def test_prior_rolling_max_excludes_current_bar(self):
+        values = np.array([1.0, 5.0, 3.0, 2.0, 4.0])
+        result = prior_rolling_max(values, 2)
+        assert np.isnan(result[0])
+        np.testing.assert_allclose(result[1:], [1.0, 5.0, 5.0, 3.0])
+
+    def test_atr_matches_backtrader(self):
+        df = make_ohlcv(7, bars=120)
+        strategy, _ = run_backtrader(df, {})
+        bt_atr = np.array(strategy.atr.array)
+        atr = average_true_range(df['high'], df['low'], df['close'], 14)
+        mask = ~np.isnan(atr)
+        np.testing.assert_allclose(atr[mask], bt_atr[mask], rtol=1e-9)
+
+
+class TestVectorizedParity:
+    """Trades, PnL and analyzer output match the Backtrader engine."""
+
+    @pytest.mark.parametrize('seed', [0, 1, 2, 3])
+    @pytest.mark.parametrize('params', PARITY_PARAMS)
+    def test_trades_and_pnl_match(self, seed, params):
+        df = make_ohlcv(seed)
+        strategy, bt_end_value = run_backtrader(df, params)
+
+        sim = simulate_breakout(df, params)
+        closed = [
+            (t['entry_price'], t['pnl'], t['pnlcomm'], t['barlen'])
+            for t in sim['trades'] if t['exit_bar'] is not None
+        ]
+        bt_closed = strategy.analyzers.closed_trades.get_analysis()
+
+        assert len(closed) == len(bt_closed)
+        if closed:
+            np.testing.assert_allclose(np.array(closed), np.array(bt_closed), rtol=1e-9)
+        assert sim['equity'][-1] == pytest.approx(bt_end_value, rel=1e-12)
+
+    @pytest.mark.parametrize('seed', [0, 3])
+    def test_analyzers_match(self, seed):
+        df = make_ohlcv(seed)
+        strategy, bt_end_value = run_backtrader(df, {})
+        result = run_vectorized_backtest(df)
+
+        assert result['success'] is True
+        assert result['end_value'] == pytest.approx(bt_end_value)
+        analyzers = result['analyzers']
+
+        bt_trades = strategy.analyzers.trade_analyzer.get_analysis()
+        assert analyzers['trade_analyzer']['total'] == dict(bt_trades['total'])
+        assert analyzers['trade_analyzer']['pnl']['net']['total'] == pytest.approx(bt_trades['pnl']['net']['total'])
+        assert analyzers['trade_analyzer']['won']['total'] == bt_trades['won']['total']
+
+        assert analyzers['sqn']['sqn'] == pytest.approx(strategy.analyzers.sqn.get_analysis()['sqn'])
+        bt_drawdown = strategy.analyzers.drawdown.get_analysis()
+        assert analyzers['drawdown']['max']['drawdown'] == pytest.approx(bt_drawdown['max']['drawdown'])
+        assert analyzers['drawdown']['max']['len'] == bt_drawdown['max']['len']
+        assert analyzers['sharpe']['sharperatio'] == pytest.approx(
+            strategy.analyzers.sharpe.get_analysis()['sharperatio']
+        )
+
+    def test_no_trades(self):
+        df = make_ohlcv(0, bars=15)
+        result = run_vectorized_backtest(df)
+        assert result['success'] is True
+        assert result['analyzers']['trade_analyzer'] == {'total': {'total': 0}}
+        assert result['end_value'] == pytest.approx(100000.0)
+
+
+class TestRunBacktestEngineOption:
+    """run_backtest dispatches to the vectorized engine."""
+
+    @patch('core.backtester.get_ohlcv_dataframe')
+    def test_vectorized_engine(self, mock_get_df):
+        mock_get_df.return_value = make_ohlcv(1)
+        result = run_backtest('AAPL', engine='vectorized')
+        assert result['success'] is True
+        assert set(result['analyzers']) == {'trade_analyzer', 'sqn', 'drawdown', 'sharpe', 'performance'}
+        mock_get_df.assert_called_once_with('AAPL', None, None)
+
+    @patch('core.backtester.get_ohlcv_dataframe', return_value=None)
+    def test_vectorized_engine_no_data(self, mock_get_df):
+        result = run_backtest('NONEXISTENT', engine='vectorized')
+        assert result['success'] is False
+        assert result['analyzers'] is None
+
+    def test_unknown_engine(self):
+        result = run_backtest('AAPL', engine='quantum')
+        assert result['success'] is False
+        assert 'quantum' in result['error']
+
+    def test_vectorized_engine_rejects_other_strategies(self):
+        result = run_backtest('AAPL', strategy_class=bt.Strategy, engine='vectorized')
+        assert result['success'] is False
+        assert 'ClassicBreakoutStrategy' in result['error']
+
+    @patch('core.backtester.aligned_features', return_value=None)
+    @patch('core.backtester.get_data_version', return_value='v1')
+    @patch('core.backtester.get_ohlcv_dataframe')
+    def test_parameter_sweep_loads_data_once(self, mock_get_df, mock_version, mock_features):
+        mock_get_df.return_value = make_ohlcv(2)
+        grid = {'lookback': [20, 50], 'trail_stop_atr_mult': [2.0, 3.0]}
+        results = run_parameter_sweep('AAPL', grid)
+
+        assert len(results) == 4
+        assert mock_get_df.call_count == 1
+        assert results[0]['params'] == {'lookback': 20, 'trail_stop_atr_mult': 2.0}
+        assert all(r['result']['success'] for r in results)
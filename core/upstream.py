@@ -0,0 +1,77 @@
+"""
+Calling blocking upstream APIs (Alpaca, Gemini) from async views.
+
+The Alpaca and Gemini clients are synchronous and can take seconds to
+answer. Async views run them through ``call_upstream`` instead of blocking
+a worker for the whole call:
+1. Calls run on a dedicated pool of ``UPSTREAM_MAX_WORKERS`` threads, kept
+   separate from the thread that serves Django's ORM (``sync_to_async``),
+   so slow upstreams can't delay database work or take more threads
+2. Each call waits at most ``UPSTREAM_TIMEOUT_SECONDS``. A call still queued
+   when it times out is cancelled. A call that is already running finishes
+   in the background, but it keeps only its own pool thread and never
+   blocks the event loop
+3. ``UpstreamTimeout`` tells the view to answer with an error instead of
+   waiting any longer
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class UpstreamTimeout(Exception):
+    """An upstream call did not finish within its timeout."""
+
+
+def _upstream_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.UPSTREAM_MAX_WORKERS,
+                                           thread_name_prefix='upstream')
+        return _executor
+
+
+def shutdown_upstream_executor(wait=True):
+    """Stop the upstream thread pool; the next call starts a new one (e.g. after a settings change)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+async def call_upstream(func, *args, timeout=None, **kwargs):
+    """
+    Run a blocking upstream call on the upstream thread pool.
+
+    Parameters:
+        func (callable): Blocking function, e.g. ``get_latest_quote``
+        *args, **kwargs: Its arguments
+        timeout (float): Seconds to wait (default: settings.UPSTREAM_TIMEOUT_SECONDS)
+
+    Returns:
+        The function's result.
+
+    Raises:
+        UpstreamTimeout: If the call did not finish in time.
+    """
+    timeout = settings.UPSTREAM_TIMEOUT_SECONDS if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_upstream_executor(), functools.partial(func, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        name = getattr(func, '__name__', repr(func))
+        logger.warning(f"Upstream call {name} timed out after {timeout}s")
+        raise UpstreamTimeout(f"{name} did not answer within {timeout:g} seconds") from None
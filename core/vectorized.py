@@ -0,0 +1,547 @@
+"""
+Vectorized backtest engine for the Classic Breakout strategy.
+
+This module reproduces the trading rules of ``ClassicBreakoutStrategy`` with
+NumPy array operations instead of Backtrader's per-bar event loop:
+1. Indicators (consolidation range, volume MA, ATR) are computed over the
+   whole series at once
+2. Entry signals are evaluated as a single boolean mask
+3. A tight stop-tracking pass jumps from signal to signal and resolves each
+   trade's Chandelier exit with array operations over the bars it spans
+
+Execution follows Backtrader's defaults so results match the event-driven
+engine: market orders fill at the next bar's open, the default sizer buys a
+fixed stake, and commission is charged as a percentage of traded value.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from core.performance import ANALYZER_KEYS, compute_performance, equity_curve_payload, trade_records
+from core.profiling import phase
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default parameters, mirroring ClassicBreakoutStrategy.params
+DEFAULT_PARAMS = {
+    'lookback': 50,
+    'volume_ma_period': 20,
+    'volume_mult': 1.5,
+    'atr_period': 14,
+    'initial_stop_atr_mult': 2.0,
+    'trail_stop_atr_mult': 3.0,
+}
+
+# Initial window (in bars) used when searching for a trade's exit
+EXIT_SEARCH_WINDOW = 256
+
+
+def prior_rolling_max(values, window):
+    """
+    Highest value over the previous ``window`` bars, excluding the current bar.
+
+    The window expands from the start of the series until ``window`` bars are
+    available, matching the consolidation range used by the strategy.
+    """
+    return pd.Series(values).shift(1).rolling(window, min_periods=1).max().to_numpy()
+
+
+def prior_rolling_min(values, window):
+    """Lowest value over the previous ``window`` bars, excluding the current bar."""
+    return pd.Series(values).shift(1).rolling(window, min_periods=1).min().to_numpy()
+
+
+def simple_moving_average(values, period):
+    """Simple moving average; the first ``period - 1`` values are NaN."""
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        result[period - 1:] = windows.sum(axis=1) / period
+    return result
+
+
+def average_true_range(high, low, close, period, seed=None):
+    """
+    Wilder's Average True Range, seeded like Backtrader's ``ATR`` indicator.
+
+    The first value (at index ``period``) is the simple average of the first
+    ``period`` true ranges; later values use Wilder smoothing (alpha = 1/period).
+
+    With ``seed`` (the ATR value at bar 0, e.g. from a checkpoint) smoothing
+    continues from that value instead, so the result matches the tail of an
+    ATR computed over the full history.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    result = np.full(len(close), np.nan)
+    prev_close = close[:-1]
+    true_range = np.maximum(high[1:], prev_close) - np.minimum(low[1:], prev_close)
+
+    if seed is not None:
+        if len(close):
+            values = np.concatenate(([seed], true_range))
+            result[:] = pd.Series(values).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+        return result
+
+    if len(close) <= period:
+        return result
+
+    # Seed with the SMA of the first `period` true ranges, then smooth
+    smoothed = true_range[period - 1:].copy()
+    smoothed[0] = true_range[:period].sum() / period
+    result[period:] = pd.Series(smoothed).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    return result
+
+
+def first_tradable_bar(params):
+    """
+    Index of the first bar on which the strategy's ``next`` runs.
+
+    Backtrader calls ``next`` once every indicator has produced a value:
+    ATR needs ``atr_period + 1`` bars and the volume SMA ``volume_ma_period``.
+    """
+    return max(params['atr_period'], params['volume_ma_period'] - 1)
+
+
+def compute_breakout_indicators(high, low, volume, close, params):
+    """
+    Compute all indicator arrays used by the Classic Breakout rules.
+
+    Returns:
+        dict: 'range_high', 'range_low', 'vol_ma' and 'atr' arrays
+    """
+    return {
+        'range_high': prior_rolling_max(high, params['lookback']),
+        'range_low': prior_rolling_min(low, params['lookback']),
+        'vol_ma': simple_moving_average(volume, params['volume_ma_period']),
+        'atr': average_true_range(high, low, close, params['atr_period']),
+    }
+
+
+def breakout_signals(close, volume, range_high, vol_ma, volume_mult, start=0):
+    """
+    Boolean mask of bars that close above the consolidation range on high volume.
+
+    Bars before ``start`` (indicator warm-up) are always False.
+    """
+    with np.errstate(invalid='ignore'):
+        signals = (close > range_high) & (volume > vol_ma * volume_mult)
+    signals[:start] = False
+    return signals
+
+
+def find_exit_signal(high, close, atr, start, highest, stop, trail_mult):
+    """
+    Locate the bar on which the Chandelier trailing stop is hit.
+
+    Starting at bar ``start`` with the running ``highest`` high and current
+    ``stop``, the stop is raised on every new high to
+    ``highest - ATR * trail_mult`` (never lowered), and the exit signal fires
+    on the first close below it.
+
+    Returns:
+        tuple: (exit signal bar index or None, highest high, stop price) where
+               highest and stop are the values at the exit bar (or at the end
+               of the data if the stop is never hit).
+    """
+    n = len(close)
+    window = EXIT_SEARCH_WINDOW
+    while True:
+        end = min(n, start + window)
+        seg_high = high[start:end]
+
+        # Running highest high *before* each bar of the segment
+        running = np.maximum.accumulate(np.concatenate(([highest], seg_high)))
+        new_high = seg_high > running[:-1]
+
+        # Candidate stops only on bars that print a new high
+        candidates = np.where(new_high, seg_high - atr[start:end] * trail_mult, -np.inf)
+        stops = np.maximum(np.maximum.accumulate(candidates), stop)
+
+        hits = np.flatnonzero(close[start:end] < stops)
+        if hits.size:
+            k = hits[0]
+            return start + k, running[k + 1], stops[k]
+        if end == n:
+            return None, running[-1], stops[-1] if len(stops) else stop
+        window *= 2
+
+
+def breakout_params(params=None):
+    """Strategy parameters merged over ``DEFAULT_PARAMS``."""
+    p = dict(DEFAULT_PARAMS)
+    if params:
+        p.update(params)
+    return p
+
+
+def checkpoint_window(params):
+    """
+    Number of trailing bars a checkpoint keeps to resume the simulation.
+
+    Enough for the consolidation range and volume MA of the next bar and the
+    true range of the first new bar.
+    """
+    return max(params['lookback'], params['volume_ma_period'], params['atr_period']) + 1
+
+
+def _ohlcv_arrays(data):
+    """Float arrays of the OHLCV columns of a DataFrame."""
+    return tuple(data[column].to_numpy(dtype=float) for column in ('open', 'high', 'low', 'close', 'volume'))
+
+
+def simulate_breakout(data, params=None, initial_cash=100000.0, commission=0.001, stake=1, indicators=None):
+    """
+    Run the Classic Breakout rules over a full OHLCV DataFrame.
+
+    Parameters:
+        data (pd.DataFrame): OHLCV data indexed by timestamp with lowercase
+                             'open', 'high', 'low', 'close', 'volume' columns.
+        params (dict): Strategy parameters (defaults from ClassicBreakoutStrategy).
+        initial_cash (float): Starting cash.
+        commission (float): Commission rate as a fraction of traded value.
+        stake (int): Fixed position size, Backtrader's default sizer stake.
+        indicators (dict): Optional precomputed ``compute_breakout_indicators``
+                           arrays (e.g. from ``core.indicator_cache``).
+
+    Returns:
+        dict: 'trades' (list of trade dicts), 'equity' (portfolio value per
+              bar), 'cash' (final cash), 'position' (final position size) and
+              'checkpoint' (state for ``resume_breakout``).
+    """
+    p = breakout_params(params)
+    open_, high, low, close, volume = _ohlcv_arrays(data)
+
+    with phase('indicators'):
+        ind = indicators or compute_breakout_indicators(high, low, volume, close, p)
+        start = first_tradable_bar(p)
+        signal_bars = np.flatnonzero(
+            breakout_signals(close, volume, ind['range_high'], ind['vol_ma'], p['volume_mult'], start)
+        )
+
+    with phase('trades'):
+        run = _breakout_trades(open_, high, close, ind['atr'], signal_bars, data.index, p,
+                               initial_cash, commission, stake, start)
+    trades = run['trades']
+    return {
+        'trades': trades,
+        'equity': _equity_curve(close, trades, initial_cash),
+        'cash': run['cash'],
+        'position': run['open_trade']['size'] if run['open_trade'] else 0,
+        'checkpoint': _make_checkpoint(data, len(data), ind['atr'], run, p),
+    }
+
+
+def resume_breakout(checkpoint, new_data, params=None, commission=0.001, stake=1):
+    """
+    Continue a simulation over bars appended after a checkpoint.
+
+    Only the checkpoint's trailing window and the new bars are processed, so
+    the cost grows with the number of new bars rather than the history.
+    Results match running ``simulate_breakout`` over the full history.
+
+    Parameters:
+        checkpoint (dict): 'checkpoint' from ``simulate_breakout`` or a
+                           previous ``resume_breakout`` call.
+        new_data (pd.DataFrame): OHLCV bars after the checkpoint, oldest first.
+        params (dict): The strategy parameters of the original run.
+        commission (float): Commission rate as a fraction of traded value.
+        stake (int): Fixed position size.
+
+    Returns:
+        dict: 'trades' (trades opened or closed in the new bars, with bar
+              indices counted from the start of the full history), 'equity'
+              (portfolio value per new bar), 'cash', 'position' and
+              'checkpoint' (state after the new bars).
+    """
+    p = breakout_params(params)
+    tail = pd.DataFrame(
+        {column: checkpoint['tail'][column] for column in ('open', 'high', 'low', 'close', 'volume')},
+        index=pd.DatetimeIndex(checkpoint['tail']['timestamp'])
+    )
+    data = pd.concat([tail, new_data[tail.columns]])
+    open_, high, low, close, volume = _ohlcv_arrays(data)
+    tail_len = len(tail)
+    # Absolute index of the first bar in `data`
+    offset = checkpoint['bars'] - tail_len
+
+    ind = compute_breakout_indicators(high, low, volume, close, p)
+    atr = ind['atr']
+    if checkpoint['atr'] is not None:
+        # Continue Wilder smoothing from the checkpoint's last ATR value
+        atr = np.full(len(close), np.nan)
+        atr[tail_len - 1:] = average_true_range(
+            high[tail_len - 1:], low[tail_len - 1:], close[tail_len - 1:], p['atr_period'],
+            seed=checkpoint['atr']
+        )
+    start = max(first_tradable_bar(p) - offset, 0)
+    signal_bars = np.flatnonzero(
+        breakout_signals(close, volume, ind['range_high'], ind['vol_ma'], p['volume_mult'], start)
+    )
+
+    open_trade = checkpoint['open_trade']
+    if open_trade is not None:
+        open_trade = dict(open_trade, entry_bar=open_trade['entry_bar'] - offset,
+                          entry_date=pd.Timestamp(open_trade['entry_date']))
+        i = tail_len
+    else:
+        # A signal on the checkpoint's last bar fills on the first new bar
+        i = max(tail_len - 1, start)
+
+    run = _breakout_trades(open_, high, close, atr, signal_bars, data.index, p,
+                           checkpoint['cash'], commission, stake, i,
+                           open_trade=open_trade, exit_pending=checkpoint['exit_pending'])
+    trades = run['trades']
+    equity = _equity_curve(close[tail_len:], trades, checkpoint['cash'],
+                           initial_position=checkpoint['position'], offset=tail_len)
+
+    new_checkpoint = _make_checkpoint(data, checkpoint['bars'] + len(new_data), atr, run, p, offset=offset)
+
+    for trade in trades:
+        trade['entry_bar'] += offset
+        if trade['exit_bar'] is not None:
+            trade['exit_bar'] += offset
+
+    return {
+        'trades': trades,
+        'equity': equity,
+        'cash': run['cash'],
+        'position': new_checkpoint['position'],
+        'checkpoint': new_checkpoint,
+    }
+
+
+def _breakout_trades(open_, high, close, atr, signal_bars, index, p, cash, commission, stake, i,
+                     open_trade=None, exit_pending=False):
+    """
+    Resolve entries and Chandelier exits from bar ``i`` onwards.
+
+    ``open_trade`` (with its running 'highest_high' and 'trailing_stop')
+    resumes a position carried over from a checkpoint; ``exit_pending`` means
+    its exit signal fired on bar ``i - 1`` and the sell fills on bar ``i``.
+
+    Returns:
+        dict: 'trades', final 'cash', 'open_trade' (the position still held
+              at the end, or None) and 'exit_pending'.
+    """
+    n = len(close)
+    trades = []
+    trade = open_trade
+    while True:
+        if trade is None:
+            # Next entry signal at or after bar i; the order fills on the following open
+            pos = np.searchsorted(signal_bars, i)
+            if pos == len(signal_bars):
+                break
+            entry_bar = signal_bars[pos] + 1
+            if entry_bar >= n:
+                break
+
+            entry_price = open_[entry_bar]
+            entry_comm = abs(stake) * entry_price * commission
+            if entry_price * stake + entry_comm > cash:
+                # Broker rejects the order for lack of cash; strategy keeps scanning
+                i = entry_bar
+                continue
+            cash -= entry_price * stake + entry_comm
+
+            initial_stop = entry_price - atr[entry_bar] * p['initial_stop_atr_mult']
+            trade = {
+                'entry_bar': int(entry_bar),
+                'entry_date': index[entry_bar],
+                'entry_price': entry_price,
+                'size': stake,
+                'initial_stop': initial_stop,
+                'entry_commission': entry_comm,
+                'highest_high': high[entry_bar],
+                'trailing_stop': initial_stop,
+            }
+            i = entry_bar
+
+        if exit_pending:
+            exit_signal = i - 1
+            exit_pending = False
+        else:
+            exit_signal, trade['highest_high'], trade['trailing_stop'] = find_exit_signal(
+                high, close, atr, i, trade['highest_high'], trade['trailing_stop'], p['trail_stop_atr_mult']
+            )
+
+        if exit_signal is None or exit_signal + 1 >= n:
+            # Still in the market when the data runs out
+            trade.update({'exit_bar': None, 'exit_date': None, 'exit_price': None,
+                          'exit_commission': 0.0, 'commission': trade['entry_commission'],
+                          'pnl': None, 'pnlcomm': None, 'barlen': None})
+            trades.append(trade)
+            return {'trades': trades, 'cash': cash, 'open_trade': trade,
+                    'exit_pending': exit_signal is not None}
+
+        exit_bar = exit_signal + 1
+        exit_price = open_[exit_bar]
+        exit_comm = abs(trade['size']) * exit_price * commission
+        cash += exit_price * trade['size'] - exit_comm
+        pnl = (exit_price - trade['entry_price']) * trade['size']
+        trade.update({
+            'exit_bar': int(exit_bar),
+            'exit_date': index[exit_bar],
+            'exit_price': exit_price,
+            'exit_commission': exit_comm,
+            'commission': trade['entry_commission'] + exit_comm,
+            'pnl': pnl,
+            'pnlcomm': pnl - trade['entry_commission'] - exit_comm,
+            'barlen': int(exit_bar - trade['entry_bar']),
+        })
+        trades.append(trade)
+        # The strategy is flat again from the exit bar onwards
+        trade = None
+        i = exit_bar
+
+    return {'trades': trades, 'cash': cash, 'open_trade': None, 'exit_pending': False}
+
+
+def _make_checkpoint(data, bars, atr, run, p, offset=0):
+    """
+    JSON-serializable simulation state after the last bar of ``data``.
+
+    Holds the trailing window of bars the indicators need, the last ATR
+    value, cash and any open position (bar indices counted from the start
+    of the full history; ``offset`` is the absolute index of ``data``'s
+    first bar).
+    """
+    tail = data.iloc[-checkpoint_window(p):]
+    last_atr = atr[-1] if len(atr) else np.nan
+    open_trade = None
+    if run['open_trade'] is not None:
+        trade = run['open_trade']
+        open_trade = {
+            'entry_bar': int(trade['entry_bar']) + offset,
+            'entry_date': pd.Timestamp(trade['entry_date']).isoformat(),
+            'entry_price': float(trade['entry_price']),
+            'size': trade['size'],
+            'initial_stop': float(trade['initial_stop']),
+            'entry_commission': float(trade['entry_commission']),
+            'highest_high': float(trade['highest_high']),
+            'trailing_stop': float(trade['trailing_stop']),
+        }
+    return {
+        'bars': int(bars),
+        'tail': {
+            'timestamp': [ts.isoformat() for ts in pd.DatetimeIndex(tail.index)],
+            **{column: [float(v) for v in tail[column]] for column in ('open', 'high', 'low', 'close', 'volume')},
+        },
+        'atr': None if np.isnan(last_atr) else float(last_atr),
+        'cash': float(run['cash']),
+        'position': open_trade['size'] if open_trade else 0,
+        'open_trade': open_trade,
+        'exit_pending': bool(run['exit_pending']),
+    }
+
+
+def _equity_curve(close, trades, initial_cash, initial_position=0, offset=0):
+    """
+    Portfolio value (cash + marked-to-market position) at every bar's close.
+
+    Trade bar indices are shifted by ``offset`` relative to ``close``; cash
+    flows of bars before the first one (a position carried in as
+    ``initial_position``) are already part of ``initial_cash``.
+    """
+    n = len(close)
+    cash_flow = np.zeros(n)
+    position_change = np.zeros(n)
+    for t in trades:
+        entry_bar = t['entry_bar'] - offset
+        if entry_bar >= 0:
+            cash_flow[entry_bar] -= t['entry_price'] * t['size'] + t['entry_commission']
+            position_change[entry_bar] += t['size']
+        if t['exit_bar'] is not None:
+            exit_bar = t['exit_bar'] - offset
+            cash_flow[exit_bar] += t['exit_price'] * t['size'] - t['exit_commission']
+            position_change[exit_bar] -= t['size']
+    cash = initial_cash + np.cumsum(cash_flow)
+    position = initial_position + np.cumsum(position_change)
+    return cash + position * close
+
+
+def run_vectorized_backtest(data, strategy_params=None, initial_cash=100000.0, commission=0.001,
+                            indicators=None):
+    """
+    Run the Classic Breakout rules with the vectorized engine.
+
+    Parameters:
+        data (pd.DataFrame): OHLCV data indexed by timestamp.
+        strategy_params (dict): Optional ClassicBreakoutStrategy parameters.
+        initial_cash (float): Initial cash amount for the backtest.
+        commission (float): Commission rate (e.g., 0.001 for 0.1%).
+        indicators (dict): Optional precomputed indicator arrays.
+
+    Returns:
+        dict: Same shape as ``core.backtester.run_backtest``: 'success',
+              'analyzers', 'error', 'start_value', 'end_value',
+              'equity_curve' and 'trades'.
+    """
+    unknown = set(strategy_params or {}) - set(DEFAULT_PARAMS)
+    if unknown:
+        error_msg = f"Unsupported strategy parameters for vectorized engine: {sorted(unknown)}"
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg, 'analyzers': None,
+                'start_value': initial_cash, 'end_value': None}
+
+    sim = simulate_breakout(data, strategy_params, initial_cash, commission, indicators=indicators)
+    equity = sim['equity']
+    end_value = float(equity[-1]) if len(equity) else initial_cash
+    logger.info(
+        f"Vectorized backtest complete: {len(sim['trades'])} trades, "
+        f"final portfolio value {end_value:.2f}"
+    )
+
+    return vectorized_result(data.index, equity, sim['trades'], initial_cash)
+
+
+def vectorized_result(index, equity, trades, initial_cash):
+    """
+    Build the ``run_backtest`` result dictionary from a simulation.
+
+    Parameters:
+        index (array): Timestamp of every bar.
+        equity (array): Portfolio value at every bar.
+        trades (list): Trade dicts; open trades have ``exit_bar`` None.
+        initial_cash (float): Initial cash amount.
+
+    Returns:
+        dict: 'success', 'analyzers', 'error', 'start_value', 'end_value',
+              'equity_curve' and 'trades'.
+    """
+    equity = np.asarray(equity, dtype=float)
+    end_value = float(equity[-1]) if len(equity) else initial_cash
+    closed = [t for t in trades if t['exit_bar'] is not None]
+    columns = {
+        'entry_date': [t['entry_date'] for t in closed],
+        'exit_date': [t['exit_date'] for t in closed],
+        'entry_price': np.array([t['entry_price'] for t in closed], dtype=float),
+        'size': np.array([t['size'] for t in closed], dtype=float),
+        'pnl': np.array([t['pnl'] for t in closed], dtype=float),
+        'pnlcomm': np.array([t['pnlcomm'] for t in closed], dtype=float),
+        'barlen': np.array([t['barlen'] for t in closed], dtype=float),
+        'risk': np.array([(t['entry_price'] - t['initial_stop']) * t['size'] for t in closed], dtype=float),
+    }
+    with phase('metrics'):
+        analysis = compute_performance(
+            equity, initial_cash, columns['pnl'], columns['pnlcomm'], columns['barlen'], columns['risk'],
+            days=pd.DatetimeIndex(index).normalize(),
+            open_trades=len(trades) - len(closed),
+        )
+    analyzers = {name: analysis[name] for name in ANALYZER_KEYS}
+    analyzers['performance'] = analysis['performance']
+
+    return {
+        'success': True,
+        'analyzers': analyzers,
+        'error': None,
+        'start_value': initial_cash,
+        'end_value': end_value,
+        'equity_curve': equity_curve_payload(index, equity),
+        'trades': trade_records(**columns),
+    }
@@ -0,0 +1,148 @@
+"""
+Versioned caching of dashboard views and template fragments.
+
+Entries live in Django's default cache (``CACHES`` in settings: local
+memory, files or Redis) under keys that include the version of the data
+they were built from, so changed data makes old entries unreachable instead
+of requiring explicit invalidation:
+1. Ticker data is versioned by the ticker's catalog ``data_version``
+   (``core.catalog``), which changes whenever its bars do
+2. Trade logs and the ticker list are versioned by generation counters,
+   bumped by model signals (``dashboard.signals``) when their rows change
+3. Each cached section counts its hits and misses in the cache, and
+   ``cache_stats`` reports them for the cache stats page
+
+Template fragments use the ``{% cachedfragment %}`` tag
+(``dashboard.templatetags.view_cache``), which records the same statistics.
+"""
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cached sections, reported by cache_stats
+SECTION_CHART_DATA = 'chart_data'
+SECTION_TICKER_LIST = 'ticker_list'
+SECTION_TRADE_LOG_LIST = 'trade_log_list'
+SECTIONS = (SECTION_CHART_DATA, SECTION_TICKER_LIST, SECTION_TRADE_LOG_LIST)
+
+# Generation counters bumped by dashboard.signals
+GENERATION_TRADE_LOGS = 'trade_logs'
+GENERATION_CATALOG = 'catalog'
+
+_MISSING = object()
+
+
+def _generation_key(name):
+    return f"generation:{name}"
+
+
+def generation(name):
+    """
+    Current value of a generation counter.
+
+    A counter missing from the cache (never set, evicted or cleared) starts
+    at the current time in nanoseconds, so it never repeats a value that
+    entries may still be cached under.
+    """
+    key = _generation_key(name)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def bump_generation(name):
+    """Advance a generation counter, making entries versioned by it unreachable."""
+    key = _generation_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not in the cache: any new value is unused
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def trade_log_version():
+    """Version of the trade logs and their checklists."""
+    return generation(GENERATION_TRADE_LOGS)
+
+
+def catalog_version():
+    """Version of the list of tickers with data."""
+    return generation(GENERATION_CATALOG)
+
+
+def make_key(section, *parts):
+    """Cache key of a section entry; ``parts`` must include the data version."""
+    canonical = json.dumps(parts, sort_keys=True, default=str)
+    return f"view:{section}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]}"
+
+
+def _stats_key(section, outcome):
+    return f"stats:{section}:{outcome}"
+
+
+def record(section, hit):
+    """Count a hit or miss of a cached section."""
+    key = _stats_key(section, 'hits' if hit else 'misses')
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr
+            cache.set(key, 1, timeout=None)
+
+
+def cached(section, parts, build, timeout=None):
+    """
+    Return a cached value of a section, building and storing it on a miss.
+
+    Parameters:
+        section (str): One of SECTIONS
+        parts (tuple): Key components, including the data version
+        build (callable): Returns the value; None results are not cached
+        timeout (int): Seconds to keep the entry (default: settings.VIEW_CACHE_TIMEOUT)
+
+    Returns:
+        The cached or newly built value.
+    """
+    key = make_key(section, *parts)
+    value = cache.get(key, _MISSING)
+    record(section, value is not _MISSING)
+    if value is _MISSING:
+        value = build()
+        if value is not None:
+            cache.set(key, value, settings.VIEW_CACHE_TIMEOUT if timeout is None else timeout)
+    return value
+
+
+def cache_stats():
+    """
+    Hit and miss counts of the cached sections.
+
+    Returns:
+        list: One dict per section with 'section', 'hits', 'misses' and
+              'hit_rate' (fraction of lookups that hit; None before any).
+    """
+    counts = cache.get_many([_stats_key(section, outcome) for section in SECTIONS
+                             for outcome in ('hits', 'misses')])
+    stats = []
+    for section in SECTIONS:
+        hits = counts.get(_stats_key(section, 'hits'), 0)
+        misses = counts.get(_stats_key(section, 'misses'), 0)
+        lookups = hits + misses
+        stats.append({'section': section, 'hits': hits, 'misses': misses,
+                      'hit_rate': hits / lookups if lookups else None})
+    return stats
+
+
+def reset_cache_stats():
+    """Reset the hit and miss counts of every section."""
+    cache.delete_many([_stats_key(section, outcome) for section in SECTIONS for outcome in ('hits', 'misses')])
@@ -1,11 +1,27 @@
 from django.contrib import admin
-from .models import OHLCVData, TradeLog, TradeChecklistStatus
+from .models import (OHLCVData, TradeLog, TradeChecklistStatus, BacktestJob, BacktestCheckpoint,
+                     BacktestCheckpointRun, IndicatorState, DailyFeature, TickerCatalog, JournalSummary)
+
+
+class CatalogTickerFilter(admin.SimpleListFilter):
+    """Ticker filter listing tickers from the catalog instead of a DISTINCT scan of the bars."""
+    title = 'ticker'
+    parameter_name = 'ticker'
+
+    def lookups(self, request, model_admin):
+        return [(ticker, ticker) for ticker in TickerCatalog.objects.values_list('ticker', flat=True)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(ticker=self.value())
+        return queryset
+
 
 # Register the OHLCVData model
 @admin.register(OHLCVData)
 class OHLCVDataAdmin(admin.ModelAdmin):
     list_display = ('ticker', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
-    list_filter = ('ticker',)
+    list_filter = (CatalogTickerFilter,)
     search_fields = ('ticker',)
     date_hierarchy = 'timestamp'
 
@@ -52,3 +68,67 @@ class TradeChecklistStatusAdmin(admin.ModelAdmin):
     list_filter = ('is_checked', 'checklist_item')
     search_fields = ('trade_log__ticker', 'checklist_item')
     list_editable = ('is_checked',)
+
+
+# Register the BacktestJob model
+@admin.register(BacktestJob)
+class BacktestJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'ticker', 'status', 'progress', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('status', 'ticker')
+    search_fields = ('ticker', 'config_key')
+    readonly_fields = ('config_key', 'config', 'result', 'error', 'created_at', 'started_at', 'finished_at', 'updated_at')
+
+
+# Runs of a checkpoint, shown inline (their curves and trades are read-only)
+class BacktestCheckpointRunInline(admin.TabularInline):
+    model = BacktestCheckpointRun
+    extra = 0
+    readonly_fields = ('first_bar', 'equity_curve', 'trades', 'created_at')
+
+
+# Register the BacktestCheckpoint model
+@admin.register(BacktestCheckpoint)
+class BacktestCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('id', 'ticker', 'bars', 'last_timestamp', 'updated_at')
+    list_filter = ('ticker',)
+    search_fields = ('ticker', 'config_key')
+    readonly_fields = ('config_key', 'config', 'bars', 'last_timestamp', 'data_summary',
+                       'state', 'performance', 'created_at', 'updated_at')
+    inlines = [BacktestCheckpointRunInline]
+
+
+# Register the IndicatorState model
+@admin.register(IndicatorState)
+class IndicatorStateAdmin(admin.ModelAdmin):
+    list_display = ('ticker', 'bars', 'last_timestamp', 'updated_at')
+    search_fields = ('ticker',)
+    readonly_fields = ('ticker', 'bars', 'last_timestamp', 'state', 'updated_at')
+
+
+# Register the DailyFeature model
+@admin.register(DailyFeature)
+class DailyFeatureAdmin(admin.ModelAdmin):
+    list_display = ('ticker', 'timestamp', 'sma_20', 'ema_20', 'atr_14', 'vol_ma_20')
+    list_filter = (CatalogTickerFilter,)
+    search_fields = ('ticker',)
+    date_hierarchy = 'timestamp'
+
+
+# Register the TickerCatalog model
+@admin.register(TickerCatalog)
+class TickerCatalogAdmin(admin.ModelAdmin):
+    list_display = ('ticker', 'first_timestamp', 'last_timestamp', 'bars', 'data_version', 'last_ingest')
+    search_fields = ('ticker',)
+    readonly_fields = ('ticker', 'first_timestamp', 'last_timestamp', 'bars', 'data_version', 'last_ingest',
+                       'updated_at')
+
+
+# Register the JournalSummary model
+@admin.register(JournalSummary)
+class JournalSummaryAdmin(admin.ModelAdmin):
+    list_display = ('strategy', 'ticker', 'month', 'trades', 'wins', 'losses', 'total_pnl', 'updated_at')
+    list_filter = ('strategy',)
+    search_fields = ('ticker', 'strategy')
+    date_hierarchy = 'month'
+    readonly_fields = ('strategy', 'ticker', 'month', 'trades', 'closed', 'wins', 'losses', 'total_pnl',
+                       'planned_rr_sum', 'planned_rr_count', 'r_multiple_sum', 'r_multiple_count', 'updated_at')
@@ -0,0 +1,97 @@
+# dashboard/consumers.py
+"""
+WebSocket consumers.
+
+``QuoteConsumer`` (ws/quotes/) streams live quotes to the market quote page:
+1. The client sends ``{"action": "subscribe", "ticker": "AAPL"}`` (or
+   ``"unsubscribe"``) for up to QUOTE_MAX_SUBSCRIPTIONS tickers
+2. The consumer joins the ticker's group, fed by one shared poller per
+   ticker (core.quote_stream), and answers with the latest known quote
+3. Quotes arriving faster than QUOTE_MAX_UPDATES_PER_SECOND are coalesced:
+   only the newest quote of each ticker is sent at the next allowed time
+"""
+import asyncio
+import logging
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from core import quote_stream
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class QuoteConsumer(AsyncJsonWebsocketConsumer):
+
+    async def connect(self):
+        self.tickers = set()
+        self.pending = {}
+        self.flush_task = None
+        self.last_flush = None
+        await self.accept()
+
+    async def disconnect(self, code):
+        for ticker in list(self.tickers):
+            await self._unsubscribe(ticker)
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get('action') if isinstance(content, dict) else None
+        if action not in ('subscribe', 'unsubscribe'):
+            await self.send_json({'type': 'error', 'error': "action must be 'subscribe' or 'unsubscribe'"})
+            return
+        try:
+            ticker = quote_stream.normalize_ticker(content.get('ticker'))
+        except ValueError as e:
+            await self.send_json({'type': 'error', 'error': str(e)})
+            return
+
+        if action == 'unsubscribe':
+            if ticker in self.tickers:
+                await self._unsubscribe(ticker)
+            await self.send_json({'type': 'unsubscribed', 'ticker': ticker})
+        elif ticker not in self.tickers:
+            if len(self.tickers) >= settings.QUOTE_MAX_SUBSCRIPTIONS:
+                await self.send_json({'type': 'error', 'ticker': ticker, 'error': (
+                    f"At most {settings.QUOTE_MAX_SUBSCRIPTIONS} tickers can be watched at once")})
+                return
+            await self._subscribe(ticker)
+
+    async def quote_update(self, event):
+        """A quote published by a ticker's poller; queued until the next allowed send."""
+        quote = event['quote']
+        if quote['ticker'] not in self.tickers:
+            return
+        self.pending[quote['ticker']] = quote
+        if self.flush_task is None:
+            loop = asyncio.get_running_loop()
+            delay = 0
+            if self.last_flush is not None:
+                delay = max(0, self.last_flush + 1 / settings.QUOTE_MAX_UPDATES_PER_SECOND - loop.time())
+            self.flush_task = loop.create_task(self._flush(delay))
+
+    async def _flush(self, delay):
+        await asyncio.sleep(delay)
+        pending, self.pending = self.pending, {}
+        self.flush_task = None
+        self.last_flush = asyncio.get_running_loop().time()
+        for ticker, quote in pending.items():
+            if ticker in self.tickers:
+                await self.send_json({'type': 'quote', 'quote': quote})
+
+    async def _subscribe(self, ticker):
+        await self.channel_layer.group_add(quote_stream.quote_group(ticker), self.channel_name)
+        self.tickers.add(ticker)
+        quote_stream.subscribe(ticker)
+        await self.send_json({'type': 'subscribed', 'ticker': ticker})
+        latest = await quote_stream.latest_quote(ticker)
+        if latest is not None:
+            await self.quote_update({'quote': latest})
+
+    async def _unsubscribe(self, ticker):
+        self.tickers.discard(ticker)
+        self.pending.pop(ticker, None)
+        quote_stream.unsubscribe(ticker)
+        await self.channel_layer.group_discard(quote_stream.quote_group(ticker), self.channel_name)
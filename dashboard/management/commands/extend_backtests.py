@@ -0,0 +1,87 @@
+# dashboard/management/commands/extend_backtests.py
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from dashboard.models import BacktestCheckpoint
+from core.incremental import checkpoint_kwargs, run_incremental_backtest
+
+
+class Command(BaseCommand):
+    help = ('Extends every checkpointed backtest with the bars added since its last run. '
+            'Schedule nightly after fetch_data. With --add, registers a new configuration to track '
+            'by running its first (full-history) backtest.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ticker', type=str, default=None,
+            help='Only extend checkpoints for this ticker.'
+        )
+        parser.add_argument(
+            '--add', type=str, default=None, metavar='TICKER',
+            help='Start tracking a Classic Breakout backtest of this ticker instead of extending.'
+        )
+        parser.add_argument('--start-date', type=str, default=None, help='Start date (YYYY-MM-DD) for --add.')
+        parser.add_argument(
+            '--initial-cash', type=float, default=100000.0,
+            help='Initial cash for --add (default: 100000).'
+        )
+        parser.add_argument(
+            '--commission', type=float, default=0.001,
+            help='Commission rate for --add (default: 0.001).'
+        )
+        parser.add_argument(
+            '--params', type=str, default=None,
+            help='Strategy parameters for --add as JSON, e.g. \'{"lookback": 20}\'.'
+        )
+
+    def handle(self, *args, **options):
+        if options['add']:
+            self._add(options)
+            return
+
+        checkpoints = BacktestCheckpoint.objects.all()
+        if options['ticker']:
+            checkpoints = checkpoints.filter(ticker=options['ticker'].upper())
+
+        extended = failed = 0
+        for checkpoint in checkpoints:
+            result = run_incremental_backtest(**checkpoint_kwargs(checkpoint.config))
+            if not result['success']:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"{checkpoint.ticker}: {result['error']}"))
+                continue
+            extended += 1
+            self._report(checkpoint.ticker, result)
+
+        self.stdout.write(self.style.SUCCESS(f"Extended {extended} backtest(s), {failed} failed."))
+
+    def _add(self, options):
+        ticker = options['add'].strip().upper()
+        start_date = None
+        if options['start_date']:
+            try:
+                start_date = timezone.make_aware(datetime.strptime(options['start_date'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError(f"Invalid --start-date: {options['start_date']}. Use YYYY-MM-DD.")
+        try:
+            strategy_params = json.loads(options['params']) if options['params'] else None
+        except json.JSONDecodeError as e:
+            raise CommandError(f"Invalid --params JSON: {e}")
+        if strategy_params is not None and not isinstance(strategy_params, dict):
+            raise CommandError("--params must be a JSON object.")
+
+        result = run_incremental_backtest(ticker, start_date=start_date, strategy_params=strategy_params,
+                                          initial_cash=options['initial_cash'], commission=options['commission'])
+        if not result['success']:
+            raise CommandError(f"{ticker}: {result['error']}")
+        self._report(ticker, result)
+        self.stdout.write(self.style.SUCCESS(f"Tracking {ticker}; extend_backtests will extend it nightly."))
+
+    def _report(self, ticker, result):
+        info = result['incremental']
+        self.stdout.write(
+            f"{ticker}: {info['mode']}, {info['new_bars']} new bar(s), "
+            f"final value {result['end_value']:.2f}"
+        )
@@ -0,0 +1,58 @@
+# dashboard/management/commands/load_test.py
+import asyncio
+import time
+from collections import Counter
+
+import aiohttp
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Sends concurrent GET requests to a running server and reports throughput and latency, e.g. '
+            'to compare the async quote and guidance views under an ASGI server '
+            '(daphne swing_project.asgi:application) with a WSGI server.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', type=str, help='URL to request, e.g. http://127.0.0.1:8000/market-quote/?ticker=AAPL')
+        parser.add_argument('--requests', type=int, default=200, help='Total requests (default: 200).')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once (default: 50).')
+        parser.add_argument('--timeout', type=float, default=60, help='Seconds before a request fails (default: 60).')
+        parser.add_argument('--ajax', action='store_true', help='Send X-Requested-With: XMLHttpRequest (JSON responses).')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+        headers = {'X-Requested-With': 'XMLHttpRequest'} if options['ajax'] else {}
+        started = time.perf_counter()
+        outcomes, latencies = asyncio.run(self._run(options['url'], options['requests'], options['concurrency'],
+                                                    options['timeout'], headers))
+        elapsed = time.perf_counter() - started
+
+        latencies = np.array(latencies) * 1000
+        self.stdout.write(f"{options['requests']} requests, {options['concurrency']} concurrent, in {elapsed:.2f}s")
+        self.stdout.write(f"Throughput: {options['requests'] / elapsed:.1f} requests/s")
+        self.stdout.write(f"Latency (ms): p50 {np.percentile(latencies, 50):.0f}, "
+                          f"p95 {np.percentile(latencies, 95):.0f}, max {latencies.max():.0f}")
+        for outcome, count in sorted(outcomes.items(), key=str):
+            self.stdout.write(f"  {outcome}: {count}")
+
+    async def _run(self, url, total, concurrency, timeout, headers):
+        outcomes = Counter()
+        latencies = []
+        queue = iter(range(total))
+
+        async def worker(session):
+            for _ in queue:
+                started = time.perf_counter()
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        await response.read()
+                        outcomes[response.status] += 1
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    outcomes[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            await asyncio.gather(*(worker(session) for _ in range(min(concurrency, total))))
+        return outcomes, latencies
@@ -0,0 +1,42 @@
+# dashboard/management/commands/rebuild_indicators.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.features import rebuild_features
+from core.catalog import catalog_tickers, rebuild_ticker_catalog, update_ticker_catalog
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the streaming indicator state, daily features and ticker catalog entries of tickers '
+            'from their full history, e.g. to backfill the feature table or after bars were edited outside '
+            'save_ohlcv_data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tickers', type=str, default=None,
+            help='Comma-separated tickers to rebuild (default: every ticker with data).'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Worker processes rebuilding tickers in parallel (default: 1).'
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1.")
+        if options['tickers']:
+            tickers = [t.strip().upper() for t in options['tickers'].split(',')]
+        else:
+            # One grouped aggregate refreshes the catalog, which then lists the tickers
+            rebuild_ticker_catalog()
+            tickers = catalog_tickers()
+
+        for ticker, bars in rebuild_features(tickers, workers=options['workers']):
+            if bars:
+                self.stdout.write(f"{ticker}: {bars} bars")
+            else:
+                self.stdout.write(self.style.WARNING(f"{ticker}: no OHLCV data"))
+        if options['tickers']:
+            for ticker in tickers:
+                update_ticker_catalog(ticker, ingested=False)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt indicator state, features and catalog entries for {len(tickers)} ticker(s)."))
@@ -0,0 +1,13 @@
+# dashboard/management/commands/rebuild_journal_summary.py
+from django.core.management.base import BaseCommand
+
+from core.journal import rebuild_journal_summary
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the trade journal summary table (strategy x ticker x month) from all trade logs, '
+            'e.g. after trades were imported or edited with bulk operations that send no signals.')
+
+    def handle(self, *args, **options):
+        rows = rebuild_journal_summary()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} journal summary row(s)."))
@@ -0,0 +1,57 @@
+# dashboard/management/commands/run_backtest_worker.py
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from core.backtest_jobs import DEFAULT_STALE_AFTER, claim_next_job, execute_job, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Runs queued backtest jobs submitted from the dashboard. Start one or more alongside the web server.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Seconds to wait between queue checks when idle (default: 2.0).'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Process queued jobs until the queue is empty, then exit.'
+        )
+        parser.add_argument(
+            '--max-jobs', type=int, default=None,
+            help='Exit after processing this many jobs.'
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=int(DEFAULT_STALE_AFTER.total_seconds()),
+            help='Requeue running jobs with no progress for this many seconds (default: 600).'
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+        max_jobs = options['max_jobs']
+        stale_after = timedelta(seconds=options['stale_after'])
+        processed = 0
+
+        self.stdout.write("Backtest worker started. Waiting for jobs...")
+        try:
+            while max_jobs is None or processed < max_jobs:
+                requeue_stale_jobs(stale_after)
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                self.stdout.write(f"Running backtest job {job.pk} ({job.ticker})...")
+                job = execute_job(job)
+                processed += 1
+                if job.status == job.STATUS_SUCCEEDED:
+                    self.stdout.write(self.style.SUCCESS(f"Job {job.pk} succeeded."))
+                else:
+                    self.stderr.write(self.style.ERROR(f"Job {job.pk} failed: {job.error}"))
+        except KeyboardInterrupt:
+            self.stdout.write("Worker interrupted.")
+
+        self.stdout.write(self.style.SUCCESS(f"Backtest worker stopped after {processed} job(s)."))
@@ -0,0 +1,71 @@
+# dashboard/management/commands/screen_breakouts.py
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from core.screener import DEFAULT_BARS, screen_breakouts
+
+
+class Command(BaseCommand):
+    help = ('Lists tickers whose latest bar triggered a Classic Breakout entry signal, '
+            'ranked by breakout strength, with suggested initial stops.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bars', type=int, default=DEFAULT_BARS,
+            help=f'Bars loaded per ticker (default: {DEFAULT_BARS}).'
+        )
+        parser.add_argument('--lookback', type=int, default=None, help='Consolidation range lookback.')
+        parser.add_argument('--volume-ma-period', type=int, default=None, help='Volume moving average period.')
+        parser.add_argument('--volume-mult', type=float, default=None, help='Required multiple of the volume MA.')
+        parser.add_argument('--atr-period', type=int, default=None, help='ATR period.')
+        parser.add_argument(
+            '--initial-stop-atr-mult', type=float, default=None,
+            help='Suggested stop distance below the close, in ATRs.'
+        )
+        parser.add_argument('--tickers', type=str, default=None, help='Comma-separated tickers to screen.')
+        parser.add_argument('--as-of', type=str, default=None, help='Screen as of this date (YYYY-MM-DD).')
+        parser.add_argument(
+            '--include-stale', action='store_true',
+            help='Also screen tickers whose latest bar is older than the newest bar.'
+        )
+        parser.add_argument('--limit', type=int, default=None, help='Show at most this many candidates.')
+        parser.add_argument('--json', action='store_true', help='Print the result as JSON.')
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options['as_of']:
+            try:
+                as_of = datetime.strptime(options['as_of'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Invalid --as-of date: {options['as_of']}. Use YYYY-MM-DD.")
+
+        strategy_params = {
+            name: options[name]
+            for name in ('lookback', 'volume_ma_period', 'volume_mult', 'atr_period', 'initial_stop_atr_mult')
+            if options[name] is not None
+        }
+        tickers = [t.strip().upper() for t in options['tickers'].split(',')] if options['tickers'] else None
+
+        result = screen_breakouts(
+            bars=options['bars'], strategy_params=strategy_params, as_of=as_of, tickers=tickers,
+            include_stale=options['include_stale'], limit=options['limit'],
+        )
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+
+        if result['as_of'] is None:
+            self.stdout.write(self.style.WARNING("No OHLCV data to screen."))
+            return
+
+        self.stdout.write(f"Breakouts as of {result['as_of']} ({result['scanned']} tickers screened):")
+        if result['candidates']:
+            self.stdout.write(f"{'#':>3} {'Ticker':<8} {'Close':>10} {'Range high':>10} "
+                              f"{'Vol x':>6} {'ATR':>8} {'Str.':>6} {'Stop':>10}")
+        for c in result['candidates']:
+            self.stdout.write(
+                f"{c['rank']:>3} {c['ticker']:<8} {c['close']:>10.2f} {c['range_high']:>10.2f} "
+                f"{c['volume_ratio']:>6.2f} {c['atr']:>8.2f} {c['strength']:>6.2f} {c['stop']:>10.2f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(result['candidates'])} candidate(s)."))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-19 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_tradecheckliststatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacktestJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('config_key', models.CharField(help_text='Hash of the backtest configuration, used to dedupe submissions', max_length=64)),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20)),
+                ('config', models.JSONField(help_text='Backtest configuration: dates, cash, commission, engine and strategy parameters')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', help_text='Current state of the job', max_length=10)),
+                ('progress', models.FloatField(default=0.0, help_text='Fraction of bars processed (0.0 - 1.0)')),
+                ('result', models.JSONField(blank=True, help_text='Summary metrics and equity curve of a successful run', null=True)),
+                ('error', models.TextField(blank=True, default='', help_text='Error message of a failed run')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Last change or progress report; used to detect abandoned jobs')),
+            ],
+            options={
+                'verbose_name': 'Backtest Job',
+                'verbose_name_plural': 'Backtest Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='backtestjob_status_created_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('config_key',), name='unique_active_backtest_job')],
+            },
+        ),
+    ]
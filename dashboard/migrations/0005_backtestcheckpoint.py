@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_backtestjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacktestCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('config_key', models.CharField(help_text='Hash of the backtest configuration', max_length=64, unique=True)),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20)),
+                ('config', models.JSONField(help_text='Backtest configuration: start date, cash, commission and strategy parameters')),
+                ('bars', models.PositiveIntegerField(help_text='Number of bars processed so far')),
+                ('last_timestamp', models.DateTimeField(help_text='Timestamp of the last processed bar')),
+                ('history_version', models.CharField(help_text='Fingerprint of the bars up to last_timestamp', max_length=16)),
+                ('state', models.JSONField(help_text='Engine state: trailing bars, ATR, cash and open position')),
+                ('history', models.JSONField(help_text='Equity curve and closed trades so far')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Backtest Checkpoint',
+                'verbose_name_plural': 'Backtest Checkpoints',
+                'ordering': ['ticker', 'created_at'],
+            },
+        ),
+    ]
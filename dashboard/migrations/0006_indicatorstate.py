@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_backtestcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20, unique=True)),
+                ('bars', models.PositiveIntegerField(help_text='Number of bars processed so far')),
+                ('last_timestamp', models.DateTimeField(help_text='Timestamp of the last processed bar')),
+                ('state', models.JSONField(help_text='Indicator windows and running values plus recent values')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Indicator State',
+                'verbose_name_plural': 'Indicator States',
+                'ordering': ['ticker'],
+            },
+        ),
+    ]
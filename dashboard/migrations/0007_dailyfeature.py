@@ -0,0 +1,61 @@
+# Generated by Django 5.2 on 2026-10-19 08:56
+
+from django.db import migrations, models
+
+# Same layout as dashboard_ohlcvdata (0001_initial): a TimescaleDB hypertable on
+# timestamp without the id primary key, with a unique (ticker, timestamp) index
+# serving the per-ticker range queries
+DROP_DEFAULT_PK = "ALTER TABLE dashboard_dailyfeature DROP CONSTRAINT IF EXISTS dashboard_dailyfeature_pkey;"
+ADD_DEFAULT_PK = "ALTER TABLE dashboard_dailyfeature ADD CONSTRAINT dashboard_dailyfeature_pkey PRIMARY KEY (id);"
+CREATE_HYPERTABLE = "SELECT create_hypertable('dashboard_dailyfeature', 'timestamp', if_not_exists => TRUE);"
+DROP_HYPERTABLE_TABLE = "DROP TABLE IF EXISTS dashboard_dailyfeature;"
+ADD_TICKER_TIMESTAMP_INDEX = """
+    CREATE UNIQUE INDEX IF NOT EXISTS dashboard_dailyfeature_ticker_ts_idx
+    ON dashboard_dailyfeature (ticker, timestamp);
+"""
+DROP_TICKER_TIMESTAMP_INDEX = "DROP INDEX IF EXISTS dashboard_dailyfeature_ticker_ts_idx;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_indicatorstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(help_text='Timestamp of the bar the values belong to')),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20)),
+                ('sma_10', models.FloatField(help_text='10-bar simple moving average of the close', null=True)),
+                ('sma_20', models.FloatField(help_text='20-bar simple moving average of the close', null=True)),
+                ('sma_50', models.FloatField(help_text='50-bar simple moving average of the close', null=True)),
+                ('ema_10', models.FloatField(help_text='10-bar exponential moving average of the close', null=True)),
+                ('ema_20', models.FloatField(help_text='20-bar exponential moving average of the close', null=True)),
+                ('ema_50', models.FloatField(help_text='50-bar exponential moving average of the close', null=True)),
+                ('atr_14', models.FloatField(help_text='14-bar Wilder Average True Range', null=True)),
+                ('highest_50', models.FloatField(help_text='Highest high of the last 50 bars', null=True)),
+                ('lowest_50', models.FloatField(help_text='Lowest low of the last 50 bars', null=True)),
+                ('vol_ma_20', models.FloatField(help_text='20-bar simple moving average of the volume', null=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Feature',
+                'verbose_name_plural': 'Daily Features',
+                'ordering': ['ticker', '-timestamp'],
+            },
+        ),
+        migrations.RunSQL(
+            DROP_DEFAULT_PK,
+            reverse_sql=ADD_DEFAULT_PK
+        ),
+        migrations.RunSQL(
+            CREATE_HYPERTABLE,
+            reverse_sql=DROP_HYPERTABLE_TABLE
+        ),
+        migrations.RunSQL(
+            ADD_TICKER_TIMESTAMP_INDEX,
+            reverse_sql=DROP_TICKER_TIMESTAMP_INDEX
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2 on 2026-10-19 09:10
+
+import hashlib
+import json
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def version_digest(summary):
+    # Frozen copy of core.catalog.version_digest (price sums at 4 decimal places)
+    def canonical(value):
+        if isinstance(value, Decimal):
+            return str(value.quantize(Decimal('0.0001')))
+        return str(value)
+    return hashlib.sha256(json.dumps(summary, sort_keys=True, default=canonical).encode('utf-8')).hexdigest()[:16]
+
+
+def backfill_catalog(apps, schema_editor):
+    # One grouped aggregate over the existing bars; later changes come from the ingest path
+    OHLCVData = apps.get_model('dashboard', 'OHLCVData')
+    TickerCatalog = apps.get_model('dashboard', 'TickerCatalog')
+    version_fields = {
+        'bars': Count('id'), 'first': Min('timestamp'), 'last': Max('timestamp'),
+        'open_sum': Sum('open'), 'high_sum': Sum('high'), 'low_sum': Sum('low'),
+        'close_sum': Sum('close'), 'volume_sum': Sum('volume'),
+    }
+    entries = []
+    for row in OHLCVData.objects.order_by().values('ticker').annotate(**version_fields):
+        entries.append(TickerCatalog(
+            ticker=row.pop('ticker'), first_timestamp=row['first'], last_timestamp=row['last'],
+            bars=row['bars'], data_version=version_digest(row),
+        ))
+    TickerCatalog.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_dailyfeature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TickerCatalog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20, unique=True)),
+                ('first_timestamp', models.DateTimeField(help_text="Timestamp of the ticker's first bar")),
+                ('last_timestamp', models.DateTimeField(help_text="Timestamp of the ticker's last bar")),
+                ('bars', models.PositiveIntegerField(help_text='Number of stored bars')),
+                ('data_version', models.CharField(help_text="Fingerprint of the ticker's bars (see core.backtester.get_data_version)", max_length=16)),
+                ('last_ingest', models.DateTimeField(blank=True, help_text='When bars were last ingested for the ticker', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Ticker Catalog Entry',
+                'verbose_name_plural': 'Ticker Catalog',
+                'ordering': ['ticker'],
+            },
+        ),
+        migrations.RunPython(backfill_catalog, migrations.RunPython.noop),
+    ]
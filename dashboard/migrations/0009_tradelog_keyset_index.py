@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-19 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_tickercatalog'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='tradelog',
+            options={'ordering': ['-entry_date', '-id'], 'verbose_name': 'Trade Log', 'verbose_name_plural': 'Trade Logs'},
+        ),
+        migrations.AddIndex(
+            model_name='tradelog',
+            index=models.Index(fields=['entry_date', 'id'], name='tradelog_entry_date_id_idx'),
+        ),
+    ]
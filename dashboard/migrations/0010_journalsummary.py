@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-19 09:23
+
+from django.db import migrations, models
+
+
+def backfill_summary(apps, schema_editor):
+    # One grouped aggregate over the existing trades; later changes come from TradeLog signals
+    from core.journal import summarize_trades
+    TradeLog = apps.get_model('dashboard', 'TradeLog')
+    JournalSummary = apps.get_model('dashboard', 'JournalSummary')
+    JournalSummary.objects.bulk_create([JournalSummary(**row) for row in summarize_trades(TradeLog.objects.all())])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_tradelog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('strategy', models.CharField(help_text='Trading strategy of the trades', max_length=50)),
+                ('ticker', models.CharField(help_text='Stock ticker symbol (e.g., AAPL)', max_length=20)),
+                ('month', models.DateField(help_text='First day of the month the trades were entered (UTC)')),
+                ('trades', models.PositiveIntegerField(default=0, help_text='Number of trades entered')),
+                ('closed', models.PositiveIntegerField(default=0, help_text='Number of trades with a PnL')),
+                ('wins', models.PositiveIntegerField(default=0, help_text='Closed trades with a positive PnL')),
+                ('losses', models.PositiveIntegerField(default=0, help_text='Closed trades with a negative PnL')),
+                ('total_pnl', models.DecimalField(decimal_places=4, default=0, help_text='Sum of the PnL of the closed trades', max_digits=19)),
+                ('planned_rr_sum', models.DecimalField(decimal_places=2, default=0, help_text='Sum of the planned risk-reward ratios', max_digits=19)),
+                ('planned_rr_count', models.PositiveIntegerField(default=0, help_text='Number of trades with a planned risk-reward ratio')),
+                ('r_multiple_sum', models.FloatField(default=0, help_text='Sum of the realized R-multiples (PnL / initial risk) of the closed trades')),
+                ('r_multiple_count', models.PositiveIntegerField(default=0, help_text='Number of closed trades with a non-zero initial risk')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Journal Summary',
+                'verbose_name_plural': 'Journal Summaries',
+                'ordering': ['-month', 'strategy', 'ticker'],
+                'constraints': [models.UniqueConstraint(fields=('strategy', 'ticker', 'month'), name='unique_journal_summary_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-19 10:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_journalsummary'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='backtestcheckpoint',
+            name='history',
+        ),
+        migrations.RemoveField(
+            model_name='backtestcheckpoint',
+            name='history_version',
+        ),
+        migrations.AddField(
+            model_name='backtestcheckpoint',
+            name='data_summary',
+            field=models.JSONField(default=dict, help_text="Count, date range and price/volume sums of the ticker's bars up to last_timestamp"),
+        ),
+        migrations.AddField(
+            model_name='backtestcheckpoint',
+            name='performance',
+            field=models.JSONField(default=dict, help_text='Running performance metrics: return moments, drawdown and closed trade PnL'),
+        ),
+        migrations.CreateModel(
+            name='BacktestCheckpointRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_bar', models.PositiveIntegerField(help_text="Index of the run's first bar in the backtest")),
+                ('equity_curve', models.JSONField(help_text='Dates and portfolio values of the bars the run simulated')),
+                ('trades', models.JSONField(help_text='Trades closed during the run')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('checkpoint', models.ForeignKey(help_text='Checkpoint the run extended', on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='dashboard.backtestcheckpoint')),
+            ],
+            options={
+                'verbose_name': 'Backtest Checkpoint Run',
+                'verbose_name_plural': 'Backtest Checkpoint Runs',
+                'ordering': ['checkpoint', 'first_bar'],
+                'unique_together': {('checkpoint', 'first_bar')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0011_backtestcheckpointrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tickercatalog',
+            name='summary',
+            field=models.JSONField(default=dict, help_text='Count, date range and price/volume sums the data version fingerprints'),
+        ),
+    ]
@@ -135,11 +135,32 @@ class TradeLog(models.Model):
     class Meta:
         verbose_name = "Trade Log"
         verbose_name_plural = "Trade Logs"
-        ordering = ['-entry_date']
+        ordering = ['-entry_date', '-id']
+        indexes = [
+            # Keyset pagination of the journal (core.pagination)
+            models.Index(fields=['entry_date', 'id'], name='tradelog_entry_date_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.ticker} trade on {self.entry_date.strftime('%Y-%m-%d')}"
 
+    def create_checklist(self, items=None):
+        """
+        Create the trade's checklist rows (default: CLASSIC_BREAKOUT_CHECKLIST) with one bulk insert.
+
+        Items that already exist are left as they are.
+        """
+        TradeChecklistStatus.objects.bulk_create(
+            [TradeChecklistStatus(trade_log=self, checklist_item=item)
+             for item in (CLASSIC_BREAKOUT_CHECKLIST if items is None else items)],
+            ignore_conflicts=True,
+        )
+
+    def checklist_progress(self):
+        """(checked, total) checklist items; uses prefetched ``checklist_items`` if available."""
+        items = self.checklist_items.all()
+        return sum(1 for item in items if item.is_checked), len(items)
+
 
 # Define the checklist items for the Classic Breakout strategy
 CLASSIC_BREAKOUT_CHECKLIST = [
@@ -182,3 +203,366 @@ class TradeChecklistStatus(models.Model):
     def __str__(self):
         status = "✓" if self.is_checked else "✗"
         return f"{status} {self.checklist_item} for {self.trade_log}"
+
+
+class JournalSummary(models.Model):
+    """
+    Trade journal aggregates per strategy, ticker and month of entry.
+
+    Maintained from TradeLog save and delete signals (``core.journal``): a
+    change recomputes only the row of the trade's (strategy, ticker, month),
+    so analytics read these rows instead of the whole journal. Sums and
+    counts are stored rather than averages, so rows can be rolled up across
+    tickers or months by summing them.
+    """
+    strategy = models.CharField(
+        max_length=50,
+        help_text="Trading strategy of the trades"
+    )
+    ticker = models.CharField(
+        max_length=20,
+        help_text="Stock ticker symbol (e.g., AAPL)"
+    )
+    month = models.DateField(
+        help_text="First day of the month the trades were entered (UTC)"
+    )
+    trades = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of trades entered"
+    )
+    closed = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of trades with a PnL"
+    )
+    wins = models.PositiveIntegerField(
+        default=0,
+        help_text="Closed trades with a positive PnL"
+    )
+    losses = models.PositiveIntegerField(
+        default=0,
+        help_text="Closed trades with a negative PnL"
+    )
+    total_pnl = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0,
+        help_text="Sum of the PnL of the closed trades"
+    )
+    planned_rr_sum = models.DecimalField(
+        max_digits=19, decimal_places=2, default=0,
+        help_text="Sum of the planned risk-reward ratios"
+    )
+    planned_rr_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of trades with a planned risk-reward ratio"
+    )
+    r_multiple_sum = models.FloatField(
+        default=0,
+        help_text="Sum of the realized R-multiples (PnL / initial risk) of the closed trades"
+    )
+    r_multiple_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of closed trades with a non-zero initial risk"
+    )
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Journal Summary"
+        verbose_name_plural = "Journal Summaries"
+        ordering = ['-month', 'strategy', 'ticker']
+        constraints = [
+            models.UniqueConstraint(fields=['strategy', 'ticker', 'month'], name='unique_journal_summary_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.strategy} {self.ticker} {self.month:%Y-%m}: {self.trades} trades"
+
+
+class BacktestJob(models.Model):
+    """
+    A backtest submitted from the dashboard and executed by the background
+    worker (``manage.py run_backtest_worker``) instead of inside the web request.
+
+    Identical submissions share a ``config_key``; while a job with that key is
+    queued or running, new submissions are attached to it instead of creating
+    a second job.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    config_key = models.CharField(
+        max_length=64,
+        help_text="Hash of the backtest configuration, used to dedupe submissions"
+    )
+    ticker = models.CharField(
+        max_length=20,
+        help_text="Stock ticker symbol (e.g., AAPL)"
+    )
+    config = models.JSONField(
+        help_text="Backtest configuration: dates, cash, commission, engine and strategy parameters"
+    )
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED,
+        help_text="Current state of the job"
+    )
+    progress = models.FloatField(
+        default=0.0,
+        help_text="Fraction of bars processed (0.0 - 1.0)"
+    )
+    result = models.JSONField(
+        null=True, blank=True,
+        help_text="Summary metrics and equity curve of a successful run"
+    )
+    error = models.TextField(
+        blank=True, default='',
+        help_text="Error message of a failed run"
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Last change or progress report; used to detect abandoned jobs"
+    )
+
+    class Meta:
+        verbose_name = "Backtest Job"
+        verbose_name_plural = "Backtest Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='backtestjob_status_created_idx'),
+        ]
+        constraints = [
+            # At most one queued/running job per configuration
+            models.UniqueConstraint(
+                fields=['config_key'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_backtest_job'
+            ),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"Backtest {self.ticker} [{self.status}] #{self.pk}"
+
+
+class BacktestCheckpoint(models.Model):
+    """
+    Saved state of an incremental backtest (``core.incremental``).
+
+    Holds the vectorized engine's state after the last processed bar and the
+    running performance metrics, so the next run only simulates bars newer
+    than ``last_timestamp``. The equity curve and closed trades are stored
+    per run in ``BacktestCheckpointRun`` rows. ``data_summary`` is the
+    fingerprinted aggregate of the ticker's bars up to ``last_timestamp``;
+    if they change, the backtest is rerun in full.
+    """
+    config_key = models.CharField(
+        max_length=64, unique=True,
+        help_text="Hash of the backtest configuration"
+    )
+    ticker = models.CharField(
+        max_length=20,
+        help_text="Stock ticker symbol (e.g., AAPL)"
+    )
+    config = models.JSONField(
+        help_text="Backtest configuration: start date, cash, commission and strategy parameters"
+    )
+    bars = models.PositiveIntegerField(
+        help_text="Number of bars processed so far"
+    )
+    last_timestamp = models.DateTimeField(
+        help_text="Timestamp of the last processed bar"
+    )
+    data_summary = models.JSONField(
+        default=dict,
+        help_text="Count, date range and price/volume sums of the ticker's bars up to last_timestamp"
+    )
+    state = models.JSONField(
+        help_text="Engine state: trailing bars, ATR, cash and open position"
+    )
+    performance = models.JSONField(
+        default=dict,
+        help_text="Running performance metrics: return moments, drawdown and closed trade PnL"
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Backtest Checkpoint"
+        verbose_name_plural = "Backtest Checkpoints"
+        ordering = ['ticker', 'created_at']
+
+    def __str__(self):
+        return f"Checkpoint {self.ticker} @ {self.last_timestamp:%Y-%m-%d} ({self.bars} bars)"
+
+
+class BacktestCheckpointRun(models.Model):
+    """
+    Equity curve points and closed trades added by one incremental backtest run.
+
+    A run writes only the bars it simulated, so extending a checkpoint doesn't
+    rewrite its history; ``core.incremental.checkpoint_history`` joins the runs.
+    """
+    checkpoint = models.ForeignKey(
+        BacktestCheckpoint, on_delete=models.CASCADE, related_name='runs',
+        help_text="Checkpoint the run extended"
+    )
+    first_bar = models.PositiveIntegerField(
+        help_text="Index of the run's first bar in the backtest"
+    )
+    equity_curve = models.JSONField(
+        help_text="Dates and portfolio values of the bars the run simulated"
+    )
+    trades = models.JSONField(
+        help_text="Trades closed during the run"
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Backtest Checkpoint Run"
+        verbose_name_plural = "Backtest Checkpoint Runs"
+        ordering = ['checkpoint', 'first_bar']
+        unique_together = ('checkpoint', 'first_bar')
+
+    def __str__(self):
+        return f"Run of {self.checkpoint.ticker} from bar {self.first_bar}"
+
+
+class IndicatorState(models.Model):
+    """
+    Saved state of a ticker's streaming indicators (``core.indicator_engine``).
+
+    Updated by ``save_ohlcv_data`` as bars are ingested, so the latest SMA,
+    EMA, ATR, rolling highest/lowest and volume MA values (and a short tail
+    of recent ones) can be read without loading the ticker's history.
+    """
+    ticker = models.CharField(
+        max_length=20, unique=True,
+        help_text="Stock ticker symbol (e.g., AAPL)"
+    )
+    bars = models.PositiveIntegerField(
+        help_text="Number of bars processed so far"
+    )
+    last_timestamp = models.DateTimeField(
+        help_text="Timestamp of the last processed bar"
+    )
+    state = models.JSONField(
+        help_text="Indicator windows and running values plus recent values"
+    )
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Indicator State"
+        verbose_name_plural = "Indicator States"
+        ordering = ['ticker']
+
+    def __str__(self):
+        return f"Indicators {self.ticker} @ {self.last_timestamp:%Y-%m-%d} ({self.bars} bars)"
+
+
+class DailyFeature(models.Model):
+    """
+    Per-ticker daily indicator values, one row per OHLCVData bar.
+
+    Written by the streaming indicator engine (``core.indicator_engine``) as
+    ``save_ohlcv_data`` inserts bars, and read with a single (ticker,
+    timestamp) range query by the chart view, screener and backtester
+    (``core.features``). Columns are named after the engine's indicators and
+    are NULL during each indicator's warm-up.
+    Hypertable conversion and indexing managed manually in migrations.
+    """
+    timestamp = models.DateTimeField(
+        help_text="Timestamp of the bar the values belong to"
+    )
+    ticker = models.CharField(
+        max_length=20,
+        help_text="Stock ticker symbol (e.g., AAPL)"
+    )
+    sma_10 = models.FloatField(null=True, help_text="10-bar simple moving average of the close")
+    sma_20 = models.FloatField(null=True, help_text="20-bar simple moving average of the close")
+    sma_50 = models.FloatField(null=True, help_text="50-bar simple moving average of the close")
+    ema_10 = models.FloatField(null=True, help_text="10-bar exponential moving average of the close")
+    ema_20 = models.FloatField(null=True, help_text="20-bar exponential moving average of the close")
+    ema_50 = models.FloatField(null=True, help_text="50-bar exponential moving average of the close")
+    atr_14 = models.FloatField(null=True, help_text="14-bar Wilder Average True Range")
+    highest_50 = models.FloatField(null=True, help_text="Highest high of the last 50 bars")
+    lowest_50 = models.FloatField(null=True, help_text="Lowest low of the last 50 bars")
+    vol_ma_20 = models.FloatField(null=True, help_text="20-bar simple moving average of the volume")
+
+    class Meta:
+        verbose_name = "Daily Feature"
+        verbose_name_plural = "Daily Features"
+        ordering = ['ticker', '-timestamp']
+        # Indexes are created in the migration (see OHLCVData)
+
+    def __str__(self):
+        return f"Features {self.ticker} @ {self.timestamp:%Y-%m-%d}"
+
+
+class TickerCatalog(models.Model):
+    """
+    One row per ticker with a summary of its stored OHLCV data.
+
+    Maintained by ``save_ohlcv_data`` in the same transaction as the bars
+    (``core.catalog``), so the ticker picker, available date ranges and the
+    admin's ticker filters read O(tickers) rows instead of scanning the
+    OHLCVData hypertable with DISTINCT or Min/Max aggregates.
+    """
+    ticker = models.CharField(
+        max_length=20, unique=True,
+        help_text="Stock ticker symbol (e.g., AAPL)"
+    )
+    first_timestamp = models.DateTimeField(
+        help_text="Timestamp of the ticker's first bar"
+    )
+    last_timestamp = models.DateTimeField(
+        help_text="Timestamp of the ticker's last bar"
+    )
+    bars = models.PositiveIntegerField(
+        help_text="Number of stored bars"
+    )
+    data_version = models.CharField(
+        max_length=16,
+        help_text="Fingerprint of the ticker's bars (see core.backtester.get_data_version)"
+    )
+    summary = models.JSONField(
+        default=dict,
+        help_text="Count, date range and price/volume sums the data version fingerprints"
+    )
+    last_ingest = models.DateTimeField(
+        null=True, blank=True,
+        help_text="When bars were last ingested for the ticker"
+    )
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Ticker Catalog Entry"
+        verbose_name_plural = "Ticker Catalog"
+        ordering = ['ticker']
+
+    def __str__(self):
+        return (f"{self.ticker}: {self.first_timestamp:%Y-%m-%d} to {self.last_timestamp:%Y-%m-%d} "
+                f"({self.bars} bars)")
@@ -0,0 +1,8 @@
+# dashboard/routing.py
+from django.urls import path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/quotes/', consumers.QuoteConsumer.as_asgi(), name='quote_stream'),
+]
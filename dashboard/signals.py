@@ -0,0 +1,68 @@
+# dashboard/signals.py
+"""
+Invalidation of cached views (core.view_cache).
+
+Trade logs and their checklists bump a generation counter on every save
+or delete, and the ticker catalog when a ticker is added or removed, so
+cached fragments built from the old rows are no longer used.
+
+New trade logs get their checklist rows with one bulk insert. Saving or
+deleting a trade log also refreshes the JournalSummary rows of
+its (strategy, ticker, month) before and after the change (core.journal).
+
+Bulk ``QuerySet.update``/``bulk_update`` calls bypass these signals and must
+call ``bump_generation`` and ``refresh_journal_bucket`` themselves.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.journal import journal_bucket, refresh_journal_bucket
+from core.view_cache import GENERATION_CATALOG, GENERATION_TRADE_LOGS, bump_generation
+from .models import TickerCatalog, TradeChecklistStatus, TradeLog
+
+
+@receiver([post_save, post_delete], sender=TradeLog)
+@receiver([post_save, post_delete], sender=TradeChecklistStatus)
+def trade_logs_changed(sender, **kwargs):
+    bump_generation(GENERATION_TRADE_LOGS)
+
+
+@receiver(post_save, sender=TickerCatalog)
+def catalog_saved(sender, created, **kwargs):
+    # The ticker list only changes when a ticker is added, not on every ingest
+    if created:
+        bump_generation(GENERATION_CATALOG)
+
+
+@receiver(post_delete, sender=TickerCatalog)
+def catalog_deleted(sender, **kwargs):
+    bump_generation(GENERATION_CATALOG)
+
+
+@receiver(post_save, sender=TradeLog)
+def create_trade_checklist(sender, instance, created, **kwargs):
+    if created:
+        instance.create_checklist()
+
+
+@receiver(pre_save, sender=TradeLog)
+def remember_journal_bucket(sender, instance, **kwargs):
+    # The bucket the trade leaves if its strategy, ticker or entry month is edited
+    previous = None
+    if instance.pk:
+        previous = TradeLog.objects.filter(pk=instance.pk).values_list('strategy', 'ticker', 'entry_date').first()
+    instance._previous_journal_bucket = journal_bucket(*previous) if previous else None
+
+
+@receiver(post_save, sender=TradeLog)
+def refresh_journal_summary(sender, instance, **kwargs):
+    bucket = journal_bucket(instance.strategy, instance.ticker, instance.entry_date)
+    refresh_journal_bucket(*bucket)
+    previous = getattr(instance, '_previous_journal_bucket', None)
+    if previous and previous != bucket:
+        refresh_journal_bucket(*previous)
+
+
+@receiver(post_delete, sender=TradeLog)
+def remove_from_journal_summary(sender, instance, **kwargs):
+    refresh_journal_bucket(*journal_bucket(instance.strategy, instance.ticker, instance.entry_date))
@@ -0,0 +1,44 @@
+# dashboard/templatetags/view_cache.py
+from django import template
+
+from core.view_cache import SECTIONS, cached
+
+register = template.Library()
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(self, nodelist, section, vary_on):
+        self.nodelist = nodelist
+        self.section = section
+        self.vary_on = vary_on
+
+    def render(self, context):
+        section = self.section.resolve(context)
+        if section not in SECTIONS:
+            raise template.TemplateSyntaxError(f"Unknown cache section '{section}'")
+        vary_on = [value.resolve(context) for value in self.vary_on]
+        return cached(section, vary_on, lambda: self.nodelist.render(context))
+
+
+@register.tag('cachedfragment')
+def do_cachedfragment(parser, token):
+    """
+    Cache a template fragment in a section of core.view_cache, counting hits and misses.
+
+    Usage::
+
+        {% load view_cache %}
+        {% cachedfragment 'trade_log_list' trade_log_version %}
+            .. expensive section ..
+        {% endcachedfragment %}
+
+    The arguments after the section name (e.g. the data version) are part
+    of the cache key.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires at least a section name.")
+    nodelist = parser.parse(('endcachedfragment',))
+    parser.delete_first_token()
+    return CachedFragmentNode(nodelist, parser.compile_filter(bits[1]),
+                              [parser.compile_filter(bit) for bit in bits[2:]])
@@ -0,0 +1,13 @@
+"""
+Shared fixtures for dashboard tests
+"""
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with an empty Django cache (cached views and fragments)."""
+    cache.clear()
+    yield
+    cache.clear()
@@ -0,0 +1,96 @@
+# dashboard/tests/test_async_views.py
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from django.test import AsyncClient
+from django.urls import reverse
+
+from core.upstream import UpstreamTimeout, call_upstream, shutdown_upstream_executor
+
+# Request signals touch the database connection
+pytestmark = pytest.mark.django_db
+
+LATENCY = 0.2
+QUOTE = {'ticker': 'AAPL', 'bid_price': 150.25, 'bid_size': 100, 'ask_price': 150.5, 'ask_size': 200,
+         'timestamp': '2023-05-01T12:34:56Z', 'status': 'success'}
+
+
+def slow(value, seconds=LATENCY):
+    def call(*args):
+        time.sleep(seconds)
+        return value
+    return call
+
+
+@pytest.fixture(autouse=True)
+def upstream_pool(settings):
+    settings.UPSTREAM_MAX_WORKERS = 16
+    settings.UPSTREAM_TIMEOUT_SECONDS = 2
+    shutdown_upstream_executor()
+    yield settings
+    shutdown_upstream_executor(wait=False)
+
+
+async def get_json(client, url, **params):
+    return await client.get(url, params, headers={'X-Requested-With': 'XMLHttpRequest'})
+
+
+@pytest.mark.asyncio
+async def test_quotes_served_concurrently():
+    client = AsyncClient()
+    url = reverse('dashboard:market_quote')
+    with patch('dashboard.views.get_latest_quote', slow(QUOTE)), patch('dashboard.views.is_tradable', slow(True)):
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(get_json(client, url, ticker='AAPL') for _ in range(10)))
+        elapsed = time.perf_counter() - started
+    assert [r.status_code for r in responses] == [200] * 10
+    assert responses[0].json() == {**QUOTE, 'tradable': True}
+    # Serially the quote and tradability calls would take 10 * 2 * LATENCY
+    assert elapsed < 4 * LATENCY
+
+
+@pytest.mark.asyncio
+async def test_quote_timeout(upstream_pool):
+    upstream_pool.UPSTREAM_TIMEOUT_SECONDS = LATENCY / 2
+    with patch('dashboard.views.get_latest_quote', slow(QUOTE, 1)), patch('dashboard.views.is_tradable', slow(True)):
+        started = time.perf_counter()
+        response = await get_json(AsyncClient(), reverse('dashboard:market_quote'), ticker='AAPL')
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 504
+    assert response.json()['status'] == 'error'
+    assert elapsed < 1
+
+
+@pytest.mark.asyncio
+async def test_guidance_timeout(upstream_pool):
+    upstream_pool.UPSTREAM_TIMEOUT_SECONDS = LATENCY / 2
+    with patch('dashboard.views.get_educational_context', slow("Explanation", 1)):
+        response = await get_json(AsyncClient(), reverse('dashboard:education_query'), topic='atr_stop')
+    assert response.status_code == 504
+    assert response.json()['topic'] == 'atr_stop'
+
+
+@pytest.mark.asyncio
+async def test_upstream_pool_is_bounded(upstream_pool):
+    upstream_pool.UPSTREAM_MAX_WORKERS = 2
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(LATENCY / 2)
+        with lock:
+            running -= 1
+        return True
+
+    assert await asyncio.gather(*(call_upstream(call) for _ in range(6))) == [True] * 6
+    assert peak == 2
+
+    # Calls still queued when they time out are cancelled
+    with pytest.raises(UpstreamTimeout):
+        await asyncio.gather(*(call_upstream(call, timeout=LATENCY / 4) for _ in range(6)))
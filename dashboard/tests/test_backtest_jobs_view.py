@@ -0,0 +1,143 @@
+# dashboard/tests/test_backtest_jobs_view.py
+import pytest
+import json
+from django.urls import reverse
+from django.test import Client
+from unittest.mock import patch
+
+from dashboard.models import BacktestJob
+
+AJAX = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+@pytest.mark.django_db
+class TestBacktestJobViews:
+    """Tests for queuing backtests from the backtest page and polling them"""
+
+    def setup_method(self):
+        self.client = Client()
+        self.url = reverse('dashboard:backtest_view')
+        self.post_data = {
+            'ticker': 'aapl', 'start_date': '2023-01-01', 'end_date': '2023-12-31',
+            'initial_cash': '100000', 'commission': '0.001', 'lookback': '40',
+        }
+
+    @patch('core.backtest_jobs.run_backtest')
+    def test_ajax_post_enqueues_without_running(self, mock_run_backtest):
+        response = self.client.post(self.url, self.post_data, **AJAX)
+
+        assert response.status_code == 202
+        data = json.loads(response.content)
+        assert data['status'] == 'queued'
+        assert data['deduplicated'] is False
+        mock_run_backtest.assert_not_called()
+
+        job = BacktestJob.objects.get(pk=data['job_id'])
+        assert job.ticker == 'AAPL'
+        assert job.config['strategy_params']['lookback'] == 40
+        assert job.config['strategy_params']['atr_period'] == 14  # Strategy default
+        assert data['status_url'] == reverse('dashboard:backtest_job_status', args=[job.pk])
+
+    def test_identical_submission_is_deduplicated(self):
+        first = json.loads(self.client.post(self.url, self.post_data, **AJAX).content)
+        second = json.loads(self.client.post(self.url, self.post_data, **AJAX).content)
+        assert second['job_id'] == first['job_id']
+        assert second['deduplicated'] is True
+        assert BacktestJob.objects.count() == 1
+
+    def test_ajax_post_invalid_input(self):
+        response = self.client.post(self.url, dict(self.post_data, initial_cash='lots'), **AJAX)
+        assert response.status_code == 400
+        assert json.loads(response.content)['status'] == 'error'
+        assert BacktestJob.objects.count() == 0
+
+    def test_status_endpoint(self):
+        job_id = json.loads(self.client.post(self.url, self.post_data, **AJAX).content)['job_id']
+        BacktestJob.objects.filter(pk=job_id).update(status=BacktestJob.STATUS_RUNNING, progress=0.4)
+
+        response = self.client.get(reverse('dashboard:backtest_job_status', args=[job_id]))
+        data = json.loads(response.content)
+        assert data['status'] == 'running'
+        assert data['progress'] == pytest.approx(0.4)
+
+    def test_result_endpoint_pending_and_finished(self):
+        job_id = json.loads(self.client.post(self.url, self.post_data, **AJAX).content)['job_id']
+        result_url = reverse('dashboard:backtest_job_result', args=[job_id])
+        assert self.client.get(result_url).status_code == 202
+
+        metrics = {
+            'total_trades': 3, 'winning_trades': 2, 'win_rate': 66.7, 'pnl_net': 500.0,
+            'max_drawdown': 4.0, 'sqn': 1.1, 'sharpe_ratio': None,
+            'initial_capital': 100000.0, 'final_capital': 100500.0, 'total_return': 0.5,
+        }
+        BacktestJob.objects.filter(pk=job_id).update(
+            status=BacktestJob.STATUS_SUCCEEDED, progress=1.0,
+            result={'metrics': metrics, 'equity': {'dates': ['2023-01-01', '2023-12-31'],
+                                                   'values': [100000.0, 100500.0]}}
+        )
+        response = self.client.get(result_url)
+        assert response.status_code == 200
+        data = json.loads(response.content)
+        assert data['metrics'] == metrics
+        assert 'Backtest Results for AAPL' in data['html']
+        assert f'data-job-id="{job_id}"' in data['html']  # Monte Carlo resamples this job's trades
+        assert data['equity_figure']['data'][0]['y'] == [100000.0, 100500.0]
+
+    def test_result_endpoint_failed(self):
+        job_id = json.loads(self.client.post(self.url, self.post_data, **AJAX).content)['job_id']
+        BacktestJob.objects.filter(pk=job_id).update(status=BacktestJob.STATUS_FAILED, error='No data')
+        data = json.loads(self.client.get(reverse('dashboard:backtest_job_result', args=[job_id])).content)
+        assert data['status'] == 'failed'
+        assert data['error'] == 'No data'
+
+    def test_unknown_job(self):
+        assert self.client.get(reverse('dashboard:backtest_job_status', args=[999])).status_code == 404
+
+
+@pytest.mark.django_db
+class TestMonteCarloView:
+    """Tests for the Monte Carlo endpoint on the backtest results page"""
+
+    def setup_method(self):
+        self.client = Client()
+        self.url = reverse('dashboard:backtest_monte_carlo')
+        self.job = BacktestJob.objects.create(config_key='mc', ticker='AAPL', config={})
+        self.post_data = {'job_id': self.job.pk, 'mc_method': 'shuffle', 'mc_paths': '500'}
+
+    def finish(self, trades):
+        BacktestJob.objects.filter(pk=self.job.pk).update(status=BacktestJob.STATUS_SUCCEEDED, progress=1.0, result={
+            'metrics': {'initial_capital': 100000.0, 'final_capital': 100300.0},
+            'equity': {'dates': [], 'values': []},
+            'trades': trades,
+        })
+
+    @patch('core.backtest_jobs.run_backtest')
+    def test_monte_carlo_success(self, mock_run_backtest):
+        self.finish([{'pnlcomm': 500.0}, {'pnlcomm': -200.0}])
+        response = self.client.post(self.url, self.post_data)
+
+        assert response.status_code == 200
+        data = json.loads(response.content)
+        assert data['status'] == 'success'
+        assert data['monte_carlo']['paths'] == 500
+        assert data['monte_carlo']['method'] == 'shuffle'
+        assert data['monte_carlo']['ending_equity']['p50'] == pytest.approx(100300.0)
+        assert 'Risk of ruin' in data['html']
+        assert data['figure']['data']
+        mock_run_backtest.assert_not_called()
+
+    def test_monte_carlo_without_trades(self):
+        self.finish([])
+        data = json.loads(self.client.post(self.url, self.post_data).content)
+        assert data['status'] == 'error'
+
+    def test_monte_carlo_needs_finished_job(self):
+        assert self.client.post(self.url, self.post_data).status_code == 409
+        BacktestJob.objects.filter(pk=self.job.pk).update(status=BacktestJob.STATUS_FAILED, error='No data')
+        assert self.client.post(self.url, self.post_data).status_code == 409
+        assert self.client.post(self.url, dict(self.post_data, job_id=999)).status_code == 404
+        assert self.client.post(self.url, dict(self.post_data, job_id='')).status_code == 400
+
+    def test_monte_carlo_rejects_too_many_paths(self):
+        response = self.client.post(self.url, dict(self.post_data, mc_paths='10000000'))
+        assert response.status_code == 400
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock, ANY
 import pytz
 
+from core.backtest_jobs import claim_next_job, execute_job
 from dashboard.models import OHLCVData
 
 @pytest.mark.django_db
@@ -23,7 +24,14 @@ class TestBacktestMetricsExtraction:
             open=1, high=1, low=1, close=1, volume=1
         )
 
-    @patch('dashboard.views.run_backtest')
+    def run_posted_job(self, post_data):
+        """POST the form, run the queued job as run_backtest_worker would and return its page URL"""
+        response = self.client.post(self.url, post_data)
+        assert response.status_code == 302
+        execute_job(claim_next_job())
+        return response['Location']
+
+    @patch('core.backtest_jobs.run_backtest')
     @patch('dashboard.views.get_available_date_range')
     @patch('dashboard.views.OHLCVData.objects.values_list')
     def test_metrics_extraction_full_data(self, mock_values_list, mock_get_range, mock_run_backtest):
@@ -66,9 +74,10 @@ class TestBacktestMetricsExtraction:
             'lookback': '50'
         }
 
-        # Make POST request with plotly plot mocked
+        # Queue the job from a POST, run it, then view its page with plotly plot mocked
+        job_url = self.run_posted_job(post_data)
         with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>'):
-            response = self.client.post(self.url, post_data)
+            response = self.client.get(job_url)
 
         # Check response status
         assert response.status_code == 200
@@ -92,7 +101,7 @@ class TestBacktestMetricsExtraction:
         assert metrics['sqn'] == 2.35
         assert metrics['sharpe_ratio'] == 1.25
 
-    @patch('dashboard.views.run_backtest')
+    @patch('core.backtest_jobs.run_backtest')
     @patch('dashboard.views.OHLCVData.objects.values_list')
     def test_metrics_extraction_partial_data(self, mock_values_list, mock_run_backtest):
         """Test metrics extraction with partial or missing analyzer data"""
@@ -122,9 +131,10 @@ class TestBacktestMetricsExtraction:
             'end_date': '2023-12-31'
         }
 
-        # Make POST request with plotly plot mocked
+        # Queue the job from a POST, run it, then view its page with plotly plot mocked
+        job_url = self.run_posted_job(post_data)
         with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>'):
-            response = self.client.post(self.url, post_data)
+            response = self.client.get(job_url)
 
         # Check response status
         assert response.status_code == 200
@@ -148,7 +158,7 @@ class TestBacktestMetricsExtraction:
         assert metrics['sqn'] is None  # Should be None when sqn data is missing
         assert metrics['sharpe_ratio'] is None  # Should be None when sharpe is missing
 
-    @patch('dashboard.views.run_backtest')
+    @patch('core.backtest_jobs.run_backtest')
     @patch('dashboard.views.OHLCVData.objects.values_list')
     def test_metrics_extraction_no_trades(self, mock_values_list, mock_run_backtest):
         """Test metrics extraction when no trades were executed during backtest"""
@@ -176,9 +186,10 @@ class TestBacktestMetricsExtraction:
             'end_date': '2023-12-31'
         }
 
-        # Make POST request with plotly plot mocked
+        # Queue the job from a POST, run it, then view its page with plotly plot mocked
+        job_url = self.run_posted_job(post_data)
         with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>'):
-            response = self.client.post(self.url, post_data)
+            response = self.client.get(job_url)
 
         # Check response status
         assert response.status_code == 200
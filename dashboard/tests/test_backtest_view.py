@@ -8,13 +8,18 @@ from unittest.mock import patch, MagicMock, ANY # Import ANY
 import pytz
 
 # Import models and functions for mocking
-from dashboard.models import OHLCVData
-# Note: We patch run_backtest where it's *used* in the view
+from core.backtest_jobs import claim_next_job, execute_job
+from dashboard.models import BacktestJob, OHLCVData
+# Note: Form posts only queue a job; run_backtest is patched where the job runs it
 
 @pytest.mark.django_db
 class TestBacktestView:
     """Tests for the backtest view"""
 
+    def run_queued_job(self):
+        """Run the queued job the way run_backtest_worker does"""
+        return execute_job(claim_next_job())
+
     def setup_method(self):
         """Set up the test client and other test variables"""
         self.client = Client()
@@ -37,13 +42,13 @@ class TestBacktestView:
         assert 'dashboard/backtest_view.html' in [t.name for t in response.templates]
         assert 'metrics' not in response.context
 
-    # Patch run_backtest where it's imported in views.py
-    @patch('dashboard.views.run_backtest')
+    # Patch run_backtest where the background job calls it
+    @patch('core.backtest_jobs.run_backtest')
     @patch('dashboard.views.get_available_date_range') # Mock this too if needed
     @patch('dashboard.views.OHLCVData.objects.values_list')
     def test_post_backtest_view_success_and_metrics(self, mock_values_list, mock_get_range, mock_run_backtest):
         """
-        Test successful POST request and verify metric extraction.
+        Test that a form POST queues a job whose page shows the extracted metrics.
         """
         # Mock the available tickers
         mock_values_list.return_value.distinct.return_value = ['AAPL', 'MSFT', 'GOOG']
@@ -85,12 +90,27 @@ class TestBacktestView:
             'initial_stop_atr_mult': '2.0', 'trail_stop_atr_mult': '3.0'
         }
 
-        # Make POST request (mock plotly plot)
-        with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>') as mock_plotly_plot:
-            response = self.client.post(self.url, post_data)
+        # The POST only queues the job and redirects to its page
+        response = self.client.post(self.url, post_data)
+        job = BacktestJob.objects.get()
+        job_url = reverse('dashboard:backtest_job_page', args=[job.pk])
+        assert response.status_code == 302
+        assert response['Location'] == job_url
+        mock_run_backtest.assert_not_called()
+
+        # The page refreshes itself until the job has run
+        response = self.client.get(job_url)
+        assert response.context['pending_job'] == job
+        assert b'http-equiv="refresh"' in response.content
+        assert 'metrics' not in response.context
+
+        self.run_queued_job()
+        with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>'):
+            response = self.client.get(job_url)
 
         # --- Assertions ---
         assert response.status_code == 200
+        assert 'pending_job' not in response.context
         assert 'backtest_params' in response.context
         assert 'metrics' in response.context # Check metrics dict exists
         assert 'equity_chart_div' in response.context # Check chart exists
@@ -116,7 +136,7 @@ class TestBacktestView:
         # Check for initial_cash in kwargs
         assert kwargs['initial_cash'] == 100000.0
 
-    @patch('dashboard.views.run_backtest')
+    @patch('core.backtest_jobs.run_backtest')
     @patch('dashboard.views.OHLCVData.objects.values_list')
     def test_post_backtest_view_run_fail(self, mock_values_list, mock_run_backtest):
         """Test that the backtest view handles errors from run_backtest"""
@@ -126,13 +146,15 @@ class TestBacktestView:
         start_date_str = (timezone.now() - timedelta(days=10)).strftime('%Y-%m-%d')
         end_date_str = timezone.now().strftime('%Y-%m-%d')
         post_data = {'ticker': 'AAPL', 'start_date': start_date_str, 'end_date': end_date_str}
-        response = self.client.post(self.url, post_data)
+        response = self.client.post(self.url, post_data, follow=True)
+        self.run_queued_job()
+        response = self.client.get(response.redirect_chain[-1][0])
         assert response.status_code == 200
         assert 'error_message' in response.context
         assert response.context['error_message'] == error_msg
         assert 'metrics' not in response.context
         
-    @patch('dashboard.views.run_backtest')
+    @patch('core.backtest_jobs.run_backtest')
     @patch('dashboard.views.OHLCVData.objects.values_list')
     def test_missing_metrics_handled_gracefully(self, mock_values_list, mock_run_backtest):
         """Test that the view handles missing metrics gracefully"""
@@ -153,8 +175,10 @@ class TestBacktestView:
             'end_date': '2023-12-31'
         }
         
+        job_url = self.client.post(self.url, post_data)['Location']
+        self.run_queued_job()
         with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>'):
-            response = self.client.post(self.url, post_data)
+            response = self.client.get(job_url)
         
         # Check that metrics exist with default values
         assert response.status_code == 200
@@ -0,0 +1,87 @@
+# dashboard/tests/test_chart_data.py
+import pytest
+from unittest.mock import patch
+from django.test import Client
+from django.urls import reverse
+
+from core.data_handler import save_ohlcv_data
+from core.tests.helpers import make_ohlcv, saved_bars
+
+HISTORY = {'start': '2000-01-01', 'end': '2030-12-31'}
+
+
+@pytest.mark.django_db
+class TestChartDataAPI:
+    """The chart data API answers repeat requests for unchanged data with 304"""
+
+    @pytest.fixture(autouse=True)
+    def history(self):
+        self.bars = saved_bars(make_ohlcv(2, bars=300))
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(self.bars.iloc[:250].copy(), 'DATA')
+        self.client = Client()
+        self.url = reverse('dashboard:chart_data', args=['DATA'])
+
+    def test_payload(self):
+        response = self.client.get(self.url, {**HISTORY, 'max_points': '1000'})
+        assert response.status_code == 200
+        assert set(response['Cache-Control'].split(', ')) == {'private', 'no-cache'}
+        series = response.json()
+        assert series['ticker'] == 'DATA'
+        assert series['bars'] == 250
+        assert series['downsampled'] is False
+        assert series['candles']['close'][-1] == pytest.approx(self.bars['close'].iloc[249])
+        # Compact encoding
+        assert b', ' not in response.content and b': ' not in response.content
+
+    def test_if_none_match(self):
+        first = self.client.get(self.url, HISTORY)
+        etag = first['ETag']
+        repeat = self.client.get(self.url, HISTORY, HTTP_IF_NONE_MATCH=etag)
+        assert repeat.status_code == 304
+        assert repeat.content == b''
+        # Another range or resolution is another representation
+        other = self.client.get(self.url, {**HISTORY, 'max_points': '200'}, HTTP_IF_NONE_MATCH=etag)
+        assert other.status_code == 200
+
+    def test_if_modified_since(self):
+        first = self.client.get(self.url, HISTORY)
+        repeat = self.client.get(self.url, HISTORY, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        assert repeat.status_code == 304
+
+    def test_new_bars_change_etag(self):
+        etag = self.client.get(self.url, HISTORY)['ETag']
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(self.bars.iloc[250:].copy(), 'DATA')
+        response = self.client.get(self.url, HISTORY, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert response.json()['bars'] == 300
+
+    def test_range(self):
+        start, end = self.bars.index[100], self.bars.index[149]
+        series = self.client.get(self.url, {'start': f"{start:%Y-%m-%d}", 'end': f"{end:%Y-%m-%d}"}).json()
+        assert series['bars'] == 50
+        assert series['candles']['x'][0].startswith(f"{start:%Y-%m-%d}")
+        # Moving averages are warmed up on the bars before the range
+        assert series['lines']['sma_50']['x'][0] == series['candles']['x'][0]
+
+    @pytest.mark.parametrize('params', [
+        {'start': '2020-13-01'},
+        {'end': 'yesterday'},
+        {'max_points': 'wide'},
+        {'start': '2021-01-01', 'end': '2020-01-01'},
+    ])
+    def test_invalid_params(self, params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == 400
+        assert 'error' in response.json()
+        assert not response.has_header('ETag')
+
+    def test_page_is_a_shell(self):
+        with patch('dashboard.views.plot', return_value='<div id="test-plot"></div>') as mock_plot:
+            response = self.client.get(reverse('dashboard:chart_view', args=['DATA']), {
+                'start_date': '2000-01-01', 'end_date': '2030-12-31'})
+        figure = mock_plot.call_args[0][0]
+        assert all(len(trace.x) == 0 for trace in figure.data)
+        assert response.context['chart_data_url'] == self.url
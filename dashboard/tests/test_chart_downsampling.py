@@ -0,0 +1,54 @@
+# dashboard/tests/test_chart_downsampling.py
+import pytest
+from unittest.mock import patch
+from django.test import Client
+from django.urls import reverse
+
+from core.data_handler import save_ohlcv_data
+from core.tests.helpers import make_ohlcv, saved_bars
+
+HISTORY = {'start': '2000-01-01', 'end': '2030-12-31'}
+
+
+@pytest.mark.django_db
+class TestChartDownsampling:
+    """The chart data API reduces long histories to about one point per pixel"""
+
+    @pytest.fixture(autouse=True)
+    def history(self):
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(saved_bars(make_ohlcv(1, bars=3000)), 'LONG')
+        self.client = Client()
+        self.url = reverse('dashboard:chart_data', args=['LONG'])
+
+    def test_traces_downsampled_to_width(self):
+        response = self.client.get(self.url, {**HISTORY, 'max_points': '800'})
+        series = response.json()
+        assert series['bars'] == 3000
+        assert series['downsampled'] is True
+        assert len(series['candles']['x']) == 800
+        assert len(series['volume']['y']) == 800
+        assert all(len(line['y']) == 800 for line in series['lines'].values())
+        # Candle buckets keep the extremes of the range
+        df = saved_bars(make_ohlcv(1, bars=3000))
+        assert max(series['candles']['high']) == df['high'].max()
+        assert min(series['candles']['low']) == df['low'].min()
+
+    def test_zoomed_range_is_full_resolution(self):
+        response = self.client.get(self.url, {'start': '2020-01-01', 'end': '2020-12-31', 'max_points': '800'})
+        series = response.json()
+        assert series['downsampled'] is False
+        assert len(series['candles']['x']) == series['bars'] == 262
+        assert len(series['lines']['sma_10']['y']) == 262
+
+    def test_default_points(self):
+        series = self.client.get(self.url, HISTORY).json()
+        assert len(series['candles']['x']) == 1200
+        # max_points is clamped to a sensible range
+        series = self.client.get(self.url, {**HISTORY, 'max_points': '5'}).json()
+        assert len(series['candles']['x']) == 100
+
+    def test_json_errors(self):
+        response = self.client.get(reverse('dashboard:chart_data', args=['NONE']))
+        assert response.status_code == 404
+        assert 'error' in response.json()
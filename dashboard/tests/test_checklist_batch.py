@@ -0,0 +1,94 @@
+# dashboard/tests/test_checklist_batch.py
+import json
+import pytest
+from decimal import Decimal
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core.view_cache import trade_log_version
+from dashboard.models import CLASSIC_BREAKOUT_CHECKLIST, TradeChecklistStatus, TradeLog
+
+
+def make_trade(**fields):
+    values = dict(ticker="AAPL", strategy="Classic Breakout", entry_date=timezone.now(),
+                  entry_price=Decimal("150.00"), initial_stop_loss=Decimal("145.00"),
+                  position_size=Decimal("100"), user_risk_percent=Decimal("1.0"),
+                  account_capital_at_trade=Decimal("50000.00"))
+    values.update(fields)
+    return TradeLog.objects.create(**values)
+
+
+@pytest.mark.django_db
+class TestChecklistCreation:
+    """Checklist rows are created with one bulk insert when a trade is saved"""
+
+    def test_rows_created_on_save(self, django_assert_max_num_queries):
+        # Trade insert and one checklist insert; the rest is the journal summary refresh
+        with django_assert_max_num_queries(9):
+            trade = make_trade()
+        items = list(trade.checklist_items.values_list('checklist_item', 'is_checked'))
+        assert items == [(item, False) for item in CLASSIC_BREAKOUT_CHECKLIST]
+
+    def test_resave_keeps_states(self):
+        trade = make_trade()
+        trade.checklist_items.filter(checklist_item=CLASSIC_BREAKOUT_CHECKLIST[0]).update(is_checked=True)
+        trade.notes = "updated"
+        trade.save()
+        trade.create_checklist()
+        assert trade.checklist_items.count() == len(CLASSIC_BREAKOUT_CHECKLIST)
+        assert trade.checklist_items.filter(is_checked=True).count() == 1
+
+
+@pytest.mark.django_db
+class TestChecklistBatchUpdate:
+    """Many checklist states are saved in one request with one bulk update"""
+
+    def setup_method(self):
+        self.client = Client()
+        self.trade = make_trade()
+        self.items = list(self.trade.checklist_items.all())
+        self.url = reverse('dashboard:update_checklist_items', args=[self.trade.pk])
+
+    def post(self, items):
+        return self.client.post(self.url, {'items': json.dumps(items)})
+
+    def test_batch_update(self, django_assert_max_num_queries):
+        states = {str(item.pk): n % 2 == 0 for n, item in enumerate(self.items)}
+        # Trade lookup, item load and one bulk UPDATE in a transaction, regardless of the item count
+        with django_assert_max_num_queries(5):
+            response = self.post(states)
+        assert response.status_code == 200
+        assert response.json() == {'success': True, 'updated': len(self.items[::2])}
+        checked = set(TradeChecklistStatus.objects.filter(is_checked=True).values_list('pk', flat=True))
+        assert checked == {item.pk for item in self.items[::2]}
+
+    def test_unchanged_items_not_written(self):
+        response = self.post({str(self.items[0].pk): False})
+        assert response.json()['updated'] == 0
+
+    def test_invalidates_cached_journal(self):
+        version = trade_log_version()
+        self.post({str(self.items[0].pk): True})
+        assert trade_log_version() != version
+
+    @pytest.mark.parametrize('items', ['not json', '[]', '{}', '{"x": true}', '{"1": "maybe"}'])
+    def test_invalid_payload(self, items):
+        response = self.client.post(self.url, {'items': items})
+        assert response.status_code == 400
+        assert not response.json()['success']
+
+    def test_items_of_other_trade_rejected(self):
+        other = make_trade(ticker="MSFT")
+        response = self.post({str(self.items[0].pk): True, str(other.checklist_items.first().pk): True})
+        assert response.status_code == 400
+        assert not TradeChecklistStatus.objects.filter(is_checked=True).exists()
+
+    def test_requires_post(self):
+        assert self.client.get(self.url).status_code == 405
+
+    def test_single_item_endpoint(self):
+        response = self.client.post(reverse('dashboard:update_checklist_item'),
+                                    {'item_id': self.items[1].pk, 'is_checked': 'true'})
+        assert response.json() == {'success': True, 'updated': 1}
+        assert TradeChecklistStatus.objects.get(pk=self.items[1].pk).is_checked
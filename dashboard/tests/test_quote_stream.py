@@ -0,0 +1,161 @@
+# dashboard/tests/test_quote_stream.py
+import asyncio
+import itertools
+import pytest
+from collections import Counter
+from unittest.mock import patch
+from channels.layers import channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+
+from core import quote_stream
+from core.upstream import shutdown_upstream_executor
+from dashboard.routing import websocket_urlpatterns
+
+INTERVAL = 0.02
+
+
+@pytest.fixture(autouse=True)
+def stream_settings(settings):
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+    settings.QUOTE_POLL_INTERVAL_SECONDS = INTERVAL
+    settings.QUOTE_MAX_UPDATES_PER_SECOND = 100
+    settings.QUOTE_MAX_SUBSCRIPTIONS = 20
+    channel_layers.backends.clear()
+    shutdown_upstream_executor()
+    yield settings
+    channel_layers.backends.clear()
+    shutdown_upstream_executor(wait=False)
+
+
+class FakeAlpaca:
+    """Counts quote calls per ticker; ``moving`` quotes change price on every call"""
+
+    def __init__(self, moving=False):
+        self.calls = Counter()
+        self.moving = moving
+        self.ticks = itertools.count()
+
+    def get_latest_quote(self, ticker):
+        self.calls[ticker] += 1
+        price = 100 + (next(self.ticks) if self.moving else 0)
+        return {'ticker': ticker, 'bid_price': price, 'bid_size': 1, 'ask_price': price + 0.1, 'ask_size': 1,
+                'status': 'success'}
+
+    def patch(self):
+        return patch.multiple('core.quote_stream', get_latest_quote=self.get_latest_quote,
+                              is_tradable=lambda ticker: True)
+
+
+async def connect():
+    communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/quotes/')
+    connected, _ = await communicator.connect()
+    assert connected
+    return communicator
+
+
+async def subscribe(communicator, ticker):
+    await communicator.send_json_to({'action': 'subscribe', 'ticker': ticker})
+    assert await communicator.receive_json_from() == {'type': 'subscribed', 'ticker': ticker.upper()}
+
+
+@pytest.mark.asyncio
+async def test_one_poller_per_ticker():
+    alpaca = FakeAlpaca()
+    with alpaca.patch():
+        viewers = [await connect() for _ in range(3)]
+        for viewer in viewers:
+            await subscribe(viewer, 'AAPL')
+        other = await connect()
+        await subscribe(other, 'msft')
+        assert quote_stream.active_pollers() == ['AAPL', 'MSFT']
+
+        for viewer in viewers:
+            message = await viewer.receive_json_from()
+            assert message['type'] == 'quote'
+            assert message['quote']['ticker'] == 'AAPL' and message['quote']['tradable']
+        await asyncio.sleep(10 * INTERVAL)
+        # Three viewers of AAPL cost as many upstream calls as one viewer of MSFT
+        assert abs(alpaca.calls['AAPL'] - alpaca.calls['MSFT']) <= 2
+
+        for communicator in viewers + [other]:
+            await communicator.disconnect()
+        await asyncio.sleep(INTERVAL)
+    assert quote_stream.active_pollers() == []
+    assert cache.get(quote_stream._lease_key('AAPL')) is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_quotes_not_resent():
+    with FakeAlpaca().patch():
+        viewer = await connect()
+        await subscribe(viewer, 'AAPL')
+        assert (await viewer.receive_json_from())['type'] == 'quote'
+        assert await viewer.receive_nothing(timeout=10 * INTERVAL)
+
+        # A late subscriber gets the latest quote right away
+        late = await connect()
+        await subscribe(late, 'AAPL')
+        assert (await late.receive_json_from())['quote']['bid_price'] == 100
+        await viewer.disconnect()
+        await late.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_updates_coalesced_to_max_rate(stream_settings):
+    stream_settings.QUOTE_MAX_UPDATES_PER_SECOND = 5
+    with FakeAlpaca(moving=True).patch():
+        viewer = await connect()
+        await subscribe(viewer, 'AAPL')
+        prices = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 0.65
+        while not await viewer.receive_nothing(timeout=max(0, deadline - loop.time()), interval=0.005):
+            prices.append((await viewer.receive_json_from())['quote']['bid_price'])
+        await viewer.disconnect()
+    # Polled ~30 times, but sent at most every 0.2 seconds with the newest price
+    assert 2 <= len(prices) <= 4
+    assert prices == sorted(prices) and prices[-1] - prices[0] > len(prices)
+
+
+@pytest.mark.asyncio
+async def test_standby_while_another_process_polls():
+    cache.set(quote_stream._lease_key('AAPL'), 'another-process', 60)
+    alpaca = FakeAlpaca()
+    with alpaca.patch():
+        viewer = await connect()
+        await subscribe(viewer, 'AAPL')
+        assert await viewer.receive_nothing(timeout=5 * INTERVAL)
+        await viewer.disconnect()
+    assert alpaca.calls['AAPL'] == 0
+    assert cache.get(quote_stream._lease_key('AAPL')) == 'another-process'
+
+
+@pytest.mark.asyncio
+async def test_invalid_messages(stream_settings):
+    stream_settings.QUOTE_MAX_SUBSCRIPTIONS = 1
+    with FakeAlpaca().patch():
+        viewer = await connect()
+        await viewer.send_json_to({'action': 'watch', 'ticker': 'AAPL'})
+        assert (await viewer.receive_json_from())['type'] == 'error'
+        await viewer.send_json_to({'action': 'subscribe', 'ticker': 'NOT A TICKER'})
+        assert (await viewer.receive_json_from())['type'] == 'error'
+        await subscribe(viewer, 'AAPL')
+        await viewer.send_json_to({'action': 'subscribe', 'ticker': 'MSFT'})
+        message = await viewer.receive_json_from()
+        while message['type'] == 'quote':
+            message = await viewer.receive_json_from()
+        assert message['type'] == 'error' and message['ticker'] == 'MSFT'
+        await viewer.send_json_to({'action': 'unsubscribe', 'ticker': 'AAPL'})
+        await asyncio.sleep(INTERVAL)
+        assert quote_stream.active_pollers() == []
+        await viewer.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_asgi_rejects_foreign_origins():
+    from swing_project.asgi import application
+    communicator = WebsocketCommunicator(application, '/ws/quotes/', headers=[(b'origin', b'http://evil.example')])
+    connected, _ = await communicator.connect()
+    assert not connected
@@ -0,0 +1,60 @@
+# dashboard/tests/test_screener_view.py
+import json
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+
+from core.tests.helpers import force_breakout, make_ohlcv, store_bars
+
+PARAMS = {'lookback': '20', 'volume_ma_period': '10', 'volume_mult': '1.2', 'atr_period': '10'}
+
+
+@pytest.fixture
+def universe():
+    for seed in range(12):
+        df = make_ohlcv(seed, bars=150)
+        if seed in (2, 5, 8):
+            force_breakout(df, '2015-04-15', size=seed)
+        store_bars(df, f"T{seed:02d}")
+
+
+@pytest.mark.django_db
+class TestScreenerView:
+    """Tests for the breakout screener endpoint and command"""
+
+    def setup_method(self):
+        self.client = Client()
+        self.url = reverse('dashboard:screener')
+
+    def test_returns_ranked_candidates(self, universe):
+        response = self.client.get(self.url, {**PARAMS, 'as_of': '2015-04-15'})
+
+        assert response.status_code == 200
+        data = json.loads(response.content)
+        assert data['status'] == 'success'
+        assert data['as_of'] == '2015-04-15'
+        assert data['scanned'] == 12
+        assert data['params']['lookback'] == 20
+        assert [c['ticker'] for c in data['candidates']] == ['T08', 'T05', 'T02']
+        assert [c['rank'] for c in data['candidates']] == [1, 2, 3]
+        assert all(c['stop'] < c['close'] for c in data['candidates'])
+
+    def test_invalid_parameter(self):
+        response = self.client.get(self.url, {'lookback': 'abc'})
+        assert response.status_code == 400
+        assert json.loads(response.content)['status'] == 'error'
+
+    def test_command_json_matches_endpoint(self, universe):
+        out = StringIO()
+        call_command('screen_breakouts', lookback=20, volume_ma_period=10, volume_mult=1.2, atr_period=10,
+                     json=True, stdout=out)
+        endpoint = json.loads(self.client.get(self.url, PARAMS).content)
+        assert json.loads(out.getvalue())['candidates'] == endpoint['candidates']
+
+    def test_command_table(self, universe):
+        out = StringIO()
+        call_command('screen_breakouts', stdout=out)
+        assert '12 tickers screened' in out.getvalue()
+        assert 'candidate(s).' in out.getvalue()
@@ -8,6 +8,7 @@ from unittest.mock import patch, MagicMock, ANY
 import pytz
 import json
 
+from core.backtest_jobs import claim_next_job, execute_job
 from dashboard.models import OHLCVData
 from core.strategies import ClassicBreakoutStrategy
 
@@ -36,7 +37,14 @@ class TestStory8Requirements:
                 volume=1000000 + i * 10000
             )
 
-    @patch('dashboard.views.run_backtest')
+    def run_posted_job(self, post_data):
+        """POST the form, run the queued job as run_backtest_worker would and return its page URL"""
+        response = self.client.post(self.url, post_data)
+        assert response.status_code == 302
+        execute_job(claim_next_job())
+        return response['Location']
+
+    @patch('core.backtest_jobs.run_backtest')
     def test_all_story8_acceptance_criteria(self, mock_run_backtest):
         """
         Test that all acceptance criteria for Story 8 are met:
@@ -77,9 +85,10 @@ class TestStory8Requirements:
             'commission': '0.001'
         }
 
-        # Make POST request with plotly plot mocked
+        # Queue the job from a POST, run it, then view its page with plotly plot mocked
+        job_url = self.run_posted_job(post_data)
         with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>') as mock_plot:
-            response = self.client.post(self.url, post_data)
+            response = self.client.get(job_url)
 
         # Check response
         assert response.status_code == 200
@@ -110,7 +119,7 @@ class TestStory8Requirements:
         assert response_get.status_code == 200
         assert 'metrics' not in response_get.context
     
-    @patch('dashboard.views.run_backtest')
+    @patch('core.backtest_jobs.run_backtest')
     def test_handles_error_condition(self, mock_run_backtest):
         """Test that the view correctly handles errors or failed backtests"""
         # Mock a failed backtest
@@ -127,15 +136,15 @@ class TestStory8Requirements:
             'end_date': '2023-12-31'
         }
         
-        # Make POST request
-        response = self.client.post(self.url, post_data)
+        # Queue the job from a POST, run it and view its page
+        response = self.client.get(self.run_posted_job(post_data))
         
         # Check that error message is displayed and no metrics are in context
         assert response.status_code == 200
         assert 'error_message' in response.context
         assert 'metrics' not in response.context
     
-    @patch('dashboard.views.run_backtest')
+    @patch('core.backtest_jobs.run_backtest')
     def test_handles_empty_analyzers(self, mock_run_backtest):
         """Test that the view gracefully handles missing or empty analyzers"""
         # Mock a successful backtest but with empty analyzers
@@ -153,9 +162,10 @@ class TestStory8Requirements:
             'end_date': '2023-12-31'
         }
         
-        # Make POST request with plotly plot mocked
+        # Queue the job from a POST, run it, then view its page with plotly plot mocked
+        job_url = self.run_posted_job(post_data)
         with patch('dashboard.views.plot', return_value='<div>Mock Chart</div>'):
-            response = self.client.post(self.url, post_data)
+            response = self.client.get(job_url)
         
         # Check that metrics have default values and no errors occur
         assert response.status_code == 200
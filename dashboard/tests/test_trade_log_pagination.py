@@ -0,0 +1,108 @@
+# dashboard/tests/test_trade_log_pagination.py
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.journal import trade_log_summary
+from core.pagination import KeysetPage, decode_cursor, encode_cursor
+from dashboard.models import TradeChecklistStatus, TradeLog
+from dashboard.views import TRADE_LOG_PAGE_SIZE
+
+TRADES = 120
+
+
+@pytest.mark.django_db
+class TestTradeLogPagination:
+    """The trade journal is keyset-paginated with an aggregate summary"""
+
+    def setup_method(self):
+        self.client = Client()
+        self.url = reverse('dashboard:trade_log_list')
+        start = timezone.make_aware(datetime(2020, 1, 1, 10, 0))
+        # Pairs of trades share an entry date, so the id breaks ties
+        TradeLog.objects.bulk_create([
+            TradeLog(ticker=f"T{i:03d}", strategy="Classic Breakout", entry_date=start + timedelta(days=i // 2),
+                     entry_price=Decimal("100.00"), initial_stop_loss=Decimal("95.00"),
+                     position_size=Decimal("10"), user_risk_percent=Decimal("1.0"),
+                     account_capital_at_trade=Decimal("10000.00"), rationale="x" * 2000,
+                     pnl=None if i % 4 == 3 else Decimal(-50 if i % 4 == 2 else 100))
+            for i in range(TRADES)
+        ])
+        self.expected = list(TradeLog.objects.order_by('-entry_date', '-id').values_list('id', flat=True))
+        TradeChecklistStatus.objects.bulk_create([
+            TradeChecklistStatus(trade_log_id=pk, checklist_item=f"Item {n}", is_checked=n == 0)
+            for pk in self.expected for n in range(3)
+        ])
+
+    def page(self, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url, params)
+        assert response.status_code == 200
+        return response.context['trade_logs'], captured
+
+    def test_walk_pages(self):
+        seen = []
+        page, _ = self.page()
+        assert not page.has_previous
+        pages = 1
+        while True:
+            seen.extend(row.pk for row in page)
+            if not page.has_next:
+                break
+            page, _ = self.page(after=page.next_cursor)
+            pages += 1
+        assert seen == self.expected
+        assert pages == -(-TRADES // TRADE_LOG_PAGE_SIZE)
+
+        # And back again
+        previous, _ = self.page(before=page.previous_cursor)
+        assert [row.pk for row in previous] == self.expected[TRADE_LOG_PAGE_SIZE:2 * TRADE_LOG_PAGE_SIZE]
+        assert previous.has_next and previous.has_previous
+
+    def test_constant_queries_per_page(self):
+        first, first_queries = self.page()
+        second, second_queries = self.page(after=first.next_cursor)
+        assert len(first_queries) == len(second_queries)
+        sql = ' '.join(q['sql'] for q in second_queries.captured_queries).upper()
+        assert 'OFFSET' not in sql
+        # Only the listed columns are loaded
+        assert 'RATIONALE' not in sql
+        # Checklists are prefetched with one query per page
+        assert len([q for q in second_queries.captured_queries
+                    if 'dashboard_tradecheckliststatus' in q['sql']]) == 1
+
+    def test_summary(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            summary = trade_log_summary()
+        assert summary['trades'] == TRADES
+        assert summary['closed'] == 90
+        assert summary['wins'] == 60
+        assert summary['total_pnl'] == Decimal(60 * 100 - 30 * 50)
+        assert summary['win_rate'] == pytest.approx(2 / 3)
+
+        response = self.client.get(self.url)
+        assert b'$4500.00' in response.content
+        assert b'67%' in response.content
+        assert b'1/3' in response.content
+
+    def test_invalid_cursor(self):
+        page, _ = self.page(after='not-a-cursor')
+        assert [row.pk for row in page] == self.expected[:TRADE_LOG_PAGE_SIZE]
+        with pytest.raises(ValueError):
+            decode_cursor('bm9wZQ')
+
+    def test_cursor_round_trip(self):
+        value = timezone.make_aware(datetime(2021, 3, 4, 5, 6, 7, 890))
+        assert decode_cursor(encode_cursor(value, 42)) == (value, 42)
+
+    def test_page_is_lazy(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            page = KeysetPage(TradeLog.objects.all(), 'entry_date', 10)
+        with django_assert_num_queries(1):
+            assert len(page) == 10
+            assert page.has_next
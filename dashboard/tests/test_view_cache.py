@@ -0,0 +1,120 @@
+# dashboard/tests/test_view_cache.py
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.data_handler import save_ohlcv_data
+from core.tests.helpers import make_ohlcv, saved_bars
+from core.view_cache import (GENERATION_TRADE_LOGS, SECTION_CHART_DATA, SECTION_TICKER_LIST,
+                             SECTION_TRADE_LOG_LIST, cache_stats, generation)
+from dashboard.models import TradeLog
+
+
+def stats(section):
+    return next(row for row in cache_stats() if row['section'] == section)
+
+
+def queries_on(captured, table):
+    return [q['sql'] for q in captured.captured_queries if table in q['sql']]
+
+
+def make_trade(ticker):
+    return TradeLog.objects.create(
+        ticker=ticker, strategy="Classic Breakout",
+        entry_date=timezone.make_aware(datetime(2025, 4, 26, 10, 0)),
+        entry_price=Decimal("100.00"), initial_stop_loss=Decimal("95.00"),
+        position_size=Decimal("10"), user_risk_percent=Decimal("1.0"),
+        account_capital_at_trade=Decimal("10000.00"), rationale="Cache test"
+    )
+
+
+@pytest.mark.django_db
+class TestViewCache:
+    """Views and fragments are cached under data versions and report hit rates"""
+
+    def setup_method(self):
+        self.client = Client()
+
+    def test_trade_log_list_fragment(self):
+        make_trade('AAA')
+        url = reverse('dashboard:trade_log_list')
+        assert b'AAA' in self.client.get(url).content
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        assert b'AAA' in response.content
+        assert not queries_on(captured, 'dashboard_tradelog')
+        assert (stats(SECTION_TRADE_LOG_LIST)['hits'], stats(SECTION_TRADE_LOG_LIST)['misses']) == (1, 1)
+
+        # Saving a trade log invalidates the fragment
+        make_trade('BBB')
+        assert b'BBB' in self.client.get(url).content
+        assert stats(SECTION_TRADE_LOG_LIST)['misses'] == 2
+
+    def test_ticker_list_fragment(self):
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(saved_bars(make_ohlcv(1, bars=30)), 'AAA')
+        url = reverse('dashboard:backtest_view')
+        assert b'value="AAA"' in self.client.get(url).content
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url)
+        assert not queries_on(captured, 'dashboard_tickercatalog')
+        assert stats(SECTION_TICKER_LIST)['hits'] == 1
+
+        # New bars for a known ticker keep the list; a new ticker replaces it
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(saved_bars(make_ohlcv(1, bars=40)), 'AAA')
+            self.client.get(url)
+            assert stats(SECTION_TICKER_LIST)['hits'] == 2
+            save_ohlcv_data(saved_bars(make_ohlcv(2, bars=30)), 'BBB')
+        assert b'value="BBB"' in self.client.get(url).content
+
+    def test_chart_data_cached_per_data_version(self):
+        df = saved_bars(make_ohlcv(3, bars=120))
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(df.iloc[:100].copy(), 'CHRT')
+        url = reverse('dashboard:chart_data', args=['CHRT'])
+        params = {'start': '2000-01-01', 'end': '2030-12-31'}
+        first = self.client.get(url, params).json()
+        with CaptureQueriesContext(connection) as captured:
+            assert self.client.get(url, params).json() == first
+        assert not queries_on(captured, 'dashboard_ohlcvdata')
+        assert stats(SECTION_CHART_DATA)['hits'] == 1
+
+        with patch('logging.Logger.info'):
+            save_ohlcv_data(df.iloc[100:].copy(), 'CHRT')
+        assert self.client.get(url, params).json()['bars'] == 120
+        assert stats(SECTION_CHART_DATA)['misses'] == 2
+
+    def test_generation_after_cache_clear(self):
+        make_trade('AAA')
+        before = generation(GENERATION_TRADE_LOGS)
+        cache.clear()
+        assert generation(GENERATION_TRADE_LOGS) != before
+
+    def test_stats_page(self, admin_client):
+        url = reverse('dashboard:cache_stats')
+        assert self.client.get(url).status_code == 302  # Staff only
+
+        self.client.get(reverse('dashboard:trade_log_list'))
+        self.client.get(reverse('dashboard:trade_log_list'))
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert b'50%' in response.content
+        assert stats(SECTION_TRADE_LOG_LIST)['hit_rate'] == 0.5
+
+        admin_client.post(url)
+        assert stats(SECTION_TRADE_LOG_LIST)['hit_rate'] is None
+
+    def test_landing_page_cached(self):
+        url = reverse('dashboard:landing_page')
+        self.client.get(url)
+        with patch('dashboard.views.HttpResponse') as response:
+            assert self.client.get(url).status_code == 200
+        response.assert_not_called()
@@ -10,24 +10,37 @@ urlpatterns = [
     
     # Chart URLs (Story 5)
     path('chart/<str:ticker>/', views.chart_view, name='chart_view'),
+    path('chart/<str:ticker>/data/', views.chart_data_view, name='chart_data'),
     path('chart/', views.chart_view, name='chart_view_default'),
 
     # Backtest URL (Story 7)
     path('backtest/', views.backtest_view, name='backtest_view'),
+    path('backtest/jobs/<int:job_id>/', views.backtest_job_status, name='backtest_job_status'),
+    path('backtest/jobs/<int:job_id>/result/', views.backtest_job_result, name='backtest_job_result'),
+    path('backtest/jobs/<int:job_id>/page/', views.backtest_job_page, name='backtest_job_page'),
+    path('backtest/monte-carlo/', views.backtest_monte_carlo, name='backtest_monte_carlo'),
+
+    # Breakout screener
+    path('screener/', views.screener_view, name='screener'),
 
     # Trade Log URLs (Story 10)
     path('tradelog/', views.trade_log_list_view, name='trade_log_list'),
     path('tradelog/new/', views.trade_log_create_view, name='trade_log_create'),
+    path('tradelog/analytics/', views.journal_analytics_view, name='journal_analytics'),
     path('tradelog/<int:pk>/', views.trade_log_detail_view, name='trade_log_detail'),
     path('tradelog/<int:pk>/update/', views.trade_log_update_view, name='trade_log_update'),
     path('tradelog/<int:pk>/delete/', views.trade_log_delete_view, name='trade_log_delete'),
 
     # Checklist Update URL (Story 13)
     path('tradelog/checklist/update/', views.update_checklist_item, name='update_checklist_item'),
+    path('tradelog/<int:pk>/checklist/', views.update_checklist_items, name='update_checklist_items'),
 
     # Market Quote URL (Story 12)
     path('market-quote/', views.market_quote_view, name='market_quote'),
 
     # Educational Guidance URL (Story 15)
     path('education/query/', views.educational_guidance_view, name='education_query'),
+
+    # Cache hit rates (staff only)
+    path('cache/stats/', views.cache_stats_view, name='cache_stats'),
 ]
@@ -1,7 +1,10 @@
 # dashboard/views.py
 from django.shortcuts import render
 from django.http import HttpResponse
+from django.conf import settings
+from django.views.decorators.cache import cache_page
 
+@cache_page(settings.LANDING_PAGE_CACHE_SECONDS)
 def landing_page(request):
     """
     Landing page for the Trading Lab application.
@@ -12,73 +15,859 @@ def landing_page(request):
 from django.shortcuts import redirect, get_object_or_404
 from django.utils import timezone
 from django.http import JsonResponse
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
 from decimal import Decimal
 from core.risk_calculator import calculate_rr_ratio, calculate_position_size
 from django.contrib import messages
 from django.urls import reverse
-from .models import OHLCVData, TradeLog, TradeChecklistStatus, CLASSIC_BREAKOUT_CHECKLIST
+from django.template.loader import render_to_string
+from .models import OHLCVData, TradeLog, TradeChecklistStatus, CLASSIC_BREAKOUT_CHECKLIST, BacktestJob, TickerCatalog
 from .forms import TradeLogForm
-from core.backtester import run_backtest, get_available_date_range
+from core.backtester import get_available_date_range, get_data_version, ENGINE_BACKTRADER, ENGINES
+from core.backtest_jobs import enqueue_backtest, backtest_kwargs
+from core.monte_carlo import run_monte_carlo, DEFAULT_PATHS, METHOD_BOOTSTRAP, METHODS as MONTE_CARLO_METHODS
 from core.strategies import ClassicBreakoutStrategy
 from core.market_data import get_latest_quote, is_tradable
 from core.educational_guidance import get_educational_context
+from core.screener import DEFAULT_BARS, screen_breakouts
+from core.downsampling import bucket_ohlcv, downsample_line
+from core.features import get_features
+from core.catalog import catalog_tickers
+from core.journal import ANALYTICS_DIMENSIONS, journal_analytics, trade_log_summary
+from core.pagination import KeysetPage
+from core.view_cache import (GENERATION_TRADE_LOGS, SECTION_CHART_DATA, bump_generation, cache_stats, cached,
+                             catalog_version, reset_cache_stats, trade_log_version)
+from django.contrib.admin.views.decorators import staff_member_required
+from core.indicator_engine import rebuild_indicator_state
+from core.upstream import UpstreamTimeout, call_upstream
+from asgiref.sync import sync_to_async
+import asyncio
 import json
+import logging
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from plotly.offline import plot
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
-# Include all other view functions here
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Moving-average traces of the chart: (feature column, trace name, chart_indices key)
+CHART_AVERAGES = (
+    ('sma_10', 'SMA 10', 'sma10Index'),
+    ('sma_20', 'SMA 20', 'sma20Index'),
+    ('sma_50', 'SMA 50', 'sma50Index'),
+    ('ema_10', 'EMA 10', 'ema10Index'),
+    ('ema_20', 'EMA 20', 'ema20Index'),
+    ('ema_50', 'EMA 50', 'ema50Index'),
+)
+
+# Points per trace: one per pixel of the chart's width, within these bounds
+CHART_DEFAULT_POINTS = 1200
+CHART_MIN_POINTS = 100
+CHART_MAX_POINTS = 5000
+
+# Bump when the chart data payload changes, so cached copies are revalidated
+CHART_DATA_FORMAT_VERSION = 1
+
+
+def _parse_chart_date(value, default):
+    """A YYYY-MM-DD query parameter as a date (``default`` if missing); ValueError if malformed."""
+    if not value:
+        return default
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD.")
+
+
+def _chart_dates(request, start_param='start_date', end_param='end_date'):
+    """
+    Chart date range from the query string (default: the year up to today).
+
+    Raises:
+        ValueError: If a date is malformed.
+    """
+    end_date = _parse_chart_date(request.GET.get(end_param), timezone.now().date())
+    start_date = _parse_chart_date(request.GET.get(start_param), end_date - relativedelta(years=1))
+    return start_date, end_date
+
+
+def _chart_points(value):
+    """
+    Target points per trace from the chart's width in pixels.
+
+    Raises:
+        ValueError: If the value is not an integer.
+    """
+    if not value:
+        return CHART_DEFAULT_POINTS
+    try:
+        points = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid max_points '{value}'. Use an integer.")
+    return min(max(points, CHART_MIN_POINTS), CHART_MAX_POINTS)
+
+
+def _chart_range(start_date, end_date):
+    """Aware datetimes covering whole days from ``start_date`` to ``end_date``."""
+    return (timezone.make_aware(datetime.combine(start_date, datetime.min.time())),
+            timezone.make_aware(datetime.combine(end_date, datetime.max.time())))
+
+
+def _chart_series(bars, features, points):
+    """
+    Chart traces for bars and their features, downsampled to about ``points`` points each.
+
+    Candles and volume are aggregated into buckets of bars (keeping OHLC
+    extremes); the moving averages are LTTB-downsampled. Values are rounded
+    to the 4 decimals prices are stored with.
+
+    Returns:
+        dict: 'bars' (bars in the range), 'downsampled', 'candles' (x, open,
+              high, low, close), 'volume' (x, y) and 'lines' (feature column
+              -> x, y). Timestamps are ISO strings.
+    """
+    timestamps = np.array([ts.isoformat() for ts in bars.index], dtype=object)
+    candles = bucket_ohlcv(bars['open'], bars['high'], bars['low'], bars['close'], bars['volume'], points)
+    x = timestamps[candles['start']].tolist()
+    lines = {}
+    for column, _, _ in CHART_AVERAGES:
+        values = features[column].to_numpy(dtype=float)
+        keep = downsample_line(values, points)
+        lines[column] = {'x': timestamps[keep].tolist(), 'y': np.round(values[keep], 4).tolist()}
+    return {
+        'bars': len(bars),
+        'downsampled': len(bars) > points,
+        'candles': {'x': x, **{name: np.round(candles[name], 4).tolist()
+                               for name in ('open', 'high', 'low', 'close')}},
+        'volume': {'x': x, 'y': candles['volume'].astype(np.int64).tolist()},
+        'lines': lines,
+    }
+
+
+def chart_series(ticker, start_date, end_date, points):
+    """
+    Downsampled chart traces of a ticker's bars and moving averages for a date range.
+
+    Bars come from OHLCVData and the moving averages from the persisted daily
+    features (``core.features``), one range query each. If the features don't
+    cover the bars (e.g. bars written outside ``save_ohlcv_data``), the
+    ticker's features are rebuilt first.
+
+    Returns:
+        dict: See ``_chart_series``; None if there are no bars in the range.
+    """
+    start_dt, end_dt = _chart_range(start_date, end_date)
+    bars = pd.DataFrame.from_records(
+        OHLCVData.objects.filter(ticker=ticker, timestamp__gte=start_dt, timestamp__lte=end_dt)
+        .order_by('timestamp')
+        .values_list('timestamp', 'open', 'high', 'low', 'close', 'volume'),
+        columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'],
+    )
+    if bars.empty:
+        return None
+    bars = bars.set_index('timestamp').astype(float)
+
+    columns = tuple(column for column, _, _ in CHART_AVERAGES)
+    features = get_features(ticker, start_dt, end_dt, columns)
+    if not features.index.equals(bars.index):
+        rebuild_indicator_state(ticker)
+        features = get_features(ticker, start_dt, end_dt, columns)
+    return _chart_series(bars, features.reindex(bars.index), points)
+
+
 def chart_view(request, ticker=None):
-    # Existing implementation
-    context = {'ticker': ticker or ''}
+    """
+    Page shell of a ticker's candlestick chart with SMA/EMA traces and volume.
+
+    The figure is rendered without data; the page fills it from
+    ``chart_data_view``, whose responses the browser revalidates with ETags,
+    and fetches the visible range again when the user zooms in.
+    """
+    ticker = (ticker or request.GET.get('ticker', '')).strip().upper()
+    try:
+        start_date, end_date = _chart_dates(request)
+    except ValueError:
+        start_date, end_date = _chart_dates(request, start_param=None, end_param=None)
+    context = {
+        'ticker': ticker,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+    }
+    if not ticker:
+        return render(request, 'dashboard/chart_view.html', context)
+
+    start_dt, end_dt = _chart_range(start_date, end_date)
+    try:
+        if not OHLCVData.objects.filter(ticker=ticker, timestamp__gte=start_dt, timestamp__lte=end_dt).exists():
+            context['error_message'] = (
+                f"No data found for {ticker} between {context['start_date']} and {context['end_date']}."
+            )
+            return render(request, 'dashboard/chart_view.html', context)
+
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.75, 0.25])
+        fig.add_trace(go.Candlestick(x=[], open=[], high=[], low=[], close=[], name=ticker), row=1, col=1)
+        chart_indices = {}
+        for column, name, key in CHART_AVERAGES:
+            chart_indices[key] = len(fig.data)
+            fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name=name, line={'width': 1}), row=1, col=1)
+        chart_indices['volumeIndex'] = len(fig.data)
+        fig.add_trace(go.Bar(x=[], y=[], name='Volume', marker_color='rgba(100, 100, 200, 0.5)'), row=2, col=1)
+        fig.update_layout(title=f"{ticker} Daily", xaxis_rangeslider_visible=False, height=700,
+                          legend={'orientation': 'h'})
+        fig.update_yaxes(title_text='Price', row=1, col=1)
+        fig.update_yaxes(title_text='Volume', row=2, col=1)
+
+        context['chart_div'] = plot(fig, output_type='div', include_plotlyjs=False)
+        context['chart_indices'] = json.dumps(chart_indices)
+        context['chart_data_url'] = reverse('dashboard:chart_data', args=[ticker])
+    except Exception as e:
+        logger.error(f"Error generating chart for {ticker}: {e}")
+        context['error_message'] = f"Error generating chart for {ticker}: {e}"
     return render(request, 'dashboard/chart_view.html', context)
 
+
+def _chart_data_params(request):
+    """(start date, end date, points) of a chart data request; ValueError if invalid."""
+    start_date, end_date = _chart_dates(request, start_param='start', end_param='end')
+    if start_date > end_date:
+        raise ValueError("start must not be after end.")
+    return start_date, end_date, _chart_points(request.GET.get('max_points'))
+
+
+def _chart_data_version(ticker, end_date):
+    """
+    Version of the bars a chart data response is built from: the ticker's
+    bars up to the end date (moving averages depend on earlier bars too).
+
+    When the range reaches the ticker's last bar ``get_data_version`` reads
+    it from the catalog; otherwise the bars are fingerprinted.
+    """
+    return get_data_version(ticker, None, _chart_range(end_date, end_date)[1])
+
+
+def _chart_data_etag(request, ticker):
+    """ETag of a chart data response: the data version plus the request."""
+    try:
+        start_date, end_date, points = _chart_data_params(request)
+    except ValueError:
+        return None
+    version = _chart_data_version(ticker.upper(), end_date)
+    return f"{CHART_DATA_FORMAT_VERSION}-{version}-{start_date:%Y%m%d}-{end_date:%Y%m%d}-{points}"
+
+
+def _chart_data_last_modified(request, ticker):
+    """When bars were last ingested for the ticker."""
+    return TickerCatalog.objects.filter(ticker=ticker.upper()).values_list('last_ingest', flat=True).first()
+
+
+@require_GET
+@condition(etag_func=_chart_data_etag, last_modified_func=_chart_data_last_modified)
+def chart_data_view(request, ticker):
+    """
+    JSON bars and moving averages of a ticker for client-side charts.
+
+    Query parameters: ``start`` and ``end`` (YYYY-MM-DD, default: the last
+    year) and ``max_points`` (points per trace, usually the chart width;
+    longer ranges are downsampled). Responses carry an ETag derived from the
+    ticker's data version and a Last-Modified of its latest ingest, so
+    repeat requests for unchanged data are answered with 304 Not Modified;
+    payloads are cached server-side under the same version.
+    """
+    ticker = ticker.upper()
+    try:
+        start_date, end_date, points = _chart_data_params(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    try:
+        # Cached per data version, so new bars are picked up immediately
+        series = cached(SECTION_CHART_DATA,
+                        (ticker, _chart_data_version(ticker, end_date), start_date, end_date, points,
+                         CHART_DATA_FORMAT_VERSION),
+                        lambda: chart_series(ticker, start_date, end_date, points))
+    except Exception as e:
+        logger.error(f"Error loading chart data for {ticker}: {e}")
+        return JsonResponse({'error': f"Error loading chart data for {ticker}: {e}"}, status=500)
+    if series is None:
+        return JsonResponse({'error': f"No data found for {ticker} between {start_date} and {end_date}."},
+                            status=404)
+
+    payload = {'ticker': ticker, 'start': start_date.isoformat(), 'end': end_date.isoformat(), **series}
+    response = JsonResponse(payload, json_dumps_params={'separators': (',', ':')})
+    # Cache, but revalidate every time: unchanged data costs one fingerprint query and a 304
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+# Form fields for the Classic Breakout parameters and their types
+BACKTEST_STRATEGY_FIELDS = {
+    'lookback': int,
+    'volume_ma_period': int,
+    'volume_mult': float,
+    'atr_period': int,
+    'initial_stop_atr_mult': float,
+    'trail_stop_atr_mult': float,
+}
+
+
+def _default_backtest_params():
+    """Default form values: broker settings plus the strategy's own defaults."""
+    params = {'initial_cash': 100000.0, 'commission': 0.001, 'engine': ENGINE_BACKTRADER}
+    for name in BACKTEST_STRATEGY_FIELDS:
+        params[name] = getattr(ClassicBreakoutStrategy.params, name)
+    return params
+
+
+def _backtest_config_from_post(post):
+    """
+    Build a JSON-serializable backtest configuration from submitted form data.
+
+    Raises:
+        ValueError: If the ticker is missing or a value can't be parsed.
+    """
+    defaults = _default_backtest_params()
+    ticker = post.get('ticker', '').strip().upper()
+    if not ticker:
+        raise ValueError("Please select a ticker.")
+
+    def field(name, cast):
+        raw = post.get(name, '')
+        try:
+            return cast(raw) if raw != '' else defaults[name]
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {name.replace('_', ' ')}: {raw}")
+
+    dates = {}
+    for name in ('start_date', 'end_date'):
+        raw = post.get(name) or None
+        if raw:
+            try:
+                datetime.strptime(raw, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f"Invalid {name.replace('_', ' ')}: {raw}")
+        dates[name] = raw
+
+    engine = post.get('engine') or ENGINE_BACKTRADER
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown backtest engine: {engine}")
+
+    return {
+        'ticker': ticker,
+        'start_date': dates['start_date'],
+        'end_date': dates['end_date'],
+        'initial_cash': field('initial_cash', float),
+        'commission': field('commission', float),
+        'engine': engine,
+        'low_memory': post.get('low_memory') in ('on', 'true', '1'),
+        'strategy_params': {name: field(name, cast) for name, cast in BACKTEST_STRATEGY_FIELDS.items()},
+    }
+
+
+def _backtest_params_for_template(config):
+    """Flatten a backtest configuration for re-populating the form."""
+    params = {key: value for key, value in config.items() if key != 'strategy_params'}
+    params.update(config['strategy_params'])
+    return params
+
+
+def _equity_figure(equity, ticker):
+    """Plotly figure of portfolio value over the backtest period."""
+    fig = go.Figure(go.Scatter(
+        x=equity['dates'], y=equity['values'], mode='lines', name='Portfolio Value'
+    ))
+    fig.update_layout(
+        title=f"{ticker} Portfolio Value", xaxis_title='Date', yaxis_title='Value ($)',
+        height=400, margin=dict(l=40, r=20, t=50, b=40)
+    )
+    return fig
+
+
+def _is_ajax(request):
+    return request.headers.get('x-requested-with') == 'XMLHttpRequest'
+
+
+def _job_payload(job):
+    """JSON description of a backtest job for the polling endpoints."""
+    return {
+        'job_id': job.pk,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error or None,
+        'status_url': reverse('dashboard:backtest_job_status', args=[job.pk]),
+        'result_url': reverse('dashboard:backtest_job_result', args=[job.pk]),
+    }
+
+
 def backtest_view(request):
-    # Simplified implementation
-    context = {}
+    """
+    Backtest configuration page and results.
+
+    Every submission is queued as a background job; no backtest runs in the
+    request. AJAX submissions are answered immediately with the job's id and
+    polling URLs, and the page polls for progress and the result. Regular
+    form posts (no JavaScript) are redirected to the job's page
+    (``backtest_job_page``), which refreshes itself until the job finishes.
+    """
+    context = {
+        # Only called when the cached ticker list fragment is rebuilt
+        'available_tickers': catalog_tickers,
+        'catalog_version': catalog_version(),
+        'default_params': _default_backtest_params(),
+        'engines': ENGINES,
+    }
+    if request.method != 'POST':
+        return render(request, 'dashboard/backtest_view.html', context)
+
+    try:
+        config = _backtest_config_from_post(request.POST)
+    except ValueError as e:
+        if _is_ajax(request):
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        context['error_message'] = str(e)
+        return render(request, 'dashboard/backtest_view.html', context)
+
+    job, created = enqueue_backtest(config)
+    if not _is_ajax(request):
+        return redirect('dashboard:backtest_job_page', job_id=job.pk)
+    payload = _job_payload(job)
+    payload['deduplicated'] = not created
+    return JsonResponse(payload, status=202)
+
+
+# Seconds between reloads of the job page while a job is queued or running
+BACKTEST_JOB_PAGE_REFRESH = 2
+
+
+def backtest_job_page(request, job_id):
+    """
+    Backtest page for a queued job, used when the form is posted without
+    JavaScript: it reloads itself while the job is queued or running, then
+    shows the results or the error.
+    """
+    job = get_object_or_404(BacktestJob, pk=job_id)
+    context = {
+        'available_tickers': catalog_tickers,
+        'catalog_version': catalog_version(),
+        'default_params': _default_backtest_params(),
+        'engines': ENGINES,
+        'backtest_params': _backtest_params_for_template(job.config),
+    }
+    if not job.is_finished:
+        context['pending_job'] = job
+        context['refresh_seconds'] = BACKTEST_JOB_PAGE_REFRESH
+        context['progress_percent'] = round(job.progress * 100)
+    elif job.status == BacktestJob.STATUS_FAILED:
+        context['error_message'] = job.error or 'Backtest failed.'
+    else:
+        context['metrics'] = job.result['metrics']
+        context['job_id'] = job.pk
+        context['equity_chart_div'] = plot(
+            _equity_figure(job.result['equity'], job.ticker), output_type='div', include_plotlyjs=False
+        )
     return render(request, 'dashboard/backtest_view.html', context)
 
+
+# Upper bound on simulated paths per Monte Carlo request
+MONTE_CARLO_MAX_PATHS = 50000
+
+
+def _monte_carlo_figure(analysis):
+    """Fan chart of Monte Carlo equity percentiles by trade number."""
+    bands = analysis['bands']
+    trades = list(range(analysis['trades'] + 1))
+    fig = go.Figure()
+    for low, high, name in (('p5', 'p95', '5th-95th percentile'), ('p25', 'p75', '25th-75th percentile')):
+        fig.add_trace(go.Scatter(x=trades, y=bands[high], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=trades, y=bands[low], mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor='rgba(13, 110, 253, 0.2)', name=name))
+    fig.add_trace(go.Scatter(x=trades, y=bands['p50'], mode='lines', name='Median',
+                             line=dict(color='rgb(13, 110, 253)')))
+    fig.add_hline(y=analysis['ruin_level'], line_dash='dash', line_color='red',
+                  annotation_text='Ruin level')
+    fig.update_layout(
+        title=f"Monte Carlo Equity ({analysis['paths']:,} {analysis['method']} paths)",
+        xaxis_title='Trade #', yaxis_title='Equity ($)', height=400,
+        margin=dict(l=40, r=20, t=50, b=40)
+    )
+    return fig
+
+
+def backtest_monte_carlo(request):
+    """
+    Monte Carlo stress test of a finished backtest job's closed trades.
+
+    Takes 'job_id' plus 'mc_method' and 'mc_paths', reads the trades stored
+    on the job's result (the backtest is never rerun here; 409 if the job has
+    not succeeded) and returns percentile bands, risk of ruin and a fan chart.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'POST required'}, status=405)
+    try:
+        job_id = int(request.POST.get('job_id') or '')
+        method = request.POST.get('mc_method') or METHOD_BOOTSTRAP
+        if method not in MONTE_CARLO_METHODS:
+            raise ValueError(f"Unknown Monte Carlo method: {method}")
+        n_paths = int(request.POST.get('mc_paths') or DEFAULT_PATHS)
+        if not 1 <= n_paths <= MONTE_CARLO_MAX_PATHS:
+            raise ValueError(f"Number of paths must be between 1 and {MONTE_CARLO_MAX_PATHS:,}.")
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    job = get_object_or_404(BacktestJob, pk=job_id)
+    if job.status != BacktestJob.STATUS_SUCCEEDED:
+        return JsonResponse({'status': 'error', 'message': 'The backtest has no finished result to resample.'},
+                            status=409)
+
+    pnl = [trade['pnlcomm'] for trade in job.result.get('trades') or []]
+    analysis = run_monte_carlo(pnl, job.result['metrics']['initial_capital'], n_paths=n_paths, method=method)
+    if analysis is None:
+        return JsonResponse({'status': 'error', 'message': 'The backtest has no closed trades to resample.'})
+
+    rows = [
+        {'percentile': key[1:], 'ending_equity': equity, 'max_drawdown': analysis['max_drawdown'][key]}
+        for key, equity in analysis['ending_equity'].items()
+    ]
+    html = render_to_string('dashboard/monte_carlo_results.html', {
+        'monte_carlo': analysis,
+        'rows': rows,
+        'risk_of_ruin_pct': analysis['risk_of_ruin'] * 100,
+    }, request=request)
+    return JsonResponse({
+        'status': 'success',
+        'monte_carlo': {key: value for key, value in analysis.items() if key != 'bands'},
+        'html': html,
+        'figure': json.loads(_monte_carlo_figure(analysis).to_json()),
+    })
+
+
+def backtest_job_status(request, job_id):
+    """Progress of a queued backtest job (polled by the backtest page)."""
+    job = get_object_or_404(BacktestJob, pk=job_id)
+    return JsonResponse(_job_payload(job))
+
+
+def backtest_job_result(request, job_id):
+    """
+    Result of a backtest job: 202 while it is still queued or running, the
+    error for a failed job, or the rendered results and equity chart.
+    """
+    job = get_object_or_404(BacktestJob, pk=job_id)
+    payload = _job_payload(job)
+    if not job.is_finished:
+        return JsonResponse(payload, status=202)
+    if job.status == BacktestJob.STATUS_FAILED:
+        return JsonResponse(payload)
+
+    metrics = job.result['metrics']
+    payload['metrics'] = metrics
+    payload['html'] = render_to_string('dashboard/backtest_results.html', {
+        'metrics': metrics,
+        'backtest_params': _backtest_params_for_template(job.config),
+        'job_id': job.pk,
+    }, request=request)
+    payload['equity_figure'] = json.loads(_equity_figure(job.result['equity'], job.ticker).to_json())
+    return JsonResponse(payload)
+
+def screener_view(request):
+    """
+    Tickers whose latest bar triggered a Classic Breakout entry, as JSON.
+
+    Query parameters: bars, limit, as_of (YYYY-MM-DD), include_stale and
+    any of the strategy fields (lookback, volume_mult, ...); omitted values
+    use the strategy defaults.
+    """
+    query = request.GET
+    try:
+        bars = int(query.get('bars') or DEFAULT_BARS)
+        limit = int(query['limit']) if query.get('limit') else None
+        as_of = datetime.strptime(query['as_of'], '%Y-%m-%d').date() if query.get('as_of') else None
+        strategy_params = {name: cast(query[name]) for name, cast in BACKTEST_STRATEGY_FIELDS.items()
+                           if query.get(name)}
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': f"Invalid screener parameter: {e}"}, status=400)
+
+    result = screen_breakouts(bars=bars, strategy_params=strategy_params, as_of=as_of, limit=limit,
+                              include_stale=query.get('include_stale') in ('on', 'true', '1'))
+    return JsonResponse({'status': 'success', **result})
+
+
+# Rows per page and loaded columns of the trade journal list
+TRADE_LOG_PAGE_SIZE = 50
+TRADE_LOG_LIST_FIELDS = ('ticker', 'strategy', 'entry_date', 'entry_price', 'exit_price', 'pnl')
+
+
 def trade_log_list_view(request):
-    # Simplified implementation
-    trade_logs = TradeLog.objects.all().order_by('-entry_date')
-    context = {'trade_logs': trade_logs}
+    """
+    Trade journal, newest trade first, with summary statistics.
+
+    Pages are keyset-paginated on (entry_date, id) via the ``after`` and
+    ``before`` cursors, so every page costs the same index range scan however
+    long the journal grows. Rows load only the listed columns plus their
+    prefetched checklist items, and the summary comes from one aggregate
+    query; both run only when the cached table fragment is rebuilt.
+    """
+    trade_logs = TradeLog.objects.only(*TRADE_LOG_LIST_FIELDS).prefetch_related(
+        Prefetch('checklist_items', queryset=TradeChecklistStatus.objects.only('trade_log_id', 'is_checked'))
+    )
+    after, before = request.GET.get('after'), request.GET.get('before')
+    try:
+        page = KeysetPage(trade_logs, 'entry_date', TRADE_LOG_PAGE_SIZE, after=after, before=before)
+    except ValueError:
+        messages.warning(request, "Invalid page link; showing the latest trades.")
+        after = before = None
+        page = KeysetPage(trade_logs, 'entry_date', TRADE_LOG_PAGE_SIZE)
+    context = {
+        'trade_logs': page,
+        # Called by the template only when the cached fragment is rebuilt
+        'trade_log_summary': trade_log_summary,
+        'trade_log_version': trade_log_version(),
+        'page_after': after or '',
+        'page_before': before or '',
+    }
     return render(request, 'dashboard/trade_log_list.html', context)
 
+def journal_analytics_view(request):
+    """
+    Trade journal statistics grouped by strategy, ticker and/or month.
+
+    Query parameters: group (comma-separated dimensions, default
+    'strategy,month'), strategy and ticker filters. Reads only the
+    JournalSummary aggregates, never the trades themselves.
+    """
+    group_by = tuple(name.strip() for name in request.GET.get('group', 'strategy,month').split(',') if name.strip())
+    strategy = request.GET.get('strategy', '').strip()
+    ticker = request.GET.get('ticker', '').strip().upper()
+    context = {
+        'dimensions': ANALYTICS_DIMENSIONS,
+        'group_by': group_by,
+        'group': ','.join(group_by),
+        'strategy': strategy,
+        'ticker': ticker,
+    }
+    try:
+        context['rows'] = journal_analytics(group_by, strategy=strategy or None, ticker=ticker or None)
+    except ValueError as e:
+        context['error_message'] = str(e)
+        context['rows'] = []
+    return render(request, 'dashboard/journal_analytics.html', context)
+
+def _apply_risk_calculations(trade_log):
+    """Fill in the planned R:R ratio and suggested position size when the form left them empty."""
+    if trade_log.planned_rr_ratio is None and trade_log.planned_target is not None:
+        trade_log.planned_rr_ratio = calculate_rr_ratio(
+            trade_log.entry_price, trade_log.initial_stop_loss, trade_log.planned_target)
+    if trade_log.suggested_position_size is None:
+        trade_log.suggested_position_size = calculate_position_size(
+            trade_log.account_capital_at_trade, trade_log.user_risk_percent,
+            trade_log.entry_price, trade_log.initial_stop_loss)
+
+
 def trade_log_create_view(request):
-    # Simplified implementation
-    context = {'form': TradeLogForm()}
-    return render(request, 'dashboard/trade_log_form.html', context)
+    """
+    Log a new trade. Its checklist rows are created with one bulk insert
+    when it is saved (``TradeLog.create_checklist``).
+    """
+    if request.method == 'POST':
+        form = TradeLogForm(request.POST)
+        if form.is_valid():
+            trade_log = form.save(commit=False)
+            _apply_risk_calculations(trade_log)
+            trade_log.save()
+            messages.success(request, f"Trade log for {trade_log.ticker} created.")
+            return redirect('dashboard:trade_log_list')
+    else:
+        form = TradeLogForm(initial={'strategy': 'Classic Breakout'})
+    return render(request, 'dashboard/trade_log_form.html', {'form': form})
+
 
 def trade_log_detail_view(request, pk):
-    # Simplified implementation
+    """A trade with its checklist, which the page saves in batches (``update_checklist_items``)."""
     trade_log = get_object_or_404(TradeLog, pk=pk)
-    context = {'trade_log': trade_log}
+    context = {'trade_log': trade_log, 'checklist_items': trade_log.checklist_items.all()}
     return render(request, 'dashboard/trade_log_detail.html', context)
 
+
 def trade_log_update_view(request, pk):
-    # Simplified implementation
+    """Edit a trade; empty risk fields are recalculated from the prices."""
     trade_log = get_object_or_404(TradeLog, pk=pk)
-    context = {'trade_log': trade_log, 'form': TradeLogForm(instance=trade_log)}
-    return render(request, 'dashboard/trade_log_form.html', context)
+    if request.method == 'POST':
+        form = TradeLogForm(request.POST, instance=trade_log)
+        if form.is_valid():
+            trade_log = form.save(commit=False)
+            _apply_risk_calculations(trade_log)
+            trade_log.save()
+            messages.success(request, f"Trade log for {trade_log.ticker} updated.")
+            return redirect('dashboard:trade_log_detail', pk=trade_log.pk)
+    else:
+        form = TradeLogForm(instance=trade_log)
+    return render(request, 'dashboard/trade_log_form.html', {'trade_log': trade_log, 'form': form})
+
 
 def trade_log_delete_view(request, pk):
-    # Simplified implementation
+    """Confirm (GET) and delete (POST) a trade with its checklist."""
+    trade_log = get_object_or_404(TradeLog, pk=pk)
+    if request.method == 'POST':
+        ticker = trade_log.ticker
+        trade_log.delete()
+        messages.success(request, f"Trade log for {ticker} deleted.")
+        return redirect('dashboard:trade_log_list')
+    return render(request, 'dashboard/trade_log_confirm_delete.html', {'trade_log': trade_log})
+
+
+def _parse_checklist_states(raw):
+    """
+    Checklist states from a JSON object of item id -> checked.
+
+    Raises:
+        ValueError: If the payload is not such an object.
+    """
+    try:
+        states = json.loads(raw or '')
+    except json.JSONDecodeError:
+        raise ValueError("'items' must be a JSON object of item id -> checked.")
+    if not isinstance(states, dict) or not states:
+        raise ValueError("'items' must be a non-empty JSON object of item id -> checked.")
+    try:
+        return {int(item_id): _checked_value(checked) for item_id, checked in states.items()}
+    except (TypeError, ValueError):
+        raise ValueError("Checklist item ids must be integers and states true or false.")
+
+
+def _checked_value(value):
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('true', 'false'):
+        return str(value).lower() == 'true'
+    raise ValueError(f"Invalid checklist state '{value}'")
+
+
+def _save_checklist_states(items, states):
+    """
+    Apply checklist states with one bulk update in one transaction.
+
+    Parameters:
+        items (QuerySet): TradeChecklistStatus rows the states may refer to
+        states (dict): Item id -> checked
+
+    Returns:
+        int: Number of items whose state changed.
+
+    Raises:
+        ValueError: If a state refers to an item outside ``items``.
+    """
+    rows = list(items.filter(pk__in=states).only('id', 'trade_log_id', 'is_checked'))
+    if len(rows) != len(states):
+        unknown = sorted(set(states) - {row.pk for row in rows})
+        raise ValueError(f"Unknown checklist items: {unknown}")
+    changed = [row for row in rows if row.is_checked != states[row.pk]]
+    for row in changed:
+        row.is_checked = states[row.pk]
+    if changed:
+        with transaction.atomic():
+            TradeChecklistStatus.objects.bulk_update(changed, ['is_checked'])
+        # bulk_update sends no signals; invalidate the cached journal list (checklist column)
+        bump_generation(GENERATION_TRADE_LOGS)
+    return len(changed)
+
+
+@require_POST
+def update_checklist_items(request, pk):
+    """
+    Save several checklist items of a trade in one request.
+
+    POST field ``items``: JSON object of checklist item id -> checked, as
+    collected by the detail page while the user ticks boxes.
+    """
     trade_log = get_object_or_404(TradeLog, pk=pk)
-    context = {'trade_log': trade_log}
-    return render(request, 'dashboard/trade_log_confirm_delete.html', context)
+    try:
+        updated = _save_checklist_states(trade_log.checklist_items.all(),
+                                         _parse_checklist_states(request.POST.get('items')))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'updated': updated})
 
+
+@require_POST
 def update_checklist_item(request):
-    # Simplified implementation
-    return JsonResponse({'success': True})
+    """Save one checklist item (POST fields ``item_id`` and ``is_checked``)."""
+    try:
+        states = {int(request.POST.get('item_id', '')): _checked_value(request.POST.get('is_checked'))}
+        updated = _save_checklist_states(TradeChecklistStatus.objects.all(), states)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'updated': updated})
+
+async def market_quote_view(request):
+    """
+    Live Alpaca quote of a ticker (``?ticker=``); AJAX requests get the quote as JSON.
 
-def market_quote_view(request):
-    # Simplified implementation
+    The quote and the tradability check are fetched concurrently on the
+    upstream thread pool (core.upstream) and abandoned after
+    UPSTREAM_TIMEOUT_SECONDS, so slow Alpaca calls don't hold a worker.
+    """
+    ticker = request.GET.get('ticker', '').strip().upper()
     context = {}
-    return render(request, 'dashboard/market_quote.html', context)
+    status = 200
+    if ticker:
+        try:
+            quote_data, tradable = await asyncio.gather(call_upstream(get_latest_quote, ticker),
+                                                        call_upstream(is_tradable, ticker))
+        except UpstreamTimeout:
+            quote_data, tradable = {
+                'ticker': ticker, 'status': 'error',
+                'error_message': f"Alpaca did not answer within {settings.UPSTREAM_TIMEOUT_SECONDS:g} seconds.",
+            }, False
+            status = 504
+        if quote_data is None:
+            quote_data = {'ticker': ticker, 'status': 'error',
+                          'error_message': f"No quote data found for {ticker}."}
+        if _is_ajax(request):
+            return JsonResponse({**quote_data, 'tradable': tradable}, status=status,
+                                json_dumps_params={'default': str})
+        context.update(quote_data=quote_data, tradable=tradable)
+    # Rendering reads the session (messages) and the catalog, so it runs on Django's sync thread
+    context['db_tickers'] = catalog_tickers
+    return await sync_to_async(render)(request, 'dashboard/market_quote.html', context, status=status)
+
+
+async def educational_guidance_view(request):
+    """
+    Gemini explanation of a trading topic (``?topic=``); AJAX requests get it as JSON.
+
+    The Gemini call runs on the upstream thread pool (core.upstream) and is
+    abandoned after UPSTREAM_TIMEOUT_SECONDS.
+    """
+    topic = request.GET.get('topic', 'default')
+    status = 200
+    try:
+        explanation = await call_upstream(get_educational_context, topic)
+    except UpstreamTimeout:
+        explanation = "Sorry, the educational service is taking too long to answer. Please try again later."
+        status = 504
+    if _is_ajax(request):
+        return JsonResponse({'explanation': explanation, 'topic': topic}, status=status)
+    context = {'explanation': explanation, 'topic': topic}
+    return await sync_to_async(render)(request, 'dashboard/educational_guidance.html', context, status=status)
+
 
-def educational_guidance_view(request):
-    # Simplified implementation
-    context = {'explanation': 'Educational content would go here.'}
-    return render(request, 'dashboard/educational_guidance.html', context)
+@staff_member_required
+def cache_stats_view(request):
+    """Hit rates of the cached views and fragments (core.view_cache); POST resets the counts."""
+    if request.method == 'POST':
+        reset_cache_stats()
+        messages.success(request, "Cache statistics reset.")
+        return redirect('dashboard:cache_stats')
+    context = {
+        'stats': cache_stats(),
+        'backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+        'timeout': settings.VIEW_CACHE_TIMEOUT,
+    }
+    return render(request, 'dashboard/cache_stats.html', context)
@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "channels",
     "dashboard", # Your app
 ]
 
@@ -79,6 +80,9 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "swing_project.wsgi.application"
+# The live quote and educational guidance views are async; serve them with an
+# ASGI server (e.g. daphne swing_project.asgi:application) for concurrency.
+ASGI_APPLICATION = "swing_project.asgi.application"
 
 
 # Database
@@ -141,6 +145,90 @@ STATIC_URL = "static/"
 # STATIC_ROOT = BASE_DIR / "staticfiles"
 
 
+# Django cache used by the dashboard views and template fragments (core/view_cache.py).
+# CACHE_BACKEND selects local memory (default, per process), 'file' (CACHE_DIR,
+# shared by the processes of one host) or 'redis' (CACHE_REDIS_URL, shared by
+# every host; redis-py uses the installed hiredis parser).
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem').lower()
+VIEW_CACHE_TIMEOUT = int(os.getenv('VIEW_CACHE_TIMEOUT', 60 * 60))
+if CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'trading-lab',
+            'TIMEOUT': VIEW_CACHE_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': Path(os.getenv('CACHE_DIR', BASE_DIR / '.cache' / 'django')),
+            'TIMEOUT': VIEW_CACHE_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    }
+elif CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_REDIS_URL', 'redis://127.0.0.1:6379/1'),
+            'TIMEOUT': VIEW_CACHE_TIMEOUT,
+            'KEY_PREFIX': 'trading-lab',
+        }
+    }
+else:
+    raise ValueError(f"Unknown CACHE_BACKEND '{CACHE_BACKEND}'; use locmem, file or redis")
+# Seconds the static landing page is served from the cache
+LANDING_PAGE_CACHE_SECONDS = int(os.getenv('LANDING_PAGE_CACHE_SECONDS', 15 * 60))
+
+# Backtest result cache (core/result_cache.py)
+# Results persist on disk across processes; least recently used entries are
+# evicted once the cache grows beyond BACKTEST_CACHE_MAX_BYTES.
+BACKTEST_CACHE_DIR = Path(os.getenv('BACKTEST_CACHE_DIR', BASE_DIR / '.cache' / 'backtests'))
+BACKTEST_CACHE_MAX_BYTES = int(os.getenv('BACKTEST_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Indicator arrays shared across runs and strategies (core/indicator_cache.py):
+# an in-process LRU layer of INDICATOR_CACHE_MEMORY_BYTES in front of an
+# on-disk layer evicted like the result cache.
+INDICATOR_CACHE_DIR = Path(os.getenv('INDICATOR_CACHE_DIR', BASE_DIR / '.cache' / 'indicators'))
+INDICATOR_CACHE_MAX_BYTES = int(os.getenv('INDICATOR_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+INDICATOR_CACHE_MEMORY_BYTES = int(os.getenv('INDICATOR_CACHE_MEMORY_BYTES', 64 * 1024 * 1024))
+
+# Blocking Alpaca and Gemini calls made by async views (core/upstream.py) run
+# on a pool of UPSTREAM_MAX_WORKERS threads and are abandoned after
+# UPSTREAM_TIMEOUT_SECONDS.
+UPSTREAM_MAX_WORKERS = int(os.getenv('UPSTREAM_MAX_WORKERS', 16))
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv('UPSTREAM_TIMEOUT_SECONDS', 10))
+
+# Live quote stream (core/quote_stream.py, dashboard/consumers.py). Quotes are
+# fanned out through the channel layer: 'memory' (one process; development
+# and tests) or 'redis' (CHANNEL_REDIS_URL, shared by every ASGI process; use
+# it in production together with the redis cache, which holds the per-ticker
+# poller leases).
+CHANNEL_LAYER = os.getenv('CHANNEL_LAYER', 'memory').lower()
+if CHANNEL_LAYER == 'memory':
+    CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+elif CHANNEL_LAYER == 'redis':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.getenv('CHANNEL_REDIS_URL', 'redis://127.0.0.1:6379/2')]},
+        }
+    }
+else:
+    raise ValueError(f"Unknown CHANNEL_LAYER '{CHANNEL_LAYER}'; use memory or redis")
+# Seconds between upstream polls of a watched ticker (one poller per ticker)
+QUOTE_POLL_INTERVAL_SECONDS = float(os.getenv('QUOTE_POLL_INTERVAL_SECONDS', 1))
+# Quote messages sent to one WebSocket per second; faster updates are coalesced
+QUOTE_MAX_UPDATES_PER_SECOND = float(os.getenv('QUOTE_MAX_UPDATES_PER_SECOND', 2))
+QUOTE_MAX_SUBSCRIPTIONS = int(os.getenv('QUOTE_MAX_SUBSCRIPTIONS', 20))
+
+# Profiles written by run_backtest(profile=True) and friends (core/profiling.py)
+BACKTEST_PROFILE_DIR = Path(os.getenv('BACKTEST_PROFILE_DIR', BASE_DIR / '.cache' / 'profiles'))
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 